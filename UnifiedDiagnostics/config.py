@@ -4,11 +4,193 @@ Central configuration for Master Sentinal.
 All tuneable constants live here so they can be changed in one place.
 """
 
+import os
+import sys
+
+# Persistent data (SMART trends, recorded history, baselines)
+DATA_DIR: str = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share"),
+    "MasterSentinal",
+)
+
 # Monitoring
 UPDATE_INTERVAL_SEC: int = 2
 
-# Temperature alerts
+# Adaptive polling: the tick interval is UPDATE_INTERVAL_SEC times these factors
+POLL_MAX_INTERVAL_SEC: float = 30.0
+POLL_HIDDEN_FACTOR: float = 5.0          # window minimized
+POLL_UNFOCUSED_FACTOR: float = 2.0       # another window has focus
+POLL_IDLE_AFTER_SEC: float = 300.0       # no mouse/keyboard input for this long...
+POLL_IDLE_FACTOR: float = 2.0            # ...slows polling by this much
+POLL_BUSY_CPU_PCT: float = 90.0          # overall CPU at or above this...
+POLL_BUSY_FACTOR: float = 2.0            # ...backs off further
+POLL_OVERHEAD_CEILING_PCT: float = 5.0   # the tool's own CPU use, % of one core (0 = no ceiling)
+
+# asyncio collection engine (one loop thread + a small executor for blocking calls)
+ENGINE_EXECUTOR_WORKERS: int = 4
+ENGINE_UI_POLL_MS: int = 50          # how often Tk drains the engine's result queue
+UI_LATENCY_SAMPLES: int = 120        # collection-to-paint latencies kept for the Dashboard readout
+GPU_COMMAND_TIMEOUT_SEC: float = 10.0
+SCAN_COMMAND_TIMEOUT_SEC: float = 7200.0
+
+# Resource governor (modules/governor.py). Priority levels: "idle", "low", "normal";
+# affinity is a list of logical CPU numbers, io_limit_mbps a read+write cap in MiB/s.
+SCAN_RESOURCE_DEFAULT: dict = {'cpu': "low", 'io': "idle", 'affinity': None, 'io_limit_mbps': None}
+# The disk space analyzer's walker threads use the "Disk Space Analyzer" entry.
+SCAN_RESOURCE_POLICIES: dict[str, dict] = {   # per Full Scan check name, overlaid on the default
+    "Disk Check (Scan)": {'io_limit_mbps': 100.0},
+    "Quick Disk Check": {'io_limit_mbps': 100.0},
+    "Power Monitor": {'cpu': "normal", 'io': "normal"},   # measures the system; must not be starved
+    # Benchmarks measure the machine: at low priority they would only measure what is left over
+    "Disk Benchmark": {'cpu': "normal", 'io': "normal"},
+    "Online Memory Test": {'cpu': "normal", 'io': "normal"},
+    "CPU Benchmark": {'cpu': "normal", 'io': "normal"},
+}
+MONITOR_THREAD_POLICY: dict = {'cpu': "low", 'io': "low"}   # engine, executor and sampler threads
+IO_THROTTLE_INTERVAL_SEC: float = 0.5
+
+# Disk benchmark (Full Scan check) — temp file in DISK_BENCH_DIR (None = system temp dir)
+DISK_BENCH_DIR: str | None = None
+DISK_BENCH_FILE_MB: int = 512               # capped at half the free space
+DISK_BENCH_SEQ_BLOCK_KB: int = 1024
+DISK_BENCH_QUEUE_DEPTH: int = 8             # outstanding random 4K requests
+DISK_BENCH_DURATION_SEC: float = 5.0        # per random phase
+DISK_BENCH_REGRESSION_PCT: float = 25.0     # slower than the previous run by this much = failed check
+DISK_BENCH_RESULTS_FILE: str = os.path.join(DATA_DIR, "disk_bench.jsonl")
+
+# ProcessPoolExecutor refuses more than 61 workers on Windows (None = no limit)
+PROCESS_POOL_MAX_WORKERS: int | None = 61 if sys.platform == "win32" else None
+
+# Online memory test (Full Scan check) — one worker process per core
+MEMTEST_FRACTION: float = 0.5               # share of RAMDiagnostic's available memory to test
+MEMTEST_MAX_MB: int = 16384                 # upper bound on the total (0 = none)
+MEMTEST_BUDGET_SEC: float = 60.0            # per worker
+MEMTEST_CHUNK_KB: int = 1024                # pattern generation granularity
+MEMTEST_WORKER_OVERHEAD_MB: int = 64        # interpreter + numpy per worker, counted against the fraction
+
+# CPU benchmark (Full Scan check) — one pinned worker process per logical CPU
+CPU_BENCH_DURATION_SEC: float = 20.0        # long enough for boost clocks to run out
+CPU_BENCH_WINDOW_SEC: float = 1.0           # per-worker score windows for the throttling trend
+CPU_BENCH_SAMPLE_SEC: float = 0.5           # clock / temperature sampling while the workers run
+CPU_BENCH_THROTTLE_PCT: float = 10.0        # score or clock falling this much during the run = throttling
+CPU_BENCH_MIN_CLOCK_PCT: float = 60.0       # sustained clock below this share of MaxClockSpeed = throttling
+CPU_BENCH_REGRESSION_PCT: float = 15.0      # slower than the previous run by this much = failed check
+CPU_BENCH_RESULTS_FILE: str = os.path.join(DATA_DIR, "cpu_bench.jsonl")
+
+# Named baselines (Full Scan tab) — saved summaries that later runs are compared against
+BASELINE_FILE: str = os.path.join(DATA_DIR, "baselines.json")
+BASELINE_IDLE_METRICS: list[str] = ["cpu.usage", "ram.percent", "gpu.*.load_pct", "gpu.*.temperature_c"]
+BASELINE_IDLE_PERCENTILE: float = 10.0      # of the live history: the machine at rest
+# First match wins.  'better' is the good direction; a move the other way is a regression once
+# it reaches both 'abs' (units of the metric) and 'pct' (of the baseline value); either may be omitted.
+BASELINE_RULES: list[dict] = [
+    {'metric': "bench.disk.*", 'better': "higher", 'pct': DISK_BENCH_REGRESSION_PCT},
+    {'metric': "bench.memory.mismatches", 'better': "lower", 'abs': 1},
+    {'metric': "bench.memory.*", 'better': "higher", 'pct': 15.0},
+    {'metric': "bench.cpu.errors", 'better': "lower", 'abs': 1},
+    {'metric': "bench.cpu.*", 'better': "higher", 'pct': CPU_BENCH_REGRESSION_PCT},
+    {'metric': "smart.*.temperature_c", 'better': "lower", 'abs': 10},
+    {'metric': "smart.*.wear_pct", 'better': "lower", 'abs': 5},
+    {'metric': "smart.*", 'better': "lower", 'abs': 1},   # reallocated / pending / media errors: any growth
+    {'metric': "idle.*.temperature_c", 'better': "lower", 'abs': 10},
+    {'metric': "idle.*", 'better': "lower", 'abs': 5, 'pct': 50.0},
+]
+
+# Disk space analyzer (Storage tab)
+SPACE_SCAN_WORKERS: int = 8                 # parallel scandir threads
+SPACE_TREE_DEPTH: int = 3                   # directory levels kept in memory below the mount
+SPACE_TREE_MAX_NODES: int = 20000           # ...and at most this many of them
+SPACE_TOP_N: int = 15                       # largest children shown per level
+SPACE_PROGRESS_INTERVAL_SEC: float = 0.5    # partial results streamed to the UI this often
+SPACE_INDEX_FILE: str = os.path.join(DATA_DIR, "space_index.db")   # per-directory mtime index
+SPACE_INDEX_BATCH: int = 2000               # directory records per index transaction
+
+# High-frequency CPU sampler (aggregated into each UPDATE_INTERVAL_SEC tick)
+CPU_SAMPLER_HZ: float = 20.0
+CPU_SAMPLER_MAX_HZ: float = 100.0
+CPU_SAMPLER_BUDGET_PCT: float = 1.0   # max sampler CPU use, % of one core
+
+# Numeric metric history (feeds statistics and export), memory-mapped so the
+# last window is restored instantly on restart
+HISTORY_WINDOW_SEC: int = 3600              # in-memory rings; also the span of statistics and export
+HISTORY_PERSIST: bool = True
+HISTORY_PERSIST_WINDOW_SEC: int = 86400     # rings in the memory-mapped file
+HISTORY_PERSIST_BLOCK_ROWS: int = 256     # samples per checksummed block
+HISTORY_PERSIST_MAX_KEYS: int = 1024      # metrics beyond this stay in memory only
+
+# Recorded history — columnar binary segments under DATA_DIR/history
+HISTORY_RECORD: bool = True
+HISTORY_SEGMENT_ROWS: int = 3600        # rows per segment (at most)
+HISTORY_SEGMENT_SEC: float = 900.0      # ...or this much time, whichever comes first
+HISTORY_STORE_DECIMALS: int = 2         # quantisation for delta-encoded columns
+HISTORY_RETENTION_DAYS: float = 30.0
+
+# Partition discovery — re-enumerate only when the mount table changes
+MOUNT_RESCAN_TTL_SEC: float = 60.0   # fallback when no change signal exists
+DISK_IGNORED_FSTYPES: frozenset[str] = frozenset({
+    "overlay", "tmpfs", "squashfs", "devtmpfs", "ramfs", "autofs", "nsfs",
+})
+
+# Disk usage probing — bounded wait for hung network/removable mounts
+DISK_PROBE_TIMEOUT_SEC: float = 1.0
+DISK_PROBE_QUARANTINE_AFTER: int = 2      # consecutive timeouts before backing off
+DISK_PROBE_BACKOFF_SEC: float = 10.0
+DISK_PROBE_BACKOFF_MAX_SEC: float = 600.0
+
+# WMI queries run in a helper process; a query past its deadline gets the
+# helper killed and restarted instead of hanging the app
+WMI_SANDBOX: bool = True
+WMI_QUERY_TIMEOUT_SEC: float = 15.0
+WMI_HELPER_START_TIMEOUT_SEC: float = 30.0
+
+# SMART attributes via smartmontools (falls back to WMI / sysfs status)
+SMARTCTL_PATH: str = "smartctl"
+SMART_CACHE_TTL_SEC: float = 1800.0
+SMART_MAX_CONCURRENCY: int = 4
+SMART_COMMAND_TIMEOUT_SEC: float = 30.0
+
+# SMART trend tracking and predictive warnings
+SMART_TREND_MIN_INTERVAL_SEC: float = 3600.0   # store unchanged samples at most hourly
+SMART_TREND_WINDOW_DAYS: float = 30.0          # growth rates are fitted over this window
+SMART_TREND_WARN_DAYS: float = 90.0            # warn when a threshold is this close
+SMART_TREND_THRESHOLDS: dict[str, float] = {
+    "reallocated": 100.0,
+    "pending": 20.0,
+    "media_errors": 50.0,
+    "wear_pct": 100.0,
+}
+
+# Fleet mode — agents stream snapshots to one aggregator
+FLEET_AGGREGATOR_ADDR: str = ""          # "host:port" polled by the Fleet tab ("" = disabled)
+FLEET_PORT: int = 47800
+FLEET_LISTEN_HOST: str = "127.0.0.1"     # aggregator bind address; "0.0.0.0" to accept other machines
+FLEET_PUSH_INTERVAL_SEC: float = UPDATE_INTERVAL_SEC
+FLEET_FULL_SNAPSHOT_EVERY: int = 30      # resend every key every N frames
+FLEET_VALUE_DECIMALS: int = 1            # changes below this precision are not sent
+FLEET_BUFFER_LEN: int = 60               # snapshots kept while disconnected
+FLEET_RECONNECT_MIN_SEC: float = 1.0
+FLEET_RECONNECT_MAX_SEC: float = 60.0
+FLEET_HISTORY_LEN: int = 150             # samples kept per host and metric
+FLEET_STALE_SEC: float = 10.0            # host shown as stale after this much silence
+FLEET_QUERY_TIMEOUT_SEC: float = 1.0
+
+# Processes tab
+PROCESS_TOP_N: int = 15
+
+# Alerts — rules over the numeric metric keys (see modules/alerts.py).
+# Extra rules can be added as a JSON list in ALERT_RULES_FILE.
 TEMP_ALERT_THRESHOLD_C: int = 90
+ALERT_RULES: list[dict] = [
+    {'metric': 'gpu.*.temperature_c', 'op': '>=', 'threshold': TEMP_ALERT_THRESHOLD_C,
+     'hysteresis': 5, 'severity': 'critical'},
+    {'metric': 'cpu.usage', 'op': '>=', 'threshold': 95, 'for_sec': 60, 'hysteresis': 10,
+     'severity': 'warning'},
+    {'metric': 'ram.percent', 'op': '>=', 'threshold': 90, 'for_sec': 30, 'hysteresis': 5,
+     'severity': 'warning'},
+]
+ALERT_RULES_FILE: str = os.path.join(DATA_DIR, "alert_rules.json")
+ALERT_LOG_LEN: int = 200                 # raised / cleared events kept for export
+ALERT_NOTIFY_SEVERITY: str = "warning"   # desktop notification at or above this ("" = off)
 
 # Appearance
 APPEARANCE_MODE: str = "Dark"
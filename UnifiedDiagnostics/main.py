@@ -1,6 +1,41 @@
-from ui.app_window import App
+import argparse
+import multiprocessing
+
+from config import FLEET_LISTEN_HOST, FLEET_PORT
 
 if __name__ == "__main__":
-    app = App()
-    app.protocol("WM_DELETE_WINDOW", app.on_closing)
-    app.mainloop()
+    multiprocessing.freeze_support()   # the WMI sandbox helper re-enters the frozen exe
+    parser = argparse.ArgumentParser(description="Master Sentinal system diagnostics")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--agent", metavar="HOST[:PORT]",
+                      help="run headless, streaming metrics to a fleet aggregator")
+    mode.add_argument("--aggregator", metavar="[HOST][:PORT]", nargs="?", const="",
+                      help=f"run a fleet aggregator (default {FLEET_LISTEN_HOST}:{FLEET_PORT})")
+    mode.add_argument("--record", metavar="PATH",
+                      help="run the app and capture CPU/RAM/GPU/disk collector output to PATH")
+    mode.add_argument("--replay", metavar="PATH",
+                      help="run the app on a capture instead of this machine's hardware")
+    mode.add_argument("--synthesize", metavar="PATH",
+                      help="write a synthetic capture of --cores/--gpus/--mounts and exit")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (default 1)")
+    parser.add_argument("--cores", type=int, default=256, help="synthetic logical CPUs (default 256)")
+    parser.add_argument("--gpus", type=int, default=8, help="synthetic GPUs (default 8)")
+    parser.add_argument("--mounts", type=int, default=100, help="synthetic mounted volumes (default 100)")
+    parser.add_argument("--duration", type=float, default=300.0, help="synthetic capture length in seconds")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        from modules.replay import synthesize
+        calls = synthesize(args.synthesize, args.cores, args.gpus, args.mounts, duration=args.duration)
+        print(f"Wrote {calls} collector calls to {args.synthesize}")
+    elif args.agent:
+        from modules.fleet import run_agent
+        run_agent(args.agent)
+    elif args.aggregator is not None:
+        from modules.fleet import run_aggregator
+        run_aggregator(args.aggregator)
+    else:
+        from ui.app_window import App
+        app = App(record=args.record, replay=args.replay, speed=args.speed)
+        app.protocol("WM_DELETE_WINDOW", app.on_closing)
+        app.mainloop()
@@ -0,0 +1,278 @@
+"""Alert rule engine evaluated on the numeric metric tick.
+
+A rule is a plain dict (from ``config.ALERT_RULES`` or the JSON file at
+``ALERT_RULES_FILE``)::
+
+    {'metric': 'gpu.*.temperature_c', 'op': '>=', 'threshold': 90,
+     'for_sec': 10, 'hysteresis': 5, 'severity': 'critical'}
+
+``metric`` is a key from :func:`modules.history.flatten_metrics` and may
+use shell wildcards, in which case the rule applies to every matching key
+separately.  A condition has to hold for ``for_sec`` seconds before the
+alert is raised, and once raised it only clears after the value has moved
+``hysteresis`` past the threshold the other way.
+
+Each (rule, metric) pair is one slot in a set of parallel numpy arrays, so
+a tick is evaluated for every rule at once instead of re-parsing display
+strings per widget.
+"""
+
+from __future__ import annotations
+
+import collections
+import fnmatch
+import json
+import os
+import re
+import shutil
+import sys
+from typing import Any
+
+import numpy as np
+
+from config import ALERT_LOG_LEN, ALERT_RULES, ALERT_RULES_FILE
+
+SEVERITIES = ("info", "warning", "critical")
+SEVERITY_COLORS = {"info": "#3B8ED0", "warning": "orange", "critical": "red"}
+
+_OPS = (">", ">=", "<", "<=", "==", "!=")
+
+
+def load_rules(path: str | None = ALERT_RULES_FILE) -> list[dict[str, Any]]:
+    """``config.ALERT_RULES`` plus the rules in the JSON list at *path*, if present."""
+    rules = [dict(r) for r in ALERT_RULES]
+    if path and os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                extra = json.load(f)
+            if not isinstance(extra, list):
+                raise ValueError("expected a JSON list of rules")
+            rules.extend(extra)
+        except (OSError, ValueError) as e:
+            print(f"Error loading alert rules from {path}: {e}")
+    return rules
+
+
+def _check_rule(rule: dict[str, Any]) -> dict[str, Any]:
+    """Validate *rule* and fill in defaults; raises ValueError if unusable."""
+    try:
+        metric = str(rule['metric'])
+        threshold = float(rule['threshold'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"alert rule {rule!r} needs 'metric' and a numeric 'threshold'") from e
+    op = rule.get('op', '>=')
+    severity = rule.get('severity', 'warning')
+    if op not in _OPS:
+        raise ValueError(f"alert rule {metric}: unknown op {op!r}")
+    if severity not in SEVERITIES:
+        raise ValueError(f"alert rule {metric}: unknown severity {severity!r}")
+    return {
+        'name': rule.get('name') or f"{metric} {op} {threshold:g}",
+        'metric': metric,
+        'op': op,
+        'threshold': threshold,
+        'for_sec': max(float(rule.get('for_sec', 0.0)), 0.0),
+        'hysteresis': max(float(rule.get('hysteresis', 0.0)), 0.0),
+        'severity': severity,
+    }
+
+
+class AlertEngine:
+    """Tracks pending / active state for every (rule, metric) pair.
+
+    Not thread-safe: the collection engine owns it and hands the UI
+    snapshots from :meth:`active` and the event list from :meth:`evaluate`.
+    """
+
+    def __init__(self, rules: list[dict[str, Any]] | None = None) -> None:
+        self.rules: list[dict[str, Any]] = []
+        for rule in load_rules() if rules is None else rules:
+            try:
+                self.rules.append(_check_rule(rule))
+            except ValueError as e:
+                print(f"Skipping {e}")
+        self.log: collections.deque[dict[str, Any]] = collections.deque(maxlen=ALERT_LOG_LEN)
+
+        self._keys: dict[str, int] = {}          # metric key -> column in the value vector
+        self._pair_rule = np.empty(0, dtype=np.int32)
+        self._pair_key = np.empty(0, dtype=np.int32)
+        self._pair_metric: list[str] = []
+
+        # Per-rule parameters, gathered into per-pair arrays on rebind
+        self._r_threshold = np.array([r['threshold'] for r in self.rules], dtype=np.float64)
+        self._r_sign = np.array([1.0 if r['op'][0] in ">=!" else -1.0 for r in self.rules])
+        self._r_strict = np.array([r['op'] in (">", "<") for r in self.rules], dtype=bool)
+        self._r_equality = np.array([r['op'] in ("==", "!=") for r in self.rules], dtype=bool)
+        self._r_negate = np.array([r['op'] == "!=" for r in self.rules], dtype=bool)
+        self._r_hysteresis = np.array([r['hysteresis'] for r in self.rules], dtype=np.float64)
+        self._r_for = np.array([r['for_sec'] for r in self.rules], dtype=np.float64)
+        self._rebind_arrays()
+
+    # ------------------------------------------------------------------
+    # Binding rules to metric keys
+    # ------------------------------------------------------------------
+
+    def _bind(self, new_keys: list[str]) -> None:
+        """Give each new key a column and pair it with every rule that matches it."""
+        rules, keys = [], []
+        for key in new_keys:
+            col = self._keys[key] = len(self._keys)
+            for i, rule in enumerate(self.rules):
+                if fnmatch.fnmatchcase(key, rule['metric']):
+                    rules.append(i)
+                    keys.append(col)
+                    self._pair_metric.append(key)
+        if not rules:
+            return
+        n_old = len(self._pair_rule)
+        self._pair_rule = np.concatenate([self._pair_rule, np.array(rules, dtype=np.int32)])
+        self._pair_key = np.concatenate([self._pair_key, np.array(keys, dtype=np.int32)])
+        pending, active = self._pending, self._active
+        value, since = self._value, self._since
+        self._rebind_arrays()
+        self._pending[:n_old], self._active[:n_old] = pending, active
+        self._value[:n_old], self._since[:n_old] = value, since
+
+    def _rebind_arrays(self) -> None:
+        r = self._pair_rule
+        self._threshold = self._r_threshold[r]
+        self._sign = self._r_sign[r]
+        self._strict = self._r_strict[r]
+        self._equality = self._r_equality[r]
+        self._negate = self._r_negate[r]
+        self._hysteresis = self._r_hysteresis[r]
+        self._for = self._r_for[r]
+        n = len(r)
+        self._pending = np.full(n, np.nan)     # time the condition started holding
+        self._active = np.zeros(n, dtype=bool)
+        self._value = np.full(n, np.nan)       # value when raised, then latest
+        self._since = np.full(n, np.nan)       # time the alert was raised
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def evaluate(self, values: dict[str, float], now: float) -> list[dict[str, Any]]:
+        """Evaluate every rule against one tick; return raised / cleared events.
+
+        Metrics missing from *values* keep their current state.
+        """
+        new_keys = [k for k in values if k not in self._keys]
+        if new_keys:
+            self._bind(new_keys)
+        if not len(self._pair_rule):
+            return []
+
+        column = np.full(len(self._keys), np.nan)
+        keys = self._keys
+        for key, value in values.items():
+            column[keys[key]] = value
+        x = column[self._pair_key]
+        valid = ~np.isnan(x)
+
+        with np.errstate(invalid="ignore"):
+            d = self._sign * (x - self._threshold)
+            holds = np.where(self._strict, d > 0, d >= 0)
+            clears = d < -self._hysteresis
+            equal = x == self._threshold
+            holds = np.where(self._equality, equal != self._negate, holds) & valid
+            clears = np.where(self._equality, valid & (equal == self._negate), clears)
+
+        # Sustained-for: remember when the condition started, forget when it lapses
+        start = holds & np.isnan(self._pending)
+        self._pending[start] = now
+        self._pending[valid & ~holds & ~self._active] = np.nan
+        raise_ = ~self._active & holds & (now - self._pending >= self._for)
+        clear = self._active & clears
+
+        self._active[raise_] = True
+        self._since[raise_] = now
+        self._active[clear] = False
+        self._pending[clear] = np.nan
+        self._value[valid] = x[valid]
+
+        events = [self._event(int(i), "raised", now) for i in np.flatnonzero(raise_)]
+        events += [self._event(int(i), "cleared", now) for i in np.flatnonzero(clear)]
+        self.log.extend(events)
+        return events
+
+    def _event(self, pair: int, state: str, now: float) -> dict[str, Any]:
+        rule = self.rules[self._pair_rule[pair]]
+        return {
+            'time': now,
+            'state': state,
+            'rule': rule['name'],
+            'metric': self._pair_metric[pair],
+            'severity': rule['severity'],
+            'value': float(self._value[pair]),
+        }
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def active(self) -> list[dict[str, Any]]:
+        """Currently active alerts, most severe first."""
+        alerts = []
+        for i in np.flatnonzero(self._active):
+            rule = self.rules[self._pair_rule[i]]
+            alerts.append({
+                'rule': rule['name'],
+                'metric': self._pair_metric[i],
+                'severity': rule['severity'],
+                'value': float(self._value[i]),
+                'since': float(self._since[i]),
+            })
+        alerts.sort(key=lambda a: (-SEVERITIES.index(a['severity']), a['since']))
+        return alerts
+
+
+def metric_severity(alerts: list[dict[str, Any]]) -> dict[str, str]:
+    """``{metric: highest active severity}`` for row highlighting."""
+    worst: dict[str, str] = {}
+    for a in alerts:
+        current = worst.get(a['metric'])
+        if current is None or SEVERITIES.index(a['severity']) > SEVERITIES.index(current):
+            worst[a['metric']] = a['severity']
+    return worst
+
+
+# Windows toast through the WinRT API from PowerShell (no extra module needed).  A toast
+# needs a registered AppUserModelID, so it is shown under PowerShell's own.
+_TOAST_APP_ID = r"{1AC14E77-02E7-4E5D-B744-2EB1AE5198B7}\WindowsPowerShell\v1.0\powershell.exe"
+_TOAST_SCRIPT = """\
+$n = [Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime]
+$xml = $n::GetTemplateContent([Windows.UI.Notifications.ToastTemplateType]::ToastText02)
+$text = $xml.GetElementsByTagName('text')
+$null = $text.Item(0).AppendChild($xml.CreateTextNode({title}))
+$null = $text.Item(1).AppendChild($xml.CreateTextNode({body}))
+$n::CreateToastNotifier({app_id}).Show([Windows.UI.Notifications.ToastNotification]::new($xml))
+"""
+
+
+def _ps_quote(text: str) -> str:
+    """PowerShell single-quoted string literal (no expansion inside)."""
+    # PowerShell also ends single-quoted strings at the typographic single quotes
+    return "'" + re.sub("(['\u2018\u2019\u201a\u201b])", r"\1\1", text) + "'"
+
+
+def notifier_available() -> bool:
+    """True if :func:`notify_command` has a desktop notifier to use."""
+    if sys.platform == "win32":
+        return bool(shutil.which("powershell"))
+    return (sys.platform == "darwin" and bool(shutil.which("osascript"))) or bool(shutil.which("notify-send"))
+
+
+def notify_command(title: str, body: str) -> list[str] | None:
+    """Command line for a desktop notification, or None if none is available."""
+    if sys.platform == "win32":
+        if not shutil.which("powershell"):
+            return None
+        script = _TOAST_SCRIPT.format(title=_ps_quote(title), body=_ps_quote(body), app_id=_ps_quote(_TOAST_APP_ID))
+        return ["powershell", "-NoProfile", "-NonInteractive", "-Command", script]
+    if sys.platform == "darwin" and shutil.which("osascript"):
+        script = f"display notification {json.dumps(body)} with title {json.dumps(title)}"
+        return ["osascript", "-e", script]
+    if shutil.which("notify-send"):
+        return ["notify-send", "--app-name=Master Sentinal", title, body]
+    return None
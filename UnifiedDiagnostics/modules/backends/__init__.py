@@ -0,0 +1,37 @@
+"""Platform backends for hardware inventory (CPU, board, GPU, drives).
+
+Diagnostic modules never talk to WMI or sysfs directly — they ask the
+backend returned by :func:`get_backend`, which is picked once per process
+from ``sys.platform``.  On Windows the WMI backend runs in a helper
+process (see :mod:`modules.backends.sandbox`) unless ``WMI_SANDBOX`` is off.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from config import WMI_SANDBOX
+from modules.backends.base import HardwareBackend
+
+_backend: HardwareBackend | None = None
+
+
+def get_backend() -> HardwareBackend:
+    """Return the shared backend for the running platform."""
+    global _backend
+    if _backend is None:
+        if sys.platform == "win32" and WMI_SANDBOX:
+            from modules.backends.sandbox import SandboxedBackend
+            _backend = SandboxedBackend("modules.backends.windows:WindowsBackend")
+        elif sys.platform == "win32":
+            from modules.backends.windows import WindowsBackend
+            _backend = WindowsBackend()
+        elif sys.platform.startswith("linux"):
+            from modules.backends.linux import LinuxBackend
+            _backend = LinuxBackend()
+        else:
+            _backend = HardwareBackend()
+    return _backend
+
+
+__all__ = ["HardwareBackend", "get_backend"]
@@ -0,0 +1,38 @@
+"""Backend interface shared by the Windows and Linux implementations."""
+
+from __future__ import annotations
+
+
+class HardwareBackend:
+    """Source of platform-specific hardware information.
+
+    Every method returns data in the same shape the diagnostic modules
+    expose to the UI, so swapping backends never changes what ``App`` sees.
+    Methods may raise; callers turn exceptions into ``'Error'`` entries.
+    """
+
+    name: str = "unsupported"
+
+    def get_cpu_info(self) -> dict[str, str | int]:
+        """Return ``Name``, ``Cores``, ``Threads`` and ``MaxClockSpeed``."""
+        raise NotImplementedError(f"CPU info is not supported on the {self.name} backend")
+
+    def get_board_info(self) -> dict[str, str]:
+        """Return ``Manufacturer``, ``Product``, ``SerialNumber`` and ``BIOS Version``."""
+        raise NotImplementedError(f"Board info is not supported on the {self.name} backend")
+
+    def get_gpu_info(self) -> list[dict[str, str]]:
+        """Return one dict per display adapter (used when nvidia-smi is unavailable)."""
+        raise NotImplementedError(f"GPU info is not supported on the {self.name} backend")
+
+    def get_partition_disk_map(self) -> dict[str, str]:
+        """Return ``{partition_device: disk_io_counters key}`` where they differ.
+
+        Partitions missing from the map are looked up by their device's
+        basename (``/dev/sda1`` -> ``sda1``), which is what Linux uses.
+        """
+        return {}
+
+    def get_smart_status(self) -> dict[str, str]:
+        """Return ``{stable_drive_id: "Model — Status"}`` per physical drive."""
+        raise NotImplementedError(f"Drive status is not supported on the {self.name} backend")
@@ -0,0 +1,196 @@
+"""Linux backend — hardware inventory straight from /proc and /sys.
+
+Nothing here shells out or needs root: every value comes from a plain file
+read.  All paths are resolved against *root* so tests can point the backend
+at a fake root filesystem.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+from modules.backends.base import HardwareBackend
+
+# PCI vendor IDs of the GPU vendors we can name without pci.ids
+_GPU_VENDORS: dict[str, str] = {
+    "0x10de": "NVIDIA",
+    "0x1002": "AMD",
+    "0x8086": "Intel",
+}
+
+# Block devices that are never physical drives
+_VIRTUAL_BLOCK_PREFIXES: tuple[str, ...] = ("loop", "ram", "zram", "dm-", "md", "sr", "nbd")
+
+_DRM_CARD_RE = re.compile(r"^card\d+$")
+
+
+class LinuxBackend(HardwareBackend):
+    """Reads CPU, board, GPU and drive information from procfs/sysfs."""
+
+    name = "linux"
+
+    def __init__(self, root: str = "/") -> None:
+        self.root = root
+
+    # ------------------------------------------------------------------
+    # File helpers
+    # ------------------------------------------------------------------
+
+    def _path(self, *parts: str) -> str:
+        """Join *parts* below the configured root."""
+        return os.path.join(self.root, *parts)
+
+    def _read(self, *parts: str) -> str | None:
+        """Return the stripped contents of a file, or None if unreadable."""
+        try:
+            with open(self._path(*parts), encoding="utf-8", errors="replace") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _read_int(self, *parts: str) -> int | None:
+        """Return a file's contents as an int, or None if missing/garbled."""
+        raw = self._read(*parts)
+        try:
+            return int(raw) if raw is not None else None
+        except ValueError:
+            return None
+
+    def _listdir(self, *parts: str) -> list[str]:
+        """Sorted directory listing, empty when the directory is missing."""
+        try:
+            return sorted(os.listdir(self._path(*parts)))
+        except OSError:
+            return []
+
+    # ------------------------------------------------------------------
+    # CPU — /proc/cpuinfo + cpufreq
+    # ------------------------------------------------------------------
+
+    def get_cpu_info(self) -> dict[str, str | int]:
+        raw = self._read("proc", "cpuinfo")
+        if raw is None:
+            raise OSError("/proc/cpuinfo is not readable")
+
+        processors: list[dict[str, str]] = []
+        header: dict[str, str] = {}
+        for block in raw.split("\n\n"):
+            fields: dict[str, str] = {}
+            for line in block.splitlines():
+                key, sep, value = line.partition(":")
+                if sep:
+                    fields[key.strip()] = value.strip()
+            if "processor" in fields and fields["processor"].isdigit():
+                processors.append(fields)
+            else:
+                header.update(fields)  # ARM prints "Hardware" etc. outside the per-CPU blocks
+
+        if not processors:
+            raise OSError("/proc/cpuinfo lists no processors")
+
+        first = processors[0]
+        # Assume single socket, matching the WMI backend
+        socket = [p for p in processors if p.get("physical id") == first.get("physical id")]
+        core_ids = {p["core id"] for p in socket if "core id" in p}
+
+        cpu_info: dict[str, str | int] = {
+            'Name': first.get("model name") or header.get("Hardware") or header.get("Processor") or "Unknown",
+            'Cores': len(core_ids) or len(socket),
+            'Threads': len(socket),
+        }
+
+        max_khz = self._read_int("sys", "devices", "system", "cpu", "cpu0", "cpufreq", "cpuinfo_max_freq")
+        if max_khz:
+            cpu_info['MaxClockSpeed'] = f"{max_khz // 1000} MHz"
+        elif "cpu MHz" in first:
+            cpu_info['MaxClockSpeed'] = f"{float(first['cpu MHz']):.0f} MHz"
+        return cpu_info
+
+    # ------------------------------------------------------------------
+    # Board / BIOS — /sys/class/dmi/id
+    # ------------------------------------------------------------------
+
+    def get_board_info(self) -> dict[str, str]:
+        fields = {
+            'Manufacturer': "board_vendor",
+            'Product': "board_name",
+            'SerialNumber': "board_serial",  # root-only on most distros
+            'BIOS Version': "bios_version",
+        }
+        info: dict[str, str] = {}
+        for key, name in fields.items():
+            value = self._read("sys", "class", "dmi", "id", name)
+            if value:
+                info[key] = value
+        if not info:
+            raise OSError("/sys/class/dmi/id is not available")
+        return info
+
+    # ------------------------------------------------------------------
+    # GPU — DRM + hwmon
+    # ------------------------------------------------------------------
+
+    def get_gpu_info(self) -> list[dict[str, str]]:
+        gpus: list[dict[str, str]] = []
+        for card in self._listdir("sys", "class", "drm"):
+            if not _DRM_CARD_RE.match(card):
+                continue  # connectors such as card0-DP-1
+            dev = ("sys", "class", "drm", card, "device")
+
+            uevent: dict[str, str] = {}
+            for line in (self._read(*dev, "uevent") or "").splitlines():
+                key, sep, value = line.partition("=")
+                if sep:
+                    uevent[key] = value
+
+            vendor = _GPU_VENDORS.get(self._read(*dev, "vendor") or "", "Unknown")
+            device_id = self._read(*dev, "device") or "?"
+            driver = uevent.get("DRIVER", "unknown driver")
+
+            busy = self._read_int(*dev, "gpu_busy_percent")
+            vram_total = self._read_int(*dev, "mem_info_vram_total")
+            vram_used = self._read_int(*dev, "mem_info_vram_used")
+
+            temp = "N/A"
+            for hwmon in self._listdir(*dev, "hwmon"):
+                millideg = self._read_int(*dev, "hwmon", hwmon, "temp1_input")
+                if millideg is not None:
+                    temp = f"{millideg / 1000:.0f} C"
+                    break
+
+            mb = 1024 ** 2
+            gpus.append({
+                'DeviceID': uevent.get("PCI_SLOT_NAME", card),
+                'Name': f"{vendor} GPU [{device_id}] ({driver})",
+                'Load': f"{busy}%" if busy is not None else "N/A",
+                'Free Memory': (
+                    f"{(vram_total - vram_used) // mb}MB"
+                    if vram_total is not None and vram_used is not None else "N/A"
+                ),
+                'Used Memory': f"{vram_used // mb}MB" if vram_used is not None else "N/A",
+                'Total Memory': f"{vram_total // mb}MB" if vram_total is not None else "N/A",
+                'Temperature': temp,
+            })
+        return gpus
+
+    # ------------------------------------------------------------------
+    # Drives — /sys/block
+    # ------------------------------------------------------------------
+
+    def get_smart_status(self) -> dict[str, str]:
+        status: dict[str, str] = {}
+        for name in self._listdir("sys", "block"):
+            if name.startswith(_VIRTUAL_BLOCK_PREFIXES):
+                continue
+            if not os.path.isdir(self._path("sys", "block", name, "device")):
+                continue  # virtual device without backing hardware
+
+            model = self._read("sys", "block", name, "device", "model") or name
+            state = self._read("sys", "block", name, "device", "state")
+            if state is None or state == "running" or state == "live":
+                health = "OK"
+            else:
+                health = state.capitalize()
+            status[f"/dev/{name}"] = f"{model} — {health}"
+        return status
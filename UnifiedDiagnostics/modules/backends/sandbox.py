@@ -0,0 +1,225 @@
+"""Run a hardware backend in a long-lived helper process.
+
+WMI providers can wedge (``Win32_DiskDrive()`` never returning) and COM
+faults can kill the process that made the call.  :class:`SandboxedBackend`
+keeps the real backend in a helper process and forwards each
+:class:`~modules.backends.base.HardwareBackend` call over a
+``multiprocessing`` pipe, so a hung query only costs its deadline and a
+crash only costs the helper.
+
+Wire format — one compact JSON array per pipe message::
+
+    request:   [id, "get_gpu_info"]
+    response:  [id, 1, result]            or   [id, 0, "ErrorType", "message"]
+
+A query that misses its deadline gets the helper killed and a fresh one
+started straight away (the watchdog); a helper that dies mid-query is
+replaced the same way.  Either way the caller sees an exception, which the
+diagnostic modules already turn into ``'Error'`` entries.
+
+The backend is named as ``"package.module:ClassName"`` so the helper can
+import it itself; with a fake backend the whole protocol runs on Linux.
+"""
+
+from __future__ import annotations
+
+import atexit
+import importlib
+import json
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from typing import Any
+
+from config import WMI_HELPER_START_TIMEOUT_SEC, WMI_QUERY_TIMEOUT_SEC
+from modules.backends.base import HardwareBackend
+
+# Methods forwarded to the helper (everything HardwareBackend defines)
+METHODS = ("get_cpu_info", "get_board_info", "get_gpu_info", "get_partition_disk_map", "get_smart_status")
+
+_ERRORS: dict[str, type[Exception]] = {
+    "NotImplementedError": NotImplementedError,
+    "OSError": OSError,
+    "ValueError": ValueError,
+}
+
+
+def encode(message: list[Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def decode(data: bytes) -> list[Any]:
+    message = json.loads(data)
+    if not isinstance(message, list) or len(message) < 2:
+        raise ValueError(f"malformed sandbox message: {data[:80]!r}")
+    return message
+
+
+def load_backend(spec: str) -> HardwareBackend:
+    """Instantiate ``"package.module:ClassName"``."""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)()
+
+
+def serve(conn: Connection, spec: str) -> None:
+    """Helper-process loop: answer requests on *conn* until the parent goes away."""
+    try:
+        backend = load_backend(spec)
+        conn.send_bytes(encode([0, 1, "ready"]))
+    except Exception as e:
+        conn.send_bytes(encode([0, 0, type(e).__name__, str(e)]))
+        return
+
+    while True:
+        try:
+            request_id, method = decode(conn.recv_bytes())
+        except (EOFError, OSError):
+            return  # parent closed the pipe or died
+        if method not in METHODS:
+            reply = [request_id, 0, "ValueError", f"unknown method {method!r}"]
+        else:
+            try:
+                reply = [request_id, 1, getattr(backend, method)()]
+            except Exception as e:
+                reply = [request_id, 0, type(e).__name__, str(e)]
+        try:
+            conn.send_bytes(encode(reply))
+        except (EOFError, OSError):
+            return
+
+
+class SandboxedBackend(HardwareBackend):
+    """Forwards every backend call to a helper process, restarting it when it hangs or dies."""
+
+    def __init__(
+        self,
+        spec: str,
+        timeout: float = WMI_QUERY_TIMEOUT_SEC,
+        start_timeout: float = WMI_HELPER_START_TIMEOUT_SEC,
+    ) -> None:
+        self.spec = spec
+        self.name = f"sandboxed {spec.rpartition(':')[2]}"
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()   # one query in flight; executor threads take turns
+        self._proc: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._ready = False
+        self._next_id = 0
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Helper lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    def _spawn(self) -> None:
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(target=serve, args=(child, self.spec), name="wmi-sandbox", daemon=True)
+        proc.start()
+        child.close()
+        self._proc, self._conn, self._ready = proc, parent, False
+
+    def _kill(self) -> None:
+        if self._proc is not None:
+            if self._proc.is_alive():
+                self._proc.kill()
+            self._proc.join(5)
+        if self._conn is not None:
+            self._conn.close()
+        self._proc, self._conn, self._ready = None, None, False
+
+    def _restart(self) -> None:
+        self._kill()
+        self.restarts += 1
+        self._spawn()   # warm up the replacement while the caller handles the error
+
+    def _receive(self, timeout: float) -> list[Any] | None:
+        """Next message from the helper, or None if it missed *timeout*.
+
+        Raises EOFError if the helper died (or sent garbage).
+        """
+        assert self._conn is not None
+        try:
+            if not self._conn.poll(timeout):
+                return None
+            return decode(self._conn.recv_bytes())
+        except (OSError, ValueError) as e:
+            raise EOFError(str(e)) from e
+
+    def _ensure_ready(self) -> None:
+        if self._proc is None or not self._proc.is_alive():
+            if self._proc is not None:
+                self.restarts += 1
+            self._kill()
+            self._spawn()
+        if not self._ready:
+            try:
+                reply = self._receive(self.start_timeout)
+            except EOFError:
+                self._kill()
+                raise RuntimeError(f"{self.name} helper exited during start-up") from None
+            if reply is None:
+                self._restart()
+                raise TimeoutError(f"{self.name} helper did not start within {self.start_timeout:.0f}s")
+            if not reply[1]:
+                self._kill()
+                raise RuntimeError(f"{self.name} helper failed to start: {reply[3]}")
+            self._ready = True
+
+    def close(self) -> None:
+        """Stop the helper (it also exits on its own when the pipe closes)."""
+        with self._lock:
+            self._kill()
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def call(self, method: str) -> Any:
+        """Run *method* in the helper; raises TimeoutError / RuntimeError if it hangs or crashes."""
+        with self._lock:
+            self._ensure_ready()
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._conn.send_bytes(encode([request_id, method]))
+            except (EOFError, OSError) as e:
+                self._restart()
+                raise RuntimeError(f"{self.name} helper is gone ({e}); restarted") from e
+
+            try:
+                reply = self._receive(self.timeout)
+            except EOFError:
+                self._restart()
+                raise RuntimeError(f"{self.name} helper crashed during {method}; restarted") from None
+            if reply is None:
+                self._restart()
+                raise TimeoutError(f"{method} exceeded {self.timeout:.0f}s; {self.name} helper restarted")
+            if reply[0] != request_id:
+                self._restart()
+                raise RuntimeError(f"{self.name} helper answered out of turn; restarted")
+
+        if reply[1]:
+            return reply[2]
+        raise _ERRORS.get(reply[2], RuntimeError)(reply[3])
+
+    def get_cpu_info(self) -> dict[str, str | int]:
+        return self.call("get_cpu_info")
+
+    def get_board_info(self) -> dict[str, str]:
+        return self.call("get_board_info")
+
+    def get_gpu_info(self) -> list[dict[str, str]]:
+        return self.call("get_gpu_info")
+
+    def get_partition_disk_map(self) -> dict[str, str]:
+        return self.call("get_partition_disk_map")
+
+    def get_smart_status(self) -> dict[str, str]:
+        return self.call("get_smart_status")
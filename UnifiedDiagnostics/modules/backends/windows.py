@@ -0,0 +1,86 @@
+"""Windows backend — hardware inventory via WMI."""
+
+from __future__ import annotations
+
+import pythoncom
+import wmi
+
+from modules.backends.base import HardwareBackend
+
+
+class WindowsBackend(HardwareBackend):
+    """Reads CPU, board, GPU and drive information from WMI."""
+
+    name = "windows"
+
+    @staticmethod
+    def _connect() -> wmi.WMI:
+        """Initialise COM for the calling thread and open a WMI connection."""
+        pythoncom.CoInitialize()
+        return wmi.WMI()
+
+    def get_cpu_info(self) -> dict[str, str | int]:
+        c = self._connect()
+        cpu_info: dict[str, str | int] = {}
+        for processor in c.Win32_Processor():
+            cpu_info['Name'] = processor.Name
+            cpu_info['Cores'] = processor.NumberOfCores
+            cpu_info['Threads'] = processor.NumberOfLogicalProcessors
+            cpu_info['MaxClockSpeed'] = f"{processor.MaxClockSpeed} MHz"
+            break  # Assume single socket
+        return cpu_info
+
+    def get_board_info(self) -> dict[str, str]:
+        c = self._connect()
+        info: dict[str, str] = {}
+        for board in c.Win32_BaseBoard():
+            info['Manufacturer'] = board.Manufacturer
+            info['Product'] = board.Product
+            info['SerialNumber'] = board.SerialNumber
+            break
+
+        for bios in c.Win32_BIOS():
+            info['BIOS Version'] = bios.SMBIOSBIOSVersion
+            break
+        return info
+
+    def get_gpu_info(self) -> list[dict[str, str]]:
+        c = self._connect()
+        gpus: list[dict[str, str]] = []
+        for gpu in c.Win32_VideoController():
+            ram_mb = "N/A"
+            try:
+                if gpu.AdapterRAM:
+                    ram_mb = f"{int(gpu.AdapterRAM) / (1024**2):.0f}MB"
+            except Exception:
+                pass
+
+            gpus.append({
+                'DeviceID': gpu.PNPDeviceID or gpu.DeviceID or gpu.Name,
+                'Name': gpu.Name,
+                'Load': "N/A (WMI)",
+                'Free Memory': "N/A",
+                'Used Memory': "N/A",
+                'Total Memory': ram_mb,
+                'Temperature': "N/A",
+            })
+        return gpus
+
+    def get_partition_disk_map(self) -> dict[str, str]:
+        # psutil keys Windows I/O counters by "PhysicalDriveN"; walk
+        # drive -> partition -> logical disk to find each letter's drive.
+        c = self._connect()
+        mapping: dict[str, str] = {}
+        for drive in c.Win32_DiskDrive():
+            for part in drive.associators("Win32_DiskDriveToDiskPartition"):
+                for logical in part.associators("Win32_LogicalDiskToPartition"):
+                    mapping[f"{logical.DeviceID}\\"] = f"PhysicalDrive{drive.Index}"
+        return mapping
+
+    def get_smart_status(self) -> dict[str, str]:
+        c = self._connect()
+        status: dict[str, str] = {}
+        for drive in c.Win32_DiskDrive():
+            key = drive.DeviceID or drive.Caption
+            status[key] = f"{drive.Caption} — {drive.Status}"
+        return status
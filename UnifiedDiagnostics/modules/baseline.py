@@ -0,0 +1,236 @@
+"""Named baselines — a reference point for health and benchmark numbers.
+
+A benchmark score or a SMART counter means little on its own; "20% slower
+than when the machine was commissioned" does.  A baseline is a compact
+summary of one moment, saved under a name:
+
+* ``inventory`` — what the machine is (CPU, RAM size, board, GPUs, drives),
+  compared for equality;
+* ``metrics`` — flat ``{key: number}``:
+
+  - ``bench.disk.*``, ``bench.memory.*``, ``bench.cpu.*`` — headline numbers
+    of the latest benchmark results;
+  - ``smart.<serial>.*`` — the failure-predicting SMART attributes;
+  - ``idle.<history key>`` — the ``BASELINE_IDLE_PERCENTILE``-th percentile of
+    the live history, i.e. what the machine looks like when nothing runs.
+
+All summaries live in ``BASELINE_FILE`` (a few KB each), so comparing the
+current state with a saved one never re-runs a check.  Each metric's delta
+is judged by the first rule in ``BASELINE_RULES`` whose pattern matches:
+which direction is better and how far the value may move the other way
+before it counts as a regression.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import time
+from typing import Any
+
+import numpy as np
+
+from config import BASELINE_FILE, BASELINE_IDLE_METRICS, BASELINE_IDLE_PERCENTILE, BASELINE_RULES
+from modules.cpu_bench import COMPARED as CPU_COMPARED
+from modules.disk_bench import COMPARED as DISK_COMPARED
+from modules.history import MetricHistory
+
+# Headline numbers taken from each benchmark result
+BENCH_METRICS: dict[str, tuple[str, ...]] = {
+    'disk': DISK_COMPARED,
+    'memory': ('write_mbps', 'read_mbps', 'mismatches'),
+    'cpu': (*CPU_COMPARED, 'errors'),
+}
+SMART_METRICS = ('reallocated', 'pending', 'media_errors', 'wear_pct', 'temperature_c')
+STATUSES = ("regression", "improved", "ok", "new", "missing")
+STATUS_COLORS: dict[str, str | None] = {
+    "regression": "red", "improved": "green", "ok": None, "new": "gray60", "missing": "gray60",
+}
+
+
+# ----------------------------------------------------------------------
+# Summaries
+# ----------------------------------------------------------------------
+
+def benchmark_metrics(results: dict[str, dict[str, Any] | None]) -> dict[str, float]:
+    """``{'disk': result, 'memory': ..., 'cpu': ...}`` → ``bench.<kind>.<key>`` (missing results are skipped)."""
+    metrics: dict[str, float] = {}
+    for kind, keys in BENCH_METRICS.items():
+        result = results.get(kind)
+        if not result:
+            continue
+        for key in keys:
+            if result.get(key) is not None:
+                metrics[f"bench.{kind}.{key}"] = float(result[key])
+    cpu = results.get('cpu')
+    if cpu and cpu.get('clock_mhz'):
+        metrics["bench.cpu.clock_mhz"] = float(cpu['clock_mhz']['sustained'])
+    return metrics
+
+
+def smart_metrics(attributes: dict[str, dict[str, Any]]) -> dict[str, float]:
+    """Parsed SMART attributes per drive → ``smart.<serial>.<attribute>`` (unknown values are skipped)."""
+    metrics: dict[str, float] = {}
+    for dev, attrs in attributes.items():
+        drive = attrs.get('serial') or dev
+        for key in SMART_METRICS:
+            if attrs.get(key) is not None:
+                metrics[f"smart.{drive}.{key}"] = float(attrs[key])
+    return metrics
+
+
+def idle_metrics(
+    history: MetricHistory,
+    patterns: list[str] = BASELINE_IDLE_METRICS,
+    percentile: float = BASELINE_IDLE_PERCENTILE,
+) -> dict[str, float]:
+    """Low percentile of each live history key matching *patterns* → ``idle.<key>``."""
+    metrics: dict[str, float] = {}
+    for key in history.keys():
+        if any(fnmatch.fnmatchcase(key, p) for p in patterns):
+            _ts, values = history.series(key)
+            if values.size:
+                metrics[f"idle.{key}"] = round(float(np.percentile(values, percentile)), 2)
+    return metrics
+
+
+def make_summary(
+    name: str, inventory: dict[str, str], metrics: dict[str, float], ts: float | None = None,
+) -> dict[str, Any]:
+    return {
+        'name': name,
+        'ts': time.time() if ts is None else ts,
+        'inventory': {k: str(v) for k, v in inventory.items()},
+        'metrics': metrics,
+    }
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+
+def rule_for(metric: str, rules: list[dict[str, Any]] = BASELINE_RULES) -> dict[str, Any] | None:
+    """First rule whose ``metric`` pattern matches, or None."""
+    for rule in rules:
+        if fnmatch.fnmatchcase(metric, rule['metric']):
+            return rule
+    return None
+
+
+def judge(baseline: float, current: float, rule: dict[str, Any] | None) -> str:
+    """``"regression"``, ``"improved"`` or ``"ok"`` for one metric.
+
+    A move counts only if it is at least the rule's ``abs`` *and* at least
+    its ``pct`` of the baseline (``pct`` is ignored for a zero baseline).
+    """
+    if rule is None or current == baseline:
+        return "ok"
+    worse = baseline - current if rule['better'] == "higher" else current - baseline
+    moved = abs(worse)
+    if moved < rule.get('abs', 0):
+        return "ok"
+    if baseline and moved * 100.0 / abs(baseline) < rule.get('pct', 0):
+        return "ok"
+    return "regression" if worse > 0 else "improved"
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], rules: list[dict[str, Any]] = BASELINE_RULES,
+) -> dict[str, Any]:
+    """Per-metric deltas of *current* against *baseline*, regressions first."""
+    base_metrics, cur_metrics = baseline['metrics'], current['metrics']
+    deltas = []
+    for metric in sorted(base_metrics.keys() | cur_metrics.keys()):
+        base, cur = base_metrics.get(metric), cur_metrics.get(metric)
+        delta: dict[str, Any] = {'metric': metric, 'baseline': base, 'current': cur, 'delta': None, 'delta_pct': None}
+        if base is None:
+            delta['status'] = "new"
+        elif cur is None:
+            delta['status'] = "missing"
+        else:
+            delta['delta'] = round(cur - base, 3)
+            delta['delta_pct'] = round((cur - base) * 100.0 / abs(base), 1) if base else None
+            delta['status'] = judge(base, cur, rule_for(metric, rules))
+        deltas.append(delta)
+    deltas.sort(key=lambda d: STATUSES.index(d['status']))
+
+    base_inv, cur_inv = baseline['inventory'], current['inventory']
+    inventory = [
+        {'item': item, 'baseline': base_inv.get(item), 'current': cur_inv.get(item)}
+        for item in sorted(base_inv.keys() | cur_inv.keys())
+        if base_inv.get(item) != cur_inv.get(item)
+    ]
+    return {
+        'baseline': baseline['name'],
+        'baseline_ts': baseline['ts'],
+        'ts': current['ts'],
+        'regressions': sum(d['status'] == "regression" for d in deltas),
+        'metrics': deltas,
+        'inventory': inventory,
+    }
+
+
+def format_delta(delta: dict[str, Any]) -> str:
+    """``"412 → 350 (-15.0%)"`` for display and export."""
+    def fmt(value: float | None) -> str:
+        return "—" if value is None else f"{value:g}"
+
+    text = f"{fmt(delta['baseline'])} → {fmt(delta['current'])}"
+    if delta['delta_pct'] is not None:
+        text += f" ({delta['delta_pct']:+.1f}%)"
+    elif delta['delta']:
+        text += f" ({delta['delta']:+g})"
+    return text
+
+
+# ----------------------------------------------------------------------
+# Storage
+# ----------------------------------------------------------------------
+
+class BaselineStore:
+    """Named summaries in one JSON file, rewritten atomically on every change."""
+
+    def __init__(self, path: str = BASELINE_FILE) -> None:
+        self.path = path
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            print(f"Error reading baselines from {self.path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict[str, dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def names(self) -> list[str]:
+        """Saved baseline names, newest first."""
+        data = self._read()
+        return sorted(data, key=lambda name: data[name].get('ts', 0), reverse=True)
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        return self._read().get(name)
+
+    def save(self, summary: dict[str, Any]) -> None:
+        """Store *summary* under its name (replacing a baseline of the same name)."""
+        if not summary['name']:
+            raise ValueError("a baseline needs a name")
+        data = self._read()
+        data[summary['name']] = summary
+        self._write(data)
+
+    def delete(self, name: str) -> bool:
+        data = self._read()
+        if data.pop(name, None) is None:
+            return False
+        self._write(data)
+        return True
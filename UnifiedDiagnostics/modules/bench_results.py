@@ -0,0 +1,59 @@
+"""Stored benchmark runs and run-to-run comparison.
+
+Each benchmark appends its result dicts to its own JSON-lines file, so a
+new run can be compared with the previous one on the same hardware.
+:class:`ResultStore` holds that file's path, the headline numbers compared
+between runs (higher is better for all of them) and the slowdown that
+fails the check.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+
+class ResultStore:
+    """Benchmark results in one JSON-lines file, oldest first."""
+
+    def __init__(self, path: str, compared: tuple[str, ...], regression_pct: float) -> None:
+        self.path = path
+        self.compared = compared
+        self.regression_pct = regression_pct
+
+    def save(self, result: dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, separators=(",", ":")) + "\n")
+
+    def load(self, **match: Any) -> list[dict[str, Any]]:
+        """Stored runs, oldest first; only those whose fields equal every non-None *match* value."""
+        wanted = {k: v for k, v in match.items() if v is not None}
+        results = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue   # torn last line after a crash
+                    if all(result.get(k) == v for k, v in wanted.items()):
+                        results.append(result)
+        except FileNotFoundError:
+            pass
+        return results
+
+    def compare(self, result: dict[str, Any], previous: dict[str, Any] | None) -> dict[str, float]:
+        """Percent change of each headline number versus *previous* (negative = slower)."""
+        if previous is None:
+            return {}
+        return {
+            key: round((result[key] - previous[key]) * 100.0 / previous[key], 1)
+            for key in self.compared if previous.get(key)
+        }
+
+    def regressions(self, changes: dict[str, float], threshold_pct: float | None = None) -> dict[str, float]:
+        """The changes that are slowdowns beyond *threshold_pct* (default: the store's)."""
+        threshold = self.regression_pct if threshold_pct is None else threshold_pct
+        return {k: v for k, v in changes.items() if v <= -threshold}
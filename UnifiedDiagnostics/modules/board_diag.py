@@ -1,16 +1,18 @@
-"""Motherboard and BIOS diagnostics via WMI and platform."""
+"""Motherboard and BIOS diagnostics via the platform backend and platform."""
 
 from __future__ import annotations
 
 import platform
 
-import pythoncom
-import wmi
+from modules.backends import HardwareBackend, get_backend
 
 
 class BoardDiagnostic:
     """Gathers motherboard, BIOS, and OS platform information."""
 
+    def __init__(self, backend: HardwareBackend | None = None) -> None:
+        self.backend = backend or get_backend()
+
     def get_board_info(self) -> dict[str, str]:
         """Return a dictionary of motherboard, BIOS, and OS info."""
         info: dict[str, str] = {
@@ -21,17 +23,7 @@ class BoardDiagnostic:
             'Machine': platform.machine(),
         }
         try:
-            pythoncom.CoInitialize()
-            c = wmi.WMI()
-            for board in c.Win32_BaseBoard():
-                info['Manufacturer'] = board.Manufacturer
-                info['Product'] = board.Product
-                info['SerialNumber'] = board.SerialNumber
-                break
-
-            for bios in c.Win32_BIOS():
-                info['BIOS Version'] = bios.SMBIOSBIOSVersion
-                break
+            info.update(self.backend.get_board_info())
         except Exception as e:
             info['Error'] = str(e)
         return info
@@ -0,0 +1,177 @@
+"""In-process metric bus: publish keyed values, deliver per-subscriber change sets.
+
+Publishers hand the bus a flat ``{key: value}`` dict once per tick.  The
+bus keeps the last value of every key, works out which keys changed (or
+disappeared), and calls each subscriber once with a :class:`ChangeSet`
+holding only the changed keys under the prefixes it registered for —
+consumers never diff full snapshots themselves.
+
+Keys are plain strings; the App uses ``"|"`` as separator
+(``"gpu|<DeviceID>|Temperature"``) because device ids and mountpoints may
+contain dots and slashes.  Routing a key to its subscribers is resolved
+once per key and cached, so a tick costs O(changed keys × matching
+subscribers) rather than O(keys × subscribers).
+
+Not thread-safe: publish and subscribe from one thread (the Tk thread in
+the App); callbacks run synchronously inside :meth:`MetricBus.publish`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Iterable
+
+SEP = "|"
+
+_MISSING = object()
+
+
+class ChangeSet:
+    """What changed for one subscriber in one publish."""
+
+    __slots__ = ("ts", "changed", "removed")
+
+    def __init__(self, ts: float, changed: dict[str, Any], removed: list[str]) -> None:
+        self.ts = ts
+        self.changed = changed
+        self.removed = removed
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.changed
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+    def touches(self, prefix: str) -> bool:
+        """True if any changed or removed key starts with *prefix*."""
+        return any(k.startswith(prefix) for k in self.changed) or any(k.startswith(prefix) for k in self.removed)
+
+
+class Subscription:
+    """Handle returned by :meth:`MetricBus.subscribe` (pass it to ``unsubscribe``)."""
+
+    __slots__ = ("prefixes", "callback", "deliveries")
+
+    def __init__(self, prefixes: tuple[str, ...], callback: Callable[[ChangeSet], None]) -> None:
+        self.prefixes = prefixes
+        self.callback = callback
+        self.deliveries = 0
+
+
+def keyed_rows(
+    prefix: str, items: Iterable[dict[str, Any]], key_fn: Callable[[dict[str, Any]], str],
+) -> dict[str, Any]:
+    """Flatten a list of row dicts into ``{f"{prefix}{id}|{row}": value}``."""
+    out: dict[str, Any] = {}
+    for item in items:
+        base = f"{prefix}{key_fn(item)}{SEP}"
+        for k, v in item.items():
+            out[base + k] = v
+    return out
+
+
+class MetricBus:
+    """Latest value per key plus prefix-routed change notification."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, Any] = {}
+        self._subs: list[Subscription] = []
+        self._routes: dict[str, tuple[Subscription, ...]] = {}
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self, prefixes: str | Iterable[str], callback: Callable[[ChangeSet], None], replay: bool = True,
+    ) -> Subscription:
+        """Call *callback* with a change set whenever keys under *prefixes* change.
+
+        With *replay*, the callback first receives every current matching
+        value, so late subscribers start from the same state as the rest.
+        """
+        prefixes = (prefixes,) if isinstance(prefixes, str) else tuple(prefixes)
+        sub = Subscription(prefixes, callback)
+        self._subs.append(sub)
+        self._routes.clear()
+        if replay:
+            current = {k: v for k, v in self._values.items() if k.startswith(prefixes)}
+            if current:
+                self._deliver(sub, ChangeSet(time.time(), current, []))
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self._subs:
+            self._subs.remove(sub)
+            self._routes.clear()
+
+    def _route(self, key: str) -> tuple[Subscription, ...]:
+        route = self._routes.get(key)
+        if route is None:
+            route = self._routes[key] = tuple(s for s in self._subs if key.startswith(s.prefixes))
+        return route
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, values: dict[str, Any], ts: float | None = None, complete: Iterable[str] = ()) -> int:
+        """Store *values* and notify subscribers of what changed; return how many were called.
+
+        Keys under any prefix in *complete* that are missing from *values*
+        are treated as removed (a GPU unplugged, a mount gone).
+        """
+        ts = time.time() if ts is None else ts
+        old = self._values
+        batches: dict[Subscription, ChangeSet] = {}
+
+        for key, value in values.items():
+            previous = old.get(key, _MISSING)
+            if previous is value or previous == value:
+                continue
+            old[key] = value
+            for sub in self._route(key):
+                batch = batches.get(sub)
+                if batch is None:
+                    batch = batches[sub] = ChangeSet(ts, {}, [])
+                batch.changed[key] = value
+
+        complete = tuple(complete)
+        if complete:
+            for key in [k for k in old.keys() - values.keys() if k.startswith(complete)]:
+                del old[key]
+                for sub in self._route(key):
+                    batch = batches.get(sub)
+                    if batch is None:
+                        batch = batches[sub] = ChangeSet(ts, {}, [])
+                    batch.removed.append(key)
+                self._routes.pop(key, None)
+
+        # Deliver in subscription order so consumers see a stable sequence
+        for sub in self._subs:
+            batch = batches.get(sub)
+            if batch is not None:
+                self._deliver(sub, batch)
+        return len(batches)
+
+    @staticmethod
+    def _deliver(sub: Subscription, changes: ChangeSet) -> None:
+        sub.deliveries += 1
+        try:
+            sub.callback(changes)
+        except Exception as e:
+            print(f"Error in metric bus subscriber {sub.prefixes}: {e}")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def snapshot(self, prefix: str = "") -> dict[str, Any]:
+        """Current values of every key starting with *prefix*."""
+        return {k: v for k, v in self._values.items() if k.startswith(prefix)}
+
+    def __len__(self) -> int:
+        return len(self._values)
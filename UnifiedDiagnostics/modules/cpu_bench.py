@@ -0,0 +1,315 @@
+"""CPU benchmark with throttling detection (Full Scan "CPU Benchmark" check).
+
+Nothing else in the scan says whether the CPU actually delivers what it is
+rated for.  :class:`CPUBenchmark` starts one worker process per logical CPU
+the process may use, pins each to its CPU and, once all of them are ready
+(a barrier, so every core is loaded at the same time), has each run a fixed
+integer kernel for ``CPU_BENCH_DURATION_SEC``.  A core's score is kernel
+runs per second; each run's checksum is verified, so a core that computes
+wrong results under load (unstable overclock, failing VRM) is caught too.
+
+While the workers run, the parent samples ``psutil.cpu_freq(percpu=True)``
+and the CPU temperature sensors every ``CPU_BENCH_SAMPLE_SEC``.  The run
+counts as throttled if
+
+* the combined score or the average clock falls by ``CPU_BENCH_THROTTLE_PCT``
+  from the first third of the run to the last;
+* the sustained clock is below ``CPU_BENCH_MIN_CLOCK_PCT`` of the
+  ``MaxClockSpeed`` that :class:`~modules.cpu_diag.CPUDiagnostic` reports;
+* a sensor reaches its own ``high`` threshold.
+
+Every run is appended to ``CPU_BENCH_RESULTS_FILE`` (``CPUBenchmark.results``)
+and compared with the previous run on the same CPU model and worker count.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import multiprocessing
+import os
+import re
+import threading
+import time
+from typing import Any
+
+import psutil
+
+from config import (
+    CPU_BENCH_DURATION_SEC,
+    CPU_BENCH_MIN_CLOCK_PCT,
+    CPU_BENCH_REGRESSION_PCT,
+    CPU_BENCH_RESULTS_FILE,
+    CPU_BENCH_SAMPLE_SEC,
+    CPU_BENCH_THROTTLE_PCT,
+    CPU_BENCH_WINDOW_SEC,
+    PROCESS_POOL_MAX_WORKERS,
+)
+from modules.bench_results import ResultStore
+
+KERNEL_ITERATIONS = 50_000   # one kernel run: ~5-20 ms, fine-grained enough for 1 s windows
+KERNEL_SEED = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+BARRIER_TIMEOUT_SEC = 60.0   # spawning every worker must not take longer than this
+# Sensor chips that report the CPU package / cores (psutil.sensors_temperatures keys)
+CPU_SENSORS = ("coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal", "soc_thermal")
+# Headline numbers compared between runs (higher is better for both)
+COMPARED = ('score', 'min_core_score')
+
+
+def kernel(seed: int, iterations: int = KERNEL_ITERATIONS) -> int:
+    """Fixed integer workload (64-bit LCG + shifts/xors); deterministic for a given *seed*."""
+    x = seed
+    acc = 0
+    for i in range(iterations):
+        x = (x * 6364136223846793005 + 1442695040888963407) & _MASK64
+        acc = ((acc ^ (x >> 29)) + i) & _MASK64
+    return acc
+
+
+def parse_mhz(value: Any) -> float | None:
+    """``"3600 MHz"`` (or a bare number) → 3600.0; None if there is no number."""
+    if isinstance(value, (int, float)):
+        return float(value) or None
+    match = re.search(r"\d+(?:\.\d+)?", str(value or ""))
+    if match is None:
+        return None
+    return float(match.group()) or None
+
+
+def drop_pct(series: list[float]) -> float:
+    """How far the mean of the last third of *series* is below the first third, in percent."""
+    third = len(series) // 3
+    if third == 0:
+        return 0.0
+    first = sum(series[:third]) / third
+    last = sum(series[-third:]) / third
+    if first <= 0:
+        return 0.0
+    return round(max(first - last, 0.0) * 100.0 / first, 1)
+
+
+# ----------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------
+
+_barrier: Any = None
+
+
+def _init_worker(barrier: Any) -> None:
+    global _barrier
+    _barrier = barrier
+
+
+def allowed_cpus() -> list[int]:
+    """Logical CPUs this process may run on."""
+    try:
+        return sorted(psutil.Process().cpu_affinity())
+    except (AttributeError, psutil.Error, OSError):   # no affinity API on macOS
+        return list(range(os.cpu_count() or 1))
+
+
+def run_worker(cpu: int, duration: float, window_sec: float, expected: int) -> dict[str, Any]:
+    """One pool worker: pin to *cpu*, wait for the others, run the kernel for *duration*."""
+    try:
+        psutil.Process().cpu_affinity([cpu])
+        pinned = True
+    except (AttributeError, psutil.Error, OSError, ValueError):
+        pinned = False
+    if _barrier is not None:
+        _barrier.wait(BARRIER_TIMEOUT_SEC)
+
+    started = window_start = time.perf_counter()
+    deadline = started + duration
+    runs = window_runs = errors = 0
+    windows: list[float] = []
+    while True:
+        if kernel(KERNEL_SEED) != expected:
+            errors += 1
+        runs += 1
+        window_runs += 1
+        now = time.perf_counter()
+        if now - window_start >= window_sec or now >= deadline:
+            windows.append(round(window_runs / (now - window_start), 2))
+            window_start, window_runs = now, 0
+        if now >= deadline:
+            break
+
+    return {
+        'cpu': cpu,
+        'pid': os.getpid(),
+        'pinned': pinned,
+        'score': round(runs / (now - started), 1),
+        'windows': windows,
+        'errors': errors,
+    }
+
+
+# ----------------------------------------------------------------------
+# Clock / temperature sampling
+# ----------------------------------------------------------------------
+
+def cpu_temperature() -> tuple[float | None, bool]:
+    """``(hottest CPU sensor in °C, whether any reached its high mark)``; None where unsupported."""
+    read = getattr(psutil, "sensors_temperatures", None)   # Linux / FreeBSD only
+    try:
+        sensors = read() if read else {}
+    except (OSError, RuntimeError):
+        sensors = {}
+    chips = [entries for name, entries in sensors.items() if name in CPU_SENSORS] or list(sensors.values())
+    readings = [t for entries in chips for t in entries if t.current]
+    if not readings:
+        return None, False
+    hot = any(t.high and t.current >= t.high for t in readings)
+    return max(t.current for t in readings), hot
+
+
+class ClockSampler:
+    """Background thread sampling the mean clock of *cpus* and the CPU temperature."""
+
+    def __init__(self, cpus: list[int], interval: float = CPU_BENCH_SAMPLE_SEC) -> None:
+        self.cpus = cpus
+        self.interval = interval
+        self.clocks: list[float] = []
+        self.temps: list[float] = []
+        self.reached_high = False
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample(self) -> None:
+        freqs = psutil.cpu_freq(percpu=True) or []
+        if len(freqs) > max(self.cpus):
+            freqs = [freqs[cpu] for cpu in self.cpus]
+        current = [f.current for f in freqs if f.current]
+        if current:
+            self.clocks.append(round(sum(current) / len(current), 1))
+        temp, hot = cpu_temperature()
+        if temp is not None:
+            self.temps.append(temp)
+        self.reached_high |= hot
+
+    def start(self) -> ClockSampler:
+        self._thread = threading.Thread(target=self._run, name="cpu-bench-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2 + 1.0)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except (OSError, psutil.Error) as e:
+                print(f"CPU benchmark sampling stopped: {e}")
+                return
+            if self._stop_event.wait(self.interval):
+                return
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+class CPUBenchmark:
+    """Runs the pinned per-CPU kernel and judges throttling."""
+
+    results = ResultStore(CPU_BENCH_RESULTS_FILE, COMPARED, CPU_BENCH_REGRESSION_PCT)
+
+    def __init__(
+        self,
+        name: str = "Unknown",
+        rated_mhz: float | None = None,
+        cpus: list[int] | None = None,
+        duration: float = CPU_BENCH_DURATION_SEC,
+        window_sec: float = CPU_BENCH_WINDOW_SEC,
+        sample_sec: float = CPU_BENCH_SAMPLE_SEC,
+    ) -> None:
+        self.name = name
+        self.rated_mhz = rated_mhz
+        self.cpus = cpus or allowed_cpus()
+        self.duration = duration
+        self.window_sec = window_sec
+        self.sample_sec = sample_sec
+
+    def run(self) -> dict[str, Any]:
+        expected = kernel(KERNEL_SEED)
+        ctx = multiprocessing.get_context("spawn")   # same on every OS; nothing large is inherited
+        barrier = ctx.Barrier(len(self.cpus) + 1)     # the workers, plus us to start sampling
+        sampler = ClockSampler(self.cpus, self.sample_sec)
+        # Past the per-pool limit, several pools share the barrier so every CPU still starts together
+        size = PROCESS_POOL_MAX_WORKERS or len(self.cpus)
+        with contextlib.ExitStack() as stack:
+            futures = []
+            for i in range(0, len(self.cpus), size):
+                group = self.cpus[i:i + size]
+                pool = stack.enter_context(concurrent.futures.ProcessPoolExecutor(
+                    max_workers=len(group), mp_context=ctx, initializer=_init_worker, initargs=(barrier,),
+                ))
+                futures += [pool.submit(run_worker, cpu, self.duration, self.window_sec, expected) for cpu in group]
+            try:
+                barrier.wait(BARRIER_TIMEOUT_SEC)
+            except threading.BrokenBarrierError:
+                raise RuntimeError("benchmark workers did not start") from None
+            sampler.start()
+            try:
+                workers = [f.result() for f in futures]
+            finally:
+                sampler.stop()
+        return self.evaluate(workers, sampler)
+
+    def evaluate(self, workers: list[dict[str, Any]], sampler: ClockSampler) -> dict[str, Any]:
+        """Combine per-worker results and samples into the result dict, including throttling reasons."""
+        windows = min(len(w['windows']) for w in workers)
+        combined = [sum(w['windows'][i] for w in workers) for i in range(windows)]
+        clocks, temps = sampler.clocks, sampler.temps
+        third = max(len(clocks) // 3, 1)
+        sustained = round(sum(clocks[-third:]) / third) if clocks else None
+        clock_pct = round(sustained * 100.0 / self.rated_mhz, 1) if sustained and self.rated_mhz else None
+
+        result: dict[str, Any] = {
+            'ts': time.time(),
+            'cpu': self.name,
+            'workers': len(workers),
+            'pinned': all(w['pinned'] for w in workers),
+            'duration': self.duration,
+            'score': round(sum(w['score'] for w in workers), 1),
+            'min_core_score': min(w['score'] for w in workers),
+            'max_core_score': max(w['score'] for w in workers),
+            'per_core': [{'cpu': w['cpu'], 'score': w['score'], 'errors': w['errors']} for w in workers],
+            'errors': sum(w['errors'] for w in workers),
+            'rated_mhz': self.rated_mhz,
+            'clock_mhz': {'start': clocks[0], 'sustained': sustained, 'min': min(clocks)} if clocks else None,
+            'clock_pct': clock_pct,
+            'temp_c': {'start': temps[0], 'max': max(temps)} if temps else None,
+            'score_drop_pct': drop_pct(combined),
+            'clock_drop_pct': drop_pct(clocks),
+        }
+
+        reasons = []
+        if result['score_drop_pct'] >= CPU_BENCH_THROTTLE_PCT:
+            reasons.append(f"score fell {result['score_drop_pct']:.0f}% during the run")
+        if result['clock_drop_pct'] >= CPU_BENCH_THROTTLE_PCT:
+            reasons.append(f"clock fell {result['clock_drop_pct']:.0f}% during the run")
+        if clock_pct is not None and clock_pct < CPU_BENCH_MIN_CLOCK_PCT:
+            reasons.append(f"{sustained} MHz is {clock_pct:.0f}% of rated {self.rated_mhz:.0f} MHz")
+        if sampler.reached_high:
+            reasons.append(f"reached {max(temps):.0f} °C")
+        result['throttling'] = reasons
+        return result
+
+
+# ----------------------------------------------------------------------
+# Stored results
+# ----------------------------------------------------------------------
+
+def summarize(result: dict[str, Any]) -> str:
+    """One short line for the Full Scan status column."""
+    text = f"{result['score']:.0f} pts on {result['workers']} CPUs"
+    if result['clock_mhz']:
+        text += f", {result['clock_mhz']['sustained']} MHz"
+    if result['clock_pct'] is not None:
+        text += f" ({result['clock_pct']:.0f}% of rated)"
+    return text
@@ -1,28 +1,26 @@
-"""CPU diagnostics — static info and real-time usage via psutil / WMI."""
+"""CPU diagnostics — static info via the platform backend, live usage via psutil."""
 
 from __future__ import annotations
 
+from typing import Any
+
 import psutil
-import wmi
-import pythoncom
+
+from modules.backends import HardwareBackend, get_backend
+from modules.cpu_sampler import CPUSampler
 
 
 class CPUDiagnostic:
     """Gathers CPU information and live usage metrics."""
 
+    def __init__(self, backend: HardwareBackend | None = None) -> None:
+        self.backend = backend or get_backend()
+        self.sampler: CPUSampler | None = None
+
     def get_cpu_info(self) -> dict[str, str | int]:
         """Return static CPU information (name, cores, threads, clock speed)."""
         try:
-            pythoncom.CoInitialize()
-            c = wmi.WMI()
-            cpu_info: dict[str, str | int] = {}
-            for processor in c.Win32_Processor():
-                cpu_info['Name'] = processor.Name
-                cpu_info['Cores'] = processor.NumberOfCores
-                cpu_info['Threads'] = processor.NumberOfLogicalProcessors
-                cpu_info['MaxClockSpeed'] = f"{processor.MaxClockSpeed} MHz"
-                break  # Assume single socket
-            return cpu_info
+            return self.backend.get_cpu_info()
         except Exception as e:
             return {'Error': str(e)}
 
@@ -40,3 +38,26 @@ class CPUDiagnostic:
         if freq:
             return f"{freq.current:.2f} MHz"
         return "N/A"
+
+    def start_sampler(self, **kwargs: Any) -> CPUSampler:
+        """Start the high-frequency per-core sampler (see :mod:`modules.cpu_sampler`)."""
+        if self.sampler is None:
+            self.sampler = CPUSampler(**kwargs)
+            self.sampler.start()
+        return self.sampler
+
+    def stop_sampler(self) -> None:
+        """Stop the high-frequency sampler if it is running."""
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def get_interval_stats(self) -> dict[str, Any] | None:
+        """Return min/mean/max/p95 usage since the previous call, or None.
+
+        ``None`` means the sampler is not running or has no samples yet;
+        callers should fall back to :meth:`get_per_core_usage`.
+        """
+        if self.sampler is None:
+            return None
+        return self.sampler.drain()
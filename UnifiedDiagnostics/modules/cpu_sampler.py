@@ -0,0 +1,220 @@
+"""High-frequency per-core CPU sampler with per-interval aggregation.
+
+``psutil.cpu_percent`` once per UI tick averages a 2-second window, which
+hides the sub-second bursts behind latency spikes.  :class:`CPUSampler`
+reads raw per-core tick counters at 10–100 Hz in a background thread and
+folds them into min / mean / max / p95 for each display interval.
+
+On Linux the counters come from ``/proc/stat``, kept open and re-read with
+``os.pread`` so a sample costs one syscall and no file-table churn.  Other
+platforms use a single batched ``psutil.cpu_times(percpu=True)`` call.
+The sampler measures its own thread CPU time and stretches the sampling
+period whenever it would exceed the configured budget.
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import threading
+import time
+from typing import Any
+
+import numpy as np
+import psutil
+
+from config import CPU_SAMPLER_BUDGET_PCT, CPU_SAMPLER_HZ, CPU_SAMPLER_MAX_HZ
+from modules.governor import ResourcePolicy, lower_current_thread
+
+
+class ProcStatReader:
+    """Reads per-core ``(total, idle)`` ticks from an open ``/proc/stat``."""
+
+    # Column order after the "cpuN" label: user nice system idle iowait irq softirq steal
+    _FIELDS = 8
+    _IDLE_COLS = (3, 4)  # idle + iowait
+
+    def __init__(self, path: str = "/proc/stat") -> None:
+        self._fd = os.open(path, os.O_RDONLY)
+        self._bufsize = 1 << 16
+
+    def read(self) -> np.ndarray:
+        """Return an ``(ncpu, 2)`` int64 array of cumulative total/idle ticks."""
+        raw = os.pread(self._fd, self._bufsize, 0)
+        while len(raw) == self._bufsize:  # hosts with hundreds of cores
+            self._bufsize *= 2
+            raw = os.pread(self._fd, self._bufsize, 0)
+
+        rows = [
+            line.split()[1:1 + self._FIELDS]
+            for line in raw.split(b"\n")
+            if line.startswith(b"cpu") and line[3:4].isdigit()
+        ]
+        ticks = np.array(rows, dtype=np.int64)
+        return np.column_stack((ticks.sum(axis=1), ticks[:, self._IDLE_COLS].sum(axis=1)))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PsutilTimesReader:
+    """Portable reader — one batched ``psutil.cpu_times(percpu=True)`` call."""
+
+    def read(self) -> np.ndarray:
+        """Return an ``(ncpu, 2)`` float64 array of cumulative total/idle seconds."""
+        times = psutil.cpu_times(percpu=True)
+        arr = np.array([tuple(t) for t in times], dtype=np.float64)
+        idle_cols = [i for i, f in enumerate(times[0]._fields) if f in ("idle", "iowait")]
+        # guest time is already counted inside user/nice on Linux
+        total_cols = [i for i, f in enumerate(times[0]._fields) if f not in ("guest", "guest_nice")]
+        return np.column_stack((arr[:, total_cols].sum(axis=1), arr[:, idle_cols].sum(axis=1)))
+
+    def close(self) -> None:
+        pass
+
+
+def default_reader() -> ProcStatReader | PsutilTimesReader:
+    """Return the cheapest counter reader available on this platform."""
+    if os.path.exists("/proc/stat") and hasattr(os, "pread"):
+        try:
+            return ProcStatReader()
+        except OSError:
+            pass
+    return PsutilTimesReader()
+
+
+class CPUSampler:
+    """Background sampler that aggregates per-core usage between drains."""
+
+    def __init__(
+        self,
+        hz: float = CPU_SAMPLER_HZ,
+        budget_pct: float = CPU_SAMPLER_BUDGET_PCT,
+        reader: Any = None,
+        max_samples: int = 10_000,
+        thread_policy: ResourcePolicy | None = None,
+    ) -> None:
+        self.hz = min(max(hz, 1.0), CPU_SAMPLER_MAX_HZ)
+        self.budget_pct = budget_pct
+        self.reader = reader or default_reader()
+        self.thread_policy = thread_policy
+
+        self._samples: collections.deque[np.ndarray] = collections.deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Self-accounting (thread CPU seconds / wall seconds since last drain)
+        self._cpu_used = 0.0
+        self._wall_start = time.perf_counter()
+        self.period = 1.0 / self.hz
+        self.slowdown = 1.0   # set by adaptive polling: sample this many times less often
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the sampling thread (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread and release the counter source."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self.reader.close()
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def busy_percent(prev: np.ndarray, cur: np.ndarray) -> np.ndarray:
+        """Vectorised per-core busy % between two ``(ncpu, 2)`` counter snapshots."""
+        delta = (cur - prev).astype(np.float64)
+        total = delta[:, 0]
+        busy = total - delta[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(total > 0, busy * 100.0 / total, 0.0)
+        return np.clip(pct, 0.0, 100.0)
+
+    def sample_once(self, prev: np.ndarray) -> np.ndarray:
+        """Take one sample relative to *prev*, store it, and return the new counters."""
+        cur = self.reader.read()
+        if cur.shape == prev.shape:  # CPU hot-plug changes the shape; skip that sample
+            pct = self.busy_percent(prev, cur)
+            with self._lock:
+                self._samples.append(pct)
+        return cur
+
+    def _run(self) -> None:
+        lower_current_thread(self.thread_policy)
+        budget = self.budget_pct / 100.0
+        prev = self.reader.read()
+        while not self._stop_event.wait(self.period):
+            t0 = time.thread_time()
+            try:
+                prev = self.sample_once(prev)
+            except Exception as e:
+                print(f"Error in CPU sampler: {e}")
+                continue
+            cost = time.thread_time() - t0
+            with self._lock:
+                self._cpu_used += cost
+            # Stretch the period so cost / period stays under the budget
+            min_period = self.slowdown / self.hz
+            self.period = max(min_period, cost / budget if budget > 0 else min_period)
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    def drain(self) -> dict[str, Any] | None:
+        """Aggregate and clear every sample taken since the previous drain.
+
+        Returns ``None`` until at least one sample exists.  Otherwise::
+
+            {
+                'per_core': {'min': [...], 'mean': [...], 'max': [...], 'p95': [...]},
+                'overall': {'min': x, 'mean': x, 'max': x, 'p95': x},
+                'samples': n,
+                'rate_hz': effective sampling rate,
+                'overhead_pct': sampler CPU time as % of one core,
+            }
+        """
+        now = time.perf_counter()
+        with self._lock:
+            samples = list(self._samples)
+            self._samples.clear()
+            cpu_used, self._cpu_used = self._cpu_used, 0.0
+        wall = max(now - self._wall_start, 1e-9)
+        self._wall_start = now
+
+        if not samples:
+            return None
+
+        data = np.vstack(samples)        # (n, ncpu)
+        overall = data.mean(axis=1)      # (n,)
+        per_core = {
+            'min': data.min(axis=0),
+            'mean': data.mean(axis=0),
+            'max': data.max(axis=0),
+            'p95': np.percentile(data, 95, axis=0),
+        }
+        return {
+            'per_core': {k: np.round(v, 1).tolist() for k, v in per_core.items()},
+            'overall': {
+                'min': round(float(overall.min()), 1),
+                'mean': round(float(overall.mean()), 1),
+                'max': round(float(overall.max()), 1),
+                'p95': round(float(np.percentile(overall, 95)), 1),
+            },
+            'samples': len(samples),
+            'rate_hz': round(len(samples) / wall, 1),
+            'overhead_pct': round(cpu_used * 100.0 / wall, 3),
+        }
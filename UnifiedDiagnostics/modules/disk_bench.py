@@ -0,0 +1,268 @@
+"""Storage throughput benchmark (Full Scan "Disk Benchmark" check).
+
+CHKDSK answers "is the filesystem consistent", not "is the drive slow".
+:class:`DiskBenchmark` measures, against a temporary file:
+
+* sequential write and read throughput (``DISK_BENCH_SEQ_BLOCK_KB`` blocks);
+* random 4 KiB read and write IOPS at ``DISK_BENCH_QUEUE_DEPTH`` outstanding
+  requests (one thread per request — reads and writes release the GIL),
+  with p50 / p95 / p99 / max latency.
+
+The file is opened with ``O_DIRECT`` on Linux (``F_NOCACHE`` on macOS,
+``FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH`` on Windows) so the
+page cache does not answer for the drive; buffers are page-aligned
+anonymous mmaps as direct I/O requires.  Filesystems that refuse direct
+I/O (tmpfs, some FUSE mounts) fall back to ``O_DSYNC`` writes and a cache
+drop before the read phases where the OS allows it; the result then says
+``'direct': False``.
+
+Every run is appended to ``DISK_BENCH_RESULTS_FILE`` (``DiskBenchmark.results``)
+so a run can be compared with the previous one on the same directory.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from config import (
+    DISK_BENCH_DIR,
+    DISK_BENCH_DURATION_SEC,
+    DISK_BENCH_FILE_MB,
+    DISK_BENCH_QUEUE_DEPTH,
+    DISK_BENCH_REGRESSION_PCT,
+    DISK_BENCH_RESULTS_FILE,
+    DISK_BENCH_SEQ_BLOCK_KB,
+)
+from modules.bench_results import ResultStore
+
+RANDOM_BLOCK = 4096
+# Headline numbers compared between runs (higher is better for all of them)
+COMPARED = ('seq_write_mbps', 'seq_read_mbps', 'rand_read_iops', 'rand_write_iops')
+
+# CreateFileW arguments for unbuffered, write-through I/O on Windows
+_GENERIC_READ_WRITE = 0x80000000 | 0x40000000
+_FILE_SHARE_READ_WRITE = 0x1 | 0x2
+_OPEN_EXISTING = 3
+_FILE_FLAG_NO_BUFFERING_WRITE_THROUGH = 0x20000000 | 0x80000000
+
+
+def _open_unbuffered_win32(path: str) -> int:
+    """C runtime fd for *path* opened around the Windows file cache."""
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = (
+        wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+        wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+    )
+    handle = kernel32.CreateFileW(
+        path, _GENERIC_READ_WRITE, _FILE_SHARE_READ_WRITE, None,
+        _OPEN_EXISTING, _FILE_FLAG_NO_BUFFERING_WRITE_THROUGH, None,
+    )
+    if handle is None or handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        return msvcrt.open_osfhandle(handle, os.O_RDWR | os.O_BINARY)
+    except OSError:
+        kernel32.CloseHandle(wintypes.HANDLE(handle))
+        raise
+
+
+def _aligned_buffer(size: int, fill: bool = True) -> mmap.mmap:
+    """Page-aligned buffer (anonymous mmap) filled with incompressible data."""
+    buf = mmap.mmap(-1, size)
+    if fill:
+        buf.write(os.urandom(size))
+        buf.seek(0)
+    return buf
+
+
+def latency_percentiles(latencies_ns: np.ndarray) -> dict[str, float]:
+    """p50 / p95 / p99 / max in milliseconds."""
+    if latencies_ns.size == 0:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    p50, p95, p99, top = (np.percentile(latencies_ns, (50, 95, 99, 100)) / 1e6).tolist()
+    return {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3), 'max': round(top, 3)}
+
+
+class DiskBenchmark:
+    """Sequential and random 4K throughput / latency against a temp file."""
+
+    results = ResultStore(DISK_BENCH_RESULTS_FILE, COMPARED, DISK_BENCH_REGRESSION_PCT)
+
+    def __init__(
+        self,
+        directory: str | None = DISK_BENCH_DIR,
+        file_mb: int = DISK_BENCH_FILE_MB,
+        queue_depth: int = DISK_BENCH_QUEUE_DEPTH,
+        duration: float = DISK_BENCH_DURATION_SEC,
+        seq_block_kb: int = DISK_BENCH_SEQ_BLOCK_KB,
+    ) -> None:
+        self.directory = os.path.abspath(directory or tempfile.gettempdir())
+        self.file_mb = file_mb
+        self.queue_depth = max(queue_depth, 1)
+        self.duration = duration
+        self.seq_block = seq_block_kb * 1024
+
+    # ------------------------------------------------------------------
+    # File handling
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _open(path: str) -> tuple[io.FileIO, bool]:
+        """Open *path* read/write, bypassing the page cache if possible → ``(file, direct)``."""
+        flags = os.O_RDWR | getattr(os, "O_BINARY", 0)
+        if sys.platform == "win32":
+            try:
+                return io.FileIO(_open_unbuffered_win32(path), "r+b"), True
+            except OSError:
+                pass
+        if hasattr(os, "O_DIRECT"):
+            try:
+                return io.FileIO(os.open(path, flags | os.O_DIRECT), "r+b"), True
+            except OSError:
+                pass   # tmpfs and some FUSE filesystems refuse O_DIRECT
+        f = io.FileIO(os.open(path, flags | getattr(os, "O_DSYNC", 0)), "r+b")
+        if sys.platform == "darwin":
+            import fcntl
+            fcntl.fcntl(f.fileno(), fcntl.F_NOCACHE, 1)
+            return f, True
+        return f, False
+
+    @staticmethod
+    def _drop_cache(fd: int) -> None:
+        """Evict the file's clean pages (buffered fallback only; a no-op where unsupported)."""
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    def _size_bytes(self) -> int:
+        # Leave at least half of the free space alone
+        free = shutil.disk_usage(self.directory).free
+        size = min(self.file_mb * 1024 * 1024, free // 2)
+        size -= size % self.seq_block
+        if size < self.seq_block:
+            raise OSError(f"not enough free space in {self.directory}")
+        return size
+
+    # ------------------------------------------------------------------
+    # Phases
+    # ------------------------------------------------------------------
+
+    def _sequential(self, f: io.FileIO, size: int, write: bool) -> float:
+        """Stream the whole file in seq_block chunks; return MB/s."""
+        buf = _aligned_buffer(self.seq_block, fill=write)
+        started = time.perf_counter()
+        f.seek(0)
+        for _ in range(size // self.seq_block):
+            if write:
+                f.write(buf)
+            else:
+                f.readinto(buf)
+        if write:
+            os.fsync(f.fileno())
+        elapsed = time.perf_counter() - started
+        buf.close()
+        return size / elapsed / 1e6
+
+    def _random(self, path: str, size: int, write: bool) -> dict[str, Any]:
+        """queue_depth threads doing 4K I/O at random aligned offsets for *duration*."""
+        blocks = size // RANDOM_BLOCK
+        deadline = time.perf_counter() + self.duration
+        results: list[list[int]] = [[] for _ in range(self.queue_depth)]
+        errors: list[BaseException] = []
+
+        def worker(slot: int) -> None:
+            rng = random.Random(slot)
+            buf = _aligned_buffer(RANDOM_BLOCK, fill=write)
+            lat = results[slot]
+            try:
+                f, _ = self._open(path)
+                with f:
+                    op = f.write if write else f.readinto
+                    while time.perf_counter() < deadline:
+                        offset = rng.randrange(blocks) * RANDOM_BLOCK
+                        t0 = time.perf_counter_ns()
+                        f.seek(offset)
+                        op(buf)
+                        lat.append(time.perf_counter_ns() - t0)
+            except OSError as e:
+                errors.append(e)
+            finally:
+                buf.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,), name=f"disk-bench-{i}") for i in range(self.queue_depth)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+
+        latencies = np.fromiter((x for lat in results for x in lat), dtype=np.int64)
+        iops = latencies.size / elapsed
+        return {'iops': round(iops), 'mbps': round(iops * RANDOM_BLOCK / 1e6, 2), 'latency_ms': latency_percentiles(latencies)}
+
+    def run(self) -> dict[str, Any]:
+        """Run all four phases and return the result dict (not stored; see :func:`save_result`)."""
+        size = self._size_bytes()
+        fd, path = tempfile.mkstemp(prefix="sentinal-bench-", suffix=".bin", dir=self.directory)
+        os.close(fd)
+        try:
+            f, direct = self._open(path)
+            with f:
+                seq_write = self._sequential(f, size, write=True)
+                if not direct:
+                    self._drop_cache(f.fileno())
+                seq_read = self._sequential(f, size, write=False)
+                if not direct:
+                    self._drop_cache(f.fileno())
+            rand_read = self._random(path, size, write=False)
+            rand_write = self._random(path, size, write=True)
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        return {
+            'ts': time.time(),
+            'directory': self.directory,
+            'file_mb': size // (1024 * 1024),
+            'direct': direct,
+            'queue_depth': self.queue_depth,
+            'seq_write_mbps': round(seq_write, 1),
+            'seq_read_mbps': round(seq_read, 1),
+            'rand_read_iops': rand_read['iops'],
+            'rand_read_mbps': rand_read['mbps'],
+            'rand_read_latency_ms': rand_read['latency_ms'],
+            'rand_write_iops': rand_write['iops'],
+            'rand_write_mbps': rand_write['mbps'],
+            'rand_write_latency_ms': rand_write['latency_ms'],
+        }
+
+
+# ----------------------------------------------------------------------
+# Stored results
+# ----------------------------------------------------------------------
+
+def summarize(result: dict[str, Any]) -> str:
+    """One short line for the Full Scan status column."""
+    return (f"R {result['seq_read_mbps']:.0f} / W {result['seq_write_mbps']:.0f} MB/s, "
+            f"4K {result['rand_read_iops'] / 1000:.1f}k/{result['rand_write_iops'] / 1000:.1f}k IOPS")
@@ -1,47 +1,167 @@
-"""Disk diagnostics — partition usage and SMART status via psutil / WMI."""
+"""Disk diagnostics — partition usage via psutil, drive status via the platform backend."""
 
 from __future__ import annotations
 
+import os
+from typing import Any
+
 import psutil
-import pythoncom
-import wmi
+
+from config import DISK_IGNORED_FSTYPES
+from modules.backends import HardwareBackend, get_backend
+from modules.disk_io import DiskIOCollector, format_io
+from modules.mount_probe import MountProber, Unresponsive
+from modules.mount_watch import MountWatcher, create_mount_watcher
+from modules.smart import SmartCollector, format_attributes
+from modules.smart_trend import SmartTrendStore
 
 
 class DiskDiagnostic:
     """Gathers disk partition usage and SMART health information."""
 
+    def __init__(
+        self,
+        backend: HardwareBackend | None = None,
+        mount_watcher: MountWatcher | None = None,
+        ignored_fstypes: frozenset[str] = DISK_IGNORED_FSTYPES,
+        prober: MountProber | None = None,
+        smart: SmartCollector | None = None,
+        smart_trends: SmartTrendStore | None = None,
+    ) -> None:
+        self.backend = backend or get_backend()
+        self.io = DiskIOCollector()
+        self.mount_watcher = mount_watcher or create_mount_watcher()
+        self.prober = prober or MountProber()
+        self.smart = smart or SmartCollector()
+        self.smart_trends = smart_trends or SmartTrendStore()
+        self.smart.on_update = self._record_trends   # once per smartctl refresh, not per read
+        self.ignored_fstypes = frozenset(t.lower() for t in ignored_fstypes)
+        self._partitions: list[Any] | None = None
+        self._partition_disk_map: dict[str, str] | None = None
+
+    def get_partitions(self) -> list[Any]:
+        """Return the cached partition list, re-enumerating only on mount changes.
+
+        Partitions whose filesystem type is in *ignored_fstypes* (overlay,
+        tmpfs, squashfs, …) are filtered out.
+        """
+        if self._partitions is None or self.mount_watcher.changed():
+            self._partitions = [
+                p for p in psutil.disk_partitions()
+                if (p.fstype or "").lower() not in self.ignored_fstypes
+            ]
+            self._partition_disk_map = None  # drive letters may have moved
+        return self._partitions
+
     def get_disk_partitions_and_usage(self) -> list[dict[str, str]]:
-        """Return a list of dicts with usage stats per partition."""
+        """Return a list of dicts with usage stats per partition.
+
+        Mounts that do not answer within ``DISK_PROBE_TIMEOUT_SEC`` (stale
+        network shares, ejecting drives) are listed with ``Status``
+        ``Unresponsive`` rather than stalling the caller.
+        """
         disks: list[dict[str, str]] = []
         try:
-            partitions = psutil.disk_partitions()
+            partitions = self.get_partitions()
+            outcomes = self.prober.probe_many([p.mountpoint for p in partitions])
             for partition in partitions:
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
+                usage = outcomes.get(partition.mountpoint)
+                if isinstance(usage, PermissionError):
+                    continue
+                if isinstance(usage, Unresponsive):
+                    retry = f" (retry in {usage.retry_in:.0f}s)" if usage.retry_in >= 1 else ""
                     disks.append({
                         'Device': partition.device,
                         'Mountpoint': partition.mountpoint,
-                        'Total': f"{usage.total / (1024**3):.2f} GB",
-                        'Used': f"{usage.used / (1024**3):.2f} GB",
-                        'Free': f"{usage.free / (1024**3):.2f} GB",
-                        'Percent': f"{usage.percent}%",
+                        'Total': "N/A",
+                        'Used': "N/A",
+                        'Free': "N/A",
+                        'Percent': "N/A",
+                        'Status': f"Unresponsive{retry}",
                     })
-                except PermissionError:
                     continue
+                if isinstance(usage, BaseException):
+                    raise usage
+                disks.append({
+                    'Device': partition.device,
+                    'Mountpoint': partition.mountpoint,
+                    'Total': f"{usage.total / (1024**3):.2f} GB",
+                    'Used': f"{usage.used / (1024**3):.2f} GB",
+                    'Free': f"{usage.free / (1024**3):.2f} GB",
+                    'Percent': f"{usage.percent}%",
+                    'Status': "OK",
+                })
         except Exception as e:
             disks.append({'Error': str(e)})
         return disks
 
-    def get_smart_status(self) -> dict[str, str]:
-        """Return SMART status per physical drive (keyed by DeviceID for stability)."""
-        status: dict[str, str] = {}
+    def get_disk_io(self) -> dict[str, dict[str, float]]:
+        """Return per-disk I/O rates (MB/s, IOPS, latency, busy%) since the last call."""
+        try:
+            return self.io.sample()
+        except Exception as e:
+            print(f"Error reading disk I/O counters: {e}")
+            return {}
+
+    def io_key_for_partition(self, device: str) -> str:
+        """Return the ``disk_io_counters`` key that carries *device*'s I/O."""
+        if self._partition_disk_map is None:
+            try:
+                self._partition_disk_map = self.backend.get_partition_disk_map()
+            except Exception:
+                self._partition_disk_map = {}
+        return self._partition_disk_map.get(device) or os.path.basename(device.rstrip("\\/"))
+
+    def attach_io(self, disks: list[dict[str, str]], io: dict[str, dict[str, float]]) -> None:
+        """Add formatted I/O rows to each partition dict whose disk has rates."""
+        for disk in disks:
+            rates = io.get(self.io_key_for_partition(disk.get('Device', '')))
+            if rates:
+                disk.update(format_io(rates))
+
+    def get_smart_attributes(self) -> dict[str, dict[str, Any]]:
+        """Return parsed smartctl attributes per drive, or ``{}`` without smartctl.
+
+        Served from a long-lived cache; see :mod:`modules.smart`.
+        """
+        if not self.smart.available():
+            return {}
+        return self.smart.get()
+
+    def _record_trends(self, attrs: dict[str, dict[str, Any]]) -> None:
+        """Append freshly collected attributes to each drive's trend history."""
+        for a in attrs.values():
+            if a.get('serial'):
+                try:
+                    self.smart_trends.record(a['serial'], a)
+                except OSError as e:
+                    print(f"Error recording SMART trend: {e}")
+
+    def get_smart_warnings(self, attrs: dict[str, dict[str, Any]]) -> dict[str, list[str]]:
+        """Return predictive trend warnings per device for drives in *attrs*."""
+        warnings: dict[str, list[str]] = {}
+        for dev, a in attrs.items():
+            if a.get('serial'):
+                msgs = self.smart_trends.warnings(a['serial'])
+                if msgs:
+                    warnings[dev] = msgs
+        return warnings
+
+    def get_smart_status(self, attrs: dict[str, dict[str, Any]] | None = None) -> dict[str, str]:
+        """Return SMART status per physical drive (keyed by DeviceID for stability).
+
+        Uses smartctl's overall assessment when available (from *attrs* if
+        the caller already fetched them), otherwise the platform backend
+        (WMI status / sysfs device state).
+        """
+        if attrs is None:
+            attrs = self.get_smart_attributes()
+        if attrs:
+            return {
+                dev: f"{a.get('model') or dev} — {format_attributes(a)['Health']}"
+                for dev, a in attrs.items()
+            }
         try:
-            pythoncom.CoInitialize()
-            c = wmi.WMI()
-            for drive in c.Win32_DiskDrive():
-                key = drive.DeviceID or drive.Caption
-                display = f"{drive.Caption} — {drive.Status}"
-                status[key] = display
+            return self.backend.get_smart_status()
         except Exception as e:
-            status['Error'] = str(e)
-        return status
+            return {'Error': str(e)}
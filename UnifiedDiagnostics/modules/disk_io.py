@@ -0,0 +1,106 @@
+"""Per-disk I/O throughput, IOPS, latency and busy% from counter deltas.
+
+``psutil.disk_io_counters(perdisk=True)`` returns cumulative counters; the
+collector keeps the previous snapshot and turns each pair into rates.  Raw
+(``nowrap=False``) counters are used so wraparound is handled here, in one
+place: a counter that goes backwards is assumed to have wrapped at 32 bits
+when its previous value fits in 32 bits and the wrapped delta is below
+2**31 (a real wrap happens from near the top), and to have been reset
+otherwise — a reset reports no activity for that interval rather than a
+guess.
+Devices that appear get a baseline and report from the next call; devices
+that disappear are dropped.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+import psutil
+
+_WRAP_32 = 2 ** 32
+_MAX_WRAP_DELTA = 2 ** 31   # larger "wrapped" deltas are resets, not wraps
+
+# Counter fields used for rate calculation (busy_time is Linux/FreeBSD only)
+_FIELDS: tuple[str, ...] = (
+    "read_count", "write_count", "read_bytes", "write_bytes", "read_time", "write_time", "busy_time",
+)
+
+# Numeric metric names produced per disk, in display order
+IO_METRICS: tuple[str, ...] = (
+    "read_mb_s", "write_mb_s", "read_iops", "write_iops", "latency_ms", "busy_pct",
+)
+
+
+def counter_delta(prev: int, cur: int) -> int:
+    """Return ``cur - prev`` for a monotonically increasing counter."""
+    if cur >= prev:
+        return cur - prev
+    wrapped = cur + _WRAP_32 - prev
+    if prev < _WRAP_32 and wrapped < _MAX_WRAP_DELTA:
+        return wrapped                 # 32-bit wraparound
+    return 0                           # counter reset (driver reload, hot-swap)
+
+
+def format_io(rates: dict[str, float]) -> dict[str, str]:
+    """Render numeric rates as display strings for InfoRow widgets."""
+    busy = rates.get("busy_pct")
+    return {
+        'Read': f"{rates['read_mb_s']:.2f} MB/s",
+        'Write': f"{rates['write_mb_s']:.2f} MB/s",
+        'IOPS (R/W)': f"{rates['read_iops']:.0f} / {rates['write_iops']:.0f}",
+        'Latency': f"{rates['latency_ms']:.2f} ms",
+        'Busy': f"{busy:.1f}%" if busy is not None else "N/A",
+    }
+
+
+class DiskIOCollector:
+    """Turns successive ``disk_io_counters`` snapshots into per-disk rates."""
+
+    def __init__(
+        self,
+        counters_fn: Callable[[], dict[str, Any]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._counters_fn = counters_fn or (lambda: psutil.disk_io_counters(perdisk=True, nowrap=False) or {})
+        self._clock = clock
+        self._prev: dict[str, dict[str, int]] = {}
+        self._prev_ts: float | None = None
+
+    def sample(self) -> dict[str, dict[str, float]]:
+        """Return ``{disk: {metric: value}}`` for the interval since the last call.
+
+        ``busy_pct`` is omitted on platforms whose counters lack ``busy_time``.
+        """
+        now = self._clock()
+        raw = self._counters_fn()
+        cur = {
+            disk: {f: getattr(c, f) for f in _FIELDS if hasattr(c, f)}
+            for disk, c in raw.items()
+        }
+
+        rates: dict[str, dict[str, float]] = {}
+        dt = now - self._prev_ts if self._prev_ts is not None else 0.0
+        if dt > 0:
+            for disk, counters in cur.items():
+                prev = self._prev.get(disk)
+                if prev is None:
+                    continue  # new device: baseline only
+                d = {f: counter_delta(prev[f], counters[f]) for f in counters if f in prev}
+                ops = d["read_count"] + d["write_count"]
+                disk_rates = {
+                    "read_mb_s": d["read_bytes"] / dt / (1024 ** 2),
+                    "write_mb_s": d["write_bytes"] / dt / (1024 ** 2),
+                    "read_iops": d["read_count"] / dt,
+                    "write_iops": d["write_count"] / dt,
+                    "latency_ms": (d["read_time"] + d["write_time"]) / ops if ops else 0.0,
+                }
+                if "busy_time" in d:
+                    disk_rates["busy_pct"] = min(d["busy_time"] / (dt * 1000.0) * 100.0, 100.0)
+                rates[disk] = disk_rates
+
+        # Replacing the snapshot drops vanished devices automatically
+        self._prev = cur
+        self._prev_ts = now
+        return rates
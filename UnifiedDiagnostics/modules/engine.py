@@ -0,0 +1,250 @@
+"""asyncio collection engine: one event loop on one background thread.
+
+Collectors that wait on external programs (nvidia-smi, smartctl, the Full
+Scan commands) run as coroutines via :func:`run_command`, which gives them
+real timeouts and cancellation — a cancelled or timed-out command has its
+child process killed.  Blocking psutil/WMI calls go to a small shared
+executor instead of a thread each.
+
+Everything the engine produces for the UI goes through a single
+thread-safe queue of ``(topic, payload)`` items; Tk drains it with
+:meth:`CollectionEngine.drain` from its own thread, so no collector ever
+touches a widget.  Topics registered as *coalesced* (the live tick) skip
+the queue and go through a single-slot :class:`Mailbox` instead: if Tk
+falls behind, older snapshots are replaced rather than replayed in a burst.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import locale
+import os
+import queue
+import subprocess
+import threading
+from typing import Any, Awaitable, Callable, Coroutine
+
+from config import ENGINE_EXECUTOR_WORKERS
+from modules.governor import IOThrottle, ResourcePolicy, apply_to_process, creation_flags, lower_current_thread
+
+
+async def run_command(
+    args: list[str], timeout: float | None = None, policy: ResourcePolicy | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run *args* without a console window and capture its output as text.
+
+    Raises ``asyncio.TimeoutError`` after *timeout* seconds; the child is
+    killed on timeout and on cancellation.  A *policy* (see
+    :mod:`modules.governor`) sets the child's priority, affinity and I/O cap.
+    """
+    kwargs: dict[str, Any] = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW | (creation_flags(policy) if policy else 0)
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **kwargs,
+    )
+    throttle = None
+    if policy is not None:
+        apply_to_process(proc.pid, policy)
+        if policy.io_limit_mbps:
+            throttle = IOThrottle(proc.pid, policy.io_limit_mbps).start()
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    finally:
+        if throttle is not None:
+            throttle.stop()
+
+    # Same decoding as subprocess.run(..., text=True)
+    encoding = locale.getpreferredencoding(False)
+    return subprocess.CompletedProcess(
+        args, proc.returncode,
+        out.decode(encoding, errors="replace"), err.decode(encoding, errors="replace"),
+    )
+
+
+class Mailbox:
+    """Single-slot, latest-value handoff between threads.
+
+    :meth:`put` replaces whatever is waiting (counting it in *dropped*),
+    :meth:`take` empties the slot.
+    """
+
+    __slots__ = ("_lock", "_value", "_full", "dropped")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._full = False
+        self.dropped = 0
+
+    def put(self, value: Any) -> None:
+        with self._lock:
+            if self._full:
+                self.dropped += 1
+            self._value, self._full = value, True
+
+    def take(self) -> tuple[bool, Any]:
+        """Return ``(True, latest)`` and empty the slot, or ``(False, None)``."""
+        with self._lock:
+            value, full = self._value, self._full
+            self._value, self._full = None, False
+        return full, value
+
+
+class CollectionEngine:
+    """Owns the background event loop, the blocking-call executor and the UI queue."""
+
+    def __init__(
+        self,
+        executor_workers: int = ENGINE_EXECUTOR_WORKERS,
+        coalesce: tuple[str, ...] = (),
+        thread_policy: ResourcePolicy | None = None,
+    ) -> None:
+        self.results: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self.mailboxes: dict[str, Mailbox] = {topic: Mailbox() for topic in coalesce}
+        # The loop and executor threads run at *thread_policy*'s priority (the Tk thread is untouched)
+        self.thread_policy = thread_policy
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(executor_workers, 1), thread_name_prefix="engine-io",
+            initializer=lower_current_thread, initargs=(thread_policy,),
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._wakeups: dict[str, asyncio.Event] = {}   # periodic topics, touched on the loop only
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the event loop thread (returns once the loop is running)."""
+        ready = threading.Event()
+
+        def main() -> None:
+            lower_current_thread(self.thread_policy)
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.set_default_executor(self.executor)
+            self._loop = loop
+            loop.call_soon(ready.set)
+            try:
+                loop.run_forever()
+            finally:
+                # Cancel whatever is still running; run_command kills its children
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+        self._thread = threading.Thread(target=main, name="collection-engine", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel all tasks, stop the loop and release the executor."""
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Scheduling (callable from any thread)
+    # ------------------------------------------------------------------
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future[Any]:
+        """Run *coro* on the engine loop; cancel the returned future to cancel it."""
+        assert self._loop is not None, "engine not started"
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def every(
+        self, interval: float | Callable[[], float], fn: Callable[[], Awaitable[Any]], topic: str,
+    ) -> concurrent.futures.Future[Any]:
+        """Await ``fn()`` every *interval* seconds and post each result under *topic*.
+
+        *interval* may be a callable, re-read after every run (adaptive
+        polling).  A failing run is logged and retried on the next interval;
+        :meth:`wake` cuts the current wait short.
+        """
+        period = interval if callable(interval) else (lambda: interval)
+
+        async def periodic() -> None:
+            loop = asyncio.get_running_loop()
+            wakeup = self._wakeups[topic] = asyncio.Event()
+            while True:
+                started = loop.time()
+                try:
+                    self.post(topic, await fn())
+                except Exception as e:
+                    print(f"Error in {topic} collector: {e}")
+                try:
+                    await asyncio.wait_for(wakeup.wait(), max(period() - (loop.time() - started), 0.0))
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+
+        return self.submit(periodic())
+
+    def wake(self, topic: str) -> None:
+        """Run the periodic collector for *topic* now instead of at the end of its wait."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(lambda: topic in self._wakeups and self._wakeups[topic].set())
+
+    # ------------------------------------------------------------------
+    # Helpers for coroutines running on the engine
+    # ------------------------------------------------------------------
+
+    async def blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call (psutil, WMI, file I/O) on the shared executor."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def post(self, topic: str, payload: Any) -> None:
+        """Hand *payload* to the UI thread (replacing any unread one for a coalesced topic)."""
+        mailbox = self.mailboxes.get(topic)
+        if mailbox is not None:
+            mailbox.put(payload)
+        else:
+            self.results.put((topic, payload))
+
+    async def ask(self, topic: str, payload: Any) -> Any:
+        """Post ``(payload, reply)`` and wait until the UI calls ``reply(answer)``.
+
+        ``reply`` is safe to call from the Tk thread.
+        """
+        loop = asyncio.get_running_loop()
+        answer: asyncio.Future[Any] = loop.create_future()
+
+        def reply(value: Any) -> None:
+            loop.call_soon_threadsafe(lambda: answer.done() or answer.set_result(value))
+
+        self.post(topic, (payload, reply))
+        return await answer
+
+    # ------------------------------------------------------------------
+    # UI side
+    # ------------------------------------------------------------------
+
+    def drain(self) -> list[tuple[str, Any]]:
+        """Return every queued ``(topic, payload)`` item without blocking.
+
+        Coalesced topics contribute at most their latest payload, after the
+        queued items.
+        """
+        items: list[tuple[str, Any]] = []
+        while True:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        for topic, mailbox in self.mailboxes.items():
+            full, payload = mailbox.take()
+            if full:
+                items.append((topic, payload))
+        return items
@@ -0,0 +1,408 @@
+"""Fleet mode: agents stream metric snapshots to a central aggregator.
+
+Each agent keeps one persistent asyncio TCP connection to the aggregator
+and pushes the flat ``{metric_key: value}`` snapshot produced by
+:func:`modules.history.flatten_metrics` every ``FLEET_PUSH_INTERVAL_SEC``.
+The wire format is newline-delimited compact JSON:
+
+* ``{"t":"hello","host":…,"info":{…}}`` — first line of every connection;
+* ``{"t":"s","ts":…,"full":1,"set":{…}}`` — full snapshot, sent after each
+  (re)connect and every ``FLEET_FULL_SNAPSHOT_EVERY`` frames;
+* ``{"t":"s","ts":…,"set":{…},"del":[…]}`` — delta: only keys whose value
+  changed at ``FLEET_VALUE_DECIMALS`` precision, plus keys that vanished;
+* ``{"t":"query"}`` — answered with the aggregator's fleet view (used by the
+  Fleet tab).
+
+Agents reconnect with exponential backoff and keep up to
+``FLEET_BUFFER_LEN`` snapshots while disconnected, replaying them on
+reconnect so short outages leave no gap in the aggregator's history.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import platform
+import random
+import socket
+import time
+from collections import deque
+from typing import Any, Callable
+
+import psutil
+
+from config import (
+    FLEET_BUFFER_LEN,
+    FLEET_FULL_SNAPSHOT_EVERY,
+    FLEET_HISTORY_LEN,
+    FLEET_LISTEN_HOST,
+    FLEET_PORT,
+    FLEET_PUSH_INTERVAL_SEC,
+    FLEET_QUERY_TIMEOUT_SEC,
+    FLEET_RECONNECT_MAX_SEC,
+    FLEET_RECONNECT_MIN_SEC,
+    FLEET_STALE_SEC,
+    FLEET_VALUE_DECIMALS,
+)
+from modules.history import MetricHistory, flatten_metrics
+
+# Longest accepted protocol line (a full snapshot of a very large host)
+_LINE_LIMIT = 1 << 20
+
+# Metrics summarised per host in query replies
+SUMMARY_KEYS: tuple[str, ...] = ("cpu.usage", "ram.percent")
+
+
+def _dumps(obj: dict[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+def parse_addr(addr: str, default_host: str = "127.0.0.1") -> tuple[str, int]:
+    """Split ``"host[:port]"`` (either part optional) into ``(host, port)``."""
+    host, sep, port = addr.rpartition(":")
+    if not sep:
+        return addr or default_host, FLEET_PORT
+    return host or default_host, int(port)
+
+
+# ----------------------------------------------------------------------
+# Delta encoding
+# ----------------------------------------------------------------------
+
+class DeltaEncoder:
+    """Turns successive snapshots into full or delta frames."""
+
+    def __init__(self, decimals: int = FLEET_VALUE_DECIMALS, full_every: int = FLEET_FULL_SNAPSHOT_EVERY) -> None:
+        self.decimals = decimals
+        self.full_every = max(full_every, 1)
+        self._prev: dict[str, float] | None = None
+        self._count = 0
+
+    def reset(self) -> None:
+        """Force the next frame to be a full snapshot (e.g. after reconnecting)."""
+        self._prev = None
+        self._count = 0
+
+    def encode(self, snapshot: dict[str, float], ts: float) -> dict[str, Any]:
+        cur = {k: round(float(v), self.decimals) for k, v in snapshot.items()}
+        prev = self._prev
+        if prev is None or self._count % self.full_every == 0:
+            frame: dict[str, Any] = {"t": "s", "ts": ts, "full": 1, "set": cur}
+        else:
+            frame = {"t": "s", "ts": ts, "set": {k: v for k, v in cur.items() if prev.get(k) != v}}
+            gone = [k for k in prev if k not in cur]
+            if gone:
+                frame["del"] = gone
+        self._prev = cur
+        self._count += 1
+        return frame
+
+
+def apply_frame(state: dict[str, float], frame: dict[str, Any]) -> dict[str, float]:
+    """Apply a full or delta *frame* to *state* in place and return it."""
+    if frame.get("full"):
+        state.clear()
+    state.update(frame.get("set", {}))
+    for key in frame.get("del", ()):
+        state.pop(key, None)
+    return state
+
+
+# ----------------------------------------------------------------------
+# Aggregator
+# ----------------------------------------------------------------------
+
+class HostState:
+    """Latest metrics and short history for one agent."""
+
+    __slots__ = ("host", "info", "metrics", "history", "connection", "last_seen", "frames", "rx_bytes")
+
+    def __init__(self, host: str, history_len: int) -> None:
+        self.host = host
+        self.info: dict[str, Any] = {}
+        self.metrics: dict[str, float] = {}
+        self.history = MetricHistory(capacity=history_len)
+        self.connection: object | None = None   # writer of the live connection
+        self.last_seen = 0.0
+        self.frames = 0
+        self.rx_bytes = 0
+
+
+class FleetAggregator:
+    """asyncio TCP server that keeps every agent's latest state in memory."""
+
+    def __init__(
+        self,
+        history_len: int = FLEET_HISTORY_LEN,
+        stale_after: float = FLEET_STALE_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.history_len = history_len
+        self.stale_after = stale_after
+        self._clock = clock
+        self.hosts: dict[str, HostState] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = FLEET_LISTEN_HOST, port: int = FLEET_PORT) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port, limit=_LINE_LIMIT)
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful when started on port 0)."""
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        state: HostState | None = None
+        try:
+            while line := await reader.readline():
+                msg = json.loads(line)
+                if not isinstance(msg, dict):
+                    raise ValueError(f"expected a JSON object, got {type(msg).__name__}")
+                kind = msg.get("t")
+                if kind == "s" and state is not None:
+                    apply_frame(state.metrics, msg)
+                    state.history.record(state.metrics, ts=msg.get("ts"))
+                    state.last_seen = self._clock()
+                    state.frames += 1
+                    state.rx_bytes += len(line)
+                elif kind == "hello":
+                    host = str(msg.get("host") or writer.get_extra_info("peername")[0])
+                    state = self.hosts.get(host)
+                    if state is None:
+                        state = self.hosts[host] = HostState(host, self.history_len)
+                    state.info = msg.get("info", {})
+                    state.connection = writer
+                    state.last_seen = self._clock()
+                elif kind == "query":
+                    writer.write(_dumps(self.query()))
+                    await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            # ValueError covers malformed JSON, non-object messages and over-long lines
+            print(f"Fleet connection error: {e}")
+        finally:
+            if state is not None and state.connection is writer:
+                state.connection = None
+            writer.close()
+
+    def query(self) -> dict[str, Any]:
+        """Return the fleet view: latest metrics, status and summaries per host."""
+        now = self._clock()
+        hosts: dict[str, Any] = {}
+        for name, state in self.hosts.items():
+            age = now - state.last_seen
+            if state.connection is None:
+                status = "Offline"
+            elif age > self.stale_after:
+                status = "Stale"
+            else:
+                status = "Online"
+            hosts[name] = {
+                "status": status,
+                "age_s": round(age, 1),
+                "info": state.info,
+                "metrics": state.metrics,
+                "summary": {k: s for k in SUMMARY_KEYS if (s := state.history.summary(k))},
+                "frames": state.frames,
+                "rx_bytes": state.rx_bytes,
+            }
+        return {"t": "fleet", "ts": now, "hosts": hosts}
+
+
+def query_aggregator(addr: str, timeout: float = FLEET_QUERY_TIMEOUT_SEC) -> dict[str, Any]:
+    """Fetch the fleet view from the aggregator at *addr* (blocking)."""
+    with socket.create_connection(parse_addr(addr), timeout=timeout) as sock:
+        sock.sendall(_dumps({"t": "query"}))
+        with sock.makefile("rb") as f:
+            line = f.readline(_LINE_LIMIT)
+    if not line:
+        raise ConnectionError("aggregator closed the connection")
+    return json.loads(line)
+
+
+def format_fleet(reply: dict[str, Any]) -> list[dict[str, str]]:
+    """Render a query reply as display dicts for InfoRow widgets, one per host."""
+    rows: list[dict[str, str]] = []
+    for name, h in sorted(reply.get("hosts", {}).items()):
+        m = h.get("metrics", {})
+        cpu = h.get("summary", {}).get("cpu.usage")
+
+        def pct(key: str) -> str:
+            return f"{m[key]:.1f}%" if key in m else "N/A"
+
+        rows.append({
+            'Host': name,
+            'Status': h.get("status", "?"),
+            'OS': str(h.get("info", {}).get("os", "N/A")),
+            'CPU': pct("cpu.usage"),
+            'RAM': pct("ram.percent"),
+            'CPU (min/mean/max)': (
+                f"{cpu['min']:.0f} / {cpu['mean']:.0f} / {cpu['max']:.0f}%" if cpu else "N/A"
+            ),
+            'Last Seen': f"{h.get('age_s', 0):.0f}s ago",
+        })
+    return rows
+
+
+# ----------------------------------------------------------------------
+# Agent
+# ----------------------------------------------------------------------
+
+class FleetAgent:
+    """Collects snapshots on an interval and streams them to the aggregator."""
+
+    def __init__(
+        self,
+        addr: str,
+        collect_fn: Callable[[], dict[str, float]],
+        host: str | None = None,
+        info: dict[str, Any] | None = None,
+        interval: float = FLEET_PUSH_INTERVAL_SEC,
+        buffer_len: int = FLEET_BUFFER_LEN,
+        backoff_min: float = FLEET_RECONNECT_MIN_SEC,
+        backoff_max: float = FLEET_RECONNECT_MAX_SEC,
+        encoder: DeltaEncoder | None = None,
+    ) -> None:
+        self.addr = parse_addr(addr)
+        self.host = host or socket.gethostname()
+        self.info = info if info is not None else {"os": platform.platform(), "cpus": psutil.cpu_count()}
+        self.interval = interval
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.encoder = encoder or DeltaEncoder()
+        self._collect_fn = collect_fn
+
+        # (ts, snapshot) waiting to be sent; oldest dropped during long outages
+        self.buffer: deque[tuple[float, dict[str, float]]] = deque(maxlen=buffer_len)
+        self.connected = False
+        self.connects = 0
+        self._stop: asyncio.Event | None = None
+        self._wake: asyncio.Event | None = None
+
+    async def run(self) -> None:
+        """Collect and send until :meth:`stop` is called."""
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+        collector = asyncio.create_task(self._collect_loop())
+        try:
+            await self._send_loop()
+        finally:
+            collector.cancel()
+
+    def stop(self) -> None:
+        """Ask :meth:`run` to finish (call from the agent's event loop)."""
+        if self._stop is not None:
+            self._stop.set()
+            self._wake.set()
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep up to *seconds*; return True if stopped in the meantime."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _collect_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            try:
+                snapshot = await loop.run_in_executor(None, self._collect_fn)
+                self.buffer.append((time.time(), snapshot))
+                self._wake.set()
+            except Exception as e:
+                print(f"Error collecting fleet snapshot: {e}")
+            if await self._sleep(self.interval):
+                return
+
+    async def _send_loop(self) -> None:
+        delay = self.backoff_min
+        while not self._stop.is_set():
+            try:
+                reader, writer = await asyncio.open_connection(*self.addr)
+            except OSError:
+                # Jitter keeps a fleet from reconnecting in lockstep after an outage
+                if await self._sleep(delay * random.uniform(0.5, 1.0)):
+                    return
+                delay = min(delay * 2, self.backoff_max)
+                continue
+
+            delay = self.backoff_min
+            self.connected = True
+            self.connects += 1
+            self.encoder.reset()
+            try:
+                writer.write(_dumps({"t": "hello", "host": self.host, "info": self.info}))
+                await self._drain_buffer(reader, writer)
+            except ConnectionError:
+                pass
+            finally:
+                self.connected = False
+                writer.close()
+            if await self._sleep(delay * random.uniform(0.5, 1.0)):
+                return
+
+    async def _drain_buffer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while not self._stop.is_set():
+            while self.buffer:
+                if reader.at_eof():
+                    raise ConnectionResetError("aggregator closed the connection")
+                ts, snapshot = self.buffer[0]
+                writer.write(_dumps(self.encoder.encode(snapshot, ts)))
+                await writer.drain()
+                # Only drop a snapshot once it has been handed to the socket
+                self.buffer.popleft()
+            self._wake.clear()
+            if not self.buffer:
+                await self._wake.wait()
+
+
+def local_collector() -> Callable[[], dict[str, float]]:
+    """Return a snapshot function over this machine's CPU, RAM, disk and NICs."""
+    from modules.cpu_diag import CPUDiagnostic
+    from modules.disk_diag import DiskDiagnostic
+    from modules.net_diag import NetworkDiagnostic
+    from modules.ram_diag import RAMDiagnostic
+
+    cpu, ram, disk, net = CPUDiagnostic(), RAMDiagnostic(), DiskDiagnostic(), NetworkDiagnostic()
+    cpu.get_cpu_usage()  # prime psutil's interval counter
+
+    def collect() -> dict[str, float]:
+        return flatten_metrics(cpu.get_cpu_usage(), ram.get_ram_info(), disk.get_disk_io(), net.get_network_rates())
+
+    return collect
+
+
+def run_agent(addr: str) -> None:
+    """Run a headless agent for this machine until interrupted."""
+    agent = FleetAgent(addr, local_collector())
+    try:
+        asyncio.run(agent.run())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_aggregator(bind: str = "") -> None:
+    """Run the aggregator on *bind* (``"[host][:port]"``) until interrupted."""
+    host, port = parse_addr(bind, default_host=FLEET_LISTEN_HOST)
+
+    async def main() -> None:
+        aggregator = FleetAggregator()
+        await aggregator.start(host, port)
+        print(f"Fleet aggregator listening on {host}:{aggregator.port}")
+        await aggregator.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
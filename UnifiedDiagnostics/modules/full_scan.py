@@ -1,16 +1,81 @@
-"""Full system scan — runs Windows diagnostic commands (SFC, DISM, CHKDSK, etc.)."""
+"""Full system scan — runs Windows diagnostic commands (SFC, DISM, CHKDSK, etc.).
+
+Command-based checks are written as *step generators*: they yield the
+command line to run, receive its ``CompletedProcess``-style result and
+return ``(success, message)``.  The same check can then be driven with a
+blocking ``subprocess.run`` (``diag.run_sfc()``) or on the collection
+engine via ``asyncio.create_subprocess_exec`` (``await diag.run_async(diag.run_sfc)``).
+"""
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import ctypes
+import functools
 import os
 import subprocess
-from typing import Callable
+import threading
+from typing import Any, Callable, Generator
+
+from config import SCAN_COMMAND_TIMEOUT_SEC
+from modules.bench_results import ResultStore
+from modules.cpu_bench import CPUBenchmark, parse_mhz
+from modules.cpu_bench import summarize as summarize_cpu_benchmark
+from modules.cpu_diag import CPUDiagnostic
+from modules.disk_bench import DiskBenchmark
+from modules.disk_bench import summarize as summarize_disk_benchmark
+from modules.engine import run_command
+from modules.governor import ResourcePolicy, lower_current_thread, policy_for
+from modules.memtest import MemoryTest
+from modules.memtest import summarize as summarize_memory_test
+from modules.ram_diag import RAMDiagnostic
+
+# ``yield cmd`` → result with returncode/stdout/stderr → ``return (ok, msg)``
+CheckSteps = Generator[list[str], Any, tuple[bool, str]]
+
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _command_check(steps: Callable[[Any], CheckSteps]) -> Callable[[Any], tuple[bool, str]]:
+    """Turn a step generator into a blocking ``run_*`` method.
+
+    The generator stays reachable as ``method.steps`` for :meth:`FullScanDiagnostic.run_async`.
+    """
+    @functools.wraps(steps)
+    def run(self: FullScanDiagnostic) -> tuple[bool, str]:
+        gen = steps(self)
+        try:
+            cmd = next(gen)
+            while True:
+                result = subprocess.run(
+                    cmd, capture_output=True, text=True,
+                    creationflags=_NO_WINDOW, timeout=SCAN_COMMAND_TIMEOUT_SEC,
+                )
+                cmd = gen.send(result)
+        except StopIteration as done:
+            return done.value
+        except Exception as e:
+            return False, str(e)
+
+    run.steps = steps  # type: ignore[attr-defined]
+    return run
 
 
 class FullScanDiagnostic:
     """Executes a sequence of Windows system-health diagnostic commands."""
 
+    def __init__(self) -> None:
+        self.last_disk_benchmark: dict[str, Any] | None = None
+        self.last_memory_test: dict[str, Any] | None = None
+        self.last_cpu_benchmark: dict[str, Any] | None = None
+        # In-process checks each get a fresh thread, started by this launcher.  It is
+        # created here, on the constructing thread: a new thread inherits its creator's
+        # nice and I/O priority on Linux, and the engine's threads run lowered
+        # (MONITOR_THREAD_POLICY), so threads they start could never run at "normal".
+        self._launcher = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan-launcher")
+        self._launcher.submit(int).result()
+
     def is_admin(self) -> bool:
         """Return True if the current process has administrator privileges."""
         try:
@@ -58,85 +123,74 @@ class FullScanDiagnostic:
     # Individual checks — each returns ``(success, message)``
     # ------------------------------------------------------------------
 
-    def run_sfc(self) -> tuple[bool, str]:
+    @_command_check
+    def run_sfc(self) -> CheckSteps:
         """Run System File Checker (``sfc /scannow``)."""
         if not self.is_admin():
             return False, "Administrator privileges required."
 
-        try:
-            result = subprocess.run(
-                ['sfc', '/scannow'],
-                capture_output=True, text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            if result.returncode == 0:
-                if "Windows Resource Protection did not find any integrity violations" in result.stdout:
-                    return True, "No Integrity Violations"
-                if "successfully repaired" in result.stdout:
-                    return True, "Violations Found & Repaired"
-                return True, "Scan Complete"
-            output = result.stdout + (result.stderr or "")
-            return False, self._parse_friendly_error(output)
-        except Exception as e:
-            return False, str(e)
-
-    def run_dism(self) -> tuple[bool, str]:
+        result = yield ['sfc', '/scannow']
+        if result.returncode == 0:
+            if "Windows Resource Protection did not find any integrity violations" in result.stdout:
+                return True, "No Integrity Violations"
+            if "successfully repaired" in result.stdout:
+                return True, "Violations Found & Repaired"
+            return True, "Scan Complete"
+        output = result.stdout + (result.stderr or "")
+        return False, self._parse_friendly_error(output)
+
+    @_command_check
+    def run_dism(self) -> CheckSteps:
         """Run DISM RestoreHealth."""
         if not self.is_admin():
             return False, "Administrator privileges required."
 
-        try:
-            cmd = ['DISM', '/Online', '/Cleanup-Image', '/RestoreHealth']
-            result = subprocess.run(
-                cmd, capture_output=True, text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            if result.returncode == 0:
-                return True, "Restore Operation Successful"
-            output = result.stdout + (result.stderr or "")
-            return False, self._parse_friendly_error(output)
-        except Exception as e:
-            return False, str(e)
+        result = yield ['DISM', '/Online', '/Cleanup-Image', '/RestoreHealth']
+        if result.returncode == 0:
+            return True, "Restore Operation Successful"
+        output = result.stdout + (result.stderr or "")
+        return False, self._parse_friendly_error(output)
 
-    def run_chkdsk_scan(self) -> tuple[bool, str]:
+    @_command_check
+    def run_chkdsk_scan(self) -> CheckSteps:
         """Run CHKDSK in scan-only (online) mode."""
         if not self.is_admin():
             return False, "Administrator privileges required."
 
-        try:
-            result = subprocess.run(
-                ['chkdsk', 'C:', '/scan'],
-                capture_output=True, text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            if result.returncode == 0:
-                if "found no problems" in result.stdout:
-                    return True, "No Problems Found"
-                return True, "Scan Complete"
-            output = result.stdout + (result.stderr or "")
-            return False, self._parse_friendly_error(output)
-        except Exception as e:
-            return False, str(e)
+        result = yield ['chkdsk', 'C:', '/scan']
+        if result.returncode == 0:
+            if "found no problems" in result.stdout:
+                return True, "No Problems Found"
+            return True, "Scan Complete"
+        output = result.stdout + (result.stderr or "")
+        return False, self._parse_friendly_error(output)
 
-    def run_chkdsk_quick(self) -> tuple[bool, str]:
+    @_command_check
+    def run_chkdsk_quick(self) -> CheckSteps:
         """Run CHKDSK in quick/perf mode."""
         if not self.is_admin():
             return False, "Administrator privileges required."
 
+        result = yield ['chkdsk', 'C:', '/scan', '/perf']
+        if result.returncode == 0:
+            if "found no problems" in result.stdout:
+                return True, "No Problems Found"
+            return True, "Quick Scan Complete"
+        output = result.stdout + (result.stderr or "")
+        return False, self._parse_friendly_error(output)
+
+    def run_memory_test(self) -> tuple[bool, str]:
+        """Pattern-test part of the available RAM on every core, online (no reboot)."""
         try:
-            result = subprocess.run(
-                ['chkdsk', 'C:', '/scan', '/perf'],
-                capture_output=True, text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            if result.returncode == 0:
-                if "found no problems" in result.stdout:
-                    return True, "No Problems Found"
-                return True, "Quick Scan Complete"
-            output = result.stdout + (result.stderr or "")
-            return False, self._parse_friendly_error(output)
-        except Exception as e:
-            return False, str(e)
+            result = MemoryTest(RAMDiagnostic().available_bytes()).run()
+        except (MemoryError, OSError, ValueError, concurrent.futures.BrokenExecutor) as e:
+            return False, f"Memory test failed: {e}"
+        self.last_memory_test = result
+        for worker in result['per_worker']:
+            for s in worker['samples']:
+                print(f"[Memory Test] worker {worker['worker']} {s['pattern']} @+{s['offset']:#x}: "
+                      f"expected {s['expected']} got {s['actual']}")
+        return result['mismatches'] == 0, summarize_memory_test(result)
 
     def run_memory_diag(self) -> tuple[bool, str]:
         """Launch the Windows Memory Diagnostic scheduler (triggers reboot)."""
@@ -146,58 +200,112 @@ class FullScanDiagnostic:
         except Exception as e:
             return False, str(e)
 
-    def run_power_diag(self) -> tuple[bool, str]:
+    @_command_check
+    def run_power_diag(self) -> CheckSteps:
         """Run Power Efficiency Diagnostics and return the report path."""
         if not self.is_admin():
             return False, "Administrator privileges required."
 
-        try:
-            report_path = os.path.abspath("energy-report.html")
-            cmd = ['powercfg', '/energy', '/output', report_path, '/duration', '15']
-
-            if os.path.exists(report_path):
-                try:
-                    os.remove(report_path)
-                except OSError:
-                    pass
-
-            result = subprocess.run(
-                cmd, capture_output=True, text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            if result.returncode == 0:
-                return True, f"Report generated at {report_path}"
-            output = result.stdout + (result.stderr or "")
-            return False, self._parse_friendly_error(output)
-        except Exception as e:
-            return False, str(e)
+        report_path = os.path.abspath("energy-report.html")
+        cmd = ['powercfg', '/energy', '/output', report_path, '/duration', '15']
 
-    def run_battery_report(self) -> tuple[bool, str]:
+        if os.path.exists(report_path):
+            try:
+                os.remove(report_path)
+            except OSError:
+                pass
+
+        result = yield cmd
+        if result.returncode == 0:
+            return True, f"Report generated at {report_path}"
+        output = result.stdout + (result.stderr or "")
+        return False, self._parse_friendly_error(output)
+
+    @_command_check
+    def run_battery_report(self) -> CheckSteps:
         """Generate a battery report (laptops only)."""
         if not self.is_admin():
             return False, "Administrator privileges required."
 
+        report_path = os.path.abspath("battery-report.html")
+        cmd = ['powercfg', '/batteryreport', '/output', report_path]
+
+        if os.path.exists(report_path):
+            try:
+                os.remove(report_path)
+            except OSError:
+                pass
+
+        result = yield cmd
+        output = result.stdout + (result.stderr or "")
+
+        if result.returncode == 0:
+            return True, f"Report generated at {report_path}"
+        return False, self._parse_friendly_error(output)
+
+    def run_disk_benchmark(self) -> tuple[bool, str]:
+        """Measure sequential / random 4K throughput and latency; flag a slowdown versus the last run."""
+        bench = DiskBenchmark()
         try:
-            report_path = os.path.abspath("battery-report.html")
-            cmd = ['powercfg', '/batteryreport', '/output', report_path]
-
-            if os.path.exists(report_path):
-                try:
-                    os.remove(report_path)
-                except OSError:
-                    pass
-
-            result = subprocess.run(
-                cmd, capture_output=True, text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-            )
-            output = result.stdout + (result.stderr or "")
+            result = bench.run()
+        except OSError as e:
+            return False, f"Benchmark failed: {e}"
+        slower = self._compare_and_store(DiskBenchmark.results, result, "disk", directory=bench.directory)
+        self.last_disk_benchmark = result
+
+        if slower:
+            worst = min(slower, key=slower.get)
+            return False, f"Slower than last run: {worst} {slower[worst]:+.0f}%"
+        return True, summarize_disk_benchmark(result)
+
+    def run_cpu_benchmark(self) -> tuple[bool, str]:
+        """Score every logical CPU under full load; flag throttling, wrong results or a slowdown."""
+        info = CPUDiagnostic().get_cpu_info()
+        bench = CPUBenchmark(name=str(info.get('Name', "Unknown")), rated_mhz=parse_mhz(info.get('MaxClockSpeed')))
+        try:
+            result = bench.run()
+        except (OSError, RuntimeError, ValueError) as e:
+            return False, f"Benchmark failed: {e}"
+        slower = self._compare_and_store(
+            CPUBenchmark.results, result, "CPU", cpu=result['cpu'], workers=result['workers'],
+        )
+        self.last_cpu_benchmark = result
+
+        if result['errors']:
+            bad = [c['cpu'] for c in result['per_core'] if c['errors']]
+            return False, f"{result['errors']} wrong results on CPU {', '.join(map(str, bad))}"
+        if result['throttling']:
+            return False, f"Throttling: {result['throttling'][0]}"
+        if slower:
+            worst = min(slower, key=slower.get)
+            return False, f"Slower than last run: {worst} {slower[worst]:+.0f}%"
+        return True, summarize_cpu_benchmark(result)
 
-            if result.returncode == 0:
-                return True, f"Report generated at {report_path}"
-            return False, self._parse_friendly_error(output)
-        except Exception as e:
-            return False, str(e)
+    @staticmethod
+    def _compare_and_store(results: ResultStore, result: dict[str, Any], kind: str, **match: Any) -> dict[str, float]:
+        """Add *result*'s change versus the last *match*-ing stored run, store it and return its slowdowns."""
+        previous = results.load(**match)
+        result['change_pct'] = results.compare(result, previous[-1] if previous else None)
+        try:
+            results.save(result)
+        except OSError as e:
+            print(f"Error saving {kind} benchmark: {e}")
+        return results.regressions(result['change_pct'])
+
+    def latest_benchmarks(self) -> dict[str, dict[str, Any] | None]:
+        """Newest disk / memory / CPU benchmark result: this session's, else the last stored run.
+
+        The memory test is not stored, so it is only known once it ran this session.
+        """
+        disk = self.last_disk_benchmark
+        if disk is None:
+            stored = DiskBenchmark.results.load(directory=DiskBenchmark().directory)
+            disk = stored[-1] if stored else None
+        cpu = self.last_cpu_benchmark
+        if cpu is None:
+            stored = CPUBenchmark.results.load()
+            cpu = stored[-1] if stored else None
+        return {'disk': disk, 'memory': self.last_memory_test, 'cpu': cpu}
 
     def run_driver_verifier(self) -> tuple[bool, str]:
         """Launch the Driver Verifier GUI."""
@@ -207,19 +315,86 @@ class FullScanDiagnostic:
         except Exception as e:
             return False, str(e)
 
+    # ------------------------------------------------------------------
+    # Async driver (collection engine)
+    # ------------------------------------------------------------------
+
+    async def run_async(
+        self,
+        check: Callable[[], tuple[bool, str]],
+        timeout: float = SCAN_COMMAND_TIMEOUT_SEC,
+        policy: ResourcePolicy | None = None,
+    ) -> tuple[bool, str]:
+        """Run a check from :meth:`get_full_scan_list` without blocking the event loop.
+
+        Command checks run through ``asyncio.create_subprocess_exec`` (killed
+        on timeout or cancellation); in-process checks (benchmarks, launchers)
+        run on a thread of their own (:meth:`_run_in_own_thread`), so they
+        hold none of the engine's executor slots.  Either way *policy*, if
+        given, governs the work.
+        """
+        steps = getattr(check, "steps", None)
+        if steps is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._launcher, self._run_in_own_thread, check, policy,
+            )
+
+        run = run_command if policy is None else functools.partial(run_command, policy=policy)
+        gen = steps(self)
+        try:
+            cmd = next(gen)
+            while True:
+                cmd = gen.send(await run(cmd, timeout=timeout))
+        except StopIteration as done:
+            return done.value
+        except asyncio.TimeoutError:
+            return False, f"Timed out after {timeout:.0f}s"
+        except OSError as e:
+            return False, str(e)
+
+    @staticmethod
+    def _run_in_own_thread(check: Callable[[], tuple[bool, str]], policy: ResourcePolicy | None) -> tuple[bool, str]:
+        """Launcher thread: run *check* on a new thread under *policy* and wait for it.
+
+        The new thread inherits the launcher's (normal) priority and only
+        lowers itself as far as *policy* asks; threads and worker processes
+        the check starts inherit that in turn.
+        """
+        done: concurrent.futures.Future[tuple[bool, str]] = concurrent.futures.Future()
+
+        def run() -> None:
+            lower_current_thread(policy)
+            try:
+                done.set_result(check())
+            except Exception as e:
+                done.set_exception(e)
+
+        threading.Thread(target=run, name="scan-check", daemon=True).start()
+        return done.result()
+
     # ------------------------------------------------------------------
     # Scan list
     # ------------------------------------------------------------------
 
-    def get_full_scan_list(self) -> list[tuple[str, Callable[[], tuple[bool, str]], bool]]:
-        """Return an ordered list of ``(name, function, requires_reboot)`` tuples."""
-        return [
+    def get_full_scan_list(
+        self,
+    ) -> list[tuple[str, Callable[[], tuple[bool, str]], bool, ResourcePolicy]]:
+        """Return an ordered list of ``(name, function, requires_reboot, policy)`` tuples.
+
+        *policy* is the check's resource policy from ``SCAN_RESOURCE_POLICIES``
+        (low CPU / idle I/O priority by default).
+        """
+        checks = [
             ("System File Checker", self.run_sfc, False),
             ("DISM Image Repair", self.run_dism, False),
             ("Disk Check (Scan)", self.run_chkdsk_scan, False),
             ("Quick Disk Check", self.run_chkdsk_quick, False),
             ("Power Monitor", self.run_power_diag, False),
             ("Battery Health", self.run_battery_report, False),
+            ("Disk Benchmark", self.run_disk_benchmark, False),
+            ("CPU Benchmark", self.run_cpu_benchmark, False),
             ("Driver Verifier", self.run_driver_verifier, False),
+            ("Online Memory Test", self.run_memory_test, False),
             ("Memory Diagnostic", self.run_memory_diag, True),
         ]
+        return [(name, func, reboot, policy_for(name)) for name, func, reboot in checks]
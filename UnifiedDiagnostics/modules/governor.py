@@ -0,0 +1,232 @@
+"""Resource governor — keep scans and the monitor's own threads out of the way.
+
+SFC, DISM and CHKDSK happily take a full core and saturate the system disk;
+on a machine that is doing real work they should only get what is left
+over.  A :class:`ResourcePolicy` names the CPU and I/O priority level
+(``"idle"``, ``"low"`` or ``"normal"``), an optional CPU affinity and an
+optional I/O bandwidth cap, and this module applies it:
+
+* to a child process — Windows starts it directly in the right priority
+  class (:func:`creation_flags`); everything else (I/O priority, affinity,
+  POSIX nice) is set through ``psutil`` right after the spawn
+  (:func:`apply_to_process`);
+* to the calling thread (:func:`lower_current_thread`) — per-thread nice and
+  ``ioprio`` on Linux, ``SetThreadPriority`` / background mode on Windows;
+* as a bandwidth cap — :class:`IOThrottle` watches the child's I/O counters
+  and suspends it for as long as it ran ahead of ``io_limit_mbps``.
+
+Policies come from ``SCAN_RESOURCE_DEFAULT`` overlaid with the per-check
+entry in ``SCAN_RESOURCE_POLICIES`` (:func:`policy_for`).  Priority changes
+that the OS refuses (e.g. a non-admin asking for something it may not do)
+are reported and skipped; a scan never fails because of its policy.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+import psutil
+
+from config import IO_THROTTLE_INTERVAL_SEC, SCAN_RESOURCE_DEFAULT, SCAN_RESOURCE_POLICIES
+
+LEVELS = ("idle", "low", "normal")
+
+# POSIX nice values (only ever raised: lowering needs root)
+_NICE = {"idle": 19, "low": 10, "normal": 0}
+
+# Windows process priority classes (CreateProcess flags, also accepted by psutil nice())
+_WIN_PRIORITY_CLASS = {"idle": 0x00000040, "low": 0x00004000}
+# Windows thread priorities; background mode also drops the thread's I/O priority
+_WIN_THREAD_PRIORITY = {"idle": -15, "low": -1}
+_THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+# Linux I/O scheduling: (class, level)
+_LINUX_IOPRIO = {"idle": (psutil.IOPRIO_CLASS_IDLE, 0), "low": (psutil.IOPRIO_CLASS_BE, 7)} \
+    if hasattr(psutil, "IOPRIO_CLASS_IDLE") else {}
+# Windows I/O priority hints (psutil.IOPRIO_VERYLOW / IOPRIO_LOW)
+_WIN_IOPRIO = {"idle": getattr(psutil, "IOPRIO_VERYLOW", 0), "low": getattr(psutil, "IOPRIO_LOW", 1)}
+
+
+class ResourcePolicy:
+    """How much of the machine a scan (or thread) may use."""
+
+    __slots__ = ("cpu", "io", "affinity", "io_limit_mbps")
+
+    def __init__(
+        self,
+        cpu: str = "normal",
+        io: str = "normal",
+        affinity: list[int] | None = None,
+        io_limit_mbps: float | None = None,
+    ) -> None:
+        for what, level in (("cpu", cpu), ("io", io)):
+            if level not in LEVELS:
+                raise ValueError(f"{what} priority must be one of {LEVELS}, not {level!r}")
+        if io_limit_mbps is not None and io_limit_mbps <= 0:
+            raise ValueError("io_limit_mbps must be positive")
+        self.cpu = cpu
+        self.io = io
+        self.affinity = list(affinity) if affinity else None
+        self.io_limit_mbps = io_limit_mbps
+
+    @classmethod
+    def from_dict(cls, spec: dict[str, Any]) -> ResourcePolicy:
+        return cls(**{k: spec[k] for k in cls.__slots__ if k in spec})
+
+    @property
+    def is_default(self) -> bool:
+        """True if applying this policy would change nothing."""
+        return (self.cpu, self.io, self.affinity, self.io_limit_mbps) == ("normal", "normal", None, None)
+
+    def __repr__(self) -> str:
+        return (f"ResourcePolicy(cpu={self.cpu!r}, io={self.io!r}, affinity={self.affinity!r}, "
+                f"io_limit_mbps={self.io_limit_mbps!r})")
+
+
+def policy_for(name: str) -> ResourcePolicy:
+    """Policy for the Full Scan check *name*: the default overlaid with its own entry."""
+    return ResourcePolicy.from_dict({**SCAN_RESOURCE_DEFAULT, **SCAN_RESOURCE_POLICIES.get(name, {})})
+
+
+# ----------------------------------------------------------------------
+# Processes
+# ----------------------------------------------------------------------
+
+def creation_flags(policy: ResourcePolicy) -> int:
+    """``CreateProcess`` flags that start a child in the policy's priority class (0 elsewhere)."""
+    if os.name != "nt":
+        return 0
+    return _WIN_PRIORITY_CLASS.get(policy.cpu, 0)
+
+
+def apply_to_process(pid: int, policy: ResourcePolicy) -> list[str]:
+    """Set CPU / I/O priority and affinity of *pid*; return what was applied.
+
+    Settings the OS refuses are printed and skipped.
+    """
+    applied: list[str] = []
+    try:
+        proc = psutil.Process(pid)
+    except psutil.Error as e:
+        print(f"Error applying resource policy to {pid}: {e}")
+        return applied
+
+    def attempt(label: str, fn: Any, *args: Any) -> None:
+        try:
+            fn(*args)
+            applied.append(label)
+        except (psutil.Error, OSError, ValueError) as e:
+            print(f"Could not set {label} for {pid}: {e}")
+
+    if policy.cpu != "normal":
+        if os.name == "nt":
+            attempt(f"cpu={policy.cpu}", proc.nice, _WIN_PRIORITY_CLASS[policy.cpu])
+        else:
+            attempt(f"cpu={policy.cpu}", proc.nice, max(_NICE[policy.cpu], proc.nice()))
+    if policy.io != "normal" and hasattr(proc, "ionice"):
+        if os.name == "nt":
+            attempt(f"io={policy.io}", proc.ionice, _WIN_IOPRIO[policy.io])
+        elif policy.io in _LINUX_IOPRIO:
+            attempt(f"io={policy.io}", proc.ionice, *_LINUX_IOPRIO[policy.io])
+    if policy.affinity and hasattr(proc, "cpu_affinity"):
+        attempt(f"affinity={policy.affinity}", proc.cpu_affinity, policy.affinity)
+    return applied
+
+
+class IOThrottle:
+    """Caps a process's average disk bandwidth by suspending it when it runs ahead.
+
+    Every *interval* seconds the process's read+write byte counters are
+    compared with ``limit_mbps``; if it moved more than that allows, it is
+    suspended for the time the excess would have taken at the limit.
+    """
+
+    def __init__(self, pid: int, limit_mbps: float, interval: float = IO_THROTTLE_INTERVAL_SEC) -> None:
+        self.pid = pid
+        self.limit = limit_mbps * 1024 * 1024   # bytes per second
+        self.interval = interval
+        self.suspended_sec = 0.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _io_bytes(proc: psutil.Process) -> int:
+        io = proc.io_counters()
+        return io.read_bytes + io.write_bytes
+
+    def pause_for(self, moved_bytes: int, elapsed: float) -> float:
+        """Seconds to suspend after moving *moved_bytes* in *elapsed* seconds."""
+        return max(moved_bytes / self.limit - elapsed, 0.0)
+
+    def start(self) -> IOThrottle:
+        self._thread = threading.Thread(target=self._run, name=f"io-throttle-{self.pid}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2 + 1.0)
+
+    def _run(self) -> None:
+        try:
+            proc = psutil.Process(self.pid)
+            last_bytes, last_t = self._io_bytes(proc), time.monotonic()
+            while not self._stop_event.wait(self.interval):
+                now_bytes, now_t = self._io_bytes(proc), time.monotonic()
+                pause = self.pause_for(now_bytes - last_bytes, now_t - last_t)
+                if pause > 0:
+                    proc.suspend()
+                    try:
+                        self._stop_event.wait(pause)
+                    finally:
+                        proc.resume()
+                    self.suspended_sec += pause
+                last_bytes, last_t = self._io_bytes(proc), time.monotonic()
+        except psutil.NoSuchProcess:
+            pass   # the scan finished
+        except psutil.Error as e:
+            print(f"I/O throttle for {self.pid} stopped: {e}")
+
+
+# ----------------------------------------------------------------------
+# Threads
+# ----------------------------------------------------------------------
+
+def lower_current_thread(policy: ResourcePolicy | None) -> bool:
+    """Apply *policy*'s CPU / I/O priority and affinity to the calling thread.
+
+    Returns False where per-thread priorities are not supported (macOS) or
+    the policy asks for nothing.
+    """
+    if policy is None or policy.is_default:
+        return False
+    try:
+        if sys.platform.startswith("linux"):
+            tid = threading.get_native_id()
+            if policy.cpu != "normal":
+                # Linux threads are tasks: PRIO_PROCESS with a thread id renices just this thread
+                os.setpriority(os.PRIO_PROCESS, tid, max(_NICE[policy.cpu], os.getpriority(os.PRIO_PROCESS, tid)))
+            if policy.io in _LINUX_IOPRIO:
+                psutil.Process(tid).ionice(*_LINUX_IOPRIO[policy.io])
+            if policy.affinity:
+                os.sched_setaffinity(0, policy.affinity)   # 0 = calling thread
+            return True
+        if os.name == "nt":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            thread = kernel32.GetCurrentThread()
+            if policy.io == "idle":
+                kernel32.SetThreadPriority(thread, _THREAD_MODE_BACKGROUND_BEGIN)
+            elif policy.cpu != "normal":
+                kernel32.SetThreadPriority(thread, _WIN_THREAD_PRIORITY[policy.cpu])
+            if policy.affinity:
+                kernel32.SetThreadAffinityMask(thread, sum(1 << cpu for cpu in policy.affinity))
+            return True
+    except (OSError, psutil.Error) as e:
+        print(f"Could not lower thread priority: {e}")
+    return False
@@ -1,16 +1,45 @@
-"""GPU diagnostics — NVIDIA-SMI with WMI fallback."""
+"""GPU diagnostics — NVIDIA-SMI with a platform-backend fallback (WMI / DRM sysfs)."""
 
 from __future__ import annotations
 
+import asyncio
 import os
 import subprocess
 
-import pythoncom
-import wmi
+from config import GPU_COMMAND_TIMEOUT_SEC
+from modules.backends import HardwareBackend, get_backend
+from modules.engine import run_command
+
+NVIDIA_SMI_CMD: list[str] = [
+    'nvidia-smi',
+    '--query-gpu=gpu_uuid,name,utilization.gpu,memory.free,memory.used,memory.total,temperature.gpu',
+    '--format=csv,noheader,nounits',
+]
+
+
+def parse_nvidia_smi(output: str) -> list[dict[str, str]]:
+    """Parse ``nvidia-smi --format=csv,noheader,nounits`` output, one dict per GPU."""
+    gpus: list[dict[str, str]] = []
+    for line in output.strip().split('\n'):
+        vals = [x.strip() for x in line.split(',')]
+        if len(vals) >= 7:
+            gpus.append({
+                'DeviceID': vals[0],   # GPU UUID — stable identifier
+                'Name': vals[1],
+                'Load': f"{vals[2]}%",
+                'Free Memory': f"{vals[3]}MB",
+                'Used Memory': f"{vals[4]}MB",
+                'Total Memory': f"{vals[5]}MB",
+                'Temperature': f"{vals[6]} C",
+            })
+    return gpus
 
 
 class GPUDiagnostic:
-    """Gathers GPU information using nvidia-smi (preferred) or WMI."""
+    """Gathers GPU information using nvidia-smi (preferred) or the platform backend."""
+
+    def __init__(self, backend: HardwareBackend | None = None) -> None:
+        self.backend = backend or get_backend()
 
     def get_gpu_info(self) -> list[dict[str, str]]:
         """Return a list of dicts, one per GPU, with load/memory/temp data.
@@ -26,55 +55,43 @@ class GPUDiagnostic:
                 startupinfo = subprocess.STARTUPINFO()
                 startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
 
-            cmd = [
-                'nvidia-smi',
-                '--query-gpu=gpu_uuid,name,utilization.gpu,memory.free,memory.used,memory.total,temperature.gpu',
-                '--format=csv,noheader,nounits',
-            ]
-
-            output = subprocess.check_output(cmd, startupinfo=startupinfo, stderr=subprocess.DEVNULL)
-            lines = output.decode('utf-8').strip().split('\n')
-
-            for line in lines:
-                vals = [x.strip() for x in line.split(',')]
-                if len(vals) >= 7:
-                    gpus.append({
-                        'DeviceID': vals[0],   # GPU UUID — stable identifier
-                        'Name': vals[1],
-                        'Load': f"{vals[2]}%",
-                        'Free Memory': f"{vals[3]}MB",
-                        'Used Memory': f"{vals[4]}MB",
-                        'Total Memory': f"{vals[5]}MB",
-                        'Temperature': f"{vals[6]} C",
-                    })
+            output = subprocess.check_output(
+                NVIDIA_SMI_CMD, startupinfo=startupinfo, stderr=subprocess.DEVNULL,
+                timeout=GPU_COMMAND_TIMEOUT_SEC,
+            )
+            gpus = parse_nvidia_smi(output.decode('utf-8'))
         except (subprocess.CalledProcessError, FileNotFoundError):
             pass
         except Exception:
             pass
 
-        # 2. Fallback to WMI
+        # 2. Fallback to the platform backend (WMI on Windows, sysfs on Linux)
         if not gpus:
             try:
-                pythoncom.CoInitialize()
-                c = wmi.WMI()
-                for gpu in c.Win32_VideoController():
-                    ram_mb = "N/A"
-                    try:
-                        if gpu.AdapterRAM:
-                            ram_mb = f"{int(gpu.AdapterRAM) / (1024**2):.0f}MB"
-                    except Exception:
-                        pass
-
-                    gpus.append({
-                        'DeviceID': gpu.PNPDeviceID or gpu.DeviceID or gpu.Name,
-                        'Name': gpu.Name,
-                        'Load': "N/A (WMI)",
-                        'Free Memory': "N/A",
-                        'Used Memory': "N/A",
-                        'Total Memory': ram_mb,
-                        'Temperature': "N/A",
-                    })
+                gpus = self.backend.get_gpu_info()
             except Exception as e:
                 gpus.append({'Error': str(e)})
 
         return gpus
+
+    async def get_gpu_info_async(self) -> list[dict[str, str]]:
+        """Coroutine version of :meth:`get_gpu_info` for the collection engine.
+
+        nvidia-smi runs as an async subprocess (killed after
+        ``GPU_COMMAND_TIMEOUT_SEC``); the backend fallback runs on the
+        loop's default executor.
+        """
+        gpus: list[dict[str, str]] = []
+        try:
+            result = await run_command(NVIDIA_SMI_CMD, timeout=GPU_COMMAND_TIMEOUT_SEC)
+            if result.returncode == 0:
+                gpus = parse_nvidia_smi(result.stdout)
+        except (OSError, asyncio.TimeoutError):
+            pass
+
+        if not gpus:
+            try:
+                gpus = await asyncio.get_running_loop().run_in_executor(None, self.backend.get_gpu_info)
+            except Exception as e:
+                gpus = [{'Error': str(e)}]
+        return gpus
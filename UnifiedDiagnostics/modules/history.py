@@ -0,0 +1,220 @@
+"""In-memory numeric metric history.
+
+Collectors produce display strings; the history keeps the numbers behind
+them so trends, statistics and exports don't have to re-parse text.  Each
+metric key (``"cpu.usage"``, ``"disk.sda.read_mb_s"`` …) gets a fixed-size
+ring of ``(timestamp, value)`` pairs covering ``HISTORY_WINDOW_SEC``.
+
+Given a *persist_path*, the rings live in a memory-mapped file (see
+:mod:`modules.history_mmap`), cover ``HISTORY_PERSIST_WINDOW_SEC`` instead,
+and the previous window is back the moment the history is constructed.
+Keys that do not fit in the file keep the in-memory window.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+
+from typing import Any
+
+import numpy as np
+
+from config import (
+    HISTORY_PERSIST_BLOCK_ROWS,
+    HISTORY_PERSIST_MAX_KEYS,
+    HISTORY_PERSIST_WINDOW_SEC,
+    HISTORY_WINDOW_SEC,
+    UPDATE_INTERVAL_SEC,
+)
+from modules.history_mmap import MappedHistoryFile
+
+_NUMBER = re.compile(r"\s*-?\d+(?:\.\d+)?")
+
+
+# GPU display rows with a numeric value → metric name under ``gpu.<index>.``
+GPU_METRICS: dict[str, str] = {
+    'Load': "load_pct",
+    'Used Memory': "memory_used_mb",
+    'Temperature': "temperature_c",
+}
+
+
+def _leading_float(text: str) -> float | None:
+    """``"71 C"`` → 71.0, ``"N/A"`` → None."""
+    match = _NUMBER.match(text)
+    return float(match.group()) if match else None
+
+
+def flatten_metrics(
+    cpu_load: float,
+    ram: dict[str, Any],
+    disk_io: dict[str, dict[str, float]],
+    net_rates: dict[str, dict[str, float]],
+    per_core: list[float] | None = None,
+    gpus: list[dict[str, str]] | None = None,
+) -> dict[str, float]:
+    """Flatten the numeric part of one tick into ``{metric_key: value}``."""
+    values: dict[str, float] = {
+        "cpu.usage": float(cpu_load),
+        "ram.percent": float(ram['Percentage']),
+    }
+    for i, usage in enumerate(per_core or ()):
+        values[f"cpu.core{i}.usage"] = float(usage)
+    for disk, rates in disk_io.items():
+        for metric, value in rates.items():
+            values[f"disk.{disk}.{metric}"] = value
+    for nic, rates in net_rates.items():
+        for metric, value in rates.items():
+            values[f"net.{nic}.{metric}"] = value
+    for i, gpu in enumerate(gpus or ()):
+        for row, metric in GPU_METRICS.items():
+            value = _leading_float(str(gpu.get(row, "")))
+            if value is not None:
+                values[f"gpu.{i}.{metric}"] = value
+    return values
+
+
+class _Ring:
+    """Fixed-capacity ring buffer of timestamps and float values."""
+
+    __slots__ = ("ts", "values", "head", "size", "mapped")
+
+    def __init__(self, capacity: int, ts: np.ndarray | None = None, values: np.ndarray | None = None) -> None:
+        self.ts = np.zeros(capacity, dtype=np.float64) if ts is None else ts
+        self.values = np.zeros(capacity, dtype=np.float64) if values is None else values
+        self.head = 0
+        self.size = 0
+        # Mapped rings may hold zeroed (empty or dropped) samples, marked by ts == 0
+        self.mapped = ts is not None
+        if self.mapped:
+            filled = int(np.count_nonzero(self.ts))
+            if filled:
+                self.head = (int(np.argmax(self.ts)) + 1) % capacity
+                self.size = filled
+
+    def append(self, ts: float, value: float) -> None:
+        self.ts[self.head] = ts
+        self.values[self.head] = value
+        self.head = (self.head + 1) % len(self.ts)
+        self.size = min(self.size + 1, len(self.ts))
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return copies of ``(ts, values)`` in chronological order."""
+        if self.mapped:
+            order = np.r_[self.head:len(self.ts), 0:self.head]
+            ts, values = self.ts[order], self.values[order]
+            keep = ts > 0
+            return ts[keep], values[keep]
+        if self.size < len(self.ts):
+            return self.ts[:self.size].copy(), self.values[:self.size].copy()
+        order = np.r_[self.head:len(self.ts), 0:self.head]
+        return self.ts[order], self.values[order]
+
+
+class MetricHistory:
+    """Thread-safe store of recent numeric samples keyed by metric name."""
+
+    def __init__(self, capacity: int | None = None, persist_path: str | None = None) -> None:
+        # In-memory rings; file-backed ones get mapped_capacity
+        self.capacity = capacity or max(int(HISTORY_WINDOW_SEC / UPDATE_INTERVAL_SEC), 1)
+        self.mapped_capacity = capacity or max(int(HISTORY_PERSIST_WINDOW_SEC / UPDATE_INTERVAL_SEC), 1)
+        self._rings: dict[str, _Ring] = {}
+        self._lock = threading.Lock()
+        self._store: MappedHistoryFile | None = None
+
+        if persist_path:
+            store = MappedHistoryFile(
+                persist_path, self.mapped_capacity,
+                block_rows=HISTORY_PERSIST_BLOCK_ROWS, max_keys=HISTORY_PERSIST_MAX_KEYS,
+            )
+            try:
+                restored = store.open()
+            except (OSError, ValueError) as e:
+                print(f"Error opening persisted history, keeping it in memory only: {e}")
+            else:
+                self._store = store
+                for key, (ts, values) in restored.items():
+                    self._rings[key] = _Ring(self.mapped_capacity, ts, values)
+                if store.corrupt_blocks:
+                    print(f"Persisted history: dropped {store.corrupt_blocks} torn block(s)")
+
+    def _new_ring(self, key: str) -> _Ring:
+        """Create a ring for *key*, file-backed when a store is attached (lock held)."""
+        store = self._store
+        if store is None:
+            return _Ring(self.capacity)
+        if store.remap_needed():
+            store.grow()
+            for name, slot in store.slots.items():
+                self._rings[name].ts, self._rings[name].values = store.views(slot)
+        views = store.add_key(key)
+        return _Ring(self.mapped_capacity, *views) if views else _Ring(self.capacity)
+
+    def record(self, values: dict[str, float], ts: float | None = None) -> None:
+        """Append one sample per key in *values* (all sharing timestamp *ts*)."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            for key, value in values.items():
+                ring = self._rings.get(key)
+                if ring is None:
+                    ring = self._rings[key] = self._new_ring(key)
+                index = ring.head
+                ring.append(ts, float(value))
+                if ring.mapped:
+                    self._store.seal(key, index)
+
+    def close(self) -> None:
+        """Flush and unmap the persisted file (the history is empty afterwards)."""
+        with self._lock:
+            if self._store is not None:
+                self._rings.clear()
+                self._store.close()
+                self._store = None
+
+    def span(self) -> tuple[float, float] | None:
+        """``(first, last)`` timestamp over every metric, or None when empty."""
+        with self._lock:
+            filled = [ring.ts[ring.ts > 0] for ring in self._rings.values() if ring.size]
+        filled = [ts for ts in filled if ts.size]
+        if not filled:
+            return None
+        return min(float(ts.min()) for ts in filled), max(float(ts.max()) for ts in filled)
+
+    def keys(self, prefix: str = "") -> list[str]:
+        """Sorted metric keys, optionally restricted to *prefix*."""
+        with self._lock:
+            return sorted(k for k in self._rings if k.startswith(prefix))
+
+    def series(self, key: str, since: float | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(timestamps, values)`` for *key*, optionally from *since* on."""
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                return np.empty(0), np.empty(0)
+            ts, values = ring.arrays()
+        if since is not None:
+            start = int(np.searchsorted(ts, since))
+            ts, values = ts[start:], values[start:]
+        return ts, values
+
+    def latest(self, key: str) -> float | None:
+        """Most recent value of *key*, or None if never recorded."""
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None or ring.size == 0:
+                return None
+            return float(ring.values[ring.head - 1])
+
+    def summary(self, key: str, since: float | None = None) -> dict[str, float] | None:
+        """``min`` / ``mean`` / ``max`` / ``last`` over the retained window (or from *since* on)."""
+        _ts, values = self.series(key, since)
+        if values.size == 0:
+            return None
+        return {
+            'min': float(values.min()),
+            'mean': float(values.mean()),
+            'max': float(values.max()),
+            'last': float(values[-1]),
+        }
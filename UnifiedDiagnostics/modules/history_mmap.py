@@ -0,0 +1,215 @@
+"""Memory-mapped backing file for :class:`modules.history.MetricHistory`.
+
+With a :class:`MappedHistoryFile` attached, every metric's ring buffer
+*is* a pair of numpy views onto one file, so the history survives restarts
+without any save step: on launch the file is mapped and the previous
+window is available immediately — nothing is parsed or copied into Python
+objects.
+
+Layout (little-endian)::
+
+    header | key table (max_keys x 128 B) | slot 0 | slot 1 | ...      (4 KiB aligned)
+    slot = ts[capacity] float64 | values[capacity] float64 | crc[n_blocks] uint32
+
+Each ring is split into blocks of ``block_rows`` samples with a CRC32 over
+the block's timestamps and values, refreshed on every append.  A write torn
+by a crash leaves exactly one block per metric whose CRC does not match;
+that block is zeroed on the next open (timestamp 0 marks an empty sample)
+and the rest of the history is kept.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+MAGIC = b"MSRING\x00\x01"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIIII")   # magic, version, capacity, block_rows, max_keys, n_slots
+_ENTRY = struct.Struct("<H122sI")     # name_len, name, crc32(name)
+_PAGE = 4096
+_GROW_SLOTS = 16                      # file grows this many slots at a time
+
+
+def _align(n: int) -> int:
+    return -(-n // _PAGE) * _PAGE
+
+
+class MappedHistoryFile:
+    """Fixed-capacity, checksummed ring slots in one memory-mapped file."""
+
+    def __init__(self, path: str, capacity: int, block_rows: int = 256, max_keys: int = 1024) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.block_rows = max(min(block_rows, capacity), 1)
+        self.max_keys = max_keys
+        self.n_blocks = -(-capacity // self.block_rows)
+
+        self._table_at = _HEADER.size
+        self._data_at = _align(_HEADER.size + max_keys * _ENTRY.size)
+        self._slot_bytes = _align(capacity * 16 + self.n_blocks * 4)
+
+        self.slots: dict[str, int] = {}
+        self.corrupt_blocks = 0          # blocks dropped by the last open()
+        self._mm: mmap.mmap | None = None
+        self._n_slots = 0
+
+    # ------------------------------------------------------------------
+    # Open / grow / close
+    # ------------------------------------------------------------------
+
+    def open(self) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Map the file (creating or resetting it if incompatible).
+
+        Returns ``{key: (ts_view, values_view)}`` for every persisted metric,
+        with corrupt blocks already zeroed.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fresh = True
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                head = f.read(_HEADER.size)
+            if len(head) == _HEADER.size:
+                magic, version, capacity, block_rows, max_keys, n_slots = _HEADER.unpack(head)
+                fresh = (magic, version, capacity, block_rows, max_keys) != (
+                    MAGIC, VERSION, self.capacity, self.block_rows, self.max_keys,
+                )
+                if not fresh:
+                    self._n_slots = n_slots
+        if fresh:
+            self._n_slots = 0
+            with open(self.path, "wb") as f:
+                f.truncate(self._data_at)
+
+        self._map(self._data_at + self._n_slots * self._slot_bytes)
+        if fresh:
+            self._write_header()
+
+        views: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self.corrupt_blocks = 0
+        for slot in range(self._n_slots):
+            name = self._read_entry(slot)
+            if name is None:
+                continue
+            self.slots[name] = slot
+            self.corrupt_blocks += self._verify(slot)
+            views[name] = self.views(slot)
+        return views
+
+    def _map(self, size: int) -> None:
+        with open(self.path, "r+b") as f:
+            if os.path.getsize(self.path) < size:
+                f.truncate(size)
+            self._mm = mmap.mmap(f.fileno(), size)
+
+    def _write_header(self) -> None:
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.capacity, self.block_rows, self.max_keys, self._n_slots)
+
+    def remap_needed(self) -> bool:
+        """True if the next :meth:`add_key` has to grow (and remap) the file."""
+        return len(self.slots) >= self._n_slots and self._n_slots < self.max_keys
+
+    def grow(self) -> None:
+        """Extend the file by a batch of slots and remap it.
+
+        Existing views become invalid — callers must re-fetch them with
+        :meth:`views` (MetricHistory does this under its lock).
+        """
+        self._n_slots = min(self._n_slots + _GROW_SLOTS, self.max_keys)
+        old = self._mm
+        self._map(self._data_at + self._n_slots * self._slot_bytes)
+        self._write_header()
+        if old is not None:
+            try:
+                old.close()
+            except BufferError:
+                pass  # stale views still alive; the map is released with them
+
+    def flush(self) -> None:
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self) -> None:
+        if self._mm is not None:
+            try:
+                self._mm.flush()
+                self._mm.close()
+            except (BufferError, ValueError):
+                pass
+            self._mm = None
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    def _read_entry(self, slot: int) -> str | None:
+        name_len, raw, crc = _ENTRY.unpack_from(self._mm, self._table_at + slot * _ENTRY.size)
+        if not 0 < name_len <= len(raw):
+            return None
+        raw = raw[:name_len]
+        if zlib.crc32(raw) != crc:
+            return None
+        return raw.decode("utf-8", errors="replace")
+
+    def add_key(self, name: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Claim a slot for *name*; returns its views, or None if the file is full.
+
+        Call :meth:`grow` first when :meth:`remap_needed` says so.
+        """
+        raw = name.encode("utf-8")
+        slot = len(self.slots)
+        if slot >= self._n_slots or len(raw) > _ENTRY.size - 6:
+            return None
+        base = self._slot_at(slot)
+        self._mm[base:base + self._slot_bytes] = bytes(self._slot_bytes)   # reused slot after a reset
+        _ENTRY.pack_into(self._mm, self._table_at + slot * _ENTRY.size, len(raw), raw, zlib.crc32(raw))
+        self.slots[name] = slot
+        return self.views(slot)
+
+    def _slot_at(self, slot: int) -> int:
+        return self._data_at + slot * self._slot_bytes
+
+    def views(self, slot: int) -> tuple[np.ndarray, np.ndarray]:
+        base = self._slot_at(slot)
+        ts = np.frombuffer(self._mm, dtype="<f8", count=self.capacity, offset=base)
+        values = np.frombuffer(self._mm, dtype="<f8", count=self.capacity, offset=base + self.capacity * 8)
+        return ts, values
+
+    def _crcs(self, slot: int) -> np.ndarray:
+        return np.frombuffer(
+            self._mm, dtype="<u4", count=self.n_blocks, offset=self._slot_at(slot) + self.capacity * 16,
+        )
+
+    def _block_crc(self, ts: np.ndarray, values: np.ndarray, block: int) -> int:
+        lo, hi = block * self.block_rows, min((block + 1) * self.block_rows, self.capacity)
+        return zlib.crc32(values[lo:hi].tobytes(), zlib.crc32(ts[lo:hi].tobytes()))
+
+    def seal(self, name: str, index: int) -> None:
+        """Refresh the checksum of the block holding sample *index* of *name*."""
+        slot = self.slots.get(name)
+        if slot is None:
+            return
+        ts, values = self.views(slot)
+        block = index // self.block_rows
+        self._crcs(slot)[block] = self._block_crc(ts, values, block)
+
+    def _verify(self, slot: int) -> int:
+        """Zero every block whose checksum does not match; return how many."""
+        ts, values = self.views(slot)
+        crcs = self._crcs(slot)
+        bad = 0
+        for block in range(self.n_blocks):
+            lo, hi = block * self.block_rows, min((block + 1) * self.block_rows, self.capacity)
+            if not ts[lo:hi].any() and not values[lo:hi].any():
+                continue   # never written
+            if self._block_crc(ts, values, block) != crcs[block]:
+                ts[lo:hi] = 0.0
+                values[lo:hi] = 0.0
+                crcs[block] = self._block_crc(ts, values, block)
+                bad += 1
+        return bad
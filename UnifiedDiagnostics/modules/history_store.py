@@ -0,0 +1,426 @@
+"""Columnar binary segments for recorded metric snapshots.
+
+Text recordings of per-core data at 1 Hz grow to gigabytes per month.
+:class:`HistoryRecorder` buffers flat ``{metric_key: value}`` snapshots and
+writes them as immutable *segments* (``DATA_DIR/history/<t_first_ms>.seg``)
+of fixed-width typed columns:
+
+* ``CONST`` — every value identical: nothing stored but the value;
+* ``DELTA`` — values quantised to ``HISTORY_STORE_DECIMALS`` and stored as
+  deltas in the narrowest integer type that fits (int8 for a slowly moving
+  percentage);
+* ``XOR64`` — values that cannot be quantised (NaN gaps, huge counters) as
+  float64 bits XOR-ed with the previous value, narrowed to the smallest
+  unsigned type that holds every XOR (slowly changing floats share their
+  high bits).  Segments written before it used ``XOR`` on float32 bits,
+  which rounds counters above 2**24; those still decode.
+
+Each segment starts with a header and a per-column index (encoding, width,
+base value, byte offset, min/max).  :class:`SegmentReader` memory-maps a
+segment and decodes only the timestamp column plus the one metric asked
+for — every other column is never touched.
+
+Layout (little-endian)::
+
+    header   | column index (n_cols entries) | names | column payloads (8-aligned)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import IO, Any, Iterator
+
+import numpy as np
+
+from config import (
+    DATA_DIR,
+    HISTORY_RETENTION_DAYS,
+    HISTORY_SEGMENT_ROWS,
+    HISTORY_SEGMENT_SEC,
+    HISTORY_STORE_DECIMALS,
+)
+
+MAGIC = b"MSSEG\x00\x00\x01"
+VERSION = 1
+SUFFIX = ".seg"
+TS_COLUMN = "__ts__"   # timestamps in ms, always column 0
+
+_HEADER = struct.Struct("<8sHHIqqII")   # magic, version, reserved, n_rows, t_first, t_last, n_cols, names_len
+ENTRY_DTYPE = np.dtype([
+    ('name_off', '<u4'),
+    ('name_len', '<u2'),
+    ('encoding', 'u1'),
+    ('width', 'u1'),
+    ('decimals', 'u1'),
+    ('pad', 'V7'),
+    ('base', '<f8'),
+    ('offset', '<u8'),
+    ('nbytes', '<u8'),
+    ('min', '<f8'),
+    ('max', '<f8'),
+])
+
+ENC_CONST, ENC_DELTA, ENC_XOR, ENC_XOR64 = 0, 1, 2, 3
+
+_SIGNED = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}
+_UNSIGNED = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+# Quantised values must stay exactly representable as float64 integers
+_MAX_EXACT = 2.0 ** 53
+
+
+def _signed_width(lo: int, hi: int) -> int:
+    for width, dt in _SIGNED.items():
+        info = np.iinfo(dt)
+        if info.min <= lo and hi <= info.max:
+            return width
+    return 8
+
+
+def _unsigned_width(hi: int) -> int:
+    for width, dt in _UNSIGNED.items():
+        if hi <= np.iinfo(dt).max:
+            return width
+    return 8
+
+
+def encode_column(values: np.ndarray, decimals: int) -> tuple[int, int, float, bytes]:
+    """Encode float64 *values*; return ``(encoding, width, base, payload)``."""
+    if np.isfinite(values).all():
+        if (values == values[0]).all():
+            return ENC_CONST, 0, float(values[0]), b""
+        q = np.round(values * 10.0 ** decimals)
+        if np.abs(q).max() < _MAX_EXACT:
+            q = q.astype(np.int64)
+            deltas = np.diff(q, prepend=q[0])
+            width = _signed_width(int(deltas.min()), int(deltas.max()))
+            return ENC_DELTA, width, float(q[0]), deltas.astype(_SIGNED[width]).tobytes()
+
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    xor = np.empty_like(bits)
+    xor[0] = 0                      # first value lives in the index (base)
+    np.bitwise_xor(bits[1:], bits[:-1], out=xor[1:])
+    width = _unsigned_width(int(xor.max()))
+    return ENC_XOR64, width, float(values[0]), xor.astype(_UNSIGNED[width]).tobytes()
+
+
+def decode_column(entry: np.void, buf: Any, n_rows: int, stop: int | None = None) -> np.ndarray:
+    """Decode the first *stop* rows of a column described by index *entry*."""
+    stop = n_rows if stop is None else stop
+    encoding, width, base = int(entry['encoding']), int(entry['width']), float(entry['base'])
+    if encoding == ENC_CONST:
+        return np.full(stop, base)
+    offset = int(entry['offset'])
+    if encoding == ENC_DELTA:
+        deltas = np.frombuffer(buf, dtype=_SIGNED[width], count=stop, offset=offset)
+        q = np.cumsum(deltas, dtype=np.int64) + int(base)
+        return q / 10.0 ** int(entry['decimals'])
+    if encoding == ENC_XOR64:
+        xor = np.frombuffer(buf, dtype=_UNSIGNED[width], count=stop, offset=offset).astype(np.uint64)
+        if stop:
+            xor[0] = np.float64(base).view(np.uint64)
+        return np.bitwise_xor.accumulate(xor).view(np.float64)
+    if encoding == ENC_XOR:
+        xor = np.frombuffer(buf, dtype=_UNSIGNED[width], count=stop, offset=offset).astype(np.uint32)
+        if stop:
+            xor[0] = int(base)
+        return np.bitwise_xor.accumulate(xor).view(np.float32).astype(np.float64)
+    raise ValueError(f"unknown column encoding {encoding}")
+
+
+def write_segment(
+    path: str, ts: np.ndarray, columns: dict[str, np.ndarray], decimals: int = HISTORY_STORE_DECIMALS,
+) -> None:
+    """Write one segment atomically (temp file + rename).
+
+    *ts* is in seconds; each column must have ``len(ts)`` float values (NaN
+    where the metric was absent).
+    """
+    n_rows = len(ts)
+    ts_ms = np.round(np.asarray(ts, dtype=np.float64) * 1000.0)
+    named = {TS_COLUMN: (ts_ms, 0), **{k: (np.asarray(v, dtype=np.float64), decimals) for k, v in columns.items()}}
+
+    names = b""
+    entries = np.zeros(len(named), dtype=ENTRY_DTYPE)
+    payloads: list[bytes] = []
+    for i, (name, (values, dec)) in enumerate(named.items()):
+        raw = name.encode("utf-8")
+        encoding, width, base, payload = encode_column(values, dec)
+        finite = values[np.isfinite(values)]
+        e = entries[i]
+        e['name_off'], e['name_len'] = len(names), len(raw)
+        e['encoding'], e['width'], e['decimals'], e['base'] = encoding, width, dec, base
+        e['nbytes'] = len(payload)
+        e['min'] = finite.min() if finite.size else np.nan
+        e['max'] = finite.max() if finite.size else np.nan
+        names += raw
+        payloads.append(payload)
+
+    def pad(n: int) -> int:
+        return -n % 8
+
+    offset = _HEADER.size + entries.nbytes + len(names)
+    offset += pad(offset)
+    for e, payload in zip(entries, payloads):
+        e['offset'] = offset
+        offset += len(payload) + pad(len(payload))
+
+    header = _HEADER.pack(MAGIC, VERSION, 0, n_rows, int(ts_ms[0]), int(ts_ms[-1]), len(entries), len(names))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(entries.tobytes())
+        f.write(names)
+        f.write(b"\0" * pad(f.tell()))
+        for payload in payloads:
+            f.write(payload)
+            f.write(b"\0" * pad(len(payload)))
+    os.replace(tmp, path)
+
+
+class SegmentReader:
+    """Memory-mapped view of one segment; decodes columns on demand."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _r, self.n_rows, t_first, t_last, n_cols, names_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a history segment")
+        self.t_first, self.t_last = t_first / 1000.0, t_last / 1000.0
+        self._entries = np.frombuffer(self._mm, dtype=ENTRY_DTYPE, count=n_cols, offset=_HEADER.size)
+        names_at = _HEADER.size + self._entries.nbytes
+        names = self._mm[names_at:names_at + names_len]
+        self._index = {
+            names[e['name_off']:e['name_off'] + e['name_len']].decode("utf-8"): i
+            for i, e in enumerate(self._entries)
+        }
+        self._ts: np.ndarray | None = None
+
+    def __enter__(self) -> SegmentReader:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._entries = None  # release the buffer export before closing the map
+        self._ts = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # a caller still holds a view; the map closes when it is dropped
+
+    def metrics(self) -> list[str]:
+        return [name for name in self._index if name != TS_COLUMN]
+
+    def stats(self, metric: str) -> tuple[float, float] | None:
+        """``(min, max)`` of *metric* in this segment, read from the index only."""
+        i = self._index.get(metric)
+        return None if i is None else (float(self._entries[i]['min']), float(self._entries[i]['max']))
+
+    def timestamps(self) -> np.ndarray:
+        if self._ts is None:
+            ms = decode_column(self._entries[0], self._mm, self.n_rows)
+            self._ts = ms / 1000.0
+        return self._ts
+
+    def series(
+        self, metric: str, start: float | None = None, end: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(timestamps, values)`` of *metric* within ``[start, end]``.
+
+        Only the timestamp column and *metric*'s column (up to *end*) are decoded.
+        """
+        i = self._index.get(metric)
+        if i is None:
+            return np.empty(0), np.empty(0)
+        ts = self.timestamps()
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = self.n_rows if end is None else int(np.searchsorted(ts, end, side="right"))
+        if hi <= lo:
+            return np.empty(0), np.empty(0)
+        values = decode_column(self._entries[i], self._mm, self.n_rows, stop=hi)
+        keep = np.isfinite(values[lo:hi])
+        return ts[lo:hi][keep], values[lo:hi][keep]
+
+
+class HistoryRecorder:
+    """Buffers snapshots and persists them as segments; queries span all of them."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        segment_rows: int = HISTORY_SEGMENT_ROWS,
+        segment_sec: float = HISTORY_SEGMENT_SEC,
+        decimals: int = HISTORY_STORE_DECIMALS,
+        retention_days: float = HISTORY_RETENTION_DAYS,
+    ) -> None:
+        self.directory = directory or os.path.join(DATA_DIR, "history")
+        self.segment_rows = segment_rows
+        self.segment_sec = segment_sec
+        self.decimals = decimals
+        self.retention_days = retention_days
+        self._rows: list[tuple[float, dict[str, float]]] = []
+        self._spans: dict[str, tuple[float, float]] = {}   # path -> (t_first, t_last)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, values: dict[str, float], ts: float | None = None) -> None:
+        """Buffer one snapshot; writes a segment once the buffer is full or old enough."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self._rows.append((ts, dict(values)))
+            due = len(self._rows) >= self.segment_rows or ts - self._rows[0][0] >= self.segment_sec
+        if due:
+            self.flush()
+
+    def flush(self) -> str | None:
+        """Write buffered rows as a segment and apply retention; returns the path."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return None
+
+        keys = sorted({k for _ts, values in rows for k in values})
+        ts = np.fromiter((r[0] for r in rows), dtype=np.float64, count=len(rows))
+        columns = {
+            k: np.fromiter((values.get(k, np.nan) for _ts, values in rows), dtype=np.float64, count=len(rows))
+            for k in keys
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{int(round(ts[0] * 1000)):015d}{SUFFIX}")
+        write_segment(path, ts, columns, self.decimals)
+        self._spans[path] = (float(ts[0]), float(ts[-1]))
+        self._prune(float(ts[-1]))
+        return path
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.retention_days * 86400
+        for path, (_first, last) in list(self._segment_spans().items()):
+            if last < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._spans.pop(path, None)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _segment_spans(self) -> dict[str, tuple[float, float]]:
+        """``{path: (t_first, t_last)}`` for every segment, headers read once."""
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.endswith(SUFFIX))
+        except FileNotFoundError:
+            return {}
+        spans: dict[str, tuple[float, float]] = {}
+        for name in names:
+            path = os.path.join(self.directory, name)
+            span = self._spans.get(path)
+            if span is None:
+                try:
+                    with open(path, "rb") as f:
+                        head = _HEADER.unpack(f.read(_HEADER.size))
+                except (OSError, struct.error):
+                    continue
+                if head[0] != MAGIC:
+                    continue
+                span = self._spans[path] = (head[4] / 1000.0, head[5] / 1000.0)
+            spans[path] = span
+        return spans
+
+    def segments(self, start: float | None = None, end: float | None = None) -> list[str]:
+        """Paths of segments overlapping ``[start, end]``, oldest first."""
+        return [
+            path for path, (first, last) in self._segment_spans().items()
+            if (start is None or last >= start) and (end is None or first <= end)
+        ]
+
+    def metrics(self) -> list[str]:
+        names: set[str] = set()
+        for path in self.segments():
+            with SegmentReader(path) as seg:
+                names.update(seg.metrics())
+        with self._lock:
+            for _ts, values in self._rows:
+                names.update(values)
+        return sorted(names)
+
+    def query(
+        self, metric: str, start: float | None = None, end: float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """``(timestamps, values)`` of one metric across segments and the unflushed buffer."""
+        ts_parts: list[np.ndarray] = []
+        val_parts: list[np.ndarray] = []
+        for path in self.segments(start, end):
+            try:
+                with SegmentReader(path) as seg:
+                    ts, values = seg.series(metric, start, end)
+            except (OSError, ValueError) as e:
+                print(f"Error reading history segment {path}: {e}")
+                continue
+            ts_parts.append(ts)
+            val_parts.append(values)
+
+        with self._lock:
+            pending = [
+                (t, v[metric]) for t, v in self._rows
+                if metric in v and (start is None or t >= start) and (end is None or t <= end)
+            ]
+        if pending:
+            ts_parts.append(np.array([p[0] for p in pending]))
+            val_parts.append(np.array([p[1] for p in pending], dtype=np.float64))
+        if not ts_parts:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(ts_parts), np.concatenate(val_parts)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def _iter_series(
+        self, metrics: list[str] | None, start: float | None, end: float | None,
+    ) -> Iterator[tuple[str, np.ndarray, np.ndarray]]:
+        for metric in metrics or self.metrics():
+            ts, values = self.query(metric, start, end)
+            if ts.size:
+                yield metric, ts, values
+
+    def export_csv(
+        self, f: IO[str], metrics: list[str] | None = None,
+        start: float | None = None, end: float | None = None,
+    ) -> int:
+        """Write ``Timestamp,Metric,Value`` rows to *f*; returns the row count."""
+        writer = csv.writer(f)
+        writer.writerow(["Timestamp", "Metric", "Value"])
+        count = 0
+        for metric, ts, values in self._iter_series(metrics, start, end):
+            writer.writerows((f"{t:.3f}", metric, repr(float(v))) for t, v in zip(ts, values))
+            count += ts.size
+        return count
+
+    def export_json(
+        self, f: IO[str], metrics: list[str] | None = None,
+        start: float | None = None, end: float | None = None,
+    ) -> int:
+        """Write ``{metric: {"ts": [...], "values": [...]}}`` to *f*; returns the sample count."""
+        doc: dict[str, dict[str, list[float]]] = {}
+        count = 0
+        for metric, ts, values in self._iter_series(metrics, start, end):
+            doc[metric] = {"ts": ts.round(3).tolist(), "values": values.tolist()}
+            count += ts.size
+        json.dump(doc, f, separators=(",", ":"))
+        return count
@@ -0,0 +1,225 @@
+"""Online memory test — pattern write/verify across all cores, no reboot.
+
+``mdsched.exe`` is thorough but needs a reboot, so it never runs on a
+machine that is in use.  :class:`MemoryTest` instead allocates a fraction
+of the memory that :class:`~modules.ram_diag.RAMDiagnostic` reports as
+available, splits it across one worker process per core and has each
+worker repeatedly write and verify three patterns over its block:
+
+* ``walking_ones`` — word *i* holds ``1 << (i % 64)``, exercising every bit
+  line;
+* ``random`` — a seeded pseudo-random chunk XOR-ed with the word offset, so
+  neighbouring chunks differ and the pattern can be regenerated to verify;
+* ``address`` — every word holds its own offset (address-in-address), which
+  catches aliasing and addressing faults.
+
+Every other pass writes the complement, so each bit is checked both ways.
+Patterns are generated one chunk at a time (``MEMTEST_CHUNK_KB``) and all
+work is vectorised numpy, so a worker runs at memory bandwidth; each reports
+its write / verify bandwidth, passes completed and any mismatches (with the
+first few offsets).  Workers stop at the time budget, verifying whatever
+they had written.
+
+This is a stress test of the memory the OS hands out, not of every
+physical address — it complements, not replaces, ``mdsched`` / memtest86.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import multiprocessing
+import os
+import time
+from typing import Any
+
+import numpy as np
+
+from config import (
+    MEMTEST_BUDGET_SEC,
+    MEMTEST_CHUNK_KB,
+    MEMTEST_FRACTION,
+    MEMTEST_MAX_MB,
+    MEMTEST_WORKER_OVERHEAD_MB,
+    PROCESS_POOL_MAX_WORKERS,
+)
+
+PATTERNS = ("walking_ones", "random", "address")
+MAX_SAMPLES = 8   # mismatch offsets reported per worker
+
+
+class PatternFiller:
+    """Produces the expected words of a pattern for any chunk of a worker's block."""
+
+    def __init__(self, chunk_words: int, seed: int) -> None:
+        chunk_words -= chunk_words % 64   # keeps walking_ones periodic per chunk
+        self.chunk_words = max(chunk_words, 64)
+        idx = np.arange(self.chunk_words, dtype=np.uint64)
+        self._index = idx
+        self._walk = np.left_shift(np.uint64(1), idx % np.uint64(64))
+        self._random = np.random.default_rng(seed).integers(
+            0, np.iinfo(np.uint64).max, size=self.chunk_words, dtype=np.uint64, endpoint=True,
+        )
+        self._out = np.empty(self.chunk_words, dtype=np.uint64)
+
+    def expected(self, pattern: str, start: int, n: int, invert: bool) -> np.ndarray:
+        """Expected words ``[start, start + n)`` (a view into a scratch buffer)."""
+        out = self._out[:n]
+        if pattern == "walking_ones":
+            np.copyto(out, self._walk[:n])
+        elif pattern == "random":
+            np.bitwise_xor(self._random[:n], np.uint64(start), out=out)
+        elif pattern == "address":
+            np.add(self._index[:n], np.uint64(start), out=out)
+        else:
+            raise ValueError(f"unknown pattern {pattern!r}")
+        if invert:
+            np.invert(out, out=out)
+        return out
+
+
+def write_pattern(
+    buf: np.ndarray, filler: PatternFiller, pattern: str, invert: bool, deadline: float = float("inf"),
+) -> int:
+    """Fill *buf* with *pattern*; return the number of words written (less if *deadline* passed)."""
+    step = filler.chunk_words
+    for start in range(0, buf.size, step):
+        n = min(step, buf.size - start)
+        buf[start:start + n] = filler.expected(pattern, start, n, invert)
+        if time.monotonic() >= deadline:
+            return start + n
+    return buf.size
+
+
+def verify_pattern(
+    buf: np.ndarray, filler: PatternFiller, pattern: str, invert: bool, words: int,
+) -> tuple[int, list[tuple[int, int, int]]]:
+    """Compare the first *words* of *buf* with *pattern* → ``(mismatches, [(offset, expected, actual), ...])``."""
+    step = filler.chunk_words
+    diff = np.empty(step, dtype=bool)
+    mismatches = 0
+    samples: list[tuple[int, int, int]] = []
+    for start in range(0, words, step):
+        n = min(step, words - start)
+        expected = filler.expected(pattern, start, n, invert)
+        bad = np.not_equal(buf[start:start + n], expected, out=diff[:n])
+        count = int(np.count_nonzero(bad))
+        if count:
+            mismatches += count
+            for i in np.flatnonzero(bad)[:MAX_SAMPLES - len(samples)]:
+                samples.append((start + int(i), int(expected[i]), int(buf[start + i])))
+    return mismatches, samples
+
+
+def run_worker(worker: int, nbytes: int, budget_sec: float, chunk_kb: int = MEMTEST_CHUNK_KB) -> dict[str, Any]:
+    """One pool worker: allocate *nbytes*, cycle through the patterns until *budget_sec* is used."""
+    deadline = time.monotonic() + budget_sec
+    buf = np.empty(nbytes // 8, dtype=np.uint64)
+    filler = PatternFiller(chunk_kb * 1024 // 8, seed=worker)
+    written_bytes = read_bytes = 0
+    write_sec = read_sec = 0.0
+    mismatches = 0
+    samples: list[dict[str, Any]] = []
+    passes = 0
+
+    while time.monotonic() < deadline:
+        invert = passes % 2 == 1
+        for pattern in PATTERNS:
+            t0 = time.perf_counter()
+            words = write_pattern(buf, filler, pattern, invert, deadline)
+            t1 = time.perf_counter()
+            bad, where = verify_pattern(buf, filler, pattern, invert, words)
+            t2 = time.perf_counter()
+            written_bytes += words * 8
+            read_bytes += words * 8
+            write_sec += t1 - t0
+            read_sec += t2 - t1
+            mismatches += bad
+            samples.extend(
+                {'pattern': pattern, 'offset': off * 8, 'expected': f"{exp:016x}", 'actual': f"{act:016x}"}
+                for off, exp, act in where[:MAX_SAMPLES - len(samples)]
+            )
+            if words < buf.size:
+                break   # budget ran out mid-pattern
+        else:
+            passes += 1
+
+    return {
+        'worker': worker,
+        'pid': os.getpid(),
+        'mb': round(nbytes / 2**20),
+        'passes': passes,
+        'write_mbps': round(written_bytes / write_sec / 1e6, 1) if write_sec else 0.0,
+        'read_mbps': round(read_bytes / read_sec / 1e6, 1) if read_sec else 0.0,
+        'mismatches': mismatches,
+        'samples': samples,
+    }
+
+
+class MemoryTest:
+    """Plans and runs the per-core pattern test."""
+
+    def __init__(
+        self,
+        available_bytes: int,
+        fraction: float = MEMTEST_FRACTION,
+        workers: int | None = None,
+        budget_sec: float = MEMTEST_BUDGET_SEC,
+        max_mb: int = MEMTEST_MAX_MB,
+        chunk_kb: int = MEMTEST_CHUNK_KB,
+    ) -> None:
+        self.available_bytes = available_bytes
+        self.fraction = fraction
+        self.workers = workers or os.cpu_count() or 1
+        self.budget_sec = budget_sec
+        self.max_mb = max_mb
+        self.chunk_kb = chunk_kb
+
+    def plan(self) -> tuple[int, int]:
+        """``(workers, bytes_per_worker)`` within *fraction* of the available memory.
+
+        Each worker process also costs ``MEMTEST_WORKER_OVERHEAD_MB`` (an
+        interpreter plus numpy), which comes out of the same budget; if the
+        budget is small, fewer workers are used.  So are at most
+        ``PROCESS_POOL_MAX_WORKERS``, the most one process pool accepts.
+        """
+        budget = int(self.available_bytes * self.fraction)
+        if self.max_mb:
+            budget = min(budget, self.max_mb * 2**20)
+        overhead = MEMTEST_WORKER_OVERHEAD_MB * 2**20
+        chunk = self.chunk_kb * 1024
+        workers = min(self.workers, PROCESS_POOL_MAX_WORKERS or self.workers)
+        while workers > 1 and budget // workers - overhead < chunk:
+            workers -= 1
+        per_worker = budget // workers - overhead
+        per_worker -= per_worker % chunk
+        if per_worker < chunk:
+            raise MemoryError(f"only {self.available_bytes / 2**20:.0f} MB available — too little to test")
+        return workers, per_worker
+
+    def run(self) -> dict[str, Any]:
+        workers, per_worker = self.plan()
+        started = time.perf_counter()
+        ctx = multiprocessing.get_context("spawn")   # same on every OS; nothing large is inherited
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [pool.submit(run_worker, i, per_worker, self.budget_sec, self.chunk_kb) for i in range(workers)]
+            results = [f.result() for f in futures]
+
+        return {
+            'ts': time.time(),
+            'workers': workers,
+            'tested_mb': round(workers * per_worker / 2**20),
+            'patterns': list(PATTERNS),
+            'elapsed': round(time.perf_counter() - started, 2),
+            'write_mbps': round(sum(r['write_mbps'] for r in results), 1),
+            'read_mbps': round(sum(r['read_mbps'] for r in results), 1),
+            'mismatches': sum(r['mismatches'] for r in results),
+            'per_worker': results,
+        }
+
+
+def summarize(result: dict[str, Any]) -> str:
+    """One short line for the Full Scan status column."""
+    if result['mismatches']:
+        return f"{result['mismatches']} mismatches in {result['tested_mb'] / 1024:.1f} GB"
+    return (f"OK: {result['tested_mb'] / 1024:.1f} GB, {result['workers']} cores, "
+            f"{result['read_mbps'] / 1000:.1f} GB/s")
@@ -0,0 +1,157 @@
+"""Deadline-bounded ``disk_usage`` probing for mounts that may hang.
+
+``statvfs``/``GetDiskFreeSpaceEx`` on a stale NFS/SMB mount or an ejecting
+USB drive can block for minutes, and no Python API can interrupt a thread
+stuck in such a syscall.  :class:`MountProber` therefore runs each probe in
+its own daemon worker and only *waits* up to a shared deadline:
+
+* all mounts of a tick are probed in parallel, so one tick waits at most
+  ``timeout`` seconds no matter how many mounts hang;
+* a mount whose previous worker is still stuck is not probed again (at most
+  one stranded thread per mount);
+* a mount that keeps timing out is quarantined and retried with
+  exponential backoff.
+
+Timed-out and quarantined mounts are reported as unresponsive instead of
+being dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+import psutil
+
+from config import (
+    DISK_PROBE_BACKOFF_MAX_SEC,
+    DISK_PROBE_BACKOFF_SEC,
+    DISK_PROBE_QUARANTINE_AFTER,
+    DISK_PROBE_TIMEOUT_SEC,
+)
+
+
+class Unresponsive:
+    """Probe outcome for a mount that did not answer before the deadline."""
+
+    __slots__ = ("retry_in",)
+
+    def __init__(self, retry_in: float = 0.0) -> None:
+        self.retry_in = retry_in
+
+    def __repr__(self) -> str:
+        return f"Unresponsive(retry_in={self.retry_in:.0f})"
+
+
+class _Probe:
+    """One in-flight ``usage_fn`` call on a worker thread."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _MountState:
+    __slots__ = ("probe", "failures", "retry_at")
+
+    def __init__(self) -> None:
+        self.probe: _Probe | None = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+class MountProber:
+    """Runs ``disk_usage``-style probes with a deadline, quarantine and backoff."""
+
+    def __init__(
+        self,
+        usage_fn: Callable[[str], Any] | None = None,
+        timeout: float = DISK_PROBE_TIMEOUT_SEC,
+        quarantine_after: int = DISK_PROBE_QUARANTINE_AFTER,
+        backoff: float = DISK_PROBE_BACKOFF_SEC,
+        backoff_max: float = DISK_PROBE_BACKOFF_MAX_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        # Resolve psutil.disk_usage at call time so tests can patch it
+        self._usage_fn = usage_fn or (lambda mp: psutil.disk_usage(mp))
+        self.timeout = timeout
+        self.quarantine_after = quarantine_after
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._states: dict[str, _MountState] = {}
+
+    def _start(self, mountpoint: str) -> _Probe:
+        probe = _Probe()
+
+        def work() -> None:
+            try:
+                probe.result = self._usage_fn(mountpoint)
+            except BaseException as e:  # handed back to the caller
+                probe.error = e
+            finally:
+                probe.done.set()
+
+        threading.Thread(target=work, name=f"probe:{mountpoint}", daemon=True).start()
+        return probe
+
+    def _on_timeout(self, state: _MountState, now: float) -> Unresponsive:
+        state.failures += 1
+        if state.failures >= self.quarantine_after:
+            exponent = state.failures - self.quarantine_after
+            delay = min(self.backoff * (2 ** exponent), self.backoff_max)
+            state.retry_at = now + delay
+        return Unresponsive(max(state.retry_at - now, 0.0))
+
+    @staticmethod
+    def _finish(state: _MountState, probe: _Probe) -> Any:
+        """Consume a completed probe and clear the mount's failure record."""
+        state.probe = None
+        state.failures = 0
+        state.retry_at = 0.0
+        return probe.error if probe.error is not None else probe.result
+
+    def probe_many(self, mountpoints: list[str]) -> dict[str, Any]:
+        """Probe *mountpoints* in parallel within one shared deadline.
+
+        Returns ``{mountpoint: outcome}`` where outcome is the ``usage_fn``
+        result, the exception it raised, or an :class:`Unresponsive`.
+        """
+        now = self._clock()
+        outcomes: dict[str, Any] = {}
+        waiting: dict[str, tuple[_MountState, _Probe]] = {}
+
+        for mp in mountpoints:
+            state = self._states.setdefault(mp, _MountState())
+            if state.probe is not None and state.probe.done.is_set():
+                # A worker that was stuck earlier has finished in the meantime
+                outcomes[mp] = self._finish(state, state.probe)
+                continue
+            if state.failures >= self.quarantine_after and now < state.retry_at:
+                outcomes[mp] = Unresponsive(state.retry_at - now)
+                continue
+            if state.probe is None:
+                state.probe = self._start(mp)
+            # else: the previous worker is still stuck; wait on it, never stack another
+            waiting[mp] = (state, state.probe)
+
+        deadline = time.monotonic() + self.timeout
+        for mp, (state, probe) in waiting.items():
+            if probe.done.wait(max(deadline - time.monotonic(), 0.0)):
+                outcomes[mp] = self._finish(state, probe)
+            else:
+                outcomes[mp] = self._on_timeout(state, now)
+
+        # Forget mounts that are gone (their stuck worker, if any, is abandoned)
+        for mp in [mp for mp in self._states if mp not in outcomes]:
+            del self._states[mp]
+        return outcomes
+
+    def is_quarantined(self, mountpoint: str) -> bool:
+        """True if *mountpoint* is currently being backed off."""
+        state = self._states.get(mountpoint)
+        return state is not None and state.failures >= self.quarantine_after
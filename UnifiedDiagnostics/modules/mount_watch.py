@@ -0,0 +1,93 @@
+"""Cheap "has the mount table changed?" signals for partition caching.
+
+Enumerating partitions every tick is wasteful on hosts with hundreds of
+bind and container mounts, because the list almost never changes.  A
+watcher answers :meth:`MountWatcher.changed` without re-reading the table:
+
+* Linux — ``/proc/self/mountinfo`` raises ``POLLPRI`` whenever the mount
+  namespace changes; a zero-timeout ``poll()`` costs one syscall.
+* Windows — the ``GetLogicalDrives()`` bitmask changes whenever a volume
+  letter appears or disappears.
+* Elsewhere (and as a safety net for Windows folder mounts) — a TTL.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import sys
+import time
+from typing import Callable
+
+from config import MOUNT_RESCAN_TTL_SEC
+
+
+class MountWatcher:
+    """TTL-based fallback: report a change every *ttl* seconds."""
+
+    def __init__(self, ttl: float = MOUNT_RESCAN_TTL_SEC, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._last = clock()
+
+    def changed(self) -> bool:
+        """Return True if the partition list should be re-enumerated."""
+        now = self._clock()
+        if now - self._last >= self.ttl:
+            self._last = now
+            return True
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class LinuxMountWatcher(MountWatcher):
+    """Polls ``/proc/self/mountinfo`` for ``POLLPRI`` (no TTL needed)."""
+
+    def __init__(self, path: str = "/proc/self/mountinfo") -> None:
+        super().__init__(ttl=float("inf"))
+        self._fd = os.open(path, os.O_RDONLY)
+        self._poller = select.poll()
+        self._poller.register(self._fd, select.POLLPRI | select.POLLERR)
+
+    def changed(self) -> bool:
+        # The kernel re-arms the event inside poll() itself, so each mount
+        # change is reported exactly once.
+        return any(ev & (select.POLLPRI | select.POLLERR) for _fd, ev in self._poller.poll(0))
+
+    def close(self) -> None:
+        self._poller.unregister(self._fd)
+        os.close(self._fd)
+
+
+class WindowsMountWatcher(MountWatcher):
+    """Watches the ``GetLogicalDrives()`` bitmask, with the TTL as a backstop."""
+
+    def __init__(self, ttl: float = MOUNT_RESCAN_TTL_SEC, drives_fn: Callable[[], int] | None = None) -> None:
+        super().__init__(ttl=ttl)
+        if drives_fn is None:
+            import ctypes
+            drives_fn = ctypes.windll.kernel32.GetLogicalDrives
+        self._drives_fn = drives_fn
+        self._mask = drives_fn()
+
+    def changed(self) -> bool:
+        mask = self._drives_fn()
+        if mask != self._mask:
+            self._mask = mask
+            self._last = self._clock()
+            return True
+        return super().changed()
+
+
+def create_mount_watcher() -> MountWatcher:
+    """Return the cheapest watcher available on this platform."""
+    try:
+        if sys.platform.startswith("linux") and hasattr(select, "poll"):
+            return LinuxMountWatcher()
+        if sys.platform == "win32":
+            return WindowsMountWatcher()
+    except (OSError, AttributeError):
+        pass
+    return MountWatcher()
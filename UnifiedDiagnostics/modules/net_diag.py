@@ -0,0 +1,106 @@
+"""Network diagnostics — per-NIC throughput, packet, error and drop rates via psutil.
+
+Rates come from deltas of ``psutil.net_io_counters(pernic=True)``; link
+state and speed from ``psutil.net_if_stats()``.  Counter wraparound and
+interfaces appearing/disappearing are handled the same way as disk I/O
+(see :mod:`modules.disk_io`).
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+import psutil
+
+from modules.disk_io import counter_delta
+
+# Counter field -> per-second metric name
+_RATE_FIELDS: dict[str, str] = {
+    "bytes_recv": "rx_bytes_s",
+    "bytes_sent": "tx_bytes_s",
+    "packets_recv": "rx_pkts_s",
+    "packets_sent": "tx_pkts_s",
+    "errin": "rx_errors_s",
+    "errout": "tx_errors_s",
+    "dropin": "rx_drops_s",
+    "dropout": "tx_drops_s",
+}
+
+
+class NetworkDiagnostic:
+    """Gathers per-interface network throughput and error rates."""
+
+    def __init__(
+        self,
+        counters_fn: Callable[[], dict[str, Any]] | None = None,
+        stats_fn: Callable[[], dict[str, Any]] = psutil.net_if_stats,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._counters_fn = counters_fn or (lambda: psutil.net_io_counters(pernic=True, nowrap=False))
+        self._stats_fn = stats_fn
+        self._clock = clock
+        self._prev: dict[str, dict[str, int]] = {}
+        self._prev_ts: float | None = None
+        self._last_stats: dict[str, Any] = {}
+
+    def get_network_rates(self) -> dict[str, dict[str, float]]:
+        """Return ``{nic: {metric: value}}`` for the interval since the last call.
+
+        Metrics are the ``_RATE_FIELDS`` values plus ``util_pct`` (busier
+        direction vs. link speed) when the link speed is known.
+        """
+        now = self._clock()
+        cur = {
+            nic: {f: getattr(c, f) for f in _RATE_FIELDS}
+            for nic, c in self._counters_fn().items()
+        }
+        try:
+            stats = self._stats_fn()
+        except Exception:
+            stats = {}
+
+        rates: dict[str, dict[str, float]] = {}
+        dt = now - self._prev_ts if self._prev_ts is not None else 0.0
+        if dt > 0:
+            for nic, counters in cur.items():
+                prev = self._prev.get(nic)
+                if prev is None:
+                    continue  # new interface: baseline only
+                nic_rates = {
+                    _RATE_FIELDS[f]: counter_delta(prev[f], counters[f]) / dt
+                    for f in _RATE_FIELDS
+                }
+                speed_mbps = getattr(stats.get(nic), "speed", 0) or 0
+                if speed_mbps > 0:
+                    busiest = max(nic_rates["rx_bytes_s"], nic_rates["tx_bytes_s"])
+                    nic_rates["util_pct"] = min(busiest * 8 / (speed_mbps * 1e6) * 100.0, 100.0)
+                rates[nic] = nic_rates
+
+        self._prev = cur
+        self._prev_ts = now
+        self._last_stats = stats
+        return rates
+
+    def get_interface_info(self, rates: dict[str, dict[str, float]]) -> list[dict[str, str]]:
+        """Render *rates* (plus link state) as one display dict per interface.
+
+        Each dict carries a stable ``Interface`` key for widget caching.
+        """
+        stats = self._last_stats
+        info: list[dict[str, str]] = []
+        for nic in sorted(rates):
+            r = rates[nic]
+            st = stats.get(nic)
+            speed = getattr(st, "speed", 0) or 0
+            info.append({
+                'Interface': nic,
+                'Status': ("Up" if st.isup else "Down") if st is not None else "Unknown",
+                'Link Speed': f"{speed} Mb/s" if speed else "N/A",
+                'RX': f"{r['rx_bytes_s'] / (1024 ** 2):.2f} MB/s ({r['rx_pkts_s']:.0f} pkt/s)",
+                'TX': f"{r['tx_bytes_s'] / (1024 ** 2):.2f} MB/s ({r['tx_pkts_s']:.0f} pkt/s)",
+                'Errors (in/out)': f"{r['rx_errors_s']:.1f} / {r['tx_errors_s']:.1f} per s",
+                'Drops (in/out)': f"{r['rx_drops_s']:.1f} / {r['tx_drops_s']:.1f} per s",
+                'Utilisation': f"{r['util_pct']:.1f}%" if 'util_pct' in r else "N/A",
+            })
+        return info
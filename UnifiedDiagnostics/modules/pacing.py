@@ -0,0 +1,149 @@
+"""Adaptive poll interval for the live tick.
+
+Nobody needs a 2-second refresh of a minimized window, and on a host whose
+CPUs are already saturated the monitor should not add to the load.
+:class:`AdaptivePacer` turns a handful of signals into the interval the
+collection engine waits between ticks:
+
+* presence — the window is iconified, unfocused, or nobody has touched it
+  for ``POLL_IDLE_AFTER_SEC``;
+* system load — overall CPU above ``POLL_BUSY_CPU_PCT``;
+* self-overhead — the process's own CPU time (all threads: collectors,
+  sampler, Tk painting) as a share of one core, held under
+  ``POLL_OVERHEAD_CEILING_PCT`` by stretching the interval in proportion.
+
+Each factor multiplies the base ``UPDATE_INTERVAL_SEC``; the result is
+capped at ``POLL_MAX_INTERVAL_SEC``.  Any interaction drops the presence
+factors at once, and :meth:`AdaptivePacer.touch` reports when that shortened
+the interval so the caller can wake the engine instead of waiting out the
+long sleep.
+
+The Tk thread calls the ``set_*`` / :meth:`touch` methods, the engine
+thread calls :meth:`observe` and :meth:`interval`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from config import (
+    POLL_BUSY_CPU_PCT,
+    POLL_BUSY_FACTOR,
+    POLL_HIDDEN_FACTOR,
+    POLL_IDLE_AFTER_SEC,
+    POLL_IDLE_FACTOR,
+    POLL_MAX_INTERVAL_SEC,
+    POLL_OVERHEAD_CEILING_PCT,
+    POLL_UNFOCUSED_FACTOR,
+    UPDATE_INTERVAL_SEC,
+)
+
+_SMOOTHING = 0.3   # EWMA weight of the newest self-overhead measurement
+
+
+class AdaptivePacer:
+    """Computes the live-tick interval from window state, idleness and CPU load."""
+
+    def __init__(
+        self,
+        base_interval: float = UPDATE_INTERVAL_SEC,
+        max_interval: float = POLL_MAX_INTERVAL_SEC,
+        overhead_ceiling_pct: float = POLL_OVERHEAD_CEILING_PCT,
+        clock: Callable[[], float] = time.monotonic,
+        cpu_clock: Callable[[], float] = time.process_time,
+    ) -> None:
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.overhead_ceiling_pct = overhead_ceiling_pct
+        self._clock = clock
+        self._cpu_clock = cpu_clock
+        self._lock = threading.Lock()
+
+        self.visible = True
+        self.focused = True
+        self._last_touch = clock()
+        self.busy = False
+        self.overhead_pct = 0.0          # smoothed own CPU, % of one core
+        self._overhead_scale = 1.0
+        self._last_sample: tuple[float, float] | None = None
+
+    # ------------------------------------------------------------------
+    # Signals
+    # ------------------------------------------------------------------
+
+    def set_visible(self, visible: bool) -> bool:
+        """Window mapped / iconified; returns True if the interval got shorter."""
+        return self._update(lambda: setattr(self, "visible", visible))
+
+    def set_focused(self, focused: bool) -> bool:
+        """Window gained / lost focus; returns True if the interval got shorter."""
+        return self._update(lambda: setattr(self, "focused", focused))
+
+    def touch(self) -> bool:
+        """User interaction; returns True if that ended a presence back-off."""
+        return self._update(lambda: setattr(self, "_last_touch", self._clock()))
+
+    def _update(self, change: Callable[[], None]) -> bool:
+        with self._lock:
+            before = self._presence_factor()
+            change()
+            return self._presence_factor() < before
+
+    def observe(self, system_cpu_pct: float) -> None:
+        """Feed one tick's overall CPU load and account the process's own CPU since the last call."""
+        now, cpu = self._clock(), self._cpu_clock()
+        with self._lock:
+            self.busy = system_cpu_pct >= POLL_BUSY_CPU_PCT
+            if self._last_sample is not None:
+                wall = now - self._last_sample[0]
+                if wall > 0:
+                    pct = (cpu - self._last_sample[1]) / wall * 100.0
+                    self.overhead_pct += _SMOOTHING * (pct - self.overhead_pct)
+                    if self.overhead_ceiling_pct > 0:
+                        # Tick cost is roughly fixed, so overhead scales with 1/interval:
+                        # stretch (or relax) the interval by the ratio to the ceiling
+                        scale = self._overhead_scale * self.overhead_pct / self.overhead_ceiling_pct
+                        self._overhead_scale = min(max(scale, 1.0), self.max_interval / self.base_interval)
+            self._last_sample = (now, cpu)
+
+    # ------------------------------------------------------------------
+    # Result
+    # ------------------------------------------------------------------
+
+    def _presence_factor(self) -> float:
+        if not self.visible:
+            return POLL_HIDDEN_FACTOR
+        factor = 1.0 if self.focused else POLL_UNFOCUSED_FACTOR
+        if self._clock() - self._last_touch >= POLL_IDLE_AFTER_SEC:
+            factor *= POLL_IDLE_FACTOR
+        return factor
+
+    def interval(self) -> float:
+        """Seconds to wait between ticks right now."""
+        with self._lock:
+            factor = self._presence_factor() * self._overhead_scale
+            if self.busy:
+                factor *= POLL_BUSY_FACTOR
+        return min(self.base_interval * factor, self.max_interval)
+
+    def describe(self) -> str:
+        """Short human-readable reason for the current rate (Dashboard readout)."""
+        reasons = []
+        with self._lock:
+            if not self.visible:
+                reasons.append("minimized")
+            else:
+                if not self.focused:
+                    reasons.append("unfocused")
+                if self._clock() - self._last_touch >= POLL_IDLE_AFTER_SEC:
+                    reasons.append("idle")
+            if self.busy:
+                reasons.append("system busy")
+            if self._overhead_scale > 1.0:
+                reasons.append(f"own CPU {self.overhead_pct:.1f}% > {self.overhead_ceiling_pct:g}%")
+        interval = self.interval()
+        if not reasons:
+            return f"Polling every {interval:g}s (full rate)"
+        return f"Polling every {interval:.1f}s ({', '.join(reasons)})"
@@ -0,0 +1,173 @@
+"""Process diagnostics — top-N processes by CPU, memory or I/O via psutil.
+
+Rebuilding a full process table every tick is what makes task managers
+expensive on busy hosts.  :class:`ProcessDiagnostic` instead keeps one
+``psutil.Process`` per live ``(pid, create_time)`` across ticks, refreshes
+only the attribute being ranked (inside ``oneshot()``), and picks the
+winners with a heap.  Names and the secondary columns are fetched for the
+top N rows only.
+"""
+
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Any, Callable
+
+import psutil
+
+from config import PROCESS_TOP_N
+
+# Sort key -> human label (also the order of the UI selector)
+SORT_KEYS: dict[str, str] = {
+    "cpu": "CPU",
+    "rss": "Memory",
+    "io": "I/O",
+}
+
+
+class _Entry:
+    """Cached state for one live process."""
+
+    __slots__ = ("proc", "key", "name", "cpu", "rss", "io_bytes", "io_rate", "io_ts")
+
+    def __init__(self, proc: Any, key: tuple[int, float]) -> None:
+        self.proc = proc
+        self.key = key
+        self.name: str | None = None
+        self.cpu = 0.0
+        self.rss = 0
+        self.io_bytes: int | None = None
+        self.io_rate = 0.0
+        self.io_ts = 0.0
+
+
+class ProcessDiagnostic:
+    """Incremental process table that reports the heaviest N processes."""
+
+    def __init__(
+        self,
+        top_n: int = PROCESS_TOP_N,
+        pids_fn: Callable[[], list[int]] = psutil.pids,
+        process_factory: Callable[[int], Any] = psutil.Process,
+    ) -> None:
+        self.top_n = top_n
+        self._pids_fn = pids_fn
+        self._process_factory = process_factory
+        self._entries: dict[tuple[int, float], _Entry] = {}
+        self._key_by_pid: dict[int, tuple[int, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Cache maintenance
+    # ------------------------------------------------------------------
+
+    def _sync_pids(self) -> None:
+        """Add new pids, evict exited ones; existing Process objects are reused."""
+        live = set(self._pids_fn())
+
+        for pid in list(self._key_by_pid):
+            if pid not in live:
+                self._entries.pop(self._key_by_pid.pop(pid), None)
+
+        for pid in live:
+            if pid in self._key_by_pid:
+                continue
+            try:
+                proc = self._process_factory(pid)
+                key = (pid, proc.create_time())
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            self._key_by_pid[pid] = key
+            self._entries[key] = _Entry(proc, key)
+
+    def _evict(self, entry: _Entry) -> None:
+        self._entries.pop(entry.key, None)
+        if self._key_by_pid.get(entry.key[0]) == entry.key:
+            del self._key_by_pid[entry.key[0]]
+
+    def _refresh(self, entry: _Entry, attrs: tuple[str, ...], now: float) -> bool:
+        """Refresh only *attrs* for *entry*; return False if the process is gone."""
+        proc = entry.proc
+        try:
+            with proc.oneshot():
+                # Pid reuse: the pid now belongs to a different process
+                if not proc.is_running():
+                    return False
+                if "cpu" in attrs:
+                    entry.cpu = proc.cpu_percent(interval=None)
+                if "rss" in attrs:
+                    try:
+                        entry.rss = proc.memory_info().rss
+                    except psutil.AccessDenied:
+                        entry.rss = 0
+                if "io" in attrs:
+                    try:
+                        io = proc.io_counters()
+                        total = io.read_bytes + io.write_bytes
+                        if entry.io_bytes is not None and now > entry.io_ts:
+                            entry.io_rate = max(total - entry.io_bytes, 0) / (now - entry.io_ts)
+                        entry.io_bytes, entry.io_ts = total, now
+                    except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                        entry.io_rate = 0.0
+                if "name" in attrs and entry.name is None:
+                    try:
+                        entry.name = proc.name()
+                    except psutil.AccessDenied:
+                        entry.name = "?"
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_process_count(self) -> int:
+        """Number of processes currently tracked."""
+        return len(self._entries)
+
+    def get_top_processes(self, sort_by: str = "cpu", n: int | None = None) -> list[dict[str, str]]:
+        """Return the top *n* processes ranked by ``cpu``, ``rss`` or ``io``.
+
+        Each dict carries a stable ``PID`` key.  CPU percentages need two
+        calls to be meaningful, so the first call after a process appears
+        reports 0% for it.
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        n = self.top_n if n is None else n
+        now = time.monotonic()
+
+        try:
+            self._sync_pids()
+        except Exception as e:
+            return [{'Error': str(e)}]
+
+        # Pass 1: refresh just the ranking attribute for every process.
+        # CPU is always refreshed so its per-process delta stays one tick wide.
+        rank_attrs = tuple({sort_by, "cpu"})
+        for entry in list(self._entries.values()):
+            if not self._refresh(entry, rank_attrs, now):
+                self._evict(entry)
+
+        rank_key: Callable[[_Entry], float] = {
+            "cpu": lambda e: e.cpu,
+            "rss": lambda e: e.rss,
+            "io": lambda e: e.io_rate,
+        }[sort_by]
+        top = heapq.nlargest(n, self._entries.values(), key=rank_key)
+
+        # Pass 2: display-only attributes for the winners.
+        rows: list[dict[str, str]] = []
+        for entry in top:
+            extra = tuple(a for a in ("rss", "io", "name") if a != sort_by)
+            if not self._refresh(entry, extra, now):
+                continue
+            rows.append({
+                'PID': str(entry.key[0]),
+                'Name': entry.name or "?",
+                'CPU': f"{entry.cpu:.1f}%",
+                'Memory': f"{entry.rss / (1024 ** 2):.1f} MB",
+                'I/O': f"{entry.io_rate / (1024 ** 2):.2f} MB/s",
+            })
+        return rows
@@ -22,3 +22,7 @@ class RAMDiagnostic:
             'Used': f"{used_gb:.2f} GB",
             'Percentage': mem.percent,
         }
+
+    def available_bytes(self) -> int:
+        """Memory that can be allocated without swapping (the 'Available' figure, in bytes)."""
+        return psutil.virtual_memory().available
@@ -0,0 +1,398 @@
+"""Record and replay collector output, plus synthetic captures of any size.
+
+A *capture* is a JSON-lines file (gzip-compressed if the name ends in
+``.gz``): a header object, then one ``[t, collector, method, result]``
+array per collector call, ``t`` being seconds since recording started::
+
+    python main.py --record big-box.jsonl.gz            # on the machine with the problem
+    python main.py --replay big-box.jsonl.gz --speed 4   # anywhere, 4x faster
+    python main.py --synthesize huge.jsonl.gz --cores 256 --gpus 8 --mounts 100
+
+:class:`RecordingCollector` wraps a live ``CPUDiagnostic`` /
+``RAMDiagnostic`` / ``GPUDiagnostic`` / ``DiskDiagnostic`` and logs what
+each call in :data:`RECORDED_METHODS` returned.  :class:`ReplayCollector`
+stands in for the same object and answers every call with the latest
+recorded result at the replay clock's position, so the App, the history,
+the alert engine and the exporter run unchanged against a machine that
+isn't there.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import inspect
+import json
+import math
+import platform
+import threading
+import time
+from typing import IO, Any, Callable
+
+import numpy as np
+
+from modules.disk_io import format_io
+
+FORMAT = "master-sentinal-capture"
+VERSION = 1
+
+COLLECTORS = ("cpu", "ram", "gpu", "disk")
+
+# Calls that are captured per collector; anything else is passed through
+# while recording and ignored (returns None) on replay.
+RECORDED_METHODS: dict[str, tuple[str, ...]] = {
+    'cpu': ('get_cpu_info', 'get_cpu_usage', 'get_per_core_usage', 'get_frequency', 'get_interval_stats'),
+    'ram': ('get_ram_info',),
+    'gpu': ('get_gpu_info', 'get_gpu_info_async'),
+    'disk': (
+        'get_disk_partitions_and_usage', 'get_disk_io', 'attach_io',
+        'get_smart_status', 'get_smart_attributes', 'get_smart_warnings',
+    ),
+}
+
+# Methods that fill in their first argument instead of returning a value;
+# the argument is captured after the call and copied back in on replay.
+IN_PLACE_METHODS = frozenset({'attach_io'})
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _jsonable(value: Any) -> Any:
+    """``json.dumps`` fallback for numpy scalars / arrays."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+# ----------------------------------------------------------------------
+# Recording
+# ----------------------------------------------------------------------
+
+class CaptureWriter:
+    """Appends collector results to a capture file (thread-safe)."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        self.path = path
+        self._clock = clock
+        self._t0 = clock()
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = _open(path, "w")
+        self._file.write(json.dumps({
+            'format': FORMAT, 'version': VERSION, 'started': time.time(), 'host': platform.node(),
+        }) + "\n")
+
+    def write(self, collector: str, method: str, result: Any) -> None:
+        line = json.dumps([round(self._clock() - self._t0, 3), collector, method, result], default=_jsonable)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RecordingCollector:
+    """Transparent proxy that logs the results of :data:`RECORDED_METHODS`."""
+
+    def __init__(self, name: str, target: Any, writer: CaptureWriter) -> None:
+        self._name = name
+        self._target = target
+        self._writer = writer
+        self._methods = RECORDED_METHODS[name]
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._target, attr)
+        if attr not in self._methods:
+            return value
+        name, write = self._name, self._writer.write
+
+        if inspect.iscoroutinefunction(value):
+            async def recorded_async(*args: Any, **kwargs: Any) -> Any:
+                result = await value(*args, **kwargs)
+                write(name, attr, result)
+                return result
+            return recorded_async
+
+        def recorded(*args: Any, **kwargs: Any) -> Any:
+            result = value(*args, **kwargs)
+            write(name, attr, args[0] if attr in IN_PLACE_METHODS else result)
+            return result
+        return recorded
+
+
+def record_collectors(collectors: dict[str, Any], writer: CaptureWriter) -> dict[str, Any]:
+    """Wrap each live collector in *collectors* with a :class:`RecordingCollector`."""
+    return {name: RecordingCollector(name, c, writer) for name, c in collectors.items()}
+
+
+# ----------------------------------------------------------------------
+# Replay
+# ----------------------------------------------------------------------
+
+class Capture:
+    """A loaded capture: per ``(collector, method)``, sorted times and raw JSON results.
+
+    Results stay as JSON text until asked for, so each replayed call gets
+    fresh objects (callers mutate them) without a deep copy.
+    """
+
+    def __init__(self, header: dict[str, Any], calls: dict[tuple[str, str], tuple[list[float], list[str]]]) -> None:
+        self.header = header
+        self.calls = calls
+        self.duration = max((times[-1] for times, _ in calls.values()), default=0.0)
+
+    @classmethod
+    def load(cls, path: str) -> Capture:
+        """Read a capture file; raises ValueError if it isn't one."""
+        calls: dict[tuple[str, str], tuple[list[float], list[str]]] = {}
+        decoder = json.JSONDecoder()
+        with _open(path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get('format') != FORMAT:
+                raise ValueError(f"{path} is not a {FORMAT} file")
+            if header.get('version') != VERSION:
+                raise ValueError(f"{path}: unsupported capture version {header.get('version')}")
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                # Split off "[t, collector, method, " and keep the result as text
+                t, collector, method, result = _split_call(decoder, line)
+                times, results = calls.setdefault((collector, method), ([], []))
+                times.append(t)
+                results.append(result)
+        for times, results in calls.values():
+            if any(b < a for a, b in zip(times, times[1:])):
+                order = sorted(range(len(times)), key=times.__getitem__)
+                times[:] = [times[i] for i in order]
+                results[:] = [results[i] for i in order]
+        return cls(header, calls)
+
+    def result_at(self, collector: str, method: str, t: float) -> Any:
+        """The result of the latest recorded call at or before *t* (the first one before that)."""
+        entry = self.calls.get((collector, method))
+        if entry is None:
+            return None
+        times, results = entry
+        i = max(bisect.bisect_right(times, t) - 1, 0)
+        return json.loads(results[i])
+
+
+def _split_call(decoder: json.JSONDecoder, line: str) -> tuple[float, str, str, str]:
+    """Parse the three header fields of a call line; return the result as JSON text."""
+    pos = line.index("[") + 1
+    fields: list[Any] = []
+    for _ in range(3):
+        while line[pos] in " ,":
+            pos += 1
+        value, pos = decoder.raw_decode(line, pos)
+        fields.append(value)
+    while line[pos] in " ,":
+        pos += 1
+    return float(fields[0]), fields[1], fields[2], line[pos:line.rindex("]")]
+
+
+class ReplayClock:
+    """Maps wall time to capture time at *speed*, looping at the end."""
+
+    def __init__(
+        self, duration: float, speed: float = 1.0, loop: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.duration = duration
+        self.speed = speed
+        self.loop = loop
+        self._clock = clock
+        self._t0 = clock()
+
+    def now(self) -> float:
+        t = (self._clock() - self._t0) * self.speed
+        if self.duration <= 0:
+            return 0.0
+        if self.loop:
+            return math.fmod(t, self.duration)
+        return min(t, self.duration)
+
+
+class _NoSmart:
+    """Stands in for ``DiskDiagnostic.smart`` during replay (SMART data is replayed)."""
+
+    def available(self) -> bool:
+        return False
+
+    def schedule_refresh(self) -> None:
+        return None
+
+
+class ReplayCollector:
+    """Answers collector calls from a :class:`Capture` at the replay clock's position."""
+
+    def __init__(self, name: str, capture: Capture, clock: ReplayClock) -> None:
+        self._name = name
+        self._capture = capture
+        self._clock = clock
+        if name == 'disk':
+            self.smart = _NoSmart()
+
+    def __getattr__(self, attr: str) -> Callable[..., Any]:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        name, capture, clock = self._name, self._capture, self._clock
+        source = attr
+        if (name, source) not in capture.calls:
+            # get_gpu_info() can be answered from get_gpu_info_async() calls and vice versa
+            source = attr[:-len("_async")] if attr.endswith("_async") else attr + "_async"
+            if (name, source) not in capture.calls:
+                return lambda *args, **kwargs: None   # start_sampler() and friends
+
+        if attr.endswith("_async"):
+            async def replayed_async(*args: Any, **kwargs: Any) -> Any:
+                return capture.result_at(name, source, clock.now())
+            return replayed_async
+
+        if attr in IN_PLACE_METHODS:
+            def replayed_in_place(target: list[Any], *args: Any, **kwargs: Any) -> None:
+                target[:] = capture.result_at(name, source, clock.now())
+            return replayed_in_place
+
+        return lambda *args, **kwargs: capture.result_at(name, source, clock.now())
+
+
+def replay_collectors(path: str, speed: float = 1.0, loop: bool = True) -> dict[str, ReplayCollector]:
+    """Replay stand-ins for every collector in :data:`COLLECTORS`, sharing one clock."""
+    capture = Capture.load(path)
+    clock = ReplayClock(capture.duration, speed, loop)
+    return {name: ReplayCollector(name, capture, clock) for name in COLLECTORS}
+
+
+# ----------------------------------------------------------------------
+# Synthetic captures
+# ----------------------------------------------------------------------
+
+def synthesize(
+    path: str,
+    cores: int = 256,
+    gpus: int = 8,
+    mounts: int = 100,
+    disks: int | None = None,
+    duration: float = 300.0,
+    interval: float = 1.0,
+    seed: int = 0,
+) -> int:
+    """Write a capture of an imaginary machine of the given size; return the call count.
+
+    Shapes match what the real collectors return, values follow slow
+    random walks so trends, statistics and alerts have something to do.
+    """
+    rng = np.random.default_rng(seed)
+    disks = disks or max(min(mounts, 24), 1)
+    ticks = max(int(duration / interval), 1)
+
+    core_load = rng.uniform(5, 60, cores)
+    gpu_load = rng.uniform(0, 80, gpus)
+    gpu_temp = rng.uniform(40, 75, gpus)
+    used_pct = rng.uniform(10, 95, mounts)
+    total_gb = rng.choice([256.0, 512.0, 1024.0, 2048.0, 4096.0], mounts)
+    ram_total = 2.0 ** int(max(math.log2(cores * 4), 4))
+    ram_pct = 40.0
+    disk_names = [f"nvme{i}n1" for i in range(disks)]
+    gpu_ids = [f"GPU-{seed:04x}{i:04x}-synthetic" for i in range(gpus)]
+
+    calls = 0
+    with _open(path, "w") as f:
+        f.write(json.dumps({
+            'format': FORMAT, 'version': VERSION, 'started': time.time(),
+            'host': f"synthetic-{cores}t-{gpus}g-{mounts}m",
+        }) + "\n")
+
+        def put(t: float, collector: str, method: str, result: Any) -> None:
+            nonlocal calls
+            f.write(json.dumps([round(t, 3), collector, method, result], default=_jsonable) + "\n")
+            calls += 1
+
+        put(0.0, 'cpu', 'get_cpu_info', {
+            'Name': f"Synthetic {cores}-thread CPU", 'Cores': max(cores // 2, 1), 'Threads': cores,
+            'MaxClockSpeed': "3500 MHz",
+        })
+        for n in range(ticks):
+            t = n * interval
+            core_load = np.clip(core_load + rng.normal(0, 4, cores), 0, 100)
+            gpu_load = np.clip(gpu_load + rng.normal(0, 5, gpus), 0, 100)
+            gpu_temp = np.clip(gpu_temp + rng.normal(0, 1, gpus), 30, 95)
+            used_pct = np.clip(used_pct + rng.normal(0, 0.05, mounts), 0, 100)
+            ram_pct = float(np.clip(ram_pct + rng.normal(0, 1), 5, 99))
+
+            per_core = np.round(core_load, 1)
+            spread = rng.uniform(0, 10, cores)
+            overall = float(per_core.mean())
+            put(t, 'cpu', 'get_interval_stats', {
+                'per_core': {
+                    'min': np.round(np.maximum(per_core - spread, 0), 1).tolist(),
+                    'mean': per_core.tolist(),
+                    'max': np.round(np.minimum(per_core + spread, 100), 1).tolist(),
+                    'p95': np.round(np.minimum(per_core + spread * 0.8, 100), 1).tolist(),
+                },
+                'overall': {
+                    'min': round(max(overall - 5, 0), 1), 'mean': round(overall, 1),
+                    'max': round(min(overall + 5, 100), 1), 'p95': round(min(overall + 4, 100), 1),
+                },
+                'samples': 20, 'rate_hz': 20.0, 'overhead_pct': 0.4,
+            })
+            put(t, 'ram', 'get_ram_info', {
+                'Total': f"{ram_total:.2f} GB",
+                'Available': f"{ram_total * (1 - ram_pct / 100):.2f} GB",
+                'Used': f"{ram_total * ram_pct / 100:.2f} GB",
+                'Percentage': round(ram_pct, 1),
+            })
+            put(t, 'gpu', 'get_gpu_info_async', [
+                {
+                    'DeviceID': gpu_ids[i], 'Name': "Synthetic GPU 80GB",
+                    'Load': f"{gpu_load[i]:.0f}%",
+                    'Free Memory': f"{81920 - int(gpu_load[i] * 800)}MB",
+                    'Used Memory': f"{int(gpu_load[i] * 800)}MB",
+                    'Total Memory': "81920MB",
+                    'Temperature': f"{gpu_temp[i]:.0f} C",
+                }
+                for i in range(gpus)
+            ])
+
+            partitions = [
+                {
+                    'Device': f"/dev/{disk_names[i % disks]}p{i // disks + 1}",
+                    'Mountpoint': "/" if i == 0 else f"/mnt/vol{i:03d}",
+                    'Total': f"{total_gb[i]:.2f} GB",
+                    'Used': f"{total_gb[i] * used_pct[i] / 100:.2f} GB",
+                    'Free': f"{total_gb[i] * (1 - used_pct[i] / 100):.2f} GB",
+                    'Percent': f"{used_pct[i]:.1f}%",
+                    'Status': "OK",
+                }
+                for i in range(mounts)
+            ]
+            io = {
+                name: {
+                    'read_mb_s': float(rng.exponential(50)), 'write_mb_s': float(rng.exponential(30)),
+                    'read_iops': float(rng.exponential(2000)), 'write_iops': float(rng.exponential(1000)),
+                    'latency_ms': float(rng.exponential(0.3)), 'busy_pct': float(rng.uniform(0, 60)),
+                }
+                for name in disk_names
+            }
+            put(t, 'disk', 'get_disk_partitions_and_usage', partitions)
+            put(t, 'disk', 'get_disk_io', io)
+            for p in partitions:
+                p.update(format_io(io[p['Device'][5:].rsplit("p", 1)[0]]))
+            put(t, 'disk', 'attach_io', partitions)
+            put(t, 'disk', 'get_smart_status', {
+                name: f"Synthetic NVMe {name} — PASSED" for name in disk_names
+            })
+            put(t, 'disk', 'get_smart_attributes', {})
+            put(t, 'disk', 'get_smart_warnings', {})
+    return calls
@@ -0,0 +1,285 @@
+"""Full SMART attribute collection via ``smartctl --json``.
+
+WMI's ``Win32_DiskDrive.Status`` and sysfs only say whether a drive is
+alive.  When smartmontools is installed, :class:`SmartCollector` runs
+``smartctl --json -a`` for every drive in parallel (bounded by
+``SMART_MAX_CONCURRENCY``) and extracts the attributes that predict
+failure: reallocated and pending sectors, wear level, temperature and
+power-on hours.
+
+SMART data changes slowly, so results are cached for ``SMART_CACHE_TTL_SEC``
+and refreshed in the background — on a thread, or as an asyncio task when
+the collection engine drives it — so callers never wait for smartctl.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+from config import (
+    SMART_CACHE_TTL_SEC,
+    SMART_COMMAND_TIMEOUT_SEC,
+    SMART_MAX_CONCURRENCY,
+    SMARTCTL_PATH,
+)
+from modules.engine import run_command
+
+# ATA attribute IDs
+_ATA_REALLOCATED = 5
+_ATA_PENDING = 197
+# Vendor wear indicators whose *normalised* value counts down from 100
+_ATA_LIFE_LEFT_IDS = (177, 202, 231, 233)
+
+# smartctl exit-status bits 0-1 mean the command itself failed
+_SMARTCTL_FATAL_BITS = 0b11
+
+
+def run_smartctl(args: list[str], timeout: float = SMART_COMMAND_TIMEOUT_SEC) -> str:
+    """Run smartctl with *args* and return its stdout (JSON text)."""
+    kwargs: dict[str, Any] = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+    result = subprocess.run(
+        [SMARTCTL_PATH, *args],
+        capture_output=True, text=True, timeout=timeout, **kwargs,
+    )
+    return result.stdout
+
+
+async def run_smartctl_async(args: list[str], timeout: float = SMART_COMMAND_TIMEOUT_SEC) -> str:
+    """Coroutine version of :func:`run_smartctl` (child killed on timeout/cancel)."""
+    return (await run_command([SMARTCTL_PATH, *args], timeout=timeout)).stdout
+
+
+def parse_scan(text: str) -> list[dict[str, str]]:
+    """Parse ``smartctl --scan-open --json`` into ``[{'name', 'type'}, ...]``."""
+    doc = json.loads(text)
+    return [
+        {'name': d['name'], 'type': d.get('type', 'auto')}
+        for d in doc.get('devices', [])
+        if 'name' in d
+    ]
+
+
+def parse_device(text: str) -> dict[str, Any]:
+    """Extract the failure-predicting attributes from ``smartctl --json -a`` output.
+
+    Missing attributes are ``None`` (e.g. NVMe drives have no reallocated
+    sector counter; they report ``media_errors`` instead).
+    """
+    doc = json.loads(text)
+    exit_status = doc.get('smartctl', {}).get('exit_status', 0)
+    device = doc.get('device', {})
+
+    attrs: dict[str, Any] = {
+        'device': device.get('name'),
+        'protocol': device.get('protocol'),
+        'model': doc.get('model_name') or doc.get('scsi_model_name'),
+        'serial': doc.get('serial_number'),
+        'passed': doc.get('smart_status', {}).get('passed'),
+        'temperature_c': doc.get('temperature', {}).get('current'),
+        'power_on_hours': doc.get('power_on_time', {}).get('hours'),
+        'reallocated': None,
+        'pending': None,
+        'wear_pct': None,
+        'media_errors': None,
+        'error': None,
+    }
+    if exit_status & _SMARTCTL_FATAL_BITS:
+        messages = doc.get('smartctl', {}).get('messages', [])
+        attrs['error'] = messages[0].get('string') if messages else f"smartctl exit status {exit_status}"
+
+    table = doc.get('ata_smart_attributes', {}).get('table', [])
+    by_id = {row.get('id'): row for row in table}
+    if _ATA_REALLOCATED in by_id:
+        attrs['reallocated'] = by_id[_ATA_REALLOCATED].get('raw', {}).get('value')
+    if _ATA_PENDING in by_id:
+        attrs['pending'] = by_id[_ATA_PENDING].get('raw', {}).get('value')
+    for attr_id in _ATA_LIFE_LEFT_IDS:
+        if attr_id in by_id and by_id[attr_id].get('value') is not None:
+            attrs['wear_pct'] = max(100 - by_id[attr_id]['value'], 0)
+            break
+
+    nvme = doc.get('nvme_smart_health_information_log')
+    if nvme:
+        attrs['wear_pct'] = nvme.get('percentage_used')
+        attrs['media_errors'] = nvme.get('media_errors')
+        if attrs['temperature_c'] is None:
+            attrs['temperature_c'] = nvme.get('temperature')
+        if attrs['power_on_hours'] is None:
+            attrs['power_on_hours'] = nvme.get('power_on_hours')
+
+    return attrs
+
+
+def format_attributes(attrs: dict[str, Any]) -> dict[str, str]:
+    """Render parsed attributes as display strings for InfoRow widgets."""
+    def fmt(value: Any, suffix: str = "") -> str:
+        return "N/A" if value is None else f"{value}{suffix}"
+
+    if attrs.get('error'):
+        health = f"Error: {attrs['error']}"
+    elif attrs.get('passed') is None:
+        health = "Unknown"
+    else:
+        health = "PASSED" if attrs['passed'] else "FAILED"
+
+    return {
+        'Device': fmt(attrs.get('device')),
+        'Model': fmt(attrs.get('model')),
+        'Serial': fmt(attrs.get('serial')),
+        'Health': health,
+        'Temperature': fmt(attrs.get('temperature_c'), " C"),
+        'Power-On Hours': fmt(attrs.get('power_on_hours')),
+        'Reallocated Sectors': fmt(attrs.get('reallocated')),
+        'Pending Sectors': fmt(attrs.get('pending')),
+        'Wear Level': fmt(attrs.get('wear_pct'), "%"),
+        'Media Errors': fmt(attrs.get('media_errors')),
+    }
+
+
+class SmartCollector:
+    """Cached, parallel smartctl runner."""
+
+    def __init__(
+        self,
+        runner: Callable[[list[str]], str] = run_smartctl,
+        max_workers: int = SMART_MAX_CONCURRENCY,
+        ttl: float = SMART_CACHE_TTL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        async_runner: Callable[[list[str]], Awaitable[str]] | None = None,
+    ) -> None:
+        self._runner = runner
+        # A custom sync runner without an async one is run on the executor
+        if async_runner is None and runner is run_smartctl:
+            async_runner = run_smartctl_async
+        self._async_runner = async_runner
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._clock = clock
+
+        self._cache: dict[str, dict[str, Any]] = {}
+        self._fetched_at: float | None = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        # Called with every fresh result set, once per refresh (on the refreshing thread)
+        self.on_update: Callable[[dict[str, dict[str, Any]]], None] | None = None
+
+    def available(self) -> bool:
+        """True if a custom runner was given or a smartctl binary can be found."""
+        return self._runner is not run_smartctl or shutil.which(SMARTCTL_PATH) is not None
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        """Scan for drives and query them all now (blocking).
+
+        Returns ``{device_name: parsed_attributes}``.
+        """
+        devices = parse_scan(self._runner(["--scan-open", "--json"]))
+
+        def query(dev: dict[str, str]) -> tuple[str, dict[str, Any]]:
+            try:
+                attrs = parse_device(self._runner(self._device_args(dev)))
+            except Exception as e:
+                attrs = {'device': dev['name'], 'error': str(e)}
+            attrs['device'] = attrs.get('device') or dev['name']
+            return dev['name'], attrs
+
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1), thread_name_prefix="smartctl") as pool:
+            results = dict(pool.map(query, devices))
+        return self._store(results)
+
+    async def collect_async(self) -> dict[str, dict[str, Any]]:
+        """Coroutine version of :meth:`collect`; concurrency bounded by a semaphore."""
+        loop = asyncio.get_running_loop()
+
+        async def run(args: list[str]) -> str:
+            if self._async_runner is not None:
+                return await self._async_runner(args)
+            return await loop.run_in_executor(None, self._runner, args)
+
+        devices = parse_scan(await run(["--scan-open", "--json"]))
+        slots = asyncio.Semaphore(max(self.max_workers, 1))
+
+        async def query(dev: dict[str, str]) -> tuple[str, dict[str, Any]]:
+            async with slots:
+                try:
+                    attrs = parse_device(await run(self._device_args(dev)))
+                except Exception as e:
+                    attrs = {'device': dev['name'], 'error': str(e) or type(e).__name__}
+            attrs['device'] = attrs.get('device') or dev['name']
+            return dev['name'], attrs
+
+        results = dict(await asyncio.gather(*(query(d) for d in devices)))
+        return self._store(results)
+
+    @staticmethod
+    def _device_args(dev: dict[str, str]) -> list[str]:
+        return ["--json", "-a", "-d", dev['type'], dev['name']]
+
+    def _store(self, results: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            self._cache = results
+            self._fetched_at = self._clock()
+        if self.on_update is not None:
+            self.on_update(results)
+        return results
+
+    def _claim_refresh(self) -> bool:
+        """Mark a refresh as running if the cache is stale and none is in flight."""
+        with self._lock:
+            stale = self._fetched_at is None or self._clock() - self._fetched_at >= self.ttl
+            if stale and not self._refreshing:
+                self._refreshing = True
+                return True
+            return False
+
+    def _refresh_failed(self, e: Exception) -> None:
+        print(f"Error collecting SMART data: {e}")
+        with self._lock:
+            self._fetched_at = self._clock()  # don't hammer a broken smartctl
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.collect()
+        except Exception as e:
+            self._refresh_failed(e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def schedule_refresh(self) -> asyncio.Task[None] | None:
+        """From a running event loop: start an async refresh task if the cache is stale.
+
+        While it runs, :meth:`get` serves the cache without starting a thread.
+        """
+        if not self._claim_refresh():
+            return None
+
+        async def refresh() -> None:
+            try:
+                await self.collect_async()
+            except Exception as e:
+                self._refresh_failed(e)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        return asyncio.get_running_loop().create_task(refresh())
+
+    def get(self) -> dict[str, dict[str, Any]]:
+        """Return cached results, starting a background refresh when stale.
+
+        The first call returns ``{}`` while the initial scan runs.
+        """
+        if self._claim_refresh():
+            threading.Thread(target=self._refresh_in_background, name="smart-refresh", daemon=True).start()
+        with self._lock:
+            return dict(self._cache)
@@ -0,0 +1,192 @@
+"""SMART trend tracking and predictive drive-failure warnings.
+
+A single SMART snapshot cannot tell a drive that has had 8 reallocated
+sectors for three years from one that gained 8 this week.  The trend store
+keeps a compact on-disk time series per drive serial and fits growth rates
+to it:
+
+* one append-only file per serial of fixed 32-byte records
+  (``int64`` timestamp + ``float32`` attributes, NaN when unknown);
+* reads are a single ``numpy.fromfile`` — a year of hourly samples for 50
+  drives loads and fits in milliseconds;
+* growth rates are least-squares slopes over ``SMART_TREND_WINDOW_DAYS``,
+  projected to the thresholds in ``SMART_TREND_THRESHOLDS``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from typing import Any
+
+import numpy as np
+
+from config import (
+    DATA_DIR,
+    SMART_TREND_MIN_INTERVAL_SEC,
+    SMART_TREND_THRESHOLDS,
+    SMART_TREND_WARN_DAYS,
+    SMART_TREND_WINDOW_DAYS,
+)
+
+# On-disk record layout (little-endian, 32 bytes)
+RECORD_DTYPE = np.dtype([
+    ('ts', '<i8'),
+    ('reallocated', '<f4'),
+    ('pending', '<f4'),
+    ('wear_pct', '<f4'),
+    ('temperature_c', '<f4'),
+    ('power_on_hours', '<f4'),
+    ('media_errors', '<f4'),
+])
+TRACKED: tuple[str, ...] = RECORD_DTYPE.names[1:]
+
+# Counters whose *any* growth is worth a warning, regardless of threshold
+_GROWTH_WARN: dict[str, str] = {
+    'reallocated': "Reallocated sectors",
+    'pending': "Pending sectors",
+    'media_errors': "Media errors",
+}
+_LABELS: dict[str, str] = {**_GROWTH_WARN, 'wear_pct': "Wear level"}
+
+_DAY = 86400.0
+
+
+class SmartTrendStore:
+    """Append-only per-serial SMART time series with trend analysis."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        min_interval: float = SMART_TREND_MIN_INTERVAL_SEC,
+        window_days: float = SMART_TREND_WINDOW_DAYS,
+        thresholds: dict[str, float] | None = None,
+        warn_days: float = SMART_TREND_WARN_DAYS,
+    ) -> None:
+        self.directory = directory or os.path.join(DATA_DIR, "smart")
+        self.min_interval = min_interval
+        self.window_days = window_days
+        self.thresholds = SMART_TREND_THRESHOLDS if thresholds is None else thresholds
+        self.warn_days = warn_days
+        # serial -> (last ts, last values) to skip redundant appends
+        self._last: dict[str, tuple[int, tuple[float, ...]]] = {}
+        self._warnings: dict[str, list[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _path(self, serial: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]", "_", serial) + ".bin")
+
+    def record(self, serial: str, attrs: dict[str, Any], ts: float | None = None) -> bool:
+        """Append a sample for *serial* from parsed smartctl *attrs*.
+
+        Skipped (returns False) when nothing changed and the previous
+        sample is younger than *min_interval*.
+        """
+        ts_i = int(time.time() if ts is None else ts)
+        values = tuple(
+            float(attrs[k]) if attrs.get(k) is not None else float("nan") for k in TRACKED
+        )
+
+        last = self._last.get(serial)
+        if last is None:
+            tail = self.load(serial)[-1:]
+            if tail.size:
+                last = (int(tail['ts'][0]), tuple(float(tail[k][0]) for k in TRACKED))
+        if last is not None:
+            same = np.allclose(last[1], values, equal_nan=True)
+            if ts_i <= last[0] or (same and ts_i - last[0] < self.min_interval):
+                return False
+
+        rec = np.array([(ts_i, *values)], dtype=RECORD_DTYPE)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(serial), "ab") as f:
+            # A crash mid-append leaves a partial record: cut it off, or every
+            # later record would be read shifted by the torn bytes
+            torn = f.seek(0, os.SEEK_END) % RECORD_DTYPE.itemsize
+            if torn:
+                f.truncate(f.tell() - torn)
+            f.write(rec.tobytes())
+        self._last[serial] = (ts_i, values)
+        self._warnings.pop(serial, None)  # recompute lazily
+        return True
+
+    def load(self, serial: str, since: float | None = None) -> np.ndarray:
+        """Return *serial*'s records (optionally from *since* on) as a structured array."""
+        try:
+            data = np.fromfile(self._path(serial), dtype=RECORD_DTYPE)
+        except (FileNotFoundError, ValueError):
+            return np.empty(0, dtype=RECORD_DTYPE)
+        if since is not None:
+            data = data[np.searchsorted(data['ts'], since):]
+        return data
+
+    def serials(self) -> list[str]:
+        """Serials (file stems) that have stored history."""
+        try:
+            return sorted(n[:-4] for n in os.listdir(self.directory) if n.endswith(".bin"))
+        except FileNotFoundError:
+            return []
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    def trends(self, serial: str, now: float | None = None) -> dict[str, dict[str, float | None]]:
+        """Fit growth rates over the trend window.
+
+        Returns ``{attribute: {'current', 'rate_per_day', 'days_to_threshold'}}``
+        for every tracked attribute with at least one sample in the window.
+        """
+        now = time.time() if now is None else now
+        data = self.load(serial, since=now - self.window_days * _DAY)
+        out: dict[str, dict[str, float | None]] = {}
+        if data.size == 0:
+            return out
+
+        days = (data['ts'] - data['ts'][0]) / _DAY
+        for key in TRACKED:
+            col = data[key].astype(np.float64)
+            ok = np.isfinite(col)
+            if not ok.any():
+                continue
+            current = float(col[ok][-1])
+            rate: float | None = None
+            if ok.sum() >= 2 and np.ptp(days[ok]) > 0:
+                rate = float(np.polyfit(days[ok], col[ok], 1)[0])
+
+            eta: float | None = None
+            threshold = self.thresholds.get(key)
+            if threshold is not None:
+                if current >= threshold:
+                    eta = 0.0
+                elif rate is not None and rate > 0:
+                    eta = (threshold - current) / rate
+            out[key] = {'current': current, 'rate_per_day': rate, 'days_to_threshold': eta}
+        return out
+
+    def warnings(self, serial: str, now: float | None = None) -> list[str]:
+        """Human-readable predictive warnings for *serial* (cached until the next append)."""
+        if serial in self._warnings and now is None:
+            return self._warnings[serial]
+
+        msgs: list[str] = []
+        for key, t in self.trends(serial, now).items():
+            label = _LABELS.get(key)
+            if label is None:
+                continue
+            eta = t['days_to_threshold']
+            rate = t['rate_per_day']
+            if eta is not None and eta <= 0:
+                msgs.append(f"{label} at threshold ({t['current']:.0f})")
+            elif eta is not None and eta <= self.warn_days:
+                msgs.append(f"{label} projected to reach threshold in {eta:.0f} days")
+            elif key in _GROWTH_WARN and rate is not None and rate > 0:
+                msgs.append(f"{label} growing (+{rate * 7:.1f}/week)")
+
+        if now is None:
+            self._warnings[serial] = msgs
+        return msgs
@@ -0,0 +1,365 @@
+"""Disk space analyzer — which directories fill a partition.
+
+:class:`SpaceAnalyzer` walks one mount with a pool of ``os.scandir``
+worker threads (scandir and stat release the GIL, so the walk is bound by
+the filesystem, not by Python) and folds every directory's own file sizes
+into a :class:`DirNode` tree of totals.
+
+Memory stays bounded however many files there are:
+
+* files are never kept — each directory is reduced to one record
+  (own bytes, own file count, subdirectory names) as soon as it is read;
+* the frontier of directories still to visit is a LIFO stack, so the walk
+  is depth-first and the stack stays roughly depth × fan-out;
+* the in-memory tree only holds directories down to ``SPACE_TREE_DEPTH``
+  (and at most ``SPACE_TREE_MAX_NODES`` of them); deeper sizes are added
+  to their nearest kept ancestor, so every total is still exact.
+
+Every directory record also goes into an on-disk SQLite index
+(:class:`SpaceIndex`).  A rescan stats each directory and, if its mtime is
+unchanged, reuses the indexed record and only stats its subdirectories
+instead of listing it again.  Paths are stored as their filesystem bytes
+(``os.fsencode``), so names that are not valid UTF-8 index like any other.
+A directory's mtime changes when entries are
+added, removed or renamed, not when an existing file grows in place; such
+growth shows up once the directory itself changes.
+
+The walk stays on the filesystem it started on, does not follow symlinks,
+counts apparent file sizes and runs its threads under the Full Scan
+resource policy for ``"Disk Space Analyzer"`` (see :mod:`modules.governor`).
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from config import (
+    SPACE_INDEX_BATCH,
+    SPACE_PROGRESS_INTERVAL_SEC,
+    SPACE_SCAN_WORKERS,
+    SPACE_TOP_N,
+    SPACE_TREE_DEPTH,
+    SPACE_TREE_MAX_NODES,
+)
+from modules.governor import lower_current_thread, policy_for
+
+_DONE = object()
+_NAME_SEP = "\0"   # subdirectory names in the index (never part of a file name)
+_SCHEMA_VERSION = 1   # 1: paths and subdirectory names stored as filesystem-encoded BLOBs
+
+
+class DirNode:
+    """Totals for one directory and everything below it."""
+
+    __slots__ = ("name", "bytes", "files", "dirs", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.bytes = 0
+        self.files = 0
+        self.dirs = 0
+        self.children: dict[str, DirNode] = {}
+
+    def largest(self, n: int) -> list[DirNode]:
+        return sorted(self.children.values(), key=lambda c: c.bytes, reverse=True)[:n]
+
+    def summary(self, top: int = SPACE_TOP_N, depth: int = 2) -> dict[str, Any]:
+        """Plain-dict view of the *top* largest children, *depth* levels deep."""
+        out: dict[str, Any] = {'name': self.name, 'bytes': self.bytes, 'files': self.files, 'dirs': self.dirs}
+        if depth > 0:
+            out['children'] = [c.summary(top, depth - 1) for c in self.largest(top)]
+        return out
+
+
+class ScanResult:
+    """Outcome of one :meth:`SpaceAnalyzer.scan`."""
+
+    __slots__ = ("root", "tree", "scanned_dirs", "reused_dirs", "errors", "elapsed", "complete")
+
+    def __init__(self, root: str, tree: DirNode) -> None:
+        self.root = root
+        self.tree = tree
+        self.scanned_dirs = 0    # listed with scandir
+        self.reused_dirs = 0     # unchanged mtime: taken from the index
+        self.errors = 0          # unreadable directories
+        self.elapsed = 0.0
+        self.complete = False    # False if cancelled
+
+    def progress(self) -> dict[str, Any]:
+        """Snapshot for the UI (streamed while the scan runs, and at the end)."""
+        return {
+            'root': self.root, 'tree': self.tree.summary(), 'scanned_dirs': self.scanned_dirs,
+            'reused_dirs': self.reused_dirs, 'errors': self.errors, 'elapsed': round(self.elapsed, 2),
+            'complete': self.complete,
+        }
+
+
+class SpaceIndex:
+    """SQLite table of per-directory records, keyed by path."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = self.connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            # The index is only a cache: an older layout is dropped and rebuilt by the next scan
+            self._conn.execute("DROP TABLE IF EXISTS dirs")
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            " path BLOB PRIMARY KEY, mtime_ns INTEGER, own_bytes INTEGER, own_files INTEGER,"
+            " subdirs BLOB, scan INTEGER) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def connect(self) -> sqlite3.Connection:
+        """A new connection (one per worker thread)."""
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    @staticmethod
+    def lookup(conn: sqlite3.Connection, path: str) -> tuple[int, int, int, str] | None:
+        row = conn.execute(
+            "SELECT mtime_ns, own_bytes, own_files, subdirs FROM dirs WHERE path = ?", (os.fsencode(path),),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], row[2], os.fsdecode(row[3])
+
+    def write(self, rows: list[tuple[str, int, int, int, str, int]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?)",
+            [(os.fsencode(path), mtime_ns, b, f, os.fsencode(names), scan)
+             for path, mtime_ns, b, f, names, scan in rows],
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _subtree(root: str) -> tuple[str, tuple[bytes, bytes, bytes]]:
+        key = os.fsencode(root)
+        sep = os.fsencode(os.sep)
+        prefix = key if key.endswith(sep) else key + sep
+        # Every path under *prefix* sorts between prefix and prefix with its last byte bumped
+        upper = prefix[:-1] + bytes([prefix[-1] + 1])
+        return "(path = ? OR (path >= ? AND path < ?))", (key, prefix, upper)
+
+    def prune(self, root: str, scan: int) -> int:
+        """Drop records under *root* not seen by *scan* (deleted directories)."""
+        where, args = self._subtree(root)
+        deleted = self._conn.execute(f"DELETE FROM dirs WHERE {where} AND scan != ?", (*args, scan)).rowcount
+        self._conn.commit()
+        return deleted
+
+    def totals(self, root: str) -> tuple[int, int, int]:
+        """``(bytes, files, dirs)`` under *root* as of the last scan, straight from the index."""
+        where, args = self._subtree(root)
+        b, f, d = self._conn.execute(
+            f"SELECT SUM(own_bytes), SUM(own_files), COUNT(*) FROM dirs WHERE {where}", args,
+        ).fetchone()
+        return b or 0, f or 0, d
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SpaceAnalyzer:
+    """Parallel, incremental directory-size walk of one mount."""
+
+    def __init__(
+        self,
+        root: str,
+        index: SpaceIndex | None = None,
+        workers: int = SPACE_SCAN_WORKERS,
+        depth: int = SPACE_TREE_DEPTH,
+        max_nodes: int = SPACE_TREE_MAX_NODES,
+    ) -> None:
+        self.root = os.path.abspath(root)
+        self.index = index
+        self.workers = max(workers, 1)
+        self.depth = depth
+        self.max_nodes = max_nodes
+        self.policy = policy_for("Disk Space Analyzer")
+
+        self._todo: queue.LifoQueue[tuple[str, int] | None] = queue.LifoQueue()
+        self._done: queue.Queue[Any] = queue.Queue(maxsize=SPACE_INDEX_BATCH * 4)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._nodes = 0
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _push(self, path: str, mtime_ns: int) -> None:
+        with self._lock:
+            self._pending += 1
+        self._todo.put((path, mtime_ns))
+
+    def _visit(self, path: str, mtime_ns: int, dev: int, conn: sqlite3.Connection | None) -> tuple:
+        """Read one directory → ``(record, [(subdir, mtime_ns), ...])``.
+
+        *record* is ``(path, mtime_ns, own_bytes, own_files, subdir_names, reused)``.
+        """
+        row = self.index.lookup(conn, path) if conn is not None else None
+        if row is not None and row[0] == mtime_ns:
+            subdirs, names = [], []
+            for name in row[3].split(_NAME_SEP) if row[3] else []:
+                sub = os.path.join(path, name)
+                try:
+                    st = os.stat(sub, follow_symlinks=False)
+                except OSError:
+                    continue   # removed while we were walking
+                if st.st_dev == dev:   # mounting does not touch the parent's mtime
+                    subdirs.append((sub, st.st_mtime_ns))
+                    names.append(name)
+            return (path, mtime_ns, row[1], row[2], _NAME_SEP.join(names), True), subdirs
+
+        own_bytes = own_files = 0
+        subdirs, names = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        if not st.st_dev:      # Windows DirEntry.stat() leaves st_dev at 0
+                            st = os.stat(entry.path, follow_symlinks=False)
+                        if st.st_dev == dev:   # do not wander into other mounts
+                            subdirs.append((entry.path, st.st_mtime_ns))
+                            names.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        own_bytes += entry.stat(follow_symlinks=False).st_size
+                        own_files += 1
+                except OSError:
+                    pass   # vanished or unreadable entry
+        return (path, mtime_ns, own_bytes, own_files, _NAME_SEP.join(names), False), subdirs
+
+    def _worker(self, dev: int) -> None:
+        lower_current_thread(self.policy)
+        conn = self.index.connect() if self.index is not None else None
+        try:
+            while True:
+                item = self._todo.get()
+                if item is None:
+                    return
+                path, mtime_ns = item
+                try:
+                    if not self._cancel.is_set():
+                        record, subdirs = self._visit(path, mtime_ns, dev, conn)
+                        for sub, sub_mtime in subdirs:
+                            self._push(sub, sub_mtime)
+                        self._done.put(record)
+                except Exception as e:
+                    if not isinstance(e, OSError):
+                        print(f"Error scanning {path!r}: {e}")
+                    self._done.put((path,))   # error marker
+                finally:
+                    # Always settle the item, or scan() would wait for it forever
+                    with self._lock:
+                        self._pending -= 1
+                        finished = self._pending == 0
+                    if finished:
+                        self._done.put(_DONE)
+                        for _ in range(self.workers):
+                            self._todo.put(None)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    def _add(self, tree: DirNode, path: str, own_bytes: int, own_files: int) -> None:
+        rel = os.path.relpath(path, self.root)
+        parts = () if rel == "." else rel.split(os.sep)
+        node = tree
+        node.bytes += own_bytes
+        node.files += own_files
+        node.dirs += 1
+        for name in parts[:self.depth]:
+            child = node.children.get(name)
+            if child is None:
+                if self._nodes >= self.max_nodes:
+                    break   # keep counting in the deepest ancestor we have
+                child = node.children[name] = DirNode(name)
+                self._nodes += 1
+            node = child
+            node.bytes += own_bytes
+            node.files += own_files
+            node.dirs += 1
+
+    def scan(self, progress: Callable[[dict[str, Any]], None] | None = None) -> ScanResult:
+        """Walk the mount; call *progress* with partial results every SPACE_PROGRESS_INTERVAL_SEC."""
+        started = time.perf_counter()
+        st = os.stat(self.root)
+        result = ScanResult(self.root, DirNode(self.root))
+        scan_id = time.time_ns()
+
+        threads = [
+            threading.Thread(target=self._worker, args=(st.st_dev,), name=f"space-scan-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        self._push(self.root, st.st_mtime_ns)
+
+        batch: list[tuple[str, int, int, int, str, int]] = []
+        last_report = time.monotonic()
+        while True:
+            try:
+                record = self._done.get(timeout=SPACE_PROGRESS_INTERVAL_SEC)
+            except queue.Empty:
+                record = None
+            if record is _DONE:
+                break
+            if record is not None:
+                if len(record) == 1:
+                    result.errors += 1
+                else:
+                    path, mtime_ns, own_bytes, own_files, names, reused = record
+                    self._add(result.tree, path, own_bytes, own_files)
+                    if reused:
+                        result.reused_dirs += 1
+                    else:
+                        result.scanned_dirs += 1
+                    if self.index is not None:
+                        batch.append((path, mtime_ns, own_bytes, own_files, names, scan_id))
+                        if len(batch) >= SPACE_INDEX_BATCH:
+                            self.index.write(batch)
+                            batch = []
+            if progress is not None and time.monotonic() - last_report >= SPACE_PROGRESS_INTERVAL_SEC:
+                result.elapsed = time.perf_counter() - started
+                progress(result.progress())
+                last_report = time.monotonic()
+
+        for t in threads:
+            t.join()
+        result.complete = not self._cancel.is_set()
+        if self.index is not None:
+            if batch:
+                self.index.write(batch)
+            if result.complete:
+                self.index.prune(self.root, scan_id)
+        result.elapsed = time.perf_counter() - started
+        if progress is not None:
+            progress(result.progress())
+        return result
+
+
+def format_size(n: float) -> str:
+    if n < 1024:
+        return f"{n:.0f} B"
+    for unit in ("KB", "MB", "GB", "TB"):
+        n /= 1024
+        if n < 1024 or unit == "TB":
+            break
+    return f"{n:.2f} {unit}"
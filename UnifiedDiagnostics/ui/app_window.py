@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
 import csv
 import os
+import sqlite3
 import threading
 import time
 from datetime import datetime
@@ -13,24 +16,56 @@ from typing import Any, Callable
 import customtkinter as ctk
 
 from config import (
+    ALERT_LOG_LEN,
+    ALERT_NOTIFY_SEVERITY,
     APPEARANCE_MODE,
     COLOR_THEME,
-    TEMP_ALERT_THRESHOLD_C,
-    UPDATE_INTERVAL_SEC,
+    DATA_DIR,
+    ENGINE_UI_POLL_MS,
+    FLEET_AGGREGATOR_ADDR,
+    HISTORY_PERSIST,
+    HISTORY_RECORD,
+    HISTORY_WINDOW_SEC,
+    SPACE_INDEX_FILE,
+    MONITOR_THREAD_POLICY,
+    UI_LATENCY_SAMPLES,
     WINDOW_GEOMETRY,
     WINDOW_TITLE,
 )
+from modules.alerts import SEVERITIES, SEVERITY_COLORS, AlertEngine, metric_severity, notifier_available, notify_command
+from modules.baseline import (
+    STATUS_COLORS,
+    BaselineStore,
+    benchmark_metrics,
+    format_delta,
+    idle_metrics,
+    make_summary,
+    smart_metrics,
+)
+from modules.baseline import compare as compare_to_baseline
 from modules.board_diag import BoardDiagnostic
+from modules.bus import SEP, ChangeSet, MetricBus, keyed_rows
 from modules.cpu_diag import CPUDiagnostic
 from modules.disk_diag import DiskDiagnostic
+from modules.engine import CollectionEngine, run_command
+from modules.fleet import format_fleet, query_aggregator
 from modules.full_scan import FullScanDiagnostic
+from modules.governor import ResourcePolicy
 from modules.gpu_diag import GPUDiagnostic
+from modules.history import GPU_METRICS, MetricHistory, flatten_metrics
+from modules.history_store import HistoryRecorder
+from modules.net_diag import NetworkDiagnostic
+from modules.pacing import AdaptivePacer
+from modules.process_diag import SORT_KEYS, ProcessDiagnostic
+from modules.smart import format_attributes
+from modules.space import SpaceAnalyzer, SpaceIndex, format_size
 from modules.ram_diag import RAMDiagnostic
+from modules.replay import CaptureWriter, record_collectors, replay_collectors
 from ui.components import InfoRow, MetricCard, SectionFrame
 
 
 # Navigation items (order matters — rendered top to bottom)
-NAV_ITEMS: list[str] = ["Dashboard", "CPU", "Memory", "GPU", "Storage", "System"]
+NAV_ITEMS: list[str] = ["Dashboard", "CPU", "Memory", "GPU", "Storage", "Network", "Processes", "Fleet", "System"]
 NAV_SCAN_ITEM: str = "Full Scan"
 
 
@@ -41,7 +76,9 @@ class App(ctk.CTk):
     # Initialisation
     # ------------------------------------------------------------------
 
-    def __init__(self) -> None:
+    def __init__(self, record: str | None = None, replay: str | None = None, speed: float = 1.0) -> None:
+        """*record* captures collector output to a file, *replay* plays one back
+        at *speed* instead of reading this machine (see :mod:`modules.replay`)."""
         super().__init__()
 
         self.title(WINDOW_TITLE)
@@ -77,9 +114,12 @@ class App(ctk.CTk):
         # Content frames
         self.frames: dict[str, ctk.CTkScrollableFrame] = {}
 
-        # Widget caches — {stable_key: {metric_key: InfoRow}}
-        self.gpu_widgets: dict[str, dict[str, InfoRow]] = {}
-        self.disk_widgets: dict[str, dict[str, InfoRow]] = {}
+        # Widget caches — {stable_key: SectionFrame} (rows in SectionFrame.rows)
+        self.gpu_widgets: dict[str, SectionFrame] = {}
+        self.disk_widgets: dict[str, SectionFrame] = {}
+        self.net_widgets: dict[str, SectionFrame] = {}
+        self.fleet_widgets: dict[str, SectionFrame] = {}
+        self.smart_detail_widgets: dict[str, SectionFrame] = {}
         self.smart_widgets: dict[str, InfoRow] = {}
         self.mem_widgets: dict[str, InfoRow] = {}
 
@@ -87,13 +127,36 @@ class App(ctk.CTk):
             f = ctk.CTkScrollableFrame(self, corner_radius=0, fg_color="transparent")
             self.frames[frame_name] = f
 
-        # Diagnostic modules
-        self.cpu_mod = CPUDiagnostic()
-        self.ram_mod = RAMDiagnostic()
-        self.gpu_mod = GPUDiagnostic()
-        self.disk_mod = DiskDiagnostic()
+        # Diagnostic modules (CPU / RAM / GPU / Disk can be recorded or replayed)
+        self.capture: CaptureWriter | None = None
+        if replay:
+            collectors = replay_collectors(replay, speed)
+        else:
+            collectors = {
+                'cpu': CPUDiagnostic(), 'ram': RAMDiagnostic(), 'gpu': GPUDiagnostic(), 'disk': DiskDiagnostic(),
+            }
+            if record:
+                self.capture = CaptureWriter(record)
+                collectors = record_collectors(collectors, self.capture)
+        self.cpu_mod, self.ram_mod = collectors['cpu'], collectors['ram']
+        self.gpu_mod, self.disk_mod = collectors['gpu'], collectors['disk']
         self.board_mod = BoardDiagnostic()
+        self.proc_mod = ProcessDiagnostic()
+        self.net_mod = NetworkDiagnostic()
+        # A replayed machine must not end up in this machine's history files
+        self.history = MetricHistory(
+            persist_path=os.path.join(DATA_DIR, "live_history.bin") if HISTORY_PERSIST and not replay else None,
+        )
+        self.recorder = HistoryRecorder() if HISTORY_RECORD and not replay else None
+        self.alerts = AlertEngine()   # evaluated on the engine thread only
+        self._notifier = notifier_available()
+        self._alert_log: collections.deque[dict[str, Any]] = collections.deque(maxlen=ALERT_LOG_LEN)
+        self._latency: collections.deque[float] = collections.deque(maxlen=UI_LATENCY_SAMPLES)
+        self.pacer = AdaptivePacer()
         self.full_scan_mod = FullScanDiagnostic()
+        # Background collector threads run at low priority so the monitor yields to real work
+        self._thread_policy = ResourcePolicy.from_dict(MONITOR_THREAD_POLICY)
+        self._sampler = self.cpu_mod.start_sampler(thread_policy=self._thread_policy)   # None when replaying
 
         # Dashboard string vars
         self.cpu_usage_var = ctk.StringVar(value="0%")
@@ -107,15 +170,41 @@ class App(ctk.CTk):
         self.setup_memory_ui()
         self.setup_gpu_ui()
         self.setup_storage_ui()
+        self.setup_network_ui()
+        self.setup_processes_ui()
+        self.setup_fleet_ui()
         self.setup_system_ui()
         self.setup_full_scan_ui()
 
         self.select_frame_by_name("Dashboard")
 
-        # Monitoring thread (uses Event for clean shutdown)
-        self._stop_event = threading.Event()
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        # Metric bus: each tick is published as keyed display values and every
+        # widget group only hears about (and redraws) the keys that changed
+        self.bus = MetricBus()
+        self.bus.subscribe("dash|", self._on_dashboard_changes)
+        self.bus.subscribe("ram|", self._on_memory_changes)
+        self._device_sections = self._device_section_specs()
+        for prefix, spec in self._device_sections.items():
+            self.bus.subscribe(
+                (prefix, *spec.pop('also', ())),
+                lambda changes, prefix=prefix: self._on_device_changes(prefix, changes),
+            )
+
+        # Collection engine: one asyncio loop thread; results come back via its queue
+        # Ticks are coalesced: a busy Tk thread only ever sees the newest one
+        self.engine = CollectionEngine(coalesce=("tick", "space_progress"), thread_policy=self._thread_policy)
+        self.engine.start()
+        self._closing = False
+        self.engine.every(self.pacer.interval, self._collect_tick, "tick")
+        self.after(ENGINE_UI_POLL_MS, self._drain_engine)
+
+        # Adaptive polling inputs: window state and any user input
+        self.bind("<Map>", self._on_window_state, add="+")
+        self.bind("<Unmap>", self._on_window_state, add="+")
+        self.bind("<FocusIn>", self._on_focus_change, add="+")
+        self.bind("<FocusOut>", self._on_focus_change, add="+")
+        for sequence in ("<Motion>", "<KeyPress>", "<ButtonPress>", "<MouseWheel>"):
+            self.bind_all(sequence, self._on_user_activity, add="+")
 
     # ------------------------------------------------------------------
     # Navigation helpers
@@ -161,6 +250,14 @@ class App(ctk.CTk):
         MetricCard(grid, "GPU Status", self.gpu_count_var).pack(side="left", padx=10, expand=True, fill="x")
         MetricCard(grid, "Disks Found", self.disk_count_var).pack(side="left", padx=10, expand=True, fill="x")
 
+        self.alerts_frame = SectionFrame(df, "Active Alerts")
+        self.alerts_frame.pack(fill="x", padx=20, pady=(0, 10))
+        self.alerts_empty = ctk.CTkLabel(
+            self.alerts_frame.content, text=f"No active alerts ({len(self.alerts.rules)} rules)", text_color="gray60",
+        )
+        self.alerts_empty.pack(anchor="w", padx=5)
+        self.alert_rows: dict[tuple[str, str], InfoRow] = {}
+
         # Export Report button
         export_btn = ctk.CTkButton(
             df, text="📄 Export Report (CSV)", font=("Roboto", 14), height=36,
@@ -168,6 +265,25 @@ class App(ctk.CTk):
         )
         export_btn.pack(fill="x", padx=20, pady=(0, 10))
 
+        self.latency_label = ctk.CTkLabel(df, text="UI latency: —", font=("Roboto", 12), text_color="gray")
+        self.latency_label.pack(anchor="w", padx=20, pady=(0, 4))
+        self.pacing_label = ctk.CTkLabel(df, text="Polling: —", font=("Roboto", 12), text_color="gray")
+        self.pacing_label.pack(anchor="w", padx=20, pady=(0, 4))
+
+        span = self.history.span()
+        if span is not None:
+            ctk.CTkLabel(
+                df, text=f"History: restored {(span[1] - span[0]) / 3600:.1f} h "
+                         f"({len(self.history.keys())} metrics)",
+                font=("Roboto", 12), text_color="gray",
+            ).pack(anchor="w", padx=20, pady=(0, 10))
+
+        if self.recorder is not None:
+            ctk.CTkButton(
+                df, text="🗄 Export Recorded History (CSV / JSON)", font=("Roboto", 14), height=36,
+                command=self._export_recorded_history,
+            ).pack(fill="x", padx=20, pady=(0, 10))
+
     def setup_cpu_ui(self) -> None:
         """Build static CPU info and per-thread progress bars."""
         cf = self.frames["CPU"]
@@ -184,7 +300,14 @@ class App(ctk.CTk):
         )
         self.cpu_realtime_label.pack(pady=(20, 10), padx=20, anchor="w")
 
-        self.core_bars: list[tuple[ctk.CTkProgressBar, ctk.CTkLabel]] = []
+        # Burst summary from the high-frequency sampler
+        self.cpu_interval_label = ctk.CTkLabel(
+            cf, text="Interval: waiting for samples...",
+            font=("Roboto", 12), text_color="gray60",
+        )
+        self.cpu_interval_label.pack(pady=(0, 10), padx=20, anchor="w")
+
+        self.core_bars: list[tuple[ctk.CTkProgressBar, ctk.CTkLabel, ctk.CTkLabel]] = []
         self.core_container = ctk.CTkFrame(cf, fg_color="transparent")
         self.core_container.pack(fill="x", padx=20)
 
@@ -208,6 +331,85 @@ class App(ctk.CTk):
         self.smart_frame = SectionFrame(sf, "SMART Health Status")
         self.smart_frame.pack(fill="x", padx=20, pady=10)
 
+        # Per-drive attribute sections (only populated when smartctl is installed)
+        self.smart_detail_container = ctk.CTkFrame(sf, fg_color="transparent")
+        self.smart_detail_container.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # Disk space analyzer: which directories fill a mount
+        self.space_frame = SectionFrame(sf, "Disk Space Analyzer")
+        self.space_frame.pack(fill="x", padx=20, pady=10)
+        controls = ctk.CTkFrame(self.space_frame.content, fg_color="transparent")
+        controls.pack(fill="x", pady=(0, 6))
+        self.space_mount = ctk.CTkComboBox(controls, values=[], width=260)
+        self.space_mount.pack(side="left", padx=5)
+        self.space_btn = ctk.CTkButton(controls, text="Analyze", width=100, command=self.toggle_space_scan)
+        self.space_btn.pack(side="left", padx=5)
+        self.space_status = ctk.CTkLabel(controls, text="", text_color="gray60")
+        self.space_status.pack(side="left", padx=10)
+        self.space_rows: list[InfoRow] = []
+        self._space_mounts: list[str] = []
+        self._space_analyzer: SpaceAnalyzer | None = None
+
+    def setup_network_ui(self) -> None:
+        """Prepare the Network container (populated by the monitor loop)."""
+        self.net_container = ctk.CTkFrame(self.frames["Network"], fg_color="transparent")
+        self.net_container.pack(fill="both", expand=True, padx=20, pady=10)
+
+    def setup_processes_ui(self) -> None:
+        """Build the sort selector and a fixed set of top-N process rows."""
+        pf = self.frames["Processes"]
+
+        self.process_sort = "cpu"
+        label_to_key = {label: key for key, label in SORT_KEYS.items()}
+        selector = ctk.CTkSegmentedButton(
+            pf, values=list(SORT_KEYS.values()),
+            command=lambda label: setattr(self, "process_sort", label_to_key[label]),
+        )
+        selector.set(SORT_KEYS[self.process_sort])
+        selector.pack(padx=20, pady=(20, 10), anchor="w")
+
+        self.process_count_label = ctk.CTkLabel(pf, text="", text_color="gray60")
+        self.process_count_label.pack(padx=20, anchor="w")
+
+        table = ctk.CTkFrame(pf)
+        table.pack(fill="x", padx=20, pady=10)
+
+        # Rows are created once and relabelled in place every tick
+        self.process_columns: list[tuple[str, int]] = [
+            ("PID", 70), ("Name", 260), ("CPU", 80), ("Memory", 110), ("I/O", 110),
+        ]
+        self.process_rows: list[dict[str, ctk.CTkLabel]] = []
+        for r in range(self.proc_mod.top_n + 1):
+            row = ctk.CTkFrame(table, fg_color="transparent")
+            row.pack(fill="x", pady=1)
+            labels: dict[str, ctk.CTkLabel] = {}
+            for col, width in self.process_columns:
+                lbl = ctk.CTkLabel(
+                    row, text=col if r == 0 else "", width=width, anchor="w",
+                    font=("Roboto", 12, "bold") if r == 0 else ("Roboto", 12),
+                )
+                lbl.pack(side="left", padx=5)
+                labels[col] = lbl
+            if r:
+                self.process_rows.append(labels)
+
+    def setup_fleet_ui(self) -> None:
+        """Prepare the Fleet status line and per-host container."""
+        ff = self.frames["Fleet"]
+
+        self.fleet_status_label = ctk.CTkLabel(
+            ff,
+            text=(
+                f"Aggregator: {FLEET_AGGREGATOR_ADDR}" if FLEET_AGGREGATOR_ADDR
+                else "Fleet view disabled — set FLEET_AGGREGATOR_ADDR in config.py"
+            ),
+            font=("Roboto", 12), text_color="gray60",
+        )
+        self.fleet_status_label.pack(pady=(20, 0), padx=20, anchor="w")
+
+        self.fleet_container = ctk.CTkFrame(ff, fg_color="transparent")
+        self.fleet_container.pack(fill="both", expand=True, padx=20, pady=10)
+
     def setup_system_ui(self) -> None:
         """Build the static Motherboard & BIOS info section."""
         sf = self.frames["System"]
@@ -241,7 +443,7 @@ class App(ctk.CTk):
         self.scan_rows: dict[str, ctk.CTkLabel] = {}
         self.check_list = self.full_scan_mod.get_full_scan_list()
 
-        for name, _func, _reboot in self.check_list:
+        for name, _func, _reboot, _policy in self.check_list:
             row = ctk.CTkFrame(self.fs_container)
             row.pack(fill="x", pady=5)
 
@@ -259,6 +461,25 @@ class App(ctk.CTk):
 
             self.scan_rows[name] = lbl_status
 
+        # Baselines: save this machine's state under a name, compare later runs with it
+        self.baselines = BaselineStore()
+        self.baseline_frame = SectionFrame(self.fs_container, "Baselines")
+        self.baseline_frame.pack(fill="x", pady=(20, 0))
+        controls = ctk.CTkFrame(self.baseline_frame.content, fg_color="transparent")
+        controls.pack(fill="x", pady=(0, 6))
+        self.baseline_name = ctk.CTkEntry(controls, placeholder_text="Baseline name", width=180)
+        self.baseline_name.pack(side="left", padx=5)
+        ctk.CTkButton(controls, text="Save", width=80, command=self.save_baseline).pack(side="left", padx=5)
+        names = self.baselines.names()
+        self.baseline_choice = ctk.CTkComboBox(controls, values=names, width=180)
+        self.baseline_choice.set(names[0] if names else "")
+        self.baseline_choice.pack(side="left", padx=(20, 5))
+        ctk.CTkButton(controls, text="Compare", width=80, command=self.compare_baseline).pack(side="left", padx=5)
+        self.baseline_status = ctk.CTkLabel(self.baseline_frame.content, text="", text_color="gray60", anchor="w")
+        self.baseline_status.pack(fill="x", padx=5)
+        self.baseline_rows: list[InfoRow] = []
+        self._baseline_comparison: dict[str, Any] | None = None
+
     # ------------------------------------------------------------------
     # Full Scan
     # ------------------------------------------------------------------
@@ -278,81 +499,347 @@ class App(ctk.CTk):
         for lbl in self.scan_rows.values():
             lbl.configure(text="Pending", text_color="gray")
 
-        threading.Thread(target=self._run_full_scan, daemon=True).start()
+        self.engine.submit(self._run_full_scan())
 
-    def _run_full_scan(self) -> None:
-        """Execute each check sequentially in a background thread."""
-        for name, func, reboot in self.check_list:
-            self._ui_scan_status(name, "Running...", "orange")
+    async def _run_full_scan(self) -> None:
+        """Execute each check sequentially on the collection engine."""
+        post = self.engine.post
+        for name, func, reboot, policy in self.check_list:
+            post("scan_status", (name, "Running...", "orange"))
 
             if reboot:
-                if not messagebox.askyesno(
-                    "Reboot Required",
+                question = (
                     f"The check '{name}' requires a system restart.\n\n"
-                    "Do you want to proceed knowing your PC will reboot?",
-                ):
-                    self._ui_scan_status(name, "Skipped by User", "yellow")
+                    "Do you want to proceed knowing your PC will reboot?"
+                )
+                if not await self.engine.ask("scan_confirm", question):
+                    post("scan_status", (name, "Skipped by User", "yellow"))
                     continue
 
             # Error-protected execution (per review feedback)
             try:
-                success, output = func()
+                success, output = await self.full_scan_mod.run_async(func, policy=policy)
             except Exception as exc:
-                self._ui_scan_status(name, f"Error: {str(exc)[:50]}", "red")
+                post("scan_status", (name, f"Error: {str(exc)[:50]}", "red"))
                 print(f"[{name}] EXCEPTION: {exc}")
                 continue
 
             if success:
                 display = output if len(output) < 50 else "OK"
-                self._ui_scan_status(name, display, "green")
+                post("scan_status", (name, display, "green"))
             else:
                 if "Not a Laptop" in output:
-                    self._ui_scan_status(name, "Skipped (Not a Laptop)", "yellow")
+                    post("scan_status", (name, "Skipped (Not a Laptop)", "yellow"))
                 else:
-                    self._ui_scan_status(name, output, "red")
+                    post("scan_status", (name, output, "red"))
                     print(f"[{name}] {output}")
 
-        self.after(0, lambda: self.start_scan_btn.configure(state="normal", text="Start Full Scan"))
+        post("scan_done", None)
+
+    # ------------------------------------------------------------------
+    # Baselines
+    # ------------------------------------------------------------------
+
+    def save_baseline(self) -> None:
+        """Save the current inventory, benchmark, SMART and idle numbers under the entered name."""
+        name = self.baseline_name.get().strip()
+        if not name:
+            messagebox.showwarning("Baselines", "Enter a name for the baseline first.")
+            return
+        self.baseline_status.configure(text=f"Saving baseline '{name}'...")
+        self.engine.submit(self._baseline_task(save_as=name))
+
+    def compare_baseline(self) -> None:
+        """Compare the current numbers with the selected saved baseline."""
+        name = self.baseline_choice.get().strip()
+        if not name:
+            messagebox.showwarning("Baselines", "Save a baseline first.")
+            return
+        self.baseline_status.configure(text=f"Comparing with '{name}'...")
+        self.engine.submit(self._baseline_task(compare_to=name))
+
+    async def _baseline_task(self, save_as: str | None = None, compare_to: str | None = None) -> None:
+        """Summarize the machine on the engine, then store the summary or compare it with a saved one."""
+        run, post = self.engine.blocking, self.engine.post
+        try:
+            summary = await run(self._baseline_summary, save_as or "")
+            if save_as:
+                await run(self.baselines.save, summary)
+                post("baseline_saved", (save_as, await run(self.baselines.names)))
+            else:
+                baseline = await run(self.baselines.get, compare_to)
+                if baseline is None:
+                    raise ValueError(f"no baseline named '{compare_to}'")
+                post("baseline_compared", compare_to_baseline(summary, baseline))
+        except (OSError, ValueError) as e:
+            post("baseline_error", str(e))
+
+    def _baseline_summary(self, name: str) -> dict[str, Any]:
+        """This machine's baseline summary right now (from cached data and stored results; runs no check)."""
+        inventory: dict[str, Any] = {}
+        inventory.update({f"CPU {k}": v for k, v in self.cpu_mod.get_cpu_info().items() if k != 'Error'})
+        ram = getattr(self, "_last_ram", None) or self.ram_mod.get_ram_info()
+        inventory['RAM Total'] = ram.get('Total', "?")
+        inventory.update({f"Board {k}": v for k, v in self.board_mod.get_board_info().items() if k != 'Error'})
+        for i, gpu in enumerate(getattr(self, "_last_gpus", [])):
+            inventory[f"GPU {i}"] = gpu.get('Name', "?")
+        raw_smart = self.disk_mod.get_smart_attributes()
+        for dev, attrs in raw_smart.items():
+            inventory[f"Drive {attrs.get('serial') or dev}"] = attrs.get('model') or "?"
+
+        metrics = {
+            **benchmark_metrics(self.full_scan_mod.latest_benchmarks()),
+            **smart_metrics(raw_smart),
+            **idle_metrics(self.history),
+        }
+        return make_summary(name, inventory, metrics)
+
+    def _apply_baseline_comparison(self, comparison: dict[str, Any]) -> None:
+        self._baseline_comparison = comparison
+        saved = datetime.fromtimestamp(comparison['baseline_ts'])
+        self.baseline_status.configure(
+            text=f"Against '{comparison['baseline']}' ({saved:%Y-%m-%d %H:%M}): "
+                 f"{comparison['regressions']} regressions, {len(comparison['inventory'])} hardware changes",
+            text_color="red" if comparison['regressions'] else "gray60",
+        )
 
-    def _ui_scan_status(self, name: str, text: str, color: str) -> None:
-        """Thread-safe helper to update a scan-row label."""
-        self.after(0, lambda: self.scan_rows[name].configure(text=text, text_color=color))
+        lines = [(f"Changed: {c['item']}", f"{c['baseline'] or '—'} → {c['current'] or '—'}", "orange")
+                 for c in comparison['inventory']]
+        lines += [(d['metric'], f"{format_delta(d)}  {d['status']}", STATUS_COLORS[d['status']])
+                  for d in comparison['metrics']]
+        while len(self.baseline_rows) < len(lines):
+            row = InfoRow(self.baseline_frame.content, "", "")
+            row.label.configure(width=260)
+            row.pack(fill="x", pady=1)
+            self.baseline_rows.append(row)
+        for row, (label, value, color) in zip(self.baseline_rows, lines):
+            row.label.configure(text=label)
+            row.value.configure(text=value, text_color=color or ("gray10", "gray90"))
+        for row in self.baseline_rows[len(lines):]:
+            row.label.configure(text="")
+            row.value.configure(text="")
 
     # ------------------------------------------------------------------
     # Real-time monitor
     # ------------------------------------------------------------------
 
-    def _monitor_loop(self) -> None:
-        """Periodically poll diagnostics and schedule UI updates."""
-        while not self._stop_event.is_set():
+    async def _collect_tick(self) -> dict[str, Any]:
+        """Collect one tick of live data on the engine; independent collectors run concurrently."""
+        run = self.engine.blocking
+        if self.disk_mod.smart.available():
+            self.disk_mod.smart.schedule_refresh()  # smartctl runs as async subprocesses
+
+        gpus, cpu_ram, storage, network, procs, fleet = await asyncio.gather(
+            self.gpu_mod.get_gpu_info_async(),
+            run(self._collect_cpu_ram),
+            run(self._collect_storage),
+            run(self._collect_network),
+            run(self.proc_mod.get_top_processes, self.process_sort),
+            run(self._collect_fleet),
+        )
+        values = flatten_metrics(
+            cpu_ram['cpu_load'], cpu_ram['ram'], storage.pop('disk_io'), network.pop('net_rates'),
+            per_core=cpu_ram['per_core'], gpus=gpus,
+        )
+        now = time.time()
+        self.pacer.observe(cpu_ram['cpu_load'])
+        self.history.record(values, ts=now)
+        events = self.alerts.evaluate(values, now)
+        self._notify(events)
+        if self.recorder is not None:
             try:
-                cpu_load = self.cpu_mod.get_cpu_usage()
-                per_core = self.cpu_mod.get_per_core_usage()
-                self.cpu_usage_var.set(f"{cpu_load}%")
-
-                ram = self.ram_mod.get_ram_info()
-                self.ram_usage_var.set(f"{ram['Percentage']}%")
+                await run(self.recorder.append, values, now)
+            except OSError as e:
+                print(f"Error recording history: {e}")
+        return {
+            'gpus': gpus, 'procs': procs, **cpu_ram, **storage, **network, **fleet,
+            'alerts': self.alerts.active(), 'alert_events': events,
+            'collected_at': time.perf_counter(),
+        }
+
+    def _notify(self, events: list[dict[str, Any]]) -> None:
+        """Send a desktop notification per newly raised alert (engine thread)."""
+        if not ALERT_NOTIFY_SEVERITY or not self._notifier:
+            return
+        floor = SEVERITIES.index(ALERT_NOTIFY_SEVERITY)
+        for e in events:
+            if e['state'] == "raised" and SEVERITIES.index(e['severity']) >= floor:
+                cmd = notify_command(f"Master Sentinal: {e['severity']}", f"{e['rule']} ({e['metric']} = {e['value']:g})")
+                if cmd:
+                    self.engine.submit(run_command(cmd, timeout=5.0))
+
+    def _collect_cpu_ram(self) -> dict[str, Any]:
+        # Prefer the high-frequency sampler's interval aggregate
+        cpu_stats = self.cpu_mod.get_interval_stats()
+        if cpu_stats:
+            cpu_load = cpu_stats['overall']['mean']
+            per_core = cpu_stats['per_core']['mean']
+        else:
+            cpu_load = self.cpu_mod.get_cpu_usage()
+            per_core = self.cpu_mod.get_per_core_usage()
+        return {
+            'cpu_load': cpu_load, 'per_core': per_core, 'cpu_stats': cpu_stats,
+            'ram': self.ram_mod.get_ram_info(),
+        }
+
+    def _collect_storage(self) -> dict[str, Any]:
+        disks = self.disk_mod.get_disk_partitions_and_usage()
+        disk_io = self.disk_mod.get_disk_io()
+        self.disk_mod.attach_io(disks, disk_io)
+        raw_smart = self.disk_mod.get_smart_attributes()
+        smart = self.disk_mod.get_smart_status(raw_smart)
+        smart_attrs = [format_attributes(a) for a in raw_smart.values()]
+        for dev, msgs in self.disk_mod.get_smart_warnings(raw_smart).items():
+            smart[f"{dev} trend"] = "⚠ " + "; ".join(msgs)
+        return {'disks': disks, 'disk_io': disk_io, 'smart': smart, 'smart_attrs': smart_attrs}
+
+    def _collect_network(self) -> dict[str, Any]:
+        net_rates = self.net_mod.get_network_rates()
+        return {'net_rates': net_rates, 'nics': self.net_mod.get_interface_info(net_rates)}
+
+    def _collect_fleet(self) -> dict[str, Any]:
+        if not FLEET_AGGREGATOR_ADDR:
+            return {'fleet': None, 'fleet_status': ""}
+        try:
+            fleet = format_fleet(query_aggregator(FLEET_AGGREGATOR_ADDR))
+        except (OSError, ValueError) as e:
+            return {'fleet': None, 'fleet_status': f"Aggregator {FLEET_AGGREGATOR_ADDR} unreachable: {e}"}
+        online = sum(h['Status'] == "Online" for h in fleet)
+        return {'fleet': fleet, 'fleet_status': f"Aggregator {FLEET_AGGREGATOR_ADDR}: {online}/{len(fleet)} hosts online"}
 
-                gpus = self.gpu_mod.get_gpu_info()
-                self.gpu_count_var.set(f"{len(gpus)} Device(s)")
+    # ------------------------------------------------------------------
+    # Engine → Tk (runs on main thread)
+    # ------------------------------------------------------------------
 
-                disks = self.disk_mod.get_disk_partitions_and_usage()
-                self.disk_count_var.set(f"{len(disks)} Partitions")
-                smart = self.disk_mod.get_smart_status()
+    def _drain_engine(self) -> None:
+        """Apply everything the engine queued since the last poll, then re-arm."""
+        if self._closing:
+            return
+        for topic, payload in self.engine.drain():
+            try:
+                if topic == "tick":
+                    self._apply_tick(payload)
+                elif topic == "scan_status":
+                    name, text, color = payload
+                    self.scan_rows[name].configure(text=text, text_color=color)
+                elif topic == "scan_confirm":
+                    question, reply = payload
+                    reply(messagebox.askyesno("Reboot Required", question))
+                elif topic == "scan_done":
+                    self.start_scan_btn.configure(state="normal", text="Start Full Scan")
+                elif topic == "space_progress":
+                    self._apply_space_progress(payload)
+                elif topic == "space_done":
+                    self._space_analyzer = None
+                    self.space_btn.configure(state="normal", text="Analyze")
+                elif topic == "baseline_saved":
+                    name, names = payload
+                    self.baseline_choice.configure(values=names)
+                    self.baseline_choice.set(name)
+                    self.baseline_status.configure(text=f"Saved baseline '{name}'", text_color="gray60")
+                elif topic == "baseline_compared":
+                    self._apply_baseline_comparison(payload)
+                elif topic == "baseline_error":
+                    self.baseline_status.configure(text=f"Baseline error: {payload}", text_color="red")
+            except Exception as e:
+                print(f"Error applying {topic}: {e}")
+        self.after(ENGINE_UI_POLL_MS, self._drain_engine)
+
+    def _apply_tick(self, tick: dict[str, Any]) -> None:
+        """Publish one tick to the metric bus, export cache and tab widgets."""
+        # Store latest data for export (and for the device sections' item order)
+        self._last_gpus = tick['gpus']
+        self._last_disks = tick['disks']
+        mounts = [d['Mountpoint'] for d in tick['disks'] if d.get('Mountpoint')]
+        if mounts != self._space_mounts:
+            self._space_mounts = mounts
+            self.space_mount.configure(values=mounts)
+            if mounts and not self.space_mount.get():
+                self.space_mount.set(mounts[0])
+        self._last_smart = tick['smart']
+        self._last_smart_attrs = tick['smart_attrs']
+        self._last_ram = tick['ram']
+        self._last_procs = tick['procs']
+        self._last_nics = tick['nics']
+        self._fleet_items = tick['fleet']
+        if tick['fleet'] is not None:
+            self._last_fleet = tick['fleet']
+        self._last_alerts = tick['alerts']
+        self._alert_log.extend(tick['alert_events'])
+        if not self._notifier and any(e['state'] == "raised" for e in tick['alert_events']):
+            self.bell()
+
+        self._publish_tick(tick)
+        self._update_ui(
+            tick['per_core'], tick['smart'], tick['cpu_stats'], tick['procs'],
+            tick['fleet_status'], tick['alerts'],
+        )
+        # Idle callbacks run after Tk has redrawn, so this measures collection → paint
+        self.after_idle(self._mark_painted, tick['collected_at'])
+        self._pace(False)
+
+    def _publish_tick(self, tick: dict[str, Any]) -> None:
+        """Flatten the tick's display values onto the bus (subscribers redraw what changed)."""
+        values: dict[str, Any] = {
+            'dash|cpu': f"{tick['cpu_load']}%",
+            'dash|ram': f"{tick['ram']['Percentage']}%",
+            'dash|gpus': f"{len(tick['gpus'])} Device(s)",
+            'dash|disks': f"{len(tick['disks'])} Partitions",
+        }
+        values.update({f"ram|{k}": str(v) for k, v in tick['ram'].items()})
+        values.update({f"alert|{m}": s for m, s in metric_severity(tick['alerts']).items()})
+        complete = ["dash|", "ram|", "alert|"]
+        for prefix, spec in self._device_sections.items():
+            items = spec['items']()
+            if items is None:
+                continue   # fleet: aggregator unreachable, keep what is shown
+            values.update(keyed_rows(prefix, items, spec['key_fn']))
+            complete.append(prefix)
+        self.bus.publish(values, complete=complete)
 
-                # Store latest data for export
-                self._last_gpus = gpus
-                self._last_disks = disks
-                self._last_smart = smart
-                self._last_ram = ram
+    # ------------------------------------------------------------------
+    # Adaptive polling
+    # ------------------------------------------------------------------
 
-                self.after(0, self._update_ui, per_core, ram, gpus, disks, smart)
+    def _on_window_state(self, event: Any) -> None:
+        if event.widget is self:
+            self._pace(self.pacer.set_visible(self.wm_state() != "iconic"))
 
-            except Exception as e:
-                print(f"Error in monitor: {e}")
+    def _on_focus_change(self, event: Any) -> None:
+        # Focus moving between our own widgets fires Out+In; look once it settles
+        self.after_idle(self._refresh_focus)
 
-            # Use Event.wait instead of time.sleep for clean cancellation
-            self._stop_event.wait(UPDATE_INTERVAL_SEC)
+    def _refresh_focus(self) -> None:
+        try:
+            focused = self.focus_displayof() is not None
+        except KeyError:   # focus inside a Tk-internal widget (e.g. a combobox popdown)
+            focused = True
+        self._pace(self.pacer.set_focused(focused))
+
+    def _on_user_activity(self, event: Any) -> None:
+        # Fires on every mouse move: only do work when it ends a back-off
+        if self.pacer.touch():
+            self._pace(True)
+
+    def _pace(self, sped_up: bool) -> None:
+        """Apply the pacer's current rate; a shortened interval takes effect at once."""
+        if sped_up and not self._closing:
+            self.engine.wake("tick")
+        if self._sampler is not None:
+            self._sampler.slowdown = self.pacer.interval() / self.pacer.base_interval
+        text = self.pacer.describe()
+        if self.pacing_label.cget("text") != text:
+            self.pacing_label.configure(text=text)
+
+    def _mark_painted(self, collected_at: float) -> None:
+        """Record one collection-to-paint latency and refresh the readout."""
+        self._latency.append((time.perf_counter() - collected_at) * 1000.0)
+        ms = sorted(self._latency)
+        dropped = self.engine.mailboxes["tick"].dropped
+        self.latency_label.configure(
+            text=f"UI latency: p50 {ms[len(ms) // 2]:.0f} ms · p95 {ms[int(len(ms) * 0.95)]:.0f} ms · "
+                 f"max {ms[-1]:.0f} ms   ({dropped} stale ticks skipped)",
+        )
 
     # ------------------------------------------------------------------
     # UI update (runs on main thread)
@@ -361,12 +848,14 @@ class App(ctk.CTk):
     def _update_ui(
         self,
         per_core: list[float],
-        ram: dict[str, Any],
-        gpus: list[dict[str, str]],
-        disks: list[dict[str, str]],
         smart: dict[str, str],
+        cpu_stats: dict[str, Any] | None = None,
+        procs: list[dict[str, str]] | None = None,
+        fleet_status: str = "",
+        alerts: list[dict[str, Any]] | None = None,
     ) -> None:
-        """Refresh all live-data widgets. Called via ``self.after()``."""
+        """Refresh the widgets not driven by the metric bus (main thread, from :meth:`_apply_tick`)."""
+        self._update_alerts(alerts or [])
 
         # --- CPU per-thread bars ---
         if len(self.core_bars) != len(per_core):
@@ -382,43 +871,41 @@ class App(ctk.CTk):
                 pb.pack(side="left", fill="x", expand=True, padx=10)
                 val = ctk.CTkLabel(f, text="0%", width=40)
                 val.pack(side="left")
-                self.core_bars.append((pb, val))
+                peak = ctk.CTkLabel(f, text="", width=90, text_color="gray60")
+                peak.pack(side="left")
+                self.core_bars.append((pb, val, peak))
 
+        peaks = cpu_stats['per_core']['max'] if cpu_stats else []
         for i, usage in enumerate(per_core):
             if i < len(self.core_bars):
-                pb, val = self.core_bars[i]
+                pb, val, peak = self.core_bars[i]
                 pb.set(usage / 100)
                 val.configure(text=f"{usage}%")
+                peak.configure(text=f"max {peaks[i]}%" if i < len(peaks) else "")
+
+        if cpu_stats:
+            o = cpu_stats['overall']
+            self.cpu_interval_label.configure(
+                text=(
+                    f"Interval: min {o['min']}% · mean {o['mean']}% · max {o['max']}% · p95 {o['p95']}%"
+                    f"   ({cpu_stats['samples']} samples @ {cpu_stats['rate_hz']} Hz,"
+                    f" sampler {cpu_stats['overhead_pct']}% CPU)"
+                ),
+            )
 
-        # --- Memory ---
-        if not self.mem_widgets:
-            for k, v in ram.items():
-                row = InfoRow(self.memory_info_frame.content, k, str(v))
-                row.pack(fill="x", pady=2)
-                self.mem_widgets[k] = row
-        else:
-            for k, v in ram.items():
-                if k in self.mem_widgets:
-                    self.mem_widgets[k].value.configure(text=str(v))
-
-        # --- GPU / Disk / SMART — via generic helper ---
-        self._update_device_section(
-            container=self.gpu_container,
-            items=gpus,
-            cache=self.gpu_widgets,
-            key_fn=lambda g: g.get('DeviceID', g.get('Name', '')),
-            title_fn=lambda g, i: f"GPU {i + 1}: {g.get('Name', 'Unknown')}",
-            skip_keys={'DeviceID', 'Name'},
-            alert_rules={'Temperature': self._temp_alert_color},
-        )
-
-        self._update_device_section(
-            container=self.storage_container,
-            items=disks,
-            cache=self.disk_widgets,
-            key_fn=lambda d: d.get('Mountpoint', ''),
-            title_fn=lambda d, i: f"{d.get('Device', '?')} ({d.get('Mountpoint', '?')})",
-            skip_keys={'Device', 'Mountpoint'},
+        # --- Fleet status line (the host sections come from the bus) ---
+        if fleet_status:
+            self.fleet_status_label.configure(text=fleet_status)
+
+        # --- Processes (fixed rows, relabelled in place) ---
+        procs = procs or []
+        for i, labels in enumerate(self.process_rows):
+            proc = procs[i] if i < len(procs) else {}
+            for col, _width in self.process_columns:
+                labels[col].configure(text=proc.get(col, ""))
+        self.process_count_label.configure(
+            text=f"Tracking {self.proc_mod.get_process_count()} processes — "
+                 f"top {self.proc_mod.top_n} by {SORT_KEYS[self.process_sort]}",
         )
 
         # SMART — flat key→value (no nested dicts), use simpler path
@@ -430,12 +917,97 @@ class App(ctk.CTk):
             for k, v in smart.items():
                 r = InfoRow(self.smart_frame.content, k, str(v))
                 r.pack(fill="x", pady=2)
+                if k.endswith(" trend"):
+                    r.value.configure(text_color="orange")
                 self.smart_widgets[k] = r
         else:
             for k, v in smart.items():
                 if k in self.smart_widgets:
                     self.smart_widgets[k].value.configure(text=str(v))
 
+    # ------------------------------------------------------------------
+    # Metric bus subscribers
+    # ------------------------------------------------------------------
+
+    def _on_dashboard_changes(self, changes: ChangeSet) -> None:
+        cards = {
+            'dash|cpu': self.cpu_usage_var, 'dash|ram': self.ram_usage_var,
+            'dash|gpus': self.gpu_count_var, 'dash|disks': self.disk_count_var,
+        }
+        for key, value in changes.changed.items():
+            cards[key].set(value)
+
+    def _on_memory_changes(self, changes: ChangeSet) -> None:
+        for key, value in changes.changed.items():
+            name = key[len("ram|"):]
+            row = self.mem_widgets.get(name)
+            if row is None:
+                row = self.mem_widgets[name] = InfoRow(self.memory_info_frame.content, name, value)
+                row.pack(fill="x", pady=2)
+            else:
+                row.value.configure(text=value)
+
+    def _device_section_specs(self) -> dict[str, dict[str, Any]]:
+        """Bus prefix → arguments for :meth:`_update_device_section` (``items`` is a getter)."""
+        def gpu_alert(i: int, k: str) -> str | None:
+            if k not in GPU_METRICS:
+                return None
+            return self.bus.get(f"alert|gpu.{i}.{GPU_METRICS[k]}")
+
+        return {
+            'gpu|': {
+                'items': lambda: getattr(self, "_last_gpus", []),
+                'container': self.gpu_container, 'cache': self.gpu_widgets,
+                'key_fn': lambda g: g.get('DeviceID', g.get('Name', '')),
+                'title_fn': lambda g, i: f"GPU {i + 1}: {g.get('Name', 'Unknown')}",
+                'skip_keys': {'DeviceID', 'Name'},
+                'alert_metric': gpu_alert,
+                'also': ("alert|gpu.",),   # recolour when a GPU alert is raised or cleared
+            },
+            'disk|': {
+                'items': lambda: getattr(self, "_last_disks", []),
+                'container': self.storage_container, 'cache': self.disk_widgets,
+                'key_fn': lambda d: d.get('Mountpoint', ''),
+                'title_fn': lambda d, i: f"{d.get('Device', '?')} ({d.get('Mountpoint', '?')})",
+                'skip_keys': {'Device', 'Mountpoint'},
+                'alert_rules': {'Status': lambda v: "orange" if v.startswith("Unresponsive") else None},
+            },
+            'net|': {
+                'items': lambda: getattr(self, "_last_nics", None) or [],
+                'container': self.net_container, 'cache': self.net_widgets,
+                'key_fn': lambda n: n.get('Interface', ''),
+                'title_fn': lambda n, i: n.get('Interface', '?'),
+                'skip_keys': {'Interface'},
+            },
+            'smart|': {
+                'items': lambda: getattr(self, "_last_smart_attrs", None) or [],
+                'container': self.smart_detail_container, 'cache': self.smart_detail_widgets,
+                'key_fn': lambda a: a.get('Device', ''),
+                'title_fn': lambda a, i: f"{a.get('Model', 'Drive')} ({a.get('Device', '?')})",
+                'skip_keys': {'Device'},
+                'alert_rules': {
+                    'Health': lambda v: None if v == "PASSED" else "red",
+                    'Reallocated Sectors': self._nonzero_alert_color,
+                    'Pending Sectors': self._nonzero_alert_color,
+                    'Media Errors': self._nonzero_alert_color,
+                },
+            },
+            'fleet|': {
+                # None while the aggregator is unreachable: sections are kept as-is
+                'items': lambda: self._fleet_items,
+                'container': self.fleet_container, 'cache': self.fleet_widgets,
+                'key_fn': lambda h: h.get('Host', ''),
+                'title_fn': lambda h, i: h.get('Host', '?'),
+                'skip_keys': {'Host'},
+                'alert_rules': {'Status': lambda v: {"Stale": "orange", "Offline": "red"}.get(v)},
+            },
+        }
+
+    def _on_device_changes(self, prefix: str, changes: ChangeSet) -> None:
+        spec = dict(self._device_sections[prefix])
+        items = spec.pop('items')() or []
+        self._update_device_section(items=items, prefix=prefix, changes=changes, **spec)
+
     # ------------------------------------------------------------------
     # Generic device-section updater (eliminates GPU/Disk duplication)
     # ------------------------------------------------------------------
@@ -444,13 +1016,20 @@ class App(ctk.CTk):
         self,
         container: ctk.CTkFrame,
         items: list[dict[str, str]],
-        cache: dict[str, dict[str, InfoRow]],
+        cache: dict[str, SectionFrame],
         key_fn: Callable[[dict[str, str]], str],
         title_fn: Callable[[dict[str, str], int], str],
         skip_keys: set[str] | None = None,
         alert_rules: dict[str, Callable[[str], str | None]] | None = None,
+        alert_metric: Callable[[int, str], str | None] | None = None,
+        prefix: str = "",
+        changes: ChangeSet | None = None,
     ) -> None:
-        """Compare *items* against *cache*; rebuild only when keys change.
+        """Reconcile *items* with *cache*, touching only what changed.
+
+        Sections whose key disappeared are destroyed, new keys get a new
+        section packed in item order, and surviving sections are updated in
+        place (gaining rows for any metric they did not report before).
 
         Parameters
         ----------
@@ -459,7 +1038,8 @@ class App(ctk.CTk):
         items:
             Latest data from a diagnostic module.
         cache:
-            Mutable dict ``{stable_id: {metric: InfoRow}}``.
+            Mutable dict ``{stable_id: SectionFrame}``; rows live in
+            ``SectionFrame.rows``.
         key_fn:
             Extracts a stable identifier from each item dict.
         title_fn:
@@ -469,65 +1049,85 @@ class App(ctk.CTk):
         alert_rules:
             Optional ``{metric_key: fn(value_str) -> color_or_None}`` for
             conditional highlighting.
+        alert_metric:
+            Optional ``fn(item_index, row_key) -> severity_or_None`` giving
+            the active alert (from :mod:`modules.alerts`) behind a row;
+            takes precedence over *alert_rules*.
+        prefix, changes:
+            The bus prefix these items were published under and the change
+            set that triggered this call; existing rows whose key
+            (``f"{prefix}{id}|{row}"``) is not in it are left alone.
         """
         skip = skip_keys or set()
         rules = alert_rules or {}
-
-        current_sigs = [key_fn(item) for item in items]
-        cached_sigs = list(cache.keys())
-
-        if current_sigs != cached_sigs:
-            # Full rebuild
-            for child in container.winfo_children():
-                child.destroy()
-            cache.clear()
-
-            for i, item in enumerate(items):
-                sid = key_fn(item)
-                section = SectionFrame(container, title_fn(item, i))
-                section.pack(fill="x", pady=10)
-
-                rows: dict[str, InfoRow] = {}
-                for k, v in item.items():
-                    if k not in skip:
-                        r = InfoRow(section.content, k, str(v))
-                        r.pack(fill="x", pady=2)
-                        rows[k] = r
-                        # Apply alert colour if rule matches
-                        color = rules.get(k, lambda _: None)(str(v))
-                        if color:
-                            r.value.configure(text_color=color)
-                cache[sid] = rows
-        else:
-            # In-place update
-            for item in items:
-                sid = key_fn(item)
-                if sid in cache:
-                    rows = cache[sid]
-                    for k, v in item.items():
-                        if k in rows:
-                            rows[k].value.configure(text=str(v))
-                            color = rules.get(k, lambda _: None)(str(v))
-                            if color:
-                                rows[k].value.configure(text_color=color)
-                            else:
-                                # Reset to default
-                                rows[k].value.configure(text_color=("gray10", "gray90"))
+        recolor = changes is None or changes.touches("alert|")
+
+        current = {key_fn(item) for item in items}
+        for sid in [sid for sid in cache if sid not in current]:
+            cache.pop(sid).destroy()
+
+        previous: SectionFrame | None = None
+        for i, item in enumerate(items):
+            sid = key_fn(item)
+            section = cache.get(sid)
+            title = title_fn(item, i)
+
+            if section is None:
+                section = SectionFrame(container, title)
+                if previous is not None:
+                    section.pack(fill="x", pady=10, after=previous)
+                elif container.pack_slaves():
+                    section.pack(fill="x", pady=10, before=container.pack_slaves()[0])
+                else:
+                    section.pack(fill="x", pady=10)
+                cache[sid] = section
+            elif section.title.cget("text") != title:
+                section.title.configure(text=title)
+            previous = section
+
+            base = f"{prefix}{sid}{SEP}"
+            for k, v in item.items():
+                if k in skip:
+                    continue
+                row = section.rows.get(k)
+                if row is None:
+                    row = section.add_row(k, str(v))
+                elif changes is None or base + k in changes:
+                    row.value.configure(text=str(v))
+                elif not recolor:
+                    continue
+                severity = alert_metric(i, k) if alert_metric else None
+                color = SEVERITY_COLORS[severity] if severity else rules.get(k, lambda _: None)(str(v))
+                # Apply alert colour if rule matches, otherwise reset to default
+                row.value.configure(text_color=color or ("gray10", "gray90"))
 
     # ------------------------------------------------------------------
-    # Temperature alert helper
+    # Alerts
     # ------------------------------------------------------------------
 
+    def _update_alerts(self, alerts: list[dict[str, Any]]) -> None:
+        """Reconcile the Dashboard's Active Alerts rows with *alerts*."""
+        current = {(a['rule'], a['metric']): a for a in alerts}
+        for ident in [ident for ident in self.alert_rows if ident not in current]:
+            self.alert_rows.pop(ident).destroy()
+        for ident, a in current.items():
+            text = f"{a['metric']} = {a['value']:g}  ({a['severity']}, since {datetime.fromtimestamp(a['since']):%H:%M:%S})"
+            row = self.alert_rows.get(ident)
+            if row is None:
+                row = self.alert_rows[ident] = InfoRow(self.alerts_frame.content, a['rule'], text)
+                row.pack(fill="x", pady=2)
+                row.value.configure(text_color=SEVERITY_COLORS[a['severity']])
+            else:
+                row.value.configure(text=text)
+        if current:
+            self.alerts_empty.pack_forget()
+        elif not self.alerts_empty.winfo_ismapped():
+            self.alerts_empty.pack(anchor="w", padx=5)
+
     @staticmethod
-    def _temp_alert_color(value: str) -> str | None:
-        """Return ``'red'`` if *value* represents a temperature ≥ threshold."""
-        try:
-            num = float(value.replace("°", "").replace("C", "").strip())
-            if num >= TEMP_ALERT_THRESHOLD_C:
-                return "red"
-        except (ValueError, AttributeError):
-            pass
-        return None
+    def _nonzero_alert_color(value: str) -> str | None:
+        """Return ``'orange'`` for a counter that should normally be zero."""
+        return "orange" if value not in ("0", "N/A") else None
 
     # ------------------------------------------------------------------
     # Export report
@@ -544,50 +1144,210 @@ class App(ctk.CTk):
             return
 
         try:
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Section", "Key", "Value"])
-
-                # CPU
-                writer.writerow(["CPU", "Usage", self.cpu_usage_var.get()])
-                info = self.cpu_mod.get_cpu_info()
-                for k, v in info.items():
-                    writer.writerow(["CPU", k, v])
-
-                # RAM
-                ram = getattr(self, "_last_ram", self.ram_mod.get_ram_info())
-                for k, v in ram.items():
-                    writer.writerow(["RAM", k, v])
-
-                # GPUs
-                gpus = getattr(self, "_last_gpus", self.gpu_mod.get_gpu_info())
-                for i, gpu in enumerate(gpus):
-                    for k, v in gpu.items():
-                        writer.writerow([f"GPU {i}", k, v])
-
-                # Disks
-                disks = getattr(self, "_last_disks", self.disk_mod.get_disk_partitions_and_usage())
-                for disk in disks:
-                    label = disk.get("Mountpoint", "?")
-                    for k, v in disk.items():
-                        writer.writerow([f"Disk {label}", k, v])
-
-                # SMART
-                smart = getattr(self, "_last_smart", self.disk_mod.get_smart_status())
-                for k, v in smart.items():
-                    writer.writerow(["SMART", k, v])
-
+            self.write_report(path)
             messagebox.showinfo("Export Complete", f"Report saved to:\n{path}")
         except Exception as e:
             messagebox.showerror("Export Failed", str(e))
 
+    def write_report(self, path: str) -> None:
+        """Write the current diagnostics snapshot to *path* as CSV (no dialogs)."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Section", "Key", "Value"])
+
+            # CPU
+            writer.writerow(["CPU", "Usage", self.cpu_usage_var.get()])
+            info = self.cpu_mod.get_cpu_info()
+            for k, v in info.items():
+                writer.writerow(["CPU", k, v])
+
+            # RAM
+            ram = getattr(self, "_last_ram", self.ram_mod.get_ram_info())
+            for k, v in ram.items():
+                writer.writerow(["RAM", k, v])
+
+            # GPUs
+            gpus = getattr(self, "_last_gpus", self.gpu_mod.get_gpu_info())
+            for i, gpu in enumerate(gpus):
+                for k, v in gpu.items():
+                    writer.writerow([f"GPU {i}", k, v])
+
+            # Disks
+            disks = getattr(self, "_last_disks", self.disk_mod.get_disk_partitions_and_usage())
+            for disk in disks:
+                label = disk.get("Mountpoint", "?")
+                for k, v in disk.items():
+                    writer.writerow([f"Disk {label}", k, v])
+
+            # SMART
+            smart = getattr(self, "_last_smart", self.disk_mod.get_smart_status())
+            for k, v in smart.items():
+                writer.writerow(["SMART", k, v])
+            for attrs in getattr(self, "_last_smart_attrs", []):
+                label = f"SMART {attrs.get('Device', '?')}"
+                for k, v in attrs.items():
+                    writer.writerow([label, k, v])
+
+            # Network interfaces
+            for nic in getattr(self, "_last_nics", []):
+                label = f"Network {nic.get('Interface', '?')}"
+                for k, v in nic.items():
+                    writer.writerow([label, k, v])
+
+            # Fleet hosts (last successful aggregator query)
+            for host in getattr(self, "_last_fleet", []):
+                label = f"Fleet {host.get('Host', '?')}"
+                for k, v in host.items():
+                    writer.writerow([label, k, v])
+
+            # Alerts (active, then the recent raised / cleared log)
+            for a in getattr(self, "_last_alerts", []):
+                writer.writerow([
+                    f"Alert {a['severity']}", a['rule'],
+                    f"{a['metric']} = {a['value']:g} since {datetime.fromtimestamp(a['since']):%Y-%m-%d %H:%M:%S}",
+                ])
+            for e in self._alert_log:
+                writer.writerow([
+                    "Alert Log", f"{datetime.fromtimestamp(e['time']):%Y-%m-%d %H:%M:%S} {e['state']}",
+                    f"{e['rule']}: {e['metric']} = {e['value']:g}",
+                ])
+
+            # Metric history (min / mean / max over the last HISTORY_WINDOW_SEC)
+            since = time.time() - HISTORY_WINDOW_SEC
+            for key in self.history.keys():
+                stats = self.history.summary(key, since)
+                if stats:
+                    writer.writerow([
+                        "History", f"{key} (min/mean/max)",
+                        f"{stats['min']:.2f} / {stats['mean']:.2f} / {stats['max']:.2f}",
+                    ])
+
+            # Last baseline comparison
+            comparison = self._baseline_comparison
+            if comparison is not None:
+                label = f"Baseline {comparison['baseline']}"
+                saved = datetime.fromtimestamp(comparison['baseline_ts'])
+                writer.writerow([label, "Saved", f"{saved:%Y-%m-%d %H:%M:%S}"])
+                writer.writerow([label, "Regressions", comparison['regressions']])
+                for c in comparison['inventory']:
+                    writer.writerow([label, f"Changed: {c['item']}", f"{c['baseline'] or '—'} → {c['current'] or '—'}"])
+                for d in comparison['metrics']:
+                    writer.writerow([label, d['metric'], f"{format_delta(d)} {d['status']}"])
+
+            # Top processes
+            for proc in getattr(self, "_last_procs", []):
+                label = f"Process {proc.get('PID', '?')}"
+                for k, v in proc.items():
+                    writer.writerow([label, k, v])
+
+    def _export_recorded_history(self) -> None:
+        """Export every recorded sample (all segments) as long-format CSV or JSON."""
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile=f"MasterSentinal_History_{datetime.now():%Y%m%d_%H%M%S}.csv",
+        )
+        if not path:
+            return
+
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                if path.lower().endswith(".json"):
+                    count = self.recorder.export_json(f)
+                else:
+                    count = self.recorder.export_csv(f)
+            messagebox.showinfo("Export Complete", f"{count} samples saved to:\n{path}")
+        except Exception as e:
+            messagebox.showerror("Export Failed", str(e))
+
+    # ------------------------------------------------------------------
+    # Disk space analyzer
+    # ------------------------------------------------------------------
+
+    def toggle_space_scan(self) -> None:
+        """Analyze the selected mount, or stop the analysis that is running."""
+        if self._space_analyzer is not None:
+            self._space_analyzer.cancel()
+            self.space_btn.configure(state="disabled", text="Stopping...")
+            return
+        root = self.space_mount.get().strip()
+        if not os.path.isdir(root):
+            messagebox.showerror("Disk Space Analyzer", f"Not a directory: {root}")
+            return
+        self._space_analyzer = SpaceAnalyzer(root)
+        self.space_btn.configure(text="Stop")
+        self.space_status.configure(text="Scanning...")
+        # Own thread: a long walk must not hold one of the engine's few executor slots
+        threading.Thread(
+            target=self._space_scan, args=(self._space_analyzer,), name="space-scan", daemon=True,
+        ).start()
+
+    def _space_scan(self, analyzer: SpaceAnalyzer) -> None:
+        """Scan thread: stream partial results to Tk through the engine."""
+        post = self.engine.post
+        try:
+            analyzer.index = SpaceIndex(SPACE_INDEX_FILE)   # SQLite connections stay on this thread
+            analyzer.scan(progress=lambda snapshot: post("space_progress", snapshot))
+        except (OSError, sqlite3.Error) as e:
+            post("space_progress", {'Error': str(e)})
+        finally:
+            if analyzer.index is not None:
+                analyzer.index.close()
+            post("space_done", None)
+
+    def _apply_space_progress(self, snapshot: dict[str, Any]) -> None:
+        if 'Error' in snapshot:
+            self.space_status.configure(text=f"Error: {snapshot['Error']}")
+            return
+        tree = snapshot['tree']
+        if snapshot['complete']:
+            state = "Done"
+        else:
+            state = "Scanning" if self._space_analyzer is not None else "Stopped"
+        self.space_status.configure(
+            text=f"{state}: {format_size(tree['bytes'])} in {tree['files']:,} files, {tree['dirs']:,} dirs "
+                 f"· {snapshot['elapsed']:.1f}s ({snapshot['reused_dirs']:,} unchanged dirs from the index)",
+        )
+
+        # Largest directories, each with its three largest subdirectories
+        lines: list[tuple[str, dict[str, Any]]] = []
+        for child in tree.get('children', []):
+            lines.append((child['name'], child))
+            lines.extend((f"   └ {sub['name']}", sub) for sub in child.get('children', [])[:3])
+        while len(self.space_rows) < len(lines):
+            row = InfoRow(self.space_frame.content, "", "")
+            row.label.configure(width=260)
+            row.pack(fill="x", pady=1)
+            self.space_rows.append(row)
+        total = tree['bytes'] or 1
+        for row, (label, node) in zip(self.space_rows, lines):
+            row.label.configure(text=label)
+            row.value.configure(
+                text=f"{format_size(node['bytes'])}  ({node['bytes'] * 100 / total:.1f}%) · {node['files']:,} files",
+            )
+        for row in self.space_rows[len(lines):]:
+            row.label.configure(text="")
+            row.value.configure(text="")
+
     # ------------------------------------------------------------------
     # Shutdown
     # ------------------------------------------------------------------
 
     def on_closing(self) -> None:
-        """Signal the monitor thread to stop and destroy the window."""
-        self._stop_event.set()
+        """Stop the collection engine (cancelling running commands) and destroy the window."""
+        self._closing = True
+        if self._space_analyzer is not None:
+            self._space_analyzer.cancel()
+        self.engine.stop()
+        self.cpu_mod.stop_sampler()
+        if self.recorder is not None:
+            try:
+                self.recorder.flush()
+            except OSError as e:
+                print(f"Error saving recorded history: {e}")
+        if self.capture is not None:
+            self.capture.close()
+        self.history.close()
         self.destroy()
 
 
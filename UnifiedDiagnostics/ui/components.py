@@ -42,8 +42,11 @@ class SectionFrame(ctk.CTkFrame):
         self.content = ctk.CTkFrame(self, fg_color="transparent")
         self.content.pack(fill="both", expand=True, padx=10, pady=5)
 
+        self.rows: dict[str, InfoRow] = {}
+
     def add_row(self, label: str, value: str) -> "InfoRow":
-        """Add a label-value row and return the InfoRow widget reference."""
+        """Add a label-value row, remember it in *rows*, and return it."""
         row = InfoRow(self.content, label, value)
         row.pack(fill="x", pady=2)
+        self.rows[label] = row
         return row
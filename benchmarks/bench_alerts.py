@@ -0,0 +1,73 @@
+"""Benchmark alert rule evaluation for many rules over a realistic tick.
+
+Usage::
+
+    python benchmarks/bench_alerts.py [--rules 1000] [--cores 64] [--ticks 500]
+
+Builds a tick the size of a large workstation (per-core CPU, disks, NICs,
+GPUs), then times evaluating every rule against it, including the first
+tick that binds rules to metric keys.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.alerts import AlertEngine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--cores", type=int, default=64)
+    parser.add_argument("--ticks", type=int, default=500)
+    args = parser.parse_args()
+
+    keys = ["cpu.usage", "ram.percent"]
+    keys += [f"cpu.core{i}.usage" for i in range(args.cores)]
+    keys += [f"disk.nvme{i}n1.{m}" for i in range(8) for m in ("read_mb_s", "write_mb_s", "busy_pct")]
+    keys += [f"net.eth{i}.{m}" for i in range(8) for m in ("rx_mb_s", "tx_mb_s")]
+    keys += [f"gpu.{i}.{m}" for i in range(4) for m in ("load_pct", "memory_used_mb", "temperature_c")]
+
+    rng = np.random.default_rng(1)
+    ops = (">", ">=", "<", "<=", "==", "!=")
+    rules = []
+    for i in range(args.rules):
+        # Mostly exact keys, some wildcards that fan out over cores / devices
+        metric = keys[i % len(keys)] if i % 10 else ("cpu.core*.usage", "disk.*.busy_pct", "gpu.*.temperature_c")[i % 3]
+        rules.append({
+            'metric': metric, 'op': ops[i % len(ops)], 'threshold': float(rng.integers(0, 100)),
+            'for_sec': float(i % 5), 'hysteresis': float(i % 3), 'severity': ("info", "warning", "critical")[i % 3],
+        })
+
+    ticks = [dict(zip(keys, rng.uniform(0, 100, len(keys)))) for _ in range(args.ticks)]
+
+    engine = AlertEngine(rules)
+    t0 = time.perf_counter()
+    engine.evaluate(ticks[0], 0.0)
+    bind = time.perf_counter() - t0
+    pairs = len(engine._pair_rule)
+    print(f"{len(engine.rules)} rules x {len(keys)} metrics -> {pairs} rule/metric pairs")
+    print(f"first tick (binds rules):   {bind * 1000:8.2f} ms")
+
+    events = 0
+    t0 = time.perf_counter()
+    for n, tick in enumerate(ticks[1:], 1):
+        events += len(engine.evaluate(tick, float(n)))
+    per_tick = (time.perf_counter() - t0) / max(len(ticks) - 1, 1)
+    print(f"evaluate, per tick:         {per_tick * 1000:8.3f} ms  ({events} raised/cleared events)")
+
+    t0 = time.perf_counter()
+    active = engine.active()
+    print(f"active() snapshot:          {(time.perf_counter() - t0) * 1000:8.3f} ms  ({len(active)} active)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark metric-bus fan-out against every consumer diffing full snapshots.
+
+Usage::
+
+    python benchmarks/bench_bus.py [--keys 5000] [--subscribers 12] [--ticks 200]
+
+Publishes *keys* metrics spread over *subscribers* prefixes (plus one
+subscriber listening to everything) and changes 1 %, 10 % and 100 % of
+them per tick.  The baseline hands each consumer the full snapshot and
+lets it compare against its own copy, which is what the widgets did
+before the bus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.bus import MetricBus
+
+
+def make_keys(n: int, groups: int) -> list[str]:
+    return [f"g{i % groups}|dev{i // groups}|metric" for i in range(n)]
+
+
+def ticks(keys: list[str], fraction: float, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    values = {k: 0 for k in keys}
+    changed = max(1, int(len(keys) * fraction))
+    out = []
+    for t in range(count):
+        for k in rng.sample(keys, changed):
+            values[k] = t + 1
+        out.append(dict(values))
+    return out
+
+
+def run_bus(keys: list[str], groups: int, frames: list[dict]) -> tuple[float, int]:
+    bus = MetricBus()
+    received = [0]
+
+    def consume(changes):
+        received[0] += len(changes.changed)
+
+    for g in range(groups):
+        bus.subscribe(f"g{g}|", consume)
+    bus.subscribe("", consume)
+    bus.publish(dict.fromkeys(keys, 0))
+    received[0] = 0
+    started = time.perf_counter()
+    for frame in frames:
+        bus.publish(frame)
+    return time.perf_counter() - started, received[0]
+
+
+def run_full_diff(keys: list[str], groups: int, frames: list[dict]) -> tuple[float, int]:
+    prefixes = [f"g{g}|" for g in range(groups)] + [""]
+    copies = [{k: 0 for k in keys if k.startswith(p)} for p in prefixes]
+    received = 0
+    started = time.perf_counter()
+    for frame in frames:
+        for prefix, mine in zip(prefixes, copies):
+            for k, v in frame.items():
+                if k.startswith(prefix) and mine.get(k) != v:
+                    mine[k] = v
+                    received += 1
+    return time.perf_counter() - started, received
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--subscribers", type=int, default=12)
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+
+    keys = make_keys(args.keys, args.subscribers)
+    print(f"{args.keys} keys, {args.subscribers + 1} subscribers, {args.ticks} ticks")
+    for fraction in (0.01, 0.10, 1.0):
+        frames = ticks(keys, fraction, args.ticks)
+        bus_s, bus_n = run_bus(keys, args.subscribers, frames)
+        diff_s, diff_n = run_full_diff(keys, args.subscribers, frames)
+        assert bus_n == diff_n, (bus_n, diff_n)
+        print(f"{fraction:5.0%} changed: bus {bus_s / args.ticks * 1000:7.3f} ms/tick   "
+              f"full diff {diff_s / args.ticks * 1000:7.3f} ms/tick   "
+              f"({bus_n / args.ticks:,.0f} deliveries/tick)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Load-test the fleet aggregator with many simulated agents.
+
+Usage::
+
+    python benchmarks/bench_fleet.py [--agents 200] [--keys 60] [--interval 2] [--duration 30]
+
+Starts an aggregator in a child process, connects the simulated agents
+from this process (each a random walk over ``--keys`` metrics), and reports
+the aggregator's CPU use, resident memory and average bytes per frame.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.fleet import FleetAgent, query_aggregator, run_aggregator
+
+
+def random_walk(keys: int, seed: int):
+    rng = random.Random(seed)
+    state = {f"metric.{i}": rng.uniform(0, 100) for i in range(keys)}
+
+    def collect() -> dict[str, float]:
+        for k in state:
+            # Most metrics are steady between ticks; some move
+            if rng.random() < 0.3:
+                state[k] = min(max(state[k] + rng.gauss(0, 5), 0.0), 100.0)
+        return dict(state)
+    return collect
+
+
+async def run_agents(addr: str, args: argparse.Namespace, proc: psutil.Process) -> None:
+    agents = [
+        FleetAgent(addr, random_walk(args.keys, i), host=f"sim-{i:04d}", info={"os": "Simulated"},
+                   interval=args.interval)
+        for i in range(args.agents)
+    ]
+    tasks = [asyncio.create_task(a.run()) for a in agents]
+
+    # Let every agent connect and send its first full snapshot
+    await asyncio.sleep(max(args.interval * 2, 2.0))
+    cpu0 = proc.cpu_times()
+    t0 = time.perf_counter()
+    await asyncio.sleep(args.duration)
+    cpu1 = proc.cpu_times()
+    elapsed = time.perf_counter() - t0
+
+    loop = asyncio.get_running_loop()
+    t_query = time.perf_counter()
+    view = await loop.run_in_executor(None, query_aggregator, addr, 10.0)
+    t_query = time.perf_counter() - t_query
+
+    for a in agents:
+        a.stop()
+    await asyncio.gather(*tasks)
+
+    hosts = view["hosts"]
+    frames = sum(h["frames"] for h in hosts.values())
+    rx = sum(h["rx_bytes"] for h in hosts.values())
+    busy = (cpu1.user + cpu1.system - cpu0.user - cpu0.system) / elapsed * 100
+    print(f"hosts reporting:     {sum(h['status'] == 'Online' for h in hosts.values())}/{args.agents}")
+    print(f"aggregator CPU:      {busy:.2f}% of one core "
+          f"({args.agents / args.interval:.0f} frames/s offered)")
+    print(f"aggregator RSS:      {proc.memory_info().rss / 1024 ** 2:.1f} MB")
+    print(f"avg frame size:      {rx / max(frames, 1):.0f} bytes ({args.keys} metrics/host)")
+    print(f"fleet query:         {t_query * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--keys", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    addr = f"127.0.0.1:{port}"
+
+    server = multiprocessing.Process(target=run_aggregator, args=(addr,), daemon=True)
+    server.start()
+    try:
+        proc = psutil.Process(server.pid)
+        print(f"baseline aggregator RSS: {proc.memory_info().rss / 1024 ** 2:.1f} MB")
+        asyncio.run(run_agents(addr, args, proc))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare binary history segments with JSONL for size and query time.
+
+Usage::
+
+    python benchmarks/bench_history_store.py [--hours 24] [--cores 32]
+
+Records 1 Hz snapshots (per-core usage plus disk/network rates) both as
+segments and as one JSON object per line, then times pulling one metric
+for a one-hour window from the middle of the recording.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.history_store import HistoryRecorder
+
+
+def snapshots(hours: int, cores: int):
+    rng = np.random.default_rng(0)
+    n = hours * 3600
+    t0 = 1_700_000_000.0
+    # Per-core usage: noisy random walk at 0.1% resolution, clipped to [0, 100]
+    core = np.clip(np.cumsum(rng.normal(0, 2, (n, cores)), axis=0) % 200 - 50, 0, 100).round(1)
+    ram = np.round(40 + np.cumsum(rng.normal(0, 0.01, n)), 1)
+    rx = np.abs(rng.normal(2e6, 5e5, n))
+    busy = np.where(rng.random(n) < 0.9, 0.0, rng.uniform(0, 30, n))
+    for i in range(n):
+        snap = {f"cpu.core{c}.usage": float(core[i, c]) for c in range(cores)}
+        snap["cpu.usage"] = float(core[i].mean())
+        snap["ram.percent"] = float(ram[i])
+        snap["net.eth0.rx_bytes_s"] = float(rx[i])
+        snap["net.eth0.rx_errors_s"] = 0.0
+        snap["disk.sda.busy_pct"] = float(busy[i])
+        yield t0 + i, snap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--cores", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rec = HistoryRecorder(directory=os.path.join(tmp, "segments"), segment_sec=3600)
+        jsonl = os.path.join(tmp, "history.jsonl")
+
+        seg_write = jsonl_write = 0.0
+        with open(jsonl, "w", encoding="utf-8") as f:
+            for ts, snap in snapshots(args.hours, args.cores):
+                t = time.perf_counter()
+                rec.append(snap, ts=ts)
+                seg_write += time.perf_counter() - t
+                t = time.perf_counter()
+                f.write(json.dumps({"ts": ts, **snap}) + "\n")
+                jsonl_write += time.perf_counter() - t
+        rec.flush()
+
+        seg_size = sum(os.path.getsize(p) for p in rec.segments())
+        jsonl_size = os.path.getsize(jsonl)
+        rows = args.hours * 3600
+        print(f"{rows} snapshots x {args.cores + 6} metrics")
+        print(f"  JSONL:    {jsonl_size / 1024 ** 2:8.1f} MB  ({jsonl_write:.1f} s to write)")
+        print(f"  segments: {seg_size / 1024 ** 2:8.1f} MB  ({seg_write:.1f} s to write, "
+              f"{jsonl_size / seg_size:.1f}x smaller)")
+
+        start = 1_700_000_000.0 + rows / 2
+        end = start + 3600
+        metric = "cpu.core7.usage"
+
+        t = time.perf_counter()
+        ts_seg, v_seg = rec.query(metric, start, end)
+        seg_query = time.perf_counter() - t
+
+        t = time.perf_counter()
+        ts_j, v_j = [], []
+        with open(jsonl, encoding="utf-8") as f:
+            for line in f:
+                doc = json.loads(line)
+                if start <= doc["ts"] <= end:
+                    ts_j.append(doc["ts"])
+                    v_j.append(doc[metric])
+        jsonl_query = time.perf_counter() - t
+
+        assert np.allclose(v_seg, v_j)
+        print(f"one metric, one hour ({ts_seg.size} samples):")
+        print(f"  JSONL scan:        {jsonl_query * 1000:10.1f} ms")
+        print(f"  segment mmap read: {seg_query * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the tick pipeline and the UI against a synthetic large machine.
+
+Usage::
+
+    python benchmarks/bench_replay.py [--cores 256] [--gpus 8] [--mounts 100] [--ticks 60]
+
+Synthesizes a capture of the requested size and times loading it, then
+the headless part of a tick (replayed collectors → flatten → history →
+alerts).  When a display is available it also builds the real ``App`` on
+the replay and times applying ticks to the widgets and writing the CSV
+report; without one that part is skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.alerts import AlertEngine
+from modules.history import MetricHistory, flatten_metrics
+from modules.replay import Capture, synthesize, replay_collectors
+
+
+def _headless_tick(c: dict, history: MetricHistory, alerts: AlertEngine, now: float) -> None:
+    stats = c['cpu'].get_interval_stats()
+    ram = c['ram'].get_ram_info()
+    gpus = asyncio.run(c['gpu'].get_gpu_info_async())
+    disks = c['disk'].get_disk_partitions_and_usage()
+    io = c['disk'].get_disk_io()
+    c['disk'].attach_io(disks, io)
+    c['disk'].get_smart_status()
+    values = flatten_metrics(stats['overall']['mean'], ram, io, {}, per_core=stats['per_core']['mean'], gpus=gpus)
+    history.record(values, ts=now)
+    alerts.evaluate(values, now)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cores", type=int, default=256)
+    parser.add_argument("--gpus", type=int, default=8)
+    parser.add_argument("--mounts", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.jsonl.gz")
+        t0 = time.perf_counter()
+        calls = synthesize(path, args.cores, args.gpus, args.mounts, duration=args.ticks)
+        print(f"synthesize {args.cores} threads / {args.gpus} GPUs / {args.mounts} mounts, "
+              f"{args.ticks} s: {(time.perf_counter() - t0) * 1000:.0f} ms "
+              f"({calls} calls, {os.path.getsize(path) / 1024:.0f} KiB)")
+
+        t0 = time.perf_counter()
+        Capture.load(path)
+        print(f"load capture:               {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+        collectors = replay_collectors(path, speed=1000.0)
+        history = MetricHistory(capacity=3600)
+        alerts = AlertEngine()
+        t0 = time.perf_counter()
+        for n in range(args.ticks):
+            _headless_tick(collectors, history, alerts, float(n))
+        per_tick = (time.perf_counter() - t0) / args.ticks
+        print(f"headless tick:              {per_tick * 1000:8.2f} ms  ({len(history.keys())} metrics)")
+
+        try:
+            from ui.app_window import App
+            app = App(replay=path, speed=1000.0)
+        except Exception as e:
+            print(f"UI part skipped ({type(e).__name__}: {e})")
+            return
+        try:
+            ticks = [app.engine.submit(app._collect_tick()).result() for _ in range(min(args.ticks, 20))]
+            t0 = time.perf_counter()
+            for tick in ticks:
+                app._apply_tick(tick)
+                app.update_idletasks()
+            print(f"apply tick to widgets:      {(time.perf_counter() - t0) / len(ticks) * 1000:8.2f} ms")
+
+            report = os.path.join(tmp, "report.csv")
+            t0 = time.perf_counter()
+            app.write_report(report)
+            print(f"write CSV report:           {(time.perf_counter() - t0) * 1000:8.2f} ms "
+                  f"({os.path.getsize(report) / 1024:.0f} KiB)")
+        finally:
+            app.on_closing()
+
+
+if __name__ == "__main__":
+    main()
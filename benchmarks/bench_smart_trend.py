@@ -0,0 +1,75 @@
+"""Benchmark SmartTrendStore queries over a year of data for many drives.
+
+Usage::
+
+    python benchmarks/bench_smart_trend.py [--drives 50] [--days 365]
+
+Writes hourly samples for every drive into a temporary directory, then
+times loading one drive, fitting trends for every drive, and producing
+warnings for the whole fleet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.smart_trend import RECORD_DTYPE, SmartTrendStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drives", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    hours = args.days * 24
+    now = 1_700_000_000
+    ts = now - (hours - np.arange(hours)) * 3600
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SmartTrendStore(directory=tmp)
+        t0 = time.perf_counter()
+        for d in range(args.drives):
+            rec = np.zeros(hours, dtype=RECORD_DTYPE)
+            rec['ts'] = ts
+            rec['reallocated'] = np.cumsum(rng.random(hours) < 0.001 * (d % 5))
+            rec['pending'] = np.cumsum(rng.random(hours) < 0.0005)
+            rec['wear_pct'] = np.linspace(5, 5 + d, hours).round()
+            rec['temperature_c'] = 35 + rng.normal(0, 2, hours)
+            rec['power_on_hours'] = 10_000 + np.arange(hours)
+            rec['media_errors'] = np.nan
+            rec.tofile(os.path.join(tmp, f"SERIAL{d:03d}.bin"))
+        write = time.perf_counter() - t0
+        size = sum(os.path.getsize(os.path.join(tmp, n)) for n in os.listdir(tmp))
+        print(f"generated {args.drives} drives x {hours} samples "
+              f"({size / 1024 ** 2:.1f} MB on disk) in {write * 1000:.0f} ms")
+
+        serials = store.serials()
+
+        t0 = time.perf_counter()
+        for s in serials:
+            store.load(s)
+        print(f"load full year, all drives:   {(time.perf_counter() - t0) * 1000:8.2f} ms")
+
+        t0 = time.perf_counter()
+        for s in serials:
+            store.trends(s, now=now)
+        print(f"fit 30-day trends, all drives: {(time.perf_counter() - t0) * 1000:8.2f} ms")
+
+        t0 = time.perf_counter()
+        warned = sum(bool(store.warnings(s, now=now)) for s in serials)
+        print(f"warnings, all drives:          {(time.perf_counter() - t0) * 1000:8.2f} ms "
+              f"({warned} drives warned)")
+
+
+if __name__ == "__main__":
+    main()
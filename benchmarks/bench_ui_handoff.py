@@ -0,0 +1,71 @@
+"""Benchmark engine → UI handoff with a UI thread that stalls now and then.
+
+Usage::
+
+    python benchmarks/bench_ui_handoff.py [--interval 0.02] [--stall 0.5] [--seconds 5]
+
+Runs the collection engine with a fast tick and a consumer that polls
+like Tk (every ENGINE_UI_POLL_MS) but blocks for *stall* seconds every
+second, as a modal dialog or a large rebuild would.  Compares the plain
+queue with the coalescing mailbox: how many ticks the UI applies, the
+largest burst per poll, and how old the applied snapshots are.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from config import ENGINE_UI_POLL_MS
+from modules.engine import CollectionEngine
+
+
+def run(coalesce: bool, interval: float, stall: float, seconds: float) -> None:
+    eng = CollectionEngine(executor_workers=1, coalesce=("tick",) if coalesce else ())
+    eng.start()
+
+    async def tick() -> float:
+        return time.perf_counter()
+
+    eng.every(interval, tick, "tick")
+    ages: list[float] = []
+    burst = 0
+    started = next_stall = time.perf_counter() + 1.0
+    while time.perf_counter() - started < seconds:
+        items = eng.drain()
+        now = time.perf_counter()
+        ticks = [p for t, p in items if t == "tick"]
+        burst = max(burst, len(ticks))
+        ages.extend((now - p) * 1000.0 for p in ticks)
+        if now >= next_stall:
+            time.sleep(stall)
+            next_stall = now + 1.0
+        time.sleep(ENGINE_UI_POLL_MS / 1000.0)
+    eng.stop()
+
+    a = np.array(ages)
+    label = "mailbox" if coalesce else "queue  "
+    dropped = eng.mailboxes["tick"].dropped if coalesce else 0
+    print(f"{label}: applied {len(a):5d} ticks, max burst {burst:4d}, "
+          f"age p50 {np.percentile(a, 50):6.1f} ms  p95 {np.percentile(a, 95):6.1f} ms  "
+          f"max {a.max():6.1f} ms  ({dropped} skipped)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interval", type=float, default=0.02)
+    parser.add_argument("--stall", type=float, default=0.5)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    run(False, args.interval, args.stall, args.seconds)
+    run(True, args.interval, args.stall, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,8 @@ PyInstaller.__main__.run([
     '--icon=NONE',
     '--clean',
     '--uac-admin',
+    # Imported by name inside the WMI sandbox helper process
+    '--hidden-import=modules.backends.windows',
 ])
 
 print("Build complete. Please check the 'dist' folder (NOT 'build').")
@@ -2,10 +2,33 @@
 
 from __future__ import annotations
 
+import importlib
+import os
+import sys
+import types
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+# Root filesystem snapshot used by the Linux backend tests
+ROOTFS_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "rootfs")
+
+
+# ---------------------------------------------------------------------------
+# Windows-only modules
+# ---------------------------------------------------------------------------
+
+# ``wmi`` and ``pythoncom`` only install on Windows.  The WMI backend tests
+# patch both anyway, so register inert stand-ins elsewhere to keep those
+# tests importable on Linux CI.
+for _name, _attr in (("wmi", "WMI"), ("pythoncom", "CoInitialize")):
+    try:
+        importlib.import_module(_name)
+    except ImportError:
+        _standin = types.ModuleType(_name)
+        setattr(_standin, _attr, MagicMock(side_effect=OSError(f"{_name} is only available on Windows")))
+        sys.modules[_name] = _standin
+
 
 # ---------------------------------------------------------------------------
 # psutil mocks
@@ -108,3 +131,65 @@ def mock_wmi():
         patch("pythoncom.CoInitialize"),
     ):
         yield
+
+
+# ---------------------------------------------------------------------------
+# psutil.Process stand-in
+# ---------------------------------------------------------------------------
+
+class FakeIOCounters:
+    def __init__(self, read_bytes: int, write_bytes: int):
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+
+
+class FakeMemInfo:
+    def __init__(self, rss: int):
+        self.rss = rss
+
+
+class FakeProcess:
+    """Mimics the subset of ``psutil.Process`` used by ProcessDiagnostic.
+
+    ``calls`` counts attribute reads so tests can assert what was refreshed.
+    """
+
+    def __init__(self, pid: int, name: str = "proc", cpu: float = 0.0, rss: int = 0,
+                 io_bytes: int = 0, create_time: float = 1000.0):
+        self.pid = pid
+        self._name = name
+        self.cpu = cpu
+        self.rss = rss
+        self.io_bytes = io_bytes
+        self._create_time = create_time
+        self.running = True
+        self.calls: dict[str, int] = {}
+
+    def _count(self, attr: str) -> None:
+        self.calls[attr] = self.calls.get(attr, 0) + 1
+
+    def oneshot(self):
+        from contextlib import nullcontext
+        return nullcontext()
+
+    def create_time(self) -> float:
+        return self._create_time
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def name(self) -> str:
+        self._count("name")
+        return self._name
+
+    def cpu_percent(self, interval=None) -> float:
+        self._count("cpu")
+        return self.cpu
+
+    def memory_info(self) -> FakeMemInfo:
+        self._count("rss")
+        return FakeMemInfo(self.rss)
+
+    def io_counters(self) -> FakeIOCounters:
+        self._count("io")
+        return FakeIOCounters(self.io_bytes, 0)
@@ -0,0 +1,146 @@
+"""Unit tests for the alert rule engine."""
+
+from __future__ import annotations
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.alerts import AlertEngine, load_rules, metric_severity, notifier_available, notify_command
+from modules.history import flatten_metrics
+
+
+def _states(events):
+    return [(e['state'], e['metric']) for e in events]
+
+
+class TestThresholds:
+
+    def test_raise_and_clear_with_hysteresis(self):
+        engine = AlertEngine([{'metric': 'cpu.usage', 'op': '>=', 'threshold': 90, 'hysteresis': 5}])
+        assert engine.evaluate({'cpu.usage': 50}, 0) == []
+        assert _states(engine.evaluate({'cpu.usage': 90}, 1)) == [("raised", "cpu.usage")]
+        # Inside the hysteresis band: still active, no new event
+        assert engine.evaluate({'cpu.usage': 87}, 2) == []
+        assert len(engine.active()) == 1
+        assert _states(engine.evaluate({'cpu.usage': 84}, 3)) == [("cleared", "cpu.usage")]
+        assert engine.active() == []
+
+    def test_below_threshold_ops(self):
+        engine = AlertEngine([
+            {'metric': 'ram.free', 'op': '<', 'threshold': 10, 'hysteresis': 2},
+            {'metric': 'ram.free', 'op': '<=', 'threshold': 5},
+        ])
+        assert engine.evaluate({'ram.free': 10}, 0) == []
+        assert len(engine.evaluate({'ram.free': 5}, 1)) == 2
+        events = engine.evaluate({'ram.free': 11}, 2)
+        assert [e['rule'] for e in events] == ["ram.free <= 5"]
+        assert _states(engine.evaluate({'ram.free': 12.5}, 3)) == [("cleared", "ram.free")]
+
+    def test_equality_ops(self):
+        engine = AlertEngine([
+            {'metric': 'disk.sda.errors', 'op': '!=', 'threshold': 0, 'severity': 'critical'},
+            {'metric': 'net.eth0.up', 'op': '==', 'threshold': 0},
+        ])
+        events = engine.evaluate({'disk.sda.errors': 0, 'net.eth0.up': 0}, 0)
+        assert _states(events) == [("raised", "net.eth0.up")]
+        events = engine.evaluate({'disk.sda.errors': 3, 'net.eth0.up': 1}, 1)
+        assert sorted(_states(events)) == [("cleared", "net.eth0.up"), ("raised", "disk.sda.errors")]
+
+
+class TestSustained:
+
+    def test_condition_must_hold_for_duration(self):
+        engine = AlertEngine([{'metric': 'cpu.usage', 'threshold': 95, 'for_sec': 10}])
+        assert engine.evaluate({'cpu.usage': 99}, 100) == []
+        assert engine.evaluate({'cpu.usage': 99}, 105) == []
+        # A dip resets the timer
+        assert engine.evaluate({'cpu.usage': 50}, 106) == []
+        assert engine.evaluate({'cpu.usage': 99}, 107) == []
+        assert engine.evaluate({'cpu.usage': 99}, 116) == []
+        events = engine.evaluate({'cpu.usage': 99}, 117)
+        assert _states(events) == [("raised", "cpu.usage")]
+        assert engine.active()[0]['since'] == 117
+
+    def test_missing_metric_keeps_state(self):
+        engine = AlertEngine([{'metric': 'gpu.0.temperature_c', 'threshold': 90}])
+        engine.evaluate({'gpu.0.temperature_c': 95}, 0)
+        assert engine.evaluate({'cpu.usage': 1}, 1) == []
+        assert len(engine.active()) == 1
+
+
+class TestBinding:
+
+    def test_wildcard_applies_per_metric(self):
+        engine = AlertEngine([{'metric': 'gpu.*.temperature_c', 'threshold': 90, 'severity': 'critical'}])
+        engine.evaluate({'gpu.0.temperature_c': 60}, 0)
+        # A GPU appearing later gets the rule too, without disturbing existing state
+        events = engine.evaluate({'gpu.0.temperature_c': 91, 'gpu.1.temperature_c': 92}, 1)
+        assert sorted(_states(events)) == [("raised", "gpu.0.temperature_c"), ("raised", "gpu.1.temperature_c")]
+        assert metric_severity(engine.active()) == {
+            'gpu.0.temperature_c': "critical", 'gpu.1.temperature_c': "critical",
+        }
+
+    def test_severity_order_and_worst_per_metric(self):
+        engine = AlertEngine([
+            {'metric': 'cpu.usage', 'threshold': 80, 'severity': 'info'},
+            {'metric': 'cpu.usage', 'threshold': 95, 'severity': 'critical'},
+        ])
+        engine.evaluate({'cpu.usage': 99}, 0)
+        assert [a['severity'] for a in engine.active()] == ["critical", "info"]
+        assert metric_severity(engine.active()) == {'cpu.usage': "critical"}
+
+    def test_invalid_rules_are_skipped(self, capsys):
+        engine = AlertEngine([
+            {'metric': 'cpu.usage', 'op': '=>', 'threshold': 1},
+            {'metric': 'cpu.usage', 'threshold': 'hot'},
+            {'metric': 'cpu.usage', 'threshold': 1, 'severity': 'panic'},
+            {'metric': 'cpu.usage', 'threshold': 1},
+        ])
+        assert len(engine.rules) == 1
+        assert "Skipping" in capsys.readouterr().out
+
+    def test_rules_file_extends_config(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps([{'metric': 'net.*.rx_mb_s', 'threshold': 100}]))
+        rules = load_rules(str(path))
+        assert rules[-1]['metric'] == 'net.*.rx_mb_s'
+        assert len(rules) > 1
+        assert load_rules(str(tmp_path / "missing.json"))[-1]['metric'] != 'net.*.rx_mb_s'
+
+
+class TestGpuMetrics:
+
+    def test_gpu_rows_are_flattened(self):
+        gpus = [
+            {'Name': 'A', 'Load': '37%', 'Used Memory': '1024MB', 'Temperature': '71 C'},
+            {'Name': 'B', 'Load': 'N/A', 'Temperature': 'N/A'},
+        ]
+        values = flatten_metrics(1.0, {'Percentage': 2.0}, {}, {}, gpus=gpus)
+        assert values['gpu.0.temperature_c'] == 71.0
+        assert values['gpu.0.load_pct'] == 37.0
+        assert values['gpu.0.memory_used_mb'] == 1024.0
+        assert not any(k.startswith("gpu.1.") for k in values)
+
+
+class TestNotifications:
+
+    def test_windows_gets_a_toast(self):
+        with patch("sys.platform", "win32"), patch("shutil.which", return_value=r"C:\\powershell.exe"):
+            assert notifier_available()
+            cmd = notify_command("Master Sentinal: critical", "GPU hot (gpu.0.temperature_c = 91)")
+        assert cmd[:4] == ["powershell", "-NoProfile", "-NonInteractive", "-Command"]
+        assert "CreateToastNotifier" in cmd[4]
+        assert "'GPU hot (gpu.0.temperature_c = 91)'" in cmd[4]
+
+    def test_toast_text_cannot_break_out_of_its_string(self):
+        with patch("sys.platform", "win32"), patch("shutil.which", return_value=r"C:\\powershell.exe"):
+            cmd = notify_command("t", "it's \u2019 $(Remove-Item x)")
+        assert "'it''s \u2019\u2019 $(Remove-Item x)'" in cmd[4]
+
+    def test_windows_without_powershell_has_no_notifier(self):
+        with patch("sys.platform", "win32"), patch("shutil.which", return_value=None):
+            assert not notifier_available() and notify_command("t", "b") is None
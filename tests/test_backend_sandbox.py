@@ -0,0 +1,119 @@
+"""Unit tests for the out-of-process backend sandbox (fake backends, runs on Linux)."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.backends.base import HardwareBackend
+from modules.backends.sandbox import SandboxedBackend, decode, encode, serve
+
+SPEC = f"{__name__}:FakeBackend"
+
+
+class FakeBackend(HardwareBackend):
+    """Behaves like WMI on a bad day, selected per method."""
+
+    name = "fake"
+
+    def get_cpu_info(self):
+        return {'Name': "Fake CPU", 'Cores': 4, 'Threads': 8, 'pid': os.getpid()}
+
+    def get_gpu_info(self):
+        time.sleep(60)   # wedged provider
+        return []
+
+    def get_smart_status(self):
+        os._exit(3)      # COM fault taking the process down
+
+    def get_board_info(self):
+        raise OSError("board query failed")
+
+
+class BrokenBackend(HardwareBackend):
+
+    def __init__(self):
+        raise ImportError("no wmi here")
+
+
+class TestProtocol:
+
+    def test_messages_are_compact_json(self):
+        data = encode([7, "get_cpu_info"])
+        assert data == b'[7,"get_cpu_info"]'
+        assert decode(data) == [7, "get_cpu_info"]
+        with pytest.raises(ValueError):
+            decode(b'{"id": 1}')
+
+    def test_serve_in_a_thread(self):
+        parent, child = multiprocessing.Pipe()
+        t = threading.Thread(target=serve, args=(child, SPEC), daemon=True)
+        t.start()
+        assert decode(parent.recv_bytes()) == [0, 1, "ready"]
+
+        parent.send_bytes(encode([1, "get_cpu_info"]))
+        request_id, ok, result = decode(parent.recv_bytes())
+        assert (request_id, ok, result['Name']) == (1, 1, "Fake CPU")
+
+        parent.send_bytes(encode([2, "get_board_info"]))
+        assert decode(parent.recv_bytes()) == [2, 0, "OSError", "board query failed"]
+
+        parent.send_bytes(encode([3, "__init__"]))
+        assert decode(parent.recv_bytes())[:3] == [3, 0, "ValueError"]
+
+        parent.close()   # helper exits when the app goes away
+        t.join(5)
+        assert not t.is_alive()
+
+
+@pytest.fixture
+def sandbox():
+    backend = SandboxedBackend(SPEC, timeout=1.0, start_timeout=30.0)
+    yield backend
+    backend.close()
+
+
+class TestSandboxedBackend:
+
+    def test_calls_run_in_one_long_lived_helper(self, sandbox):
+        first = sandbox.get_cpu_info()
+        second = sandbox.get_cpu_info()
+        assert first['Name'] == "Fake CPU"
+        assert first['pid'] == second['pid'] == sandbox.pid != os.getpid()
+        assert sandbox.restarts == 0
+
+    def test_errors_keep_their_type(self, sandbox):
+        with pytest.raises(OSError, match="board query failed"):
+            sandbox.get_board_info()
+        assert sandbox.restarts == 0
+
+    def test_watchdog_kills_hung_query_and_respawns(self, sandbox):
+        old_pid = sandbox.get_cpu_info()['pid']
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            sandbox.get_gpu_info()
+        assert time.monotonic() - started < 5
+        assert sandbox.restarts == 1
+        assert sandbox.get_cpu_info()['pid'] != old_pid
+
+    def test_crash_costs_only_the_helper(self, sandbox):
+        old_pid = sandbox.get_cpu_info()['pid']
+        with pytest.raises(RuntimeError, match="crashed"):
+            sandbox.get_smart_status()
+        assert sandbox.get_cpu_info()['pid'] != old_pid
+        assert sandbox.restarts == 1
+
+    def test_helper_that_cannot_start(self):
+        backend = SandboxedBackend(f"{__name__}:BrokenBackend", start_timeout=30.0)
+        try:
+            with pytest.raises(RuntimeError, match="no wmi here"):
+                backend.get_cpu_info()
+        finally:
+            backend.close()
@@ -0,0 +1,150 @@
+"""Unit tests for named baselines and their comparison."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.baseline import (
+    BaselineStore,
+    benchmark_metrics,
+    compare,
+    format_delta,
+    idle_metrics,
+    judge,
+    make_summary,
+    rule_for,
+    smart_metrics,
+)
+from modules.cpu_bench import CPUBenchmark
+from modules.disk_bench import DiskBenchmark
+from modules.full_scan import FullScanDiagnostic
+from modules.history import MetricHistory
+
+
+def summary(name: str = "base", **metrics: float) -> dict:
+    return make_summary(name, {'CPU Name': "Test CPU", 'RAM Total': "16.00 GB"}, metrics, ts=1000.0)
+
+
+class TestMetrics:
+
+    def test_benchmark_headlines(self):
+        metrics = benchmark_metrics({
+            'disk': {'seq_read_mbps': 1000.0, 'seq_write_mbps': 500.0, 'rand_read_iops': 40000,
+                     'rand_write_iops': 20000, 'rand_read_latency_ms': {'p99': 1.0}},
+            'memory': None,
+            'cpu': {'score': 400.0, 'min_core_score': 190.0, 'errors': 0, 'clock_mhz': {'sustained': 3550}},
+        })
+        assert metrics == {
+            'bench.disk.seq_write_mbps': 500.0, 'bench.disk.seq_read_mbps': 1000.0,
+            'bench.disk.rand_read_iops': 40000.0, 'bench.disk.rand_write_iops': 20000.0,
+            'bench.cpu.score': 400.0, 'bench.cpu.min_core_score': 190.0, 'bench.cpu.errors': 0.0,
+            'bench.cpu.clock_mhz': 3550.0,
+        }
+
+    def test_smart_by_serial(self):
+        metrics = smart_metrics({
+            '/dev/sda': {'serial': "S1", 'reallocated': 8, 'pending': None, 'temperature_c': 35, 'model': "X"},
+            '/dev/sdb': {'serial': None, 'wear_pct': 3},
+        })
+        assert metrics == {'smart.S1.reallocated': 8.0, 'smart.S1.temperature_c': 35.0, 'smart./dev/sdb.wear_pct': 3.0}
+
+    def test_idle_is_a_low_percentile(self):
+        history = MetricHistory(capacity=200)
+        for i in range(100):
+            history.record({'cpu.usage': float(i), 'gpu.0.temperature_c': 40.0, 'net.eth0.rx_mb_s': 9.0}, ts=1000.0 + i)
+        metrics = idle_metrics(history, patterns=["cpu.usage", "gpu.*.temperature_c"], percentile=10)
+        assert metrics == {'idle.cpu.usage': 9.9, 'idle.gpu.0.temperature_c': 40.0}
+
+
+class TestJudgement:
+
+    def test_rules_match_in_order(self):
+        assert rule_for("bench.cpu.errors")['better'] == "lower"
+        assert rule_for("bench.cpu.score")['better'] == "higher"
+        assert rule_for("smart.S1.temperature_c")['abs'] == 10
+        assert rule_for("unknown.metric") is None
+
+    def test_both_thresholds_must_be_reached(self):
+        rule = {'metric': "idle.*", 'better': "lower", 'abs': 5, 'pct': 50.0}
+        assert judge(2.0, 4.0, rule) == "ok"            # +100% but only +2
+        assert judge(20.0, 27.0, rule) == "ok"          # +7 but only +35%
+        assert judge(10.0, 16.0, rule) == "regression"
+        assert judge(16.0, 6.0, rule) == "improved"
+
+    def test_counter_growth_from_zero(self):
+        rule = {'metric': "smart.*", 'better': "lower", 'abs': 1}
+        assert judge(0.0, 1.0, rule) == "regression"
+        assert judge(0.0, 0.0, rule) == "ok"
+
+    def test_higher_is_better(self):
+        rule = {'metric': "bench.*", 'better': "higher", 'pct': 15.0}
+        assert judge(400.0, 320.0, rule) == "regression"
+        assert judge(400.0, 380.0, rule) == "ok"
+        assert judge(400.0, 480.0, rule) == "improved"
+
+
+class TestCompare:
+
+    def test_deltas_regressions_first(self):
+        base = summary(**{'bench.cpu.score': 400.0, 'smart.S1.reallocated': 0.0, 'idle.cpu.usage': 3.0})
+        current = summary("", **{'bench.cpu.score': 300.0, 'smart.S1.reallocated': 0.0, 'smart.S2.pending': 0.0})
+        current['inventory']['RAM Total'] = "8.00 GB"
+        result = compare(current, base)
+        assert result['baseline'] == "base" and result['regressions'] == 1
+        statuses = [(d['metric'], d['status']) for d in result['metrics']]
+        assert statuses == [
+            ('bench.cpu.score', "regression"), ('smart.S1.reallocated', "ok"),
+            ('smart.S2.pending', "new"), ('idle.cpu.usage', "missing"),
+        ]
+        assert result['metrics'][0]['delta'] == -100.0 and result['metrics'][0]['delta_pct'] == -25.0
+        assert result['inventory'] == [{'item': 'RAM Total', 'baseline': "16.00 GB", 'current': "8.00 GB"}]
+
+    def test_format_delta(self):
+        assert format_delta({'baseline': 400.0, 'current': 300.0, 'delta': -100.0, 'delta_pct': -25.0}) \
+            == "400 → 300 (-25.0%)"
+        assert format_delta({'baseline': 0.0, 'current': 2.0, 'delta': 2.0, 'delta_pct': None}) == "0 → 2 (+2)"
+        assert format_delta({'baseline': None, 'current': 2.0, 'delta': None, 'delta_pct': None}) == "— → 2"
+
+
+class TestStore:
+
+    def test_save_list_get_delete(self, tmp_path):
+        store = BaselineStore(str(tmp_path / "sub" / "baselines.json"))
+        assert store.names() == [] and store.get("a") is None
+        store.save(make_summary("a", {}, {'bench.cpu.score': 1.0}, ts=1.0))
+        store.save(make_summary("b", {}, {}, ts=2.0))
+        store.save(make_summary("a", {}, {'bench.cpu.score': 2.0}, ts=3.0))   # replaces "a"
+        assert store.names() == ["a", "b"]
+        assert store.get("a")['metrics'] == {'bench.cpu.score': 2.0}
+        assert store.delete("b") and not store.delete("b")
+        assert BaselineStore(store.path).names() == ["a"]
+
+    def test_corrupt_file_reads_as_empty(self, tmp_path):
+        path = tmp_path / "baselines.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert BaselineStore(str(path)).names() == []
+
+    def test_summary_is_compact(self, tmp_path):
+        metrics = {f"smart.S{i}.{k}": 1.0 for i in range(8) for k in ("reallocated", "pending", "temperature_c")}
+        store = BaselineStore(str(tmp_path / "baselines.json"))
+        store.save(make_summary("fleet", {'CPU Name': "x" * 40}, metrics))
+        assert os.path.getsize(store.path) < 2048
+        assert json.loads((tmp_path / "baselines.json").read_text())['fleet']['name'] == "fleet"
+
+
+class TestLatestBenchmarks:
+
+    def test_session_results_win_over_stored(self):
+        diag = FullScanDiagnostic()
+        with patch.object(DiskBenchmark.results, "load", return_value=[{'seq_read_mbps': 1.0}]), \
+                patch.object(CPUBenchmark.results, "load", return_value=[]):
+            assert diag.latest_benchmarks() == {'disk': {'seq_read_mbps': 1.0}, 'memory': None, 'cpu': None}
+            diag.last_disk_benchmark = {'seq_read_mbps': 2.0}
+            diag.last_memory_test = {'read_mbps': 3.0}
+            assert diag.latest_benchmarks()['disk'] == {'seq_read_mbps': 2.0}
+            assert diag.latest_benchmarks()['memory'] == {'read_mbps': 3.0}
@@ -0,0 +1,47 @@
+"""Unit tests for stored benchmark results and run-to-run comparison."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.bench_results import ResultStore
+
+
+def store(tmp_path, name: str = "bench.jsonl") -> ResultStore:
+    return ResultStore(str(tmp_path / "sub" / name), ('read', 'write'), regression_pct=25.0)
+
+
+def run(scale: float = 1.0, **fields) -> dict:
+    return {'read': 1000.0 * scale, 'write': 500.0 * scale, **fields}
+
+
+class TestResultStore:
+
+    def test_compare_and_regressions(self, tmp_path):
+        results = store(tmp_path)
+        changes = results.compare(run(0.5), run())
+        assert changes == {'read': -50.0, 'write': -50.0}
+        assert results.regressions(changes) == changes
+        assert results.regressions(changes, threshold_pct=60.0) == {}
+        assert results.regressions(results.compare(run(0.9), run())) == {}
+        assert results.compare(run(), None) == {}
+
+    def test_keys_missing_from_the_previous_run_are_skipped(self, tmp_path):
+        assert store(tmp_path).compare(run(), {'read': 800.0}) == {'read': 25.0}
+
+    def test_store_and_reload_with_filters(self, tmp_path):
+        results = store(tmp_path)
+        assert results.load() == []
+        results.save(run(host="a", workers=2))
+        results.save(run(host="b", workers=2))
+        results.save(run(host="b", workers=4))
+        with open(results.path, "a", encoding="utf-8") as f:
+            f.write('{"torn')
+        assert len(results.load()) == 3
+        assert [r['workers'] for r in results.load(host="b")] == [2, 4]
+        assert results.load(host="b", workers=4)[0]['workers'] == 4
+        assert results.load(host="b", workers=None) == results.load(host="b")
+        assert results.load(host="c") == []
@@ -0,0 +1,93 @@
+"""Unit tests for the change-only metric bus."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.bus import ChangeSet, MetricBus, keyed_rows
+
+
+def recorder():
+    seen: list[ChangeSet] = []
+    return seen, seen.append
+
+
+class TestMetricBus:
+
+    def test_only_changed_keys_are_delivered(self):
+        bus = MetricBus()
+        seen, cb = recorder()
+        bus.subscribe("gpu|", cb)
+        bus.publish({'gpu|0|Temp': 60, 'gpu|0|Load': 10})
+        bus.publish({'gpu|0|Temp': 60, 'gpu|0|Load': 12})
+        bus.publish({'gpu|0|Temp': 60, 'gpu|0|Load': 12})   # nothing new: no call
+        assert [c.changed for c in seen] == [{'gpu|0|Temp': 60, 'gpu|0|Load': 10}, {'gpu|0|Load': 12}]
+        assert 'gpu|0|Load' in seen[1] and 'gpu|0|Temp' not in seen[1]
+
+    def test_prefix_routing(self):
+        bus = MetricBus()
+        gpu, gpu_cb = recorder()
+        both, both_cb = recorder()
+        bus.subscribe("gpu|", gpu_cb)
+        bus.subscribe(("disk|", "alert|gpu."), both_cb)
+        called = bus.publish({'gpu|0|Temp': 1, 'disk|/|Used': "5 GB", 'alert|cpu.usage': "warning"})
+        assert called == 2
+        assert gpu[0].changed == {'gpu|0|Temp': 1}
+        assert both[0].changed == {'disk|/|Used': "5 GB"}
+        assert bus.publish({'alert|gpu.0.temperature_c': "critical"}) == 1
+        assert both[1].touches("alert|") and not both[1].touches("disk|")
+
+    def test_complete_prefix_reports_removed_keys(self):
+        bus = MetricBus()
+        seen, cb = recorder()
+        bus.subscribe("disk|", cb)
+        bus.publish({'disk|/|Used': 1, 'disk|/mnt|Used': 2}, complete=["disk|"])
+        bus.publish({'disk|/|Used': 1}, complete=["disk|"])
+        assert seen[-1].removed == ['disk|/mnt|Used'] and not seen[-1].changed
+        assert bus.snapshot("disk|") == {'disk|/|Used': 1}
+        # Without `complete`, missing keys are just "not published this time"
+        bus.publish({})
+        assert len(bus) == 1
+
+    def test_late_subscriber_gets_current_state(self):
+        bus = MetricBus()
+        bus.publish({'ram|Total': "16 GB", 'cpu|load': 5})
+        seen, cb = recorder()
+        bus.subscribe("ram|", cb)
+        assert seen[0].changed == {'ram|Total': "16 GB"}
+        quiet, quiet_cb = recorder()
+        bus.subscribe("ram|", quiet_cb, replay=False)
+        assert quiet == []
+
+    def test_unsubscribe(self):
+        bus = MetricBus()
+        seen, cb = recorder()
+        sub = bus.subscribe("x|", cb)
+        bus.publish({'x|a': 1})
+        bus.unsubscribe(sub)
+        bus.unsubscribe(sub)   # idempotent
+        assert bus.publish({'x|a': 2}) == 0
+        assert len(seen) == 1 and sub.deliveries == 1
+
+    def test_failing_subscriber_does_not_starve_others(self, capsys):
+        bus = MetricBus()
+        seen, cb = recorder()
+
+        def broken(changes):
+            raise RuntimeError("widget destroyed")
+
+        bus.subscribe("x|", broken)
+        bus.subscribe("x|", cb)
+        bus.publish({'x|a': 1})
+        assert len(seen) == 1
+        assert "widget destroyed" in capsys.readouterr().out
+
+    def test_keyed_rows(self):
+        gpus = [{'DeviceID': "PCI\\0", 'Name': "RTX", 'Temperature': "60 C"}]
+        rows = keyed_rows("gpu|", gpus, lambda g: g['DeviceID'])
+        assert rows == {
+            'gpu|PCI\\0|DeviceID': "PCI\\0", 'gpu|PCI\\0|Name': "RTX", 'gpu|PCI\\0|Temperature': "60 C",
+        }
@@ -0,0 +1,163 @@
+"""Unit tests for the CPU benchmark and its Full Scan check."""
+
+from __future__ import annotations
+
+import collections
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.cpu_bench import (
+    KERNEL_SEED,
+    ClockSampler,
+    CPUBenchmark,
+    cpu_temperature,
+    drop_pct,
+    kernel,
+    parse_mhz,
+    run_worker,
+    summarize,
+)
+from modules.full_scan import FullScanDiagnostic
+
+Freq = collections.namedtuple("Freq", "current min max")
+Temp = collections.namedtuple("Temp", "label current high critical")
+
+
+def worker(cpu: int, windows: list[float], errors: int = 0) -> dict:
+    return {'cpu': cpu, 'pinned': True, 'score': sum(windows) / len(windows), 'windows': windows, 'errors': errors}
+
+
+def sampler(clocks: list[float], temps: list[float] | None = None, hot: bool = False) -> ClockSampler:
+    s = ClockSampler([0])
+    s.clocks, s.temps, s.reached_high = clocks, temps or [], hot
+    return s
+
+
+def fake_result(scale: float = 1.0, cpu: str = "Test CPU") -> dict:
+    return {
+        'cpu': cpu, 'workers': 2, 'score': 400.0 * scale, 'min_core_score': 195.0 * scale,
+        'per_core': [{'cpu': 0, 'score': 205.0, 'errors': 0}, {'cpu': 1, 'score': 195.0, 'errors': 0}],
+        'errors': 0, 'clock_mhz': {'start': 3600.0, 'sustained': 3550, 'min': 3500.0}, 'clock_pct': 98.6,
+        'throttling': [],
+    }
+
+
+class TestKernelAndHelpers:
+
+    def test_kernel_is_deterministic(self):
+        assert kernel(KERNEL_SEED, 1000) == kernel(KERNEL_SEED, 1000)
+        assert kernel(KERNEL_SEED, 1000) != kernel(KERNEL_SEED + 1, 1000)
+        assert 0 <= kernel(KERNEL_SEED) < 2 ** 64
+
+    def test_parse_mhz(self):
+        assert parse_mhz("3600 MHz") == 3600.0
+        assert parse_mhz(2400) == 2400.0
+        assert parse_mhz(None) is None and parse_mhz("N/A") is None
+
+    def test_drop_pct(self):
+        assert drop_pct([100, 100, 100, 80, 80, 80]) == 20.0
+        assert drop_pct([80, 90, 100]) == 0.0        # getting faster is not a drop
+        assert drop_pct([100, 50]) == 0.0            # too short to tell
+
+    def test_worker_scores_and_checks_results(self):
+        expected = kernel(KERNEL_SEED)
+        result = run_worker(0, duration=0.3, window_sec=0.1, expected=expected)
+        assert result['score'] > 0 and result['errors'] == 0 and len(result['windows']) >= 2
+        assert run_worker(0, duration=0.1, window_sec=0.1, expected=expected + 1)['errors'] > 0
+
+
+class TestSampling:
+
+    def test_clock_of_the_tested_cpus_only(self):
+        s = ClockSampler([1, 2])
+        with patch("psutil.cpu_freq", return_value=[Freq(800, 0, 0), Freq(3000, 0, 0), Freq(3200, 0, 0)]), \
+                patch("modules.cpu_bench.cpu_temperature", return_value=(None, False)):
+            s.sample()
+        assert s.clocks == [3100.0] and s.temps == []
+
+    def test_temperature_prefers_cpu_sensors(self):
+        sensors = {'coretemp': [Temp("Package", 71.0, 100.0, 105.0)], 'nvme': [Temp("Composite", 80.0, 85.0, 90.0)]}
+        with patch("psutil.sensors_temperatures", return_value=sensors, create=True):
+            assert cpu_temperature() == (71.0, False)
+        sensors['coretemp'].append(Temp("Core 0", 100.0, 100.0, 105.0))
+        with patch("psutil.sensors_temperatures", return_value=sensors, create=True):
+            assert cpu_temperature() == (100.0, True)
+
+
+class TestEvaluate:
+
+    def test_steady_run_is_not_throttled(self):
+        bench = CPUBenchmark(name="Test CPU", rated_mhz=3600, cpus=[0, 1])
+        result = bench.evaluate([worker(0, [200] * 6), worker(1, [190] * 6)], sampler([3600, 3590, 3580, 3600]))
+        assert result['score'] == 390.0 and result['min_core_score'] == 190.0
+        assert result['clock_mhz']['sustained'] == 3600 and result['clock_pct'] == 100.0
+        assert result['throttling'] == []
+
+    def test_falling_score_and_clock_are_throttling(self):
+        bench = CPUBenchmark(rated_mhz=4000, cpus=[0])
+        result = bench.evaluate([worker(0, [200, 200, 150, 150, 120, 120])], sampler([4000, 4000, 3000, 2000, 2000, 2000]))
+        assert result['score_drop_pct'] == 40.0 and result['clock_drop_pct'] == 50.0
+        assert len(result['throttling']) == 3       # score, clock and 50% of rated
+
+    def test_hot_sensor_is_throttling(self):
+        bench = CPUBenchmark(cpus=[0])
+        result = bench.evaluate([worker(0, [200] * 3)], sampler([], temps=[60.0, 99.0], hot=True))
+        assert result['clock_mhz'] is None and result['clock_pct'] is None
+        assert result['temp_c'] == {'start': 60.0, 'max': 99.0}
+        assert result['throttling'] == ["reached 99 °C"]
+
+    def test_process_pool_run(self):
+        result = CPUBenchmark(name="Test CPU", cpus=[0, 0], duration=0.3, window_sec=0.1, sample_sec=0.05).run()
+        assert result['workers'] == 2 and result['errors'] == 0
+        assert len(result['per_core']) == 2 and all(c['score'] > 0 for c in result['per_core'])
+
+    def test_cpus_beyond_the_pool_limit_run_in_several_pools(self):
+        with patch("modules.cpu_bench.PROCESS_POOL_MAX_WORKERS", 2):
+            result = CPUBenchmark(cpus=[0, 0, 0], duration=0.3, window_sec=0.1, sample_sec=0.05).run()
+        assert result['workers'] == 3 and result['errors'] == 0
+
+
+class TestSummary:
+
+    def test_summary_fits_the_status_column(self):
+        assert len(summarize({**fake_result(100), 'workers': 128})) < 50
+
+
+class TestFullScanCheck:
+
+    def run_check(self, result, previous):
+        diag = FullScanDiagnostic()
+        with patch.object(CPUBenchmark, "run", return_value=result), \
+                patch.object(CPUBenchmark.results, "load", return_value=previous), \
+                patch.object(CPUBenchmark.results, "save") as saved:
+            outcome = diag.run_cpu_benchmark()
+        return outcome, saved, diag
+
+    def test_first_run_passes_and_is_stored(self):
+        (ok, msg), saved, diag = self.run_check(fake_result(), [])
+        assert ok and msg == "400 pts on 2 CPUs, 3550 MHz (99% of rated)"
+        assert saved.called and diag.last_cpu_benchmark['change_pct'] == {}
+
+    def test_throttling_and_wrong_results_fail(self):
+        (ok, msg), _, _ = self.run_check({**fake_result(), 'throttling': ["clock fell 30% during the run"]}, [])
+        assert not ok and msg == "Throttling: clock fell 30% during the run"
+        broken = fake_result()
+        broken['errors'] = broken['per_core'][1]['errors'] = 3
+        (ok, msg), _, _ = self.run_check(broken, [])
+        assert not ok and msg == "3 wrong results on CPU 1"
+
+    def test_regression_fails_the_check(self):
+        (ok, msg), _, diag = self.run_check(fake_result(0.5), [fake_result()])
+        assert not ok and msg == "Slower than last run: score -50%"
+
+    def test_pool_errors_fail_the_check(self):
+        with patch.object(CPUBenchmark, "run", side_effect=ValueError("max_workers must be <= 61")):
+            ok, msg = FullScanDiagnostic().run_cpu_benchmark()
+        assert not ok and msg == "Benchmark failed: max_workers must be <= 61"
+
+    def test_in_scan_list(self):
+        names = [name for name, *_ in FullScanDiagnostic().get_full_scan_list()]
+        assert "CPU Benchmark" in names
@@ -0,0 +1,98 @@
+"""Unit tests for the high-frequency CPUSampler."""
+
+from __future__ import annotations
+
+import sys
+import os
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from conftest import ROOTFS_DIR
+from modules.cpu_sampler import CPUSampler, ProcStatReader
+
+
+class ScriptedReader:
+    """Returns pre-baked ``(ncpu, 2)`` counter snapshots, optionally slowly."""
+
+    def __init__(self, snapshots, cost_sec: float = 0.0):
+        self.snapshots = [np.array(s, dtype=np.int64) for s in snapshots]
+        self.cost_sec = cost_sec
+        self.i = 0
+
+    def read(self):
+        if self.cost_sec:
+            end = time.thread_time() + self.cost_sec
+            while time.thread_time() < end:
+                pass
+        snap = self.snapshots[min(self.i, len(self.snapshots) - 1)]
+        self.i += 1
+        return snap
+
+    def close(self):
+        pass
+
+
+class TestProcStatReader:
+
+    def test_reads_per_core_rows_only(self):
+        reader = ProcStatReader(os.path.join(ROOTFS_DIR, "proc", "stat"))
+        try:
+            ticks = reader.read()
+        finally:
+            reader.close()
+        assert ticks.shape == (4, 2)
+        # cpu0: total = 1393+280+219+795+10+0+10+0, idle = 795+10
+        assert ticks[0].tolist() == [2707, 805]
+
+
+class TestCPUSampler:
+
+    def test_busy_percent_is_vectorised(self):
+        prev = np.array([[100, 50], [100, 100]])
+        cur = np.array([[200, 75], [200, 200]])
+        assert CPUSampler.busy_percent(prev, cur).tolist() == [75.0, 0.0]
+
+    def test_zero_delta_reports_idle(self):
+        snap = np.array([[10, 5]])
+        assert CPUSampler.busy_percent(snap, snap).tolist() == [0.0]
+
+    def test_drain_aggregates_min_mean_max_p95(self):
+        # core 0 busy 0%, 100%, 50%; core 1 always 0%
+        reader = ScriptedReader([
+            [[0, 0], [0, 0]],
+            [[100, 100], [100, 100]],
+            [[200, 100], [200, 200]],
+            [[300, 150], [300, 300]],
+        ])
+        sampler = CPUSampler(reader=reader)
+        prev = reader.read()
+        for _ in range(3):
+            prev = sampler.sample_once(prev)
+
+        stats = sampler.drain()
+        assert stats['samples'] == 3
+        assert stats['per_core']['min'] == [0.0, 0.0]
+        assert stats['per_core']['max'] == [100.0, 0.0]
+        assert stats['per_core']['mean'] == [50.0, 0.0]
+        assert stats['per_core']['p95'][0] == pytest.approx(95.0)
+        assert stats['overall']['max'] == 50.0
+        assert sampler.drain() is None  # drained
+
+    def test_hotplug_sample_is_skipped(self):
+        reader = ScriptedReader([[[0, 0]], [[10, 5], [10, 5]]])
+        sampler = CPUSampler(reader=reader)
+        sampler.sample_once(reader.read())
+        assert sampler.drain() is None
+
+    def test_period_stretches_to_respect_budget(self):
+        # Each read burns ~5 ms of CPU; a 1% budget forces a period of ~0.5 s
+        reader = ScriptedReader([[[0, 0]], [[10, 5]]], cost_sec=0.005)
+        sampler = CPUSampler(hz=100, budget_pct=1.0, reader=reader)
+        sampler.start()
+        time.sleep(0.1)
+        sampler.stop()
+        assert sampler.period >= 0.4
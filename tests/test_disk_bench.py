@@ -0,0 +1,122 @@
+"""Unit tests for the storage benchmark and its Full Scan check."""
+
+from __future__ import annotations
+
+import errno
+import collections
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.disk_bench import DiskBenchmark, latency_percentiles, summarize
+from modules.full_scan import FullScanDiagnostic
+
+Usage = collections.namedtuple("Usage", "total used free")
+
+
+def small(directory) -> DiskBenchmark:
+    return DiskBenchmark(directory=str(directory), file_mb=4, queue_depth=2, duration=0.2, seq_block_kb=256)
+
+
+def fake_result(scale: float = 1.0, directory: str = "/tmp") -> dict:
+    return {
+        'directory': directory, 'seq_write_mbps': 500.0 * scale, 'seq_read_mbps': 1000.0 * scale,
+        'rand_read_iops': 40000 * scale, 'rand_write_iops': 20000 * scale,
+    }
+
+
+class TestDiskBenchmark:
+
+    def test_runs_against_a_temp_dir(self, tmp_path):
+        result = small(tmp_path).run()
+        assert result['file_mb'] == 4 and result['queue_depth'] == 2
+        for key in ('seq_write_mbps', 'seq_read_mbps', 'rand_read_iops', 'rand_write_iops'):
+            assert result[key] > 0
+        lat = result['rand_read_latency_ms']
+        assert 0 < lat['p50'] <= lat['p95'] <= lat['p99'] <= lat['max']
+        assert os.listdir(tmp_path) == []          # temp file removed
+
+    def test_falls_back_when_direct_io_is_refused(self, tmp_path):
+        real_open = os.open
+
+        def no_direct(path, flags, *args):
+            if flags & getattr(os, "O_DIRECT", 0):
+                raise OSError(errno.EINVAL, "O_DIRECT not supported")
+            return real_open(path, flags, *args)
+
+        with patch("os.open", no_direct):
+            result = small(tmp_path).run()
+        if sys.platform != "darwin":
+            assert result['direct'] is False
+        assert result['seq_read_mbps'] > 0 and result['rand_write_iops'] > 0
+
+    def test_windows_opens_around_the_file_cache(self, tmp_path):
+        path = str(tmp_path / "f.bin")
+        open(path, "wb").close()
+        with patch("sys.platform", "win32"), \
+                patch("modules.disk_bench._open_unbuffered_win32", side_effect=lambda p: os.open(p, os.O_RDWR)) as unbuffered:
+            f, direct = DiskBenchmark._open(path)
+        f.close()
+        assert direct and unbuffered.call_args.args == (path,)
+        real_open = os.open
+
+        def no_direct(path, flags, *args):
+            if flags & getattr(os, "O_DIRECT", 0):
+                raise OSError(errno.EINVAL, "O_DIRECT not supported")
+            return real_open(path, flags, *args)
+
+        with patch("sys.platform", "win32"), patch("os.open", no_direct), \
+                patch("modules.disk_bench._open_unbuffered_win32", side_effect=OSError("refused")):
+            f, direct = DiskBenchmark._open(path)
+        f.close()
+        assert not direct
+
+    def test_file_is_capped_by_free_space(self, tmp_path):
+        bench = small(tmp_path)
+        bench.file_mb = 10 ** 9
+        with patch("shutil.disk_usage", return_value=Usage(0, 0, 8 << 20)):
+            assert bench._size_bytes() == 4 << 20      # half the free space
+        with patch("shutil.disk_usage", return_value=Usage(0, 0, 1024)):
+            with pytest.raises(OSError):
+                bench._size_bytes()
+
+
+class TestResults:
+
+    def test_latency_percentiles(self):
+        lat = latency_percentiles(np.arange(1, 101, dtype=np.int64) * 1_000_000)
+        assert lat['max'] == 100.0 and lat['p50'] == pytest.approx(50.5)
+        assert latency_percentiles(np.array([], dtype=np.int64))['p99'] == 0.0
+
+    def test_summary_fits_the_status_column(self):
+        assert len(summarize(fake_result(100))) < 50
+
+
+class TestFullScanCheck:
+
+    def run_check(self, result, previous):
+        diag = FullScanDiagnostic()
+        with patch.object(DiskBenchmark, "run", return_value=result), \
+                patch.object(DiskBenchmark.results, "load", return_value=previous), \
+                patch.object(DiskBenchmark.results, "save") as saved:
+            outcome = diag.run_disk_benchmark()
+        return outcome, saved, diag
+
+    def test_first_run_passes_and_is_stored(self):
+        (ok, msg), saved, diag = self.run_check(fake_result(), [])
+        assert ok and msg.startswith("R 1000 / W 500 MB/s")
+        assert saved.called and diag.last_disk_benchmark['change_pct'] == {}
+
+    def test_regression_fails_the_check(self):
+        (ok, msg), _, diag = self.run_check(fake_result(0.5), [fake_result()])
+        assert not ok and "Slower than last run" in msg and len(msg) < 50
+        assert diag.last_disk_benchmark['change_pct']['rand_read_iops'] == -50.0
+
+    def test_in_scan_list(self):
+        names = [name for name, *_ in FullScanDiagnostic().get_full_scan_list()]
+        assert "Disk Benchmark" in names
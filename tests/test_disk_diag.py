@@ -10,6 +10,7 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
 
+from modules.backends.windows import WindowsBackend
 from modules.disk_diag import DiskDiagnostic
 
 
@@ -17,13 +18,13 @@ class TestDiskDiagnostic:
     """Tests for DiskDiagnostic methods."""
 
     def test_get_disk_partitions_returns_list(self, mock_psutil):
-        diag = DiskDiagnostic()
+        diag = DiskDiagnostic(WindowsBackend())
         disks = diag.get_disk_partitions_and_usage()
         assert isinstance(disks, list)
         assert len(disks) == 1
 
     def test_partition_data_has_expected_keys(self, mock_psutil):
-        diag = DiskDiagnostic()
+        diag = DiskDiagnostic(WindowsBackend())
         disks = diag.get_disk_partitions_and_usage()
         d = disks[0]
         assert 'Device' in d
@@ -32,12 +33,12 @@ class TestDiskDiagnostic:
         assert 'Percent' in d
 
     def test_partition_total_formatted(self, mock_psutil):
-        diag = DiskDiagnostic()
+        diag = DiskDiagnostic(WindowsBackend())
         disks = diag.get_disk_partitions_and_usage()
         assert "GB" in disks[0]['Total']
 
     def test_get_smart_status_returns_dict(self, mock_wmi):
-        diag = DiskDiagnostic()
+        diag = DiskDiagnostic(WindowsBackend())
         smart = diag.get_smart_status()
         assert isinstance(smart, dict)
         assert len(smart) >= 1
@@ -45,7 +46,7 @@ class TestDiskDiagnostic:
     def test_get_smart_status_error_handling(self):
         with patch("wmi.WMI", side_effect=Exception("WMI fail")), \
              patch("pythoncom.CoInitialize"):
-            diag = DiskDiagnostic()
+            diag = DiskDiagnostic(WindowsBackend())
             smart = diag.get_smart_status()
             assert 'Error' in smart
 
@@ -53,6 +54,16 @@ class TestDiskDiagnostic:
         from conftest import FakePartition
         with patch("psutil.disk_partitions", return_value=[FakePartition()]), \
              patch("psutil.disk_usage", side_effect=PermissionError("no access")):
-            diag = DiskDiagnostic()
+            diag = DiskDiagnostic(WindowsBackend())
             disks = diag.get_disk_partitions_and_usage()
             assert disks == []
+
+    def test_attach_io_matches_partition_to_disk(self, mock_wmi):
+        diag = DiskDiagnostic(WindowsBackend())
+        diag._partition_disk_map = {"C:\\": "PhysicalDrive0"}
+        disks = [{'Device': "C:\\", 'Mountpoint': "C:\\"}, {'Device': "/dev/sdb1", 'Mountpoint': "/data"}]
+        rates = {"read_mb_s": 1.0, "write_mb_s": 2.0, "read_iops": 3.0,
+                 "write_iops": 4.0, "latency_ms": 0.5, "busy_pct": 10.0}
+        diag.attach_io(disks, {"PhysicalDrive0": rates, "sdb1": rates})
+        assert disks[0]['Write'] == "2.00 MB/s"
+        assert disks[1]['Busy'] == "10.0%"
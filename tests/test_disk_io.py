@@ -0,0 +1,131 @@
+"""Unit tests for DiskIOCollector and the partition I/O helpers."""
+
+from __future__ import annotations
+
+import sys
+import os
+from collections import namedtuple
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.disk_io import DiskIOCollector, format_io
+from modules.history import MetricHistory
+
+IOCounters = namedtuple(
+    "IOCounters",
+    "read_count write_count read_bytes write_bytes read_time write_time busy_time",
+)
+
+
+def counters(reads=0, writes=0, rbytes=0, wbytes=0, rtime=0, wtime=0, busy=0):
+    return IOCounters(reads, writes, rbytes, wbytes, rtime, wtime, busy)
+
+
+class ScriptedCounters:
+    """Feeds successive ``disk_io_counters`` snapshots at 1-second steps."""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.t = 0.0
+
+    def counters_fn(self):
+        return self.snapshots.pop(0)
+
+    def clock(self):
+        self.t += 1.0
+        return self.t
+
+    def collector(self):
+        return DiskIOCollector(counters_fn=self.counters_fn, clock=self.clock)
+
+
+class TestDiskIOCollector:
+
+    def test_first_sample_is_baseline(self):
+        script = ScriptedCounters([{"sda": counters()}])
+        assert script.collector().sample() == {}
+
+    def test_rates_from_deltas(self):
+        script = ScriptedCounters([
+            {"sda": counters()},
+            {"sda": counters(reads=100, writes=50, rbytes=10 << 20, wbytes=5 << 20,
+                             rtime=200, wtime=100, busy=250)},
+        ])
+        col = script.collector()
+        col.sample()
+        rates = col.sample()["sda"]
+        assert rates["read_mb_s"] == pytest.approx(10.0)
+        assert rates["write_mb_s"] == pytest.approx(5.0)
+        assert rates["read_iops"] == pytest.approx(100.0)
+        assert rates["write_iops"] == pytest.approx(50.0)
+        assert rates["latency_ms"] == pytest.approx(2.0)   # 300 ms over 150 ops
+        assert rates["busy_pct"] == pytest.approx(25.0)
+
+    def test_32bit_wraparound(self):
+        script = ScriptedCounters([
+            {"sda": counters(reads=2 ** 32 - 10)},
+            {"sda": counters(reads=15)},
+        ])
+        col = script.collector()
+        col.sample()
+        assert col.sample()["sda"]["read_iops"] == pytest.approx(25.0)
+
+    def test_64bit_reset_is_not_a_huge_spike(self):
+        script = ScriptedCounters([
+            {"sda": counters(rbytes=2 ** 40)},
+            {"sda": counters(rbytes=1 << 20)},
+        ])
+        col = script.collector()
+        col.sample()
+        assert col.sample()["sda"]["read_mb_s"] == 0.0
+
+    def test_32bit_reset_is_not_a_wrap(self):
+        script = ScriptedCounters([
+            {"sda": counters(rbytes=500 << 20)},
+            {"sda": counters(rbytes=1 << 20)},      # far from the top: the counter was reset
+        ])
+        col = script.collector()
+        col.sample()
+        assert col.sample()["sda"]["read_mb_s"] == 0.0
+
+    def test_devices_appear_and_disappear(self):
+        script = ScriptedCounters([
+            {"sda": counters()},
+            {"sda": counters(reads=1), "sdb": counters(reads=500)},
+            {"sdb": counters(reads=510)},
+        ])
+        col = script.collector()
+        col.sample()
+        assert set(col.sample()) == {"sda"}      # sdb is new: baseline only
+        rates = col.sample()                     # sda is gone
+        assert set(rates) == {"sdb"}
+        assert rates["sdb"]["read_iops"] == pytest.approx(10.0)
+
+    def test_format_io_without_busy_time(self):
+        text = format_io({"read_mb_s": 1.5, "write_mb_s": 0, "read_iops": 3,
+                          "write_iops": 4, "latency_ms": 0.25})
+        assert text['Read'] == "1.50 MB/s"
+        assert text['IOPS (R/W)'] == "3 / 4"
+        assert text['Busy'] == "N/A"
+
+
+class TestMetricHistory:
+
+    def test_ring_keeps_latest_capacity_samples(self):
+        hist = MetricHistory(capacity=3)
+        for i in range(5):
+            hist.record({"cpu.usage": i}, ts=float(i))
+        ts, values = hist.series("cpu.usage")
+        assert ts.tolist() == [2.0, 3.0, 4.0]
+        assert hist.latest("cpu.usage") == 4.0
+        assert hist.summary("cpu.usage") == {'min': 2.0, 'mean': 3.0, 'max': 4.0, 'last': 4.0}
+
+    def test_series_since_and_prefix(self):
+        hist = MetricHistory(capacity=10)
+        for i in range(4):
+            hist.record({"disk.sda.read_mb_s": i, "cpu.usage": 0}, ts=float(i))
+        assert hist.series("disk.sda.read_mb_s", since=2.0)[1].tolist() == [2.0, 3.0]
+        assert hist.keys("disk.") == ["disk.sda.read_mb_s"]
+        assert hist.latest("missing") is None
@@ -0,0 +1,178 @@
+"""Tests for the asyncio collection engine and async command helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.engine import CollectionEngine, Mailbox, run_command
+
+
+@pytest.fixture
+def engine():
+    eng = CollectionEngine(executor_workers=2)
+    eng.start()
+    yield eng
+    eng.stop()
+
+
+def wait_for_items(eng: CollectionEngine, count: int, timeout: float = 5.0) -> list:
+    items: list = []
+    deadline = time.monotonic() + timeout
+    while len(items) < count and time.monotonic() < deadline:
+        items.extend(eng.drain())
+        time.sleep(0.01)
+    return items
+
+
+class TestRunCommand:
+
+    def test_captures_output_and_status(self):
+        result = asyncio.run(run_command([sys.executable, "-c", "import sys; print('hi'); sys.exit(3)"]))
+        assert result.returncode == 3
+        assert result.stdout.strip() == "hi"
+
+    def test_timeout_kills_child(self):
+        async def scenario():
+            with pytest.raises(asyncio.TimeoutError):
+                await run_command([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2)
+
+        started = time.monotonic()
+        asyncio.run(scenario())
+        assert time.monotonic() - started < 5
+
+    def test_missing_program_raises_oserror(self):
+        with pytest.raises(OSError):
+            asyncio.run(run_command(["definitely-not-a-real-program-xyz"]))
+
+
+class TestCollectionEngine:
+
+    def test_every_posts_results_to_queue(self, engine):
+        count = {'n': 0}
+
+        async def collect():
+            count['n'] += 1
+            return count['n']
+
+        engine.every(0.01, collect, "tick")
+        items = wait_for_items(engine, 3)
+        assert items[:3] == [("tick", 1), ("tick", 2), ("tick", 3)]
+
+    def test_failing_collector_keeps_running(self, engine):
+        calls = {'n': 0}
+
+        async def flaky():
+            calls['n'] += 1
+            if calls['n'] == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        engine.every(0.01, flaky, "flaky")
+        assert wait_for_items(engine, 1)[0] == ("flaky", "ok")
+
+    def test_interval_is_reread_and_wake_cuts_the_wait(self, engine):
+        period = {'s': 0.01}
+
+        async def collect():
+            return time.monotonic()
+
+        engine.every(lambda: period['s'], collect, "tick")
+        wait_for_items(engine, 2)
+        period['s'] = 60.0                 # backed off: next tick a minute away
+        time.sleep(0.1)                    # let the in-flight short wait finish
+        engine.drain()
+        assert wait_for_items(engine, 1, timeout=0.3) == []
+        started = time.monotonic()
+        engine.wake("tick")
+        (topic, ts), = wait_for_items(engine, 1)
+        assert topic == "tick" and ts - started < 1.0
+
+    def test_blocking_calls_use_the_small_executor(self, engine):
+        async def scenario():
+            names = await asyncio.gather(*(engine.blocking(lambda: threading.current_thread().name)
+                                           for _ in range(8)))
+            return set(names)
+
+        names = engine.submit(scenario()).result(5)
+        assert all(n.startswith("engine-io") for n in names)
+        assert len(names) <= 2
+
+    def test_ask_waits_for_ui_reply(self, engine):
+        future = engine.submit(engine.ask("confirm", "proceed?"))
+        (topic, (question, reply)), = wait_for_items(engine, 1)
+        assert (topic, question) == ("confirm", "proceed?")
+        reply(True)
+        assert future.result(5) is True
+
+    def test_stop_cancels_running_command(self):
+        eng = CollectionEngine()
+        eng.start()
+        future = eng.submit(run_command([sys.executable, "-c", "import time; time.sleep(30)"]))
+        time.sleep(0.2)
+        started = time.monotonic()
+        eng.stop()
+        assert time.monotonic() - started < 5
+        assert future.cancelled() or isinstance(future.exception(1), BaseException)
+
+
+class TestMailbox:
+
+    def test_keeps_only_latest(self):
+        box = Mailbox()
+        assert box.take() == (False, None)
+        for i in range(5):
+            box.put(i)
+        assert box.take() == (True, 4)
+        assert box.take() == (False, None)
+        assert box.dropped == 4
+
+    def test_concurrent_producer_never_loses_the_last_value(self):
+        box = Mailbox()
+        seen: list[int] = []
+
+        def produce():
+            for i in range(10_000):
+                box.put(i)
+
+        t = threading.Thread(target=produce)
+        t.start()
+        while t.is_alive():
+            full, value = box.take()
+            if full:
+                seen.append(value)
+        t.join()
+        full, value = box.take()
+        if full:
+            seen.append(value)
+        assert seen == sorted(seen)
+        assert seen[-1] == 9_999
+        assert box.dropped + len(seen) == 10_000
+
+    def test_slow_ui_sees_only_the_newest_tick(self):
+        eng = CollectionEngine(executor_workers=1, coalesce=("tick",))
+        eng.start()
+        try:
+            counter = iter(range(1_000_000))
+
+            async def tick():
+                return next(counter)
+
+            eng.every(0.01, tick, "tick")
+            eng.post("scan_status", "queued items are never coalesced")
+            time.sleep(0.3)   # Tk "busy" for many ticks
+            items = eng.drain()
+            ticks = [p for t, p in items if t == "tick"]
+            assert len(ticks) == 1
+            assert ticks[0] >= 10
+            assert ("scan_status", "queued items are never coalesced") in items
+            assert eng.mailboxes["tick"].dropped >= 10
+        finally:
+            eng.stop()
@@ -0,0 +1,191 @@
+"""Tests for fleet mode: delta encoding, aggregator and reconnecting agents."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import socket
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.fleet import (
+    DeltaEncoder,
+    FleetAgent,
+    FleetAggregator,
+    apply_frame,
+    format_fleet,
+    parse_addr,
+    query_aggregator,
+)
+
+
+def counter_collector(keys: int = 3):
+    """Snapshot function whose ``n`` metric counts collections."""
+    calls = {'n': 0}
+
+    def collect():
+        calls['n'] += 1
+        snap = {f"k{i}": float(i) for i in range(keys)}
+        snap["n"] = float(calls['n'])
+        return snap
+    return collect
+
+
+async def wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestDeltaEncoding:
+
+    def test_first_frame_is_full_then_only_changes(self):
+        enc = DeltaEncoder(decimals=1, full_every=100)
+        assert enc.encode({"a": 1.0, "b": 2.0}, ts=1) == {"t": "s", "ts": 1, "full": 1, "set": {"a": 1.0, "b": 2.0}}
+        assert enc.encode({"a": 1.0, "b": 3.0}, ts=2) == {"t": "s", "ts": 2, "set": {"b": 3.0}}
+
+    def test_jitter_below_precision_is_not_sent(self):
+        enc = DeltaEncoder(decimals=1, full_every=100)
+        enc.encode({"a": 1.0}, ts=1)
+        assert enc.encode({"a": 1.04}, ts=2)["set"] == {}
+
+    def test_removed_keys_and_periodic_full(self):
+        enc = DeltaEncoder(decimals=1, full_every=3)
+        enc.encode({"a": 1.0, "b": 2.0}, ts=1)
+        assert enc.encode({"a": 1.0}, ts=2)["del"] == ["b"]
+        enc.encode({"a": 1.0}, ts=3)
+        assert enc.encode({"a": 1.0}, ts=4).get("full") == 1
+
+    def test_reset_forces_full(self):
+        enc = DeltaEncoder(full_every=100)
+        enc.encode({"a": 1.0}, ts=1)
+        enc.reset()
+        assert enc.encode({"a": 1.0}, ts=2).get("full") == 1
+
+    def test_decoded_state_matches_rounded_snapshot(self):
+        rng = random.Random(7)
+        enc = DeltaEncoder(decimals=1, full_every=10)
+        state: dict[str, float] = {}
+        for ts in range(50):
+            snap = {f"m{i}": rng.uniform(0, 100) for i in range(rng.randint(5, 10))}
+            apply_frame(state, enc.encode(snap, ts))
+            assert state == {k: round(v, 1) for k, v in snap.items()}
+
+
+class TestParseAddr:
+
+    def test_forms(self):
+        assert parse_addr("host:1234") == ("host", 1234)
+        assert parse_addr("host")[0] == "host"
+        assert parse_addr(":99", default_host="0.0.0.0") == ("0.0.0.0", 99)
+
+
+class TestAggregator:
+
+    def test_agent_streams_to_aggregator_and_query(self):
+        async def scenario():
+            agg = FleetAggregator(history_len=100)
+            await agg.start("127.0.0.1", 0)
+            agent = FleetAgent(f"127.0.0.1:{agg.port}", counter_collector(), host="ws-1",
+                               info={"os": "TestOS"}, interval=0.01)
+            task = asyncio.create_task(agent.run())
+            await wait_for(lambda: "ws-1" in agg.hosts and agg.hosts["ws-1"].frames >= 5)
+            reply = await asyncio.get_running_loop().run_in_executor(
+                None, query_aggregator, f"127.0.0.1:{agg.port}")
+            agent.stop()
+            await task
+            await wait_for(lambda: agg.hosts["ws-1"].connection is None)
+            offline = agg.query()
+            await agg.stop()
+            return reply, offline
+
+        reply, offline = asyncio.run(scenario())
+        host = reply["hosts"]["ws-1"]
+        assert host["status"] == "Online"
+        assert host["info"] == {"os": "TestOS"}
+        assert host["metrics"]["k2"] == 2.0
+        assert offline["hosts"]["ws-1"]["status"] == "Offline"
+
+        row = format_fleet(reply)[0]
+        assert row["Host"] == "ws-1" and row["Status"] == "Online" and row["OS"] == "TestOS"
+
+    def test_messages_that_are_not_objects_close_only_their_connection(self):
+        async def scenario():
+            agg = FleetAggregator()
+            await agg.start("127.0.0.1", 0)
+            for junk in (b"[1, 2]\n", b'"hello"\n', b"null\n"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", agg.port)
+                writer.write(junk)
+                await writer.drain()
+                assert await reader.read() == b""       # closed by the aggregator
+                writer.close()
+            reply = await asyncio.get_running_loop().run_in_executor(
+                None, query_aggregator, f"127.0.0.1:{agg.port}")
+            await agg.stop()
+            return reply
+
+        assert asyncio.run(scenario())["hosts"] == {}
+
+    def test_listens_on_loopback_by_default(self):
+        async def scenario():
+            agg = FleetAggregator()
+            await agg.start(port=0)
+            host = agg._server.sockets[0].getsockname()[0]
+            await agg.stop()
+            return host
+
+        assert asyncio.run(scenario()) == "127.0.0.1"
+
+    def test_agent_buffers_until_aggregator_appears(self):
+        async def scenario():
+            port = free_port()
+            agent = FleetAgent(f"127.0.0.1:{port}", counter_collector(), host="late",
+                               interval=0.01, backoff_min=0.02, backoff_max=0.05)
+            task = asyncio.create_task(agent.run())
+            await wait_for(lambda: len(agent.buffer) >= 10)
+            assert not agent.connected
+
+            agg = FleetAggregator(history_len=1000)
+            await agg.start("127.0.0.1", port)
+            await wait_for(lambda: "late" in agg.hosts and agg.hosts["late"].frames >= 12)
+            agent.stop()
+            await task
+            await agg.stop()
+            return agg.hosts["late"]
+
+        state = asyncio.run(scenario())
+        _ts, values = state.history.series("n")
+        # Every buffered snapshot arrived, in order, with no gap
+        assert list(values[:10]) == [float(i) for i in range(1, 11)]
+
+    def test_two_hundred_agents(self):
+        async def scenario():
+            agg = FleetAggregator()
+            await agg.start("127.0.0.1", 0)
+            agents = [
+                FleetAgent(f"127.0.0.1:{agg.port}", counter_collector(keys=40), host=f"ws-{i:03d}",
+                           info={}, interval=0.05)
+                for i in range(200)
+            ]
+            tasks = [asyncio.create_task(a.run()) for a in agents]
+            await wait_for(lambda: len(agg.hosts) == 200
+                           and all(h.frames >= 3 for h in agg.hosts.values()), timeout=20)
+            view = agg.query()
+            for a in agents:
+                a.stop()
+            await asyncio.gather(*tasks)
+            await agg.stop()
+            return view
+
+        view = asyncio.run(scenario())
+        assert len(view["hosts"]) == 200
+        assert all(h["status"] == "Online" and len(h["metrics"]) == 41 for h in view["hosts"].values())
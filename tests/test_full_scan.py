@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import subprocess
 import sys
+import threading
 import os
 from unittest.mock import patch, MagicMock
 
@@ -11,6 +14,7 @@ import pytest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
 
 from modules.full_scan import FullScanDiagnostic
+from modules.governor import ResourcePolicy, lower_current_thread
 
 
 class TestParseFriendlyError:
@@ -88,8 +92,97 @@ class TestFullScanChecks:
 
     def test_get_full_scan_list_returns_tuples(self):
         items = self.diag.get_full_scan_list()
-        assert len(items) == 8
-        for name, func, reboot in items:
+        assert len(items) == 11
+        for name, func, reboot, policy in items:
             assert isinstance(name, str)
             assert callable(func)
             assert isinstance(reboot, bool)
+            assert isinstance(policy, ResourcePolicy)
+
+
+class TestAsyncScan:
+    """run_async drives the same checks through the async command runner."""
+
+    def setup_method(self):
+        self.diag = FullScanDiagnostic()
+
+    @patch.object(FullScanDiagnostic, 'is_admin', return_value=True)
+    def test_command_check_uses_async_runner(self, _):
+        calls = []
+
+        async def fake_run_command(cmd, timeout=None):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, "found no problems", "")
+
+        with patch("modules.full_scan.run_command", fake_run_command):
+            ok, msg = asyncio.run(self.diag.run_async(self.diag.run_chkdsk_scan))
+        assert (ok, msg) == (True, "No Problems Found")
+        assert calls == [['chkdsk', 'C:', '/scan']]
+
+    @patch.object(FullScanDiagnostic, 'is_admin', return_value=True)
+    def test_policy_is_passed_to_the_runner(self, _):
+        seen = []
+
+        async def fake_run_command(cmd, timeout=None, policy=None):
+            seen.append(policy)
+            return subprocess.CompletedProcess(cmd, 0, "found no problems", "")
+
+        name, func, _, policy = next(c for c in self.diag.get_full_scan_list() if c[0] == "Disk Check (Scan)")
+        with patch("modules.full_scan.run_command", fake_run_command):
+            asyncio.run(self.diag.run_async(func, policy=policy))
+        assert seen == [policy] and policy.io_limit_mbps
+
+    @patch.object(FullScanDiagnostic, 'is_admin', return_value=True)
+    def test_timeout_is_reported(self, _):
+        async def hung(cmd, timeout=None):
+            raise asyncio.TimeoutError
+
+        with patch("modules.full_scan.run_command", hung):
+            ok, msg = asyncio.run(self.diag.run_async(self.diag.run_sfc, timeout=5))
+        assert not ok and "Timed out" in msg
+
+    @patch.object(FullScanDiagnostic, 'is_admin', return_value=False)
+    def test_admin_check_needs_no_command(self, _):
+        ok, msg = asyncio.run(self.diag.run_async(self.diag.run_dism))
+        assert not ok and "Administrator" in msg
+
+    def test_launchers_run_on_executor(self):
+        ok, msg = asyncio.run(self.diag.run_async(lambda: (True, "launched")))
+        assert (ok, msg) == (True, "launched")
+
+    def test_in_process_checks_get_their_policy_on_their_own_thread(self):
+        seen = []
+
+        def check():
+            seen.append(threading.current_thread().name)
+            return True, "done"
+
+        name, _func, _, policy = next(c for c in self.diag.get_full_scan_list() if c[0] == "CPU Benchmark")
+        with patch("modules.full_scan.lower_current_thread", side_effect=lambda p: seen.append(p)):
+            assert asyncio.run(self.diag.run_async(check, policy=policy)) == (True, "done")
+        assert seen == [policy, "scan-check"]
+        assert (policy.cpu, policy.io) == ("normal", "normal")
+
+    def test_in_process_check_exceptions_propagate(self):
+        def check():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(self.diag.run_async(check))
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="per-thread nice is Linux-only")
+    def test_check_does_not_inherit_the_callers_lowered_priority(self):
+        def nice() -> tuple[bool, str]:
+            return True, str(os.getpriority(os.PRIO_PROCESS, threading.get_native_id()))
+
+        expected = nice()[1]   # this (constructing) thread's priority
+        result = []
+
+        def lowered_engine_thread() -> None:
+            lower_current_thread(ResourcePolicy(cpu="low"))
+            result.append(asyncio.run(self.diag.run_async(nice, policy=ResourcePolicy())))
+
+        t = threading.Thread(target=lowered_engine_thread)
+        t.start()
+        t.join()
+        assert result == [(True, expected)]
@@ -0,0 +1,116 @@
+"""Unit tests for the resource governor (runs against real child processes on Linux)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+
+import psutil
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from config import SCAN_RESOURCE_DEFAULT
+from modules.engine import CollectionEngine, run_command
+from modules.governor import IOThrottle, ResourcePolicy, apply_to_process, lower_current_thread, policy_for
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="per-thread priorities via /proc")
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+class TestResourcePolicy:
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            ResourcePolicy(cpu="realtime")
+        with pytest.raises(ValueError):
+            ResourcePolicy(io_limit_mbps=0)
+        assert ResourcePolicy().is_default
+        assert not ResourcePolicy(cpu="low").is_default
+
+    def test_per_check_overrides_the_default(self):
+        default = policy_for("System File Checker")
+        assert (default.cpu, default.io) == (SCAN_RESOURCE_DEFAULT['cpu'], SCAN_RESOURCE_DEFAULT['io'])
+        chkdsk = policy_for("Disk Check (Scan)")
+        assert chkdsk.io_limit_mbps and chkdsk.cpu == default.cpu
+        assert policy_for("Power Monitor").cpu == "normal"
+
+
+@linux_only
+class TestProcesses:
+
+    def test_apply_lowers_priority_and_pins(self, child):
+        applied = apply_to_process(child.pid, ResourcePolicy(cpu="idle", io="idle", affinity=[0]))
+        proc = psutil.Process(child.pid)
+        assert proc.nice() == 19
+        assert proc.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+        assert proc.cpu_affinity() == [0]
+        assert len(applied) == 3
+
+    def test_refused_settings_are_skipped(self, child, capsys):
+        applied = apply_to_process(child.pid, ResourcePolicy(cpu="low", affinity=[10_000]))
+        assert applied == ["cpu=low"]
+        assert "affinity" in capsys.readouterr().out
+
+    def test_run_command_with_policy(self):
+        code = "import os; print(os.nice(0))"
+        result = asyncio.run(run_command([sys.executable, "-c", "import time; time.sleep(0.3); " + code],
+                                         policy=ResourcePolicy(cpu="low")))
+        assert result.stdout.strip() == "10"
+
+
+class TestIOThrottle:
+
+    def test_pause_matches_the_excess(self):
+        throttle = IOThrottle(os.getpid(), limit_mbps=10)
+        assert throttle.pause_for(5 * 1024 * 1024, 0.5) == 0.0
+        assert throttle.pause_for(20 * 1024 * 1024, 0.5) == pytest.approx(1.5)
+
+    def test_stops_when_the_process_exits(self, child):
+        throttle = IOThrottle(child.pid, limit_mbps=1, interval=0.05).start()
+        child.kill()
+        child.wait()
+        throttle._thread.join(2)
+        assert not throttle._thread.is_alive()
+
+
+@linux_only
+class TestThreads:
+
+    def test_lowers_only_the_calling_thread(self):
+        result = {}
+
+        def worker():
+            result['applied'] = lower_current_thread(ResourcePolicy(cpu="low", io="idle"))
+            tid = threading.get_native_id()
+            result['nice'] = os.getpriority(os.PRIO_PROCESS, tid)
+            result['ioclass'] = psutil.Process(tid).ionice().ioclass
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert result == {'applied': True, 'nice': 10, 'ioclass': psutil.IOPRIO_CLASS_IDLE}
+        assert os.getpriority(os.PRIO_PROCESS, threading.get_native_id()) == os.nice(0)
+        assert lower_current_thread(None) is False
+
+    def test_engine_threads_use_the_policy(self):
+        eng = CollectionEngine(executor_workers=1, thread_policy=ResourcePolicy(cpu="low"))
+        eng.start()
+        try:
+            async def nice_values():
+                loop_nice = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+                io_nice = await eng.blocking(lambda: os.getpriority(os.PRIO_PROCESS, threading.get_native_id()))
+                return loop_nice, io_nice
+            assert eng.submit(nice_values()).result(5) == (10, 10)
+        finally:
+            eng.stop()
@@ -0,0 +1,150 @@
+"""Unit tests for the memory-mapped, checksummed metric history."""
+
+from __future__ import annotations
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from config import HISTORY_PERSIST_WINDOW_SEC, HISTORY_WINDOW_SEC, UPDATE_INTERVAL_SEC
+from modules.history import MetricHistory
+from modules.history_mmap import MappedHistoryFile
+
+
+def _fill(history: MetricHistory, n: int, keys=("cpu.usage", "ram.percent"), start: float = 1000.0) -> None:
+    for i in range(n):
+        history.record({k: float(i + j) for j, k in enumerate(keys)}, ts=start + i)
+
+
+class TestRestore:
+
+    def test_history_is_back_after_reopen(self, tmp_path):
+        path = str(tmp_path / "live.bin")
+        h = MetricHistory(capacity=100, persist_path=path)
+        _fill(h, 30)
+        h.close()
+
+        h2 = MetricHistory(capacity=100, persist_path=path)
+        assert h2.keys() == ["cpu.usage", "ram.percent"]
+        ts, values = h2.series("cpu.usage")
+        assert ts.tolist() == [1000.0 + i for i in range(30)]
+        assert values.tolist() == [float(i) for i in range(30)]
+        assert h2.latest("ram.percent") == 30.0
+        assert h2.span() == (1000.0, 1029.0)
+        h2.close()
+
+    def test_wrapped_ring_resumes_in_order(self, tmp_path):
+        path = str(tmp_path / "live.bin")
+        h = MetricHistory(capacity=50, persist_path=path)
+        _fill(h, 120, keys=("cpu.usage",))
+        h.close()
+
+        h2 = MetricHistory(capacity=50, persist_path=path)
+        _fill(h2, 5, keys=("cpu.usage",), start=2000.0)
+        ts, _values = h2.series("cpu.usage")
+        assert ts.size == 50
+        assert np.all(np.diff(ts) > 0)
+        assert ts[-1] == 2004.0
+        h2.close()
+
+    def test_restored_views_are_not_copies(self, tmp_path):
+        path = str(tmp_path / "live.bin")
+        h = MetricHistory(capacity=10, persist_path=path)
+        _fill(h, 3)
+        h.close()
+
+        store = MappedHistoryFile(path, 10, block_rows=256, max_keys=1024)
+        ts, _values = store.open()["cpu.usage"]
+        assert not ts.flags.owndata
+        store.close()
+
+
+class TestCrashConsistency:
+
+    def test_torn_block_loses_only_that_block(self, tmp_path):
+        path = str(tmp_path / "live.bin")
+        h = MetricHistory(capacity=1024, persist_path=path)
+        _fill(h, 1024, keys=("cpu.usage",))
+        h.close()
+
+        # Flip one byte inside the second block of the first slot
+        layout = MappedHistoryFile(path, 1024, block_rows=256, max_keys=1024)
+        with open(path, "r+b") as f:
+            f.seek(layout._slot_at(0) + 300 * 8)
+            byte = f.read(1)
+            f.seek(-1, 1)
+            f.write(bytes([byte[0] ^ 0xFF]))
+
+        h2 = MetricHistory(capacity=1024, persist_path=path)
+        ts, values = h2.series("cpu.usage")
+        assert ts.size == 1024 - 256
+        assert not np.any((values >= 256) & (values < 512))
+        assert h2._store.corrupt_blocks == 1
+        h2.close()
+
+    def test_incompatible_file_is_reset(self, tmp_path):
+        path = str(tmp_path / "live.bin")
+        h = MetricHistory(capacity=100, persist_path=path)
+        _fill(h, 10)
+        h.close()
+
+        h2 = MetricHistory(capacity=200, persist_path=path)
+        assert h2.keys() == []
+        _fill(h2, 3)
+        assert h2.series("cpu.usage")[0].size == 3
+        h2.close()
+
+
+class TestGrowth:
+
+    def test_many_keys_survive_remap(self, tmp_path):
+        path = str(tmp_path / "live.bin")
+        keys = tuple(f"net.eth{i}.rx" for i in range(40))
+        h = MetricHistory(capacity=20, persist_path=path)
+        _fill(h, 25, keys=keys)
+        assert h.series(keys[0])[0].size == 20
+        h.close()
+
+        h2 = MetricHistory(capacity=20, persist_path=path)
+        assert h2.keys() == sorted(keys)
+        assert h2.latest(keys[39]) == 24.0 + 39
+        h2.close()
+
+    def test_keys_beyond_the_file_stay_in_memory(self, tmp_path):
+        import modules.history as history_mod
+        path = str(tmp_path / "live.bin")
+        old = history_mod.HISTORY_PERSIST_MAX_KEYS
+        history_mod.HISTORY_PERSIST_MAX_KEYS = 2
+        try:
+            h = MetricHistory(capacity=10, persist_path=path)
+            _fill(h, 5, keys=("a", "b", "c"))
+            assert h.latest("c") == 6.0
+            h.close()
+            h2 = MetricHistory(capacity=10, persist_path=path)
+            assert h2.keys() == ["a", "b"]
+            h2.close()
+        finally:
+            history_mod.HISTORY_PERSIST_MAX_KEYS = old
+
+
+class TestWindows:
+
+    def test_only_the_mapped_rings_get_the_persisted_window(self, tmp_path):
+        memory = MetricHistory()
+        memory.record({"cpu.usage": 1.0}, ts=1000.0)
+        assert memory._rings["cpu.usage"].ts.size == HISTORY_WINDOW_SEC // UPDATE_INTERVAL_SEC
+
+        mapped = MetricHistory(persist_path=str(tmp_path / "live.bin"))
+        mapped.record({"cpu.usage": 1.0}, ts=1000.0)
+        assert mapped._rings["cpu.usage"].ts.size == HISTORY_PERSIST_WINDOW_SEC // UPDATE_INTERVAL_SEC
+        assert mapped.capacity == memory.capacity
+        mapped.close()
+
+    def test_summary_since(self):
+        h = MetricHistory(capacity=100)
+        _fill(h, 10, keys=("cpu.usage",))
+        assert h.summary("cpu.usage")['min'] == 0.0
+        assert h.summary("cpu.usage", since=1005.0) == {'min': 5.0, 'mean': 7.0, 'max': 9.0, 'last': 9.0}
@@ -0,0 +1,169 @@
+"""Unit tests for the columnar binary history segments."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.history_store import (
+    ENC_CONST,
+    ENC_DELTA,
+    ENC_XOR,
+    ENC_XOR64,
+    ENTRY_DTYPE,
+    HistoryRecorder,
+    SegmentReader,
+    decode_column,
+    encode_column,
+    write_segment,
+)
+
+
+def index_entry(encoding: int, width: int, base: float) -> np.void:
+    entry = np.zeros(1, dtype=ENTRY_DTYPE)[0]
+    entry['encoding'], entry['width'], entry['base'] = encoding, width, base
+    return entry
+
+
+class TestEncoding:
+
+    def test_constant_column_stores_nothing(self):
+        enc, width, base, payload = encode_column(np.full(100, 42.5), decimals=2)
+        assert (enc, base, payload) == (ENC_CONST, 42.5, b"")
+
+    def test_slow_percentage_uses_narrow_deltas(self):
+        values = 50 + np.cumsum(np.full(1000, 0.25))  # +0.25 per row
+        enc, width, _base, payload = encode_column(values, decimals=2)
+        assert (enc, width, len(payload)) == (ENC_DELTA, 1, 1000)
+
+    def test_nan_falls_back_to_xor(self):
+        values = np.array([1.0, np.nan, 1.5, 1.5])
+        enc, width, _base, _payload = encode_column(values, decimals=2)
+        assert enc == ENC_XOR64 and width == 8
+
+    def test_xor_narrows_for_slowly_changing_floats(self):
+        values = 1e12 + np.arange(100.0) * 1e3     # too large to quantise exactly at 2 decimals
+        enc, width, _base, _payload = encode_column(values, decimals=6)
+        assert enc == ENC_XOR64 and width < 8
+
+    def test_xor_keeps_large_counters_exact(self):
+        values = 1e12 + np.array([0.0, 1.0, 3.0, 7.5, np.nan, 12.25])
+        enc, width, base, payload = encode_column(values, decimals=6)
+        decoded = decode_column(index_entry(enc, width, base), payload, len(values))
+        np.testing.assert_array_equal(decoded, values)
+
+    def test_float32_xor_segments_still_decode(self):
+        values = np.array([1.5, 2.25, np.nan, 3.0], dtype=np.float32)
+        bits = values.view(np.uint32)
+        xor = np.bitwise_xor(bits, np.concatenate(([0], bits[:-1])).astype(np.uint32))
+        decoded = decode_column(index_entry(ENC_XOR, 4, float(bits[0])), xor.tobytes(), len(values))
+        np.testing.assert_array_equal(decoded, values.astype(np.float64))
+
+
+@pytest.fixture
+def segment(tmp_path):
+    rng = np.random.default_rng(0)
+    ts = 1_700_000_000 + np.arange(600.0)
+    columns = {
+        "cpu.usage": np.round(rng.uniform(0, 100, 600), 1),
+        "ram.percent": np.full(600, 63.2),
+        "net.eth0.rx_bytes_s": rng.uniform(0, 1e9, 600),
+        "disk.sdb.read_mb_s": np.where(np.arange(600) < 300, np.nan, 5.0),
+    }
+    path = str(tmp_path / "seg.seg")
+    write_segment(path, ts, columns, decimals=2)
+    return path, ts, columns
+
+
+class TestSegmentReader:
+
+    def test_round_trip(self, segment):
+        path, ts, columns = segment
+        with SegmentReader(path) as seg:
+            assert seg.n_rows == 600
+            assert sorted(seg.metrics()) == sorted(columns)
+            t, v = seg.series("cpu.usage")
+            np.testing.assert_allclose(t, ts)
+            np.testing.assert_allclose(v, columns["cpu.usage"])
+            _t, v = seg.series("ram.percent")
+            assert (v == 63.2).all()
+            _t, v = seg.series("net.eth0.rx_bytes_s")
+            np.testing.assert_allclose(v, columns["net.eth0.rx_bytes_s"], rtol=1e-6)
+
+    def test_time_range_and_missing_values(self, segment):
+        path, ts, columns = segment
+        with SegmentReader(path) as seg:
+            t, v = seg.series("cpu.usage", start=ts[100], end=ts[109])
+            np.testing.assert_allclose(t, ts[100:110])
+            np.testing.assert_allclose(v, columns["cpu.usage"][100:110])
+            t, _v = seg.series("disk.sdb.read_mb_s")
+            assert t[0] == ts[300] and t.size == 300
+            assert seg.series("nope")[0].size == 0
+
+    def test_index_stats_without_decoding(self, segment):
+        path, _ts, columns = segment
+        with SegmentReader(path) as seg:
+            lo, hi = seg.stats("cpu.usage")
+            assert lo == columns["cpu.usage"].min() and hi == columns["cpu.usage"].max()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        bad = tmp_path / "bad.seg"
+        bad.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            SegmentReader(str(bad))
+
+
+class TestHistoryRecorder:
+
+    def make(self, tmp_path, **kw):
+        return HistoryRecorder(directory=str(tmp_path), segment_rows=10, segment_sec=1e9, **kw)
+
+    def test_segments_roll_and_query_spans_them(self, tmp_path):
+        rec = self.make(tmp_path)
+        for i in range(25):
+            rec.append({"cpu.usage": float(i)}, ts=1000.0 + i)
+        assert len(rec.segments()) == 2            # 5 rows still buffered
+        ts, values = rec.query("cpu.usage")
+        assert values.tolist() == [float(i) for i in range(25)]
+        ts, values = rec.query("cpu.usage", start=1008, end=1012)
+        assert ts.tolist() == [1008.0, 1009.0, 1010.0, 1011.0, 1012.0]
+
+    def test_metrics_appearing_later(self, tmp_path):
+        rec = self.make(tmp_path)
+        for i in range(10):
+            snap = {"cpu.usage": 1.0}
+            if i >= 5:
+                snap["disk.sdc.read_mb_s"] = 2.0
+            rec.append(snap, ts=float(i))
+        ts, _values = rec.query("disk.sdc.read_mb_s")
+        assert ts.tolist() == [5.0, 6.0, 7.0, 8.0, 9.0]
+        assert rec.metrics() == ["cpu.usage", "disk.sdc.read_mb_s"]
+
+    def test_retention_prunes_old_segments(self, tmp_path):
+        rec = self.make(tmp_path, retention_days=1)
+        for i in range(10):
+            rec.append({"x": 1.0}, ts=float(i))
+        for i in range(10):
+            rec.append({"x": 2.0}, ts=3 * 86400.0 + i)
+        assert len(rec.segments()) == 1
+
+    def test_export_csv_and_json(self, tmp_path):
+        rec = self.make(tmp_path)
+        for i in range(3):
+            rec.append({"a": float(i), "b": 1.5}, ts=100.0 + i)
+        buf = io.StringIO()
+        assert rec.export_csv(buf) == 6
+        lines = buf.getvalue().splitlines()
+        assert lines[0] == "Timestamp,Metric,Value"
+        assert lines[1] == "100.000,a,0.0"
+
+        buf = io.StringIO()
+        assert rec.export_json(buf, metrics=["b"]) == 3
+        assert json.loads(buf.getvalue()) == {"b": {"ts": [100.0, 101.0, 102.0], "values": [1.5, 1.5, 1.5]}}
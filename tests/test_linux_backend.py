@@ -0,0 +1,95 @@
+"""Unit tests for the Linux procfs/sysfs backend (runs against tests/fixtures/rootfs)."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from conftest import ROOTFS_DIR
+from modules.backends.linux import LinuxBackend
+from modules.board_diag import BoardDiagnostic
+from modules.cpu_diag import CPUDiagnostic
+from modules.disk_diag import DiskDiagnostic
+from modules.gpu_diag import GPUDiagnostic
+
+
+@pytest.fixture
+def backend():
+    return LinuxBackend(root=ROOTFS_DIR)
+
+
+class TestLinuxBackend:
+    """Tests for LinuxBackend against a captured root filesystem."""
+
+    def test_cpu_info_counts_cores_and_threads(self, backend):
+        info = backend.get_cpu_info()
+        assert info['Name'] == "AMD Ryzen 7 5800X 8-Core Processor"
+        assert info['Cores'] == 2
+        assert info['Threads'] == 4
+
+    def test_cpu_max_clock_from_cpufreq(self, backend):
+        assert backend.get_cpu_info()['MaxClockSpeed'] == "4850 MHz"
+
+    def test_board_info_skips_unreadable_serial(self, backend):
+        info = backend.get_board_info()
+        assert info['Manufacturer'] == "ASUSTeK COMPUTER INC."
+        assert info['Product'] == "ROG STRIX B550-F GAMING"
+        assert info['BIOS Version'] == "2803"
+        assert 'SerialNumber' not in info
+
+    def test_gpu_info_from_drm(self, backend):
+        gpus = backend.get_gpu_info()
+        assert len(gpus) == 1  # card0-DP-1 is a connector, not a GPU
+        gpu = gpus[0]
+        assert gpu['DeviceID'] == "0000:0b:00.0"
+        assert gpu['Name'].startswith("AMD")
+        assert gpu['Load'] == "37%"
+        assert gpu['Used Memory'] == "2048MB"
+        assert gpu['Total Memory'] == "16368MB"
+        assert gpu['Temperature'] == "52 C"
+
+    def test_drive_status_from_sys_block(self, backend):
+        status = backend.get_smart_status()
+        assert status == {
+            "/dev/nvme0n1": "Samsung SSD 980 PRO 1TB — OK",
+            "/dev/sda": "WDC WD40EFRX-68N32N0 — Offline",
+        }
+
+    def test_missing_root_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            LinuxBackend(root=str(tmp_path)).get_cpu_info()
+
+
+class TestModulesOnLinuxBackend:
+    """The diagnostic modules keep their output contracts on Linux."""
+
+    def test_cpu_diag(self, backend):
+        assert CPUDiagnostic(backend).get_cpu_info()['Threads'] == 4
+
+    def test_board_diag_merges_platform_info(self, backend):
+        info = BoardDiagnostic(backend).get_board_info()
+        assert 'System' in info
+        assert info['BIOS Version'] == "2803"
+
+    def test_gpu_diag_falls_back_to_sysfs(self, backend, monkeypatch):
+        def no_nvidia_smi(*args, **kwargs):
+            raise FileNotFoundError("nvidia-smi")
+        monkeypatch.setattr("subprocess.check_output", no_nvidia_smi)
+        gpus = GPUDiagnostic(backend).get_gpu_info()
+        assert gpus[0]['DeviceID'] == "0000:0b:00.0"
+
+    def test_gpu_diag_async_falls_back_to_sysfs(self, backend, monkeypatch):
+        async def no_nvidia_smi(*args, **kwargs):
+            raise FileNotFoundError("nvidia-smi")
+        monkeypatch.setattr("modules.gpu_diag.run_command", no_nvidia_smi)
+        gpus = asyncio.run(GPUDiagnostic(backend).get_gpu_info_async())
+        assert gpus[0]['DeviceID'] == "0000:0b:00.0"
+
+    def test_disk_diag_error_is_reported(self, tmp_path):
+        assert DiskDiagnostic(LinuxBackend(root=str(tmp_path))).get_smart_status() == {}
+        assert 'Error' in CPUDiagnostic(LinuxBackend(root=str(tmp_path))).get_cpu_info()
@@ -0,0 +1,113 @@
+"""Unit tests for the online multi-core memory pattern test."""
+
+from __future__ import annotations
+
+import concurrent.futures.process
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from config import MEMTEST_WORKER_OVERHEAD_MB
+from modules.full_scan import FullScanDiagnostic
+from modules.memtest import PATTERNS, MemoryTest, PatternFiller, run_worker, summarize, verify_pattern, write_pattern
+
+MB = 2 ** 20
+
+
+class TestPatterns:
+
+    def setup_method(self):
+        self.filler = PatternFiller(chunk_words=256, seed=1)
+
+    def test_walking_ones(self):
+        words = self.filler.expected("walking_ones", 0, 130, invert=False)
+        assert words[0] == 1 and words[63] == 1 << 63 and words[64] == 1 and words[129] == 2
+
+    def test_address_in_address(self):
+        assert list(self.filler.expected("address", 512, 4, invert=False)) == [512, 513, 514, 515]
+
+    def test_random_is_repeatable_and_differs_per_chunk(self):
+        a = self.filler.expected("random", 0, 256, invert=False).copy()
+        b = self.filler.expected("random", 256, 256, invert=False).copy()
+        assert np.array_equal(a, self.filler.expected("random", 0, 256, invert=False))
+        assert not np.array_equal(a, b)
+
+    def test_invert_flips_every_bit(self):
+        plain = self.filler.expected("address", 0, 8, invert=False).copy()
+        assert np.array_equal(self.filler.expected("address", 0, 8, invert=True), ~plain)
+
+
+class TestWriteVerify:
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_clean_buffer_verifies(self, pattern):
+        filler = PatternFiller(chunk_words=1024, seed=3)
+        buf = np.empty(5000, dtype=np.uint64)          # not a multiple of the chunk
+        assert write_pattern(buf, filler, pattern, invert=True) == buf.size
+        assert verify_pattern(buf, filler, pattern, True, buf.size) == (0, [])
+
+    def test_flipped_bit_is_reported(self):
+        filler = PatternFiller(chunk_words=1024, seed=3)
+        buf = np.empty(4096, dtype=np.uint64)
+        write_pattern(buf, filler, "address", invert=False)
+        buf[2049] ^= np.uint64(1 << 17)                # a stuck bit
+        mismatches, samples = verify_pattern(buf, filler, "address", False, buf.size)
+        assert mismatches == 1
+        assert samples == [(2049, 2049, 2049 ^ (1 << 17))]
+
+    def test_deadline_stops_after_the_current_chunk(self):
+        filler = PatternFiller(chunk_words=1024, seed=0)
+        buf = np.empty(10 * 1024, dtype=np.uint64)
+        assert write_pattern(buf, filler, "random", False, deadline=time.monotonic() - 1) == 1024
+
+    def test_worker_runs_to_its_budget(self):
+        result = run_worker(0, 4 * MB, budget_sec=0.3, chunk_kb=256)
+        assert result['passes'] >= 1 and result['mismatches'] == 0
+        assert result['write_mbps'] > 0 and result['read_mbps'] > 0
+
+
+class TestMemoryTest:
+
+    def test_plan_respects_available_memory(self):
+        available = 4096 * MB
+        workers, per_worker = MemoryTest(available, fraction=0.25, workers=4, max_mb=0).plan()
+        assert workers == 4
+        assert workers * (per_worker + MEMTEST_WORKER_OVERHEAD_MB * MB) <= available * 0.25
+
+    def test_small_budget_uses_fewer_workers(self):
+        workers, per_worker = MemoryTest(400 * MB, fraction=0.5, workers=16, max_mb=0).plan()
+        assert workers < 16 and per_worker > 0
+        with pytest.raises(MemoryError):
+            MemoryTest(32 * MB, fraction=0.5, workers=4).plan()
+
+    def test_workers_are_capped_at_the_pool_limit(self):
+        with patch("modules.memtest.PROCESS_POOL_MAX_WORKERS", 61):
+            workers, _ = MemoryTest(64 * 1024 * MB, fraction=0.5, workers=128, max_mb=0).plan()
+        assert workers == 61
+
+    def test_process_pool_run(self):
+        budget = 2 * (MEMTEST_WORKER_OVERHEAD_MB + 8) * MB
+        result = MemoryTest(budget, fraction=1.0, workers=2, budget_sec=0.3, chunk_kb=256).run()
+        assert result['workers'] == 2 and result['mismatches'] == 0
+        assert len({w['pid'] for w in result['per_worker']}) == 2
+        assert summarize(result).startswith("OK")
+
+    def test_full_scan_check_fails_on_mismatch(self):
+        bad = {'workers': 2, 'tested_mb': 1024, 'read_mbps': 1.0, 'mismatches': 3, 'per_worker': [
+            {'worker': 0, 'samples': [{'pattern': "address", 'offset': 8, 'expected': "0" * 16, 'actual': "1" * 16}]},
+        ]}
+        with patch.object(MemoryTest, "run", return_value=bad):
+            ok, msg = FullScanDiagnostic().run_memory_test()
+        assert not ok and msg == "3 mismatches in 1.0 GB"
+
+    def test_full_scan_check_fails_when_a_worker_is_killed(self):
+        broken = concurrent.futures.process.BrokenProcessPool("a child process terminated abruptly")
+        with patch.object(MemoryTest, "run", side_effect=broken):
+            ok, msg = FullScanDiagnostic().run_memory_test()
+        assert not ok and msg == "Memory test failed: a child process terminated abruptly"
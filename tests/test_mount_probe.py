@@ -0,0 +1,123 @@
+"""Unit tests for MountProber (hang-proof disk_usage) and its DiskDiagnostic wiring."""
+
+from __future__ import annotations
+
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from conftest import FakeDiskUsage, FakePartition
+from modules.backends.base import HardwareBackend
+from modules.disk_diag import DiskDiagnostic
+from modules.mount_probe import MountProber, Unresponsive
+from modules.mount_watch import MountWatcher
+
+
+class HangingUsage:
+    """Fake ``disk_usage`` that blocks on selected mountpoints until released."""
+
+    def __init__(self, hung: set[str]):
+        self.hung = set(hung)
+        self.release = threading.Event()
+        self.calls: dict[str, int] = {}
+
+    def __call__(self, mountpoint: str):
+        self.calls[mountpoint] = self.calls.get(mountpoint, 0) + 1
+        if mountpoint in self.hung:
+            self.release.wait(5)
+        return FakeDiskUsage()
+
+
+@pytest.fixture
+def clock():
+    now = [0.0]
+
+    def tick():
+        return now[0]
+    tick.now = now
+    return tick
+
+
+class TestMountProber:
+
+    def test_healthy_mounts_return_usage(self):
+        prober = MountProber(usage_fn=lambda mp: FakeDiskUsage(), timeout=0.5)
+        out = prober.probe_many(["/", "/home"])
+        assert all(isinstance(v, FakeDiskUsage) for v in out.values())
+
+    def test_hung_mounts_share_one_deadline(self):
+        usage = HangingUsage({"/nfs/a", "/nfs/b", "/nfs/c"})
+        prober = MountProber(usage_fn=usage, timeout=0.2)
+        t0 = time.monotonic()
+        out = prober.probe_many(["/", "/nfs/a", "/nfs/b", "/nfs/c"])
+        elapsed = time.monotonic() - t0
+        usage.release.set()
+        assert elapsed < 0.5
+        assert isinstance(out["/"], FakeDiskUsage)
+        assert all(isinstance(out[mp], Unresponsive) for mp in ("/nfs/a", "/nfs/b", "/nfs/c"))
+
+    def test_stuck_worker_is_not_stacked(self):
+        usage = HangingUsage({"/nfs"})
+        prober = MountProber(usage_fn=usage, timeout=0.05, quarantine_after=10)
+        for _ in range(3):
+            prober.probe_many(["/nfs"])
+        usage.release.set()
+        assert usage.calls["/nfs"] == 1
+
+    def test_quarantine_with_exponential_backoff(self, clock):
+        usage = HangingUsage({"/nfs"})
+        prober = MountProber(usage_fn=usage, timeout=0.01, quarantine_after=2,
+                             backoff=10, backoff_max=25, clock=clock)
+        prober.probe_many(["/nfs"])                     # failure 1
+        out = prober.probe_many(["/nfs"])               # failure 2 -> quarantined 10 s
+        assert prober.is_quarantined("/nfs")
+        assert out["/nfs"].retry_in == pytest.approx(10)
+
+        clock.now[0] = 5.0
+        t0 = time.monotonic()
+        assert isinstance(prober.probe_many(["/nfs"])["/nfs"], Unresponsive)
+        assert time.monotonic() - t0 < 0.01               # no wait while backing off
+
+        clock.now[0] = 10.0
+        assert prober.probe_many(["/nfs"])["/nfs"].retry_in == pytest.approx(20)
+        clock.now[0] = 30.0
+        assert prober.probe_many(["/nfs"])["/nfs"].retry_in == pytest.approx(25)   # capped
+
+    def test_recovery_clears_quarantine(self, clock):
+        usage = HangingUsage({"/usb"})
+        prober = MountProber(usage_fn=usage, timeout=0.01, quarantine_after=1, clock=clock)
+        prober.probe_many(["/usb"])
+        usage.release.set()
+        time.sleep(0.05)
+        out = prober.probe_many(["/usb"])
+        assert isinstance(out["/usb"], FakeDiskUsage)
+        assert not prober.is_quarantined("/usb")
+
+    def test_exceptions_are_returned(self):
+        def deny(mp):
+            raise PermissionError(mp)
+        out = MountProber(usage_fn=deny, timeout=0.5).probe_many(["/root"])
+        assert isinstance(out["/root"], PermissionError)
+
+
+class TestDiskDiagnosticUnresponsive:
+
+    def test_unresponsive_mount_is_listed_not_dropped(self):
+        usage = HangingUsage({"Z:\\"})
+        diag = DiskDiagnostic(
+            HardwareBackend(),
+            mount_watcher=MountWatcher(ttl=float("inf")),
+            prober=MountProber(usage_fn=usage, timeout=0.05),
+        )
+        parts = [FakePartition(), FakePartition("Z:\\", "Z:\\")]
+        with patch("psutil.disk_partitions", return_value=parts):
+            disks = diag.get_disk_partitions_and_usage()
+        usage.release.set()
+        assert [d['Status'] for d in disks] == ["OK", "Unresponsive"]
+        assert disks[1]['Total'] == "N/A"
@@ -0,0 +1,91 @@
+"""Unit tests for mount-change watchers and DiskDiagnostic partition caching."""
+
+from __future__ import annotations
+
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from conftest import FakeDiskUsage, FakePartition
+from modules.backends.base import HardwareBackend
+from modules.disk_diag import DiskDiagnostic
+from modules.mount_watch import LinuxMountWatcher, MountWatcher, WindowsMountWatcher
+
+
+class ManualWatcher(MountWatcher):
+    """Reports a change only when told to."""
+
+    def __init__(self):
+        super().__init__(ttl=float("inf"))
+        self.pending = False
+
+    def changed(self):
+        pending, self.pending = self.pending, False
+        return pending
+
+
+class TestWatchers:
+
+    def test_ttl_watcher(self):
+        now = [0.0]
+        watcher = MountWatcher(ttl=10, clock=lambda: now[0])
+        assert not watcher.changed()
+        now[0] = 10.0
+        assert watcher.changed()
+        assert not watcher.changed()
+
+    def test_windows_watcher_on_drive_mask(self):
+        mask = [0b100]
+        watcher = WindowsMountWatcher(ttl=float("inf"), drives_fn=lambda: mask[0])
+        assert not watcher.changed()
+        mask[0] = 0b1100   # D: inserted
+        assert watcher.changed()
+        assert not watcher.changed()
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/mountinfo"), reason="Linux only")
+    def test_linux_watcher_is_quiet_without_mount_changes(self):
+        watcher = LinuxMountWatcher()
+        try:
+            assert not watcher.changed()
+        finally:
+            watcher.close()
+
+
+class TestPartitionCache:
+
+    def make_diag(self, watcher, **kwargs):
+        return DiskDiagnostic(HardwareBackend(), mount_watcher=watcher, **kwargs)
+
+    def test_partitions_enumerated_once_until_change(self):
+        watcher = ManualWatcher()
+        diag = self.make_diag(watcher)
+        with patch("psutil.disk_partitions", return_value=[FakePartition()]) as parts, \
+             patch("psutil.disk_usage", return_value=FakeDiskUsage()):
+            for _ in range(3):
+                diag.get_disk_partitions_and_usage()
+            assert parts.call_count == 1
+            watcher.pending = True
+            diag.get_disk_partitions_and_usage()
+            assert parts.call_count == 2
+
+    def test_pseudo_filesystems_filtered(self):
+        overlay = FakePartition("overlay", "/var/lib/docker/overlay2/x/merged")
+        overlay.fstype = "overlay"
+        snap = FakePartition("/dev/loop3", "/snap/core/1")
+        snap.fstype = "squashfs"
+        diag = self.make_diag(ManualWatcher())
+        with patch("psutil.disk_partitions", return_value=[FakePartition(), overlay, snap]), \
+             patch("psutil.disk_usage", return_value=FakeDiskUsage()) as usage:
+            disks = diag.get_disk_partitions_and_usage()
+        assert [d['Mountpoint'] for d in disks] == ["C:\\"]
+        assert usage.call_count == 1
+
+    def test_custom_fstype_filter(self):
+        diag = self.make_diag(ManualWatcher(), ignored_fstypes=frozenset({"NTFS"}))
+        with patch("psutil.disk_partitions", return_value=[FakePartition()]), \
+             patch("psutil.disk_usage", return_value=FakeDiskUsage()):
+            assert diag.get_disk_partitions_and_usage() == []
@@ -0,0 +1,93 @@
+"""Unit tests for NetworkDiagnostic."""
+
+from __future__ import annotations
+
+import sys
+import os
+from collections import namedtuple
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.net_diag import NetworkDiagnostic
+
+NetIO = namedtuple(
+    "NetIO",
+    "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout",
+)
+IfStats = namedtuple("IfStats", "isup speed")
+
+
+def netio(sent=0, recv=0, psent=0, precv=0, errin=0, errout=0, dropin=0, dropout=0):
+    return NetIO(sent, recv, psent, precv, errin, errout, dropin, dropout)
+
+
+class Script:
+    """Feeds successive snapshots at 2-second steps."""
+
+    def __init__(self, snapshots, stats=None):
+        self.snapshots = list(snapshots)
+        self.stats = stats or {}
+        self.t = 0.0
+
+    def clock(self):
+        self.t += 2.0
+        return self.t
+
+    def diag(self):
+        return NetworkDiagnostic(
+            counters_fn=lambda: self.snapshots.pop(0),
+            stats_fn=lambda: self.stats,
+            clock=self.clock,
+        )
+
+
+class TestNetworkDiagnostic:
+
+    def test_first_call_is_baseline(self):
+        assert Script([{"eth0": netio()}]).diag().get_network_rates() == {}
+
+    def test_rates_and_utilisation(self):
+        script = Script(
+            [{"eth0": netio()},
+             {"eth0": netio(sent=25_000_000, recv=2_500_000, psent=2000, precv=400, errin=4, dropout=2)}],
+            stats={"eth0": IfStats(True, 1000)},
+        )
+        diag = script.diag()
+        diag.get_network_rates()
+        r = diag.get_network_rates()["eth0"]
+        assert r["tx_bytes_s"] == pytest.approx(12_500_000)
+        assert r["rx_pkts_s"] == pytest.approx(200)
+        assert r["rx_errors_s"] == pytest.approx(2)
+        assert r["tx_drops_s"] == pytest.approx(1)
+        assert r["util_pct"] == pytest.approx(10.0)   # 100 Mb/s of 1000
+
+    def test_unknown_speed_has_no_utilisation(self):
+        script = Script([{"lo": netio()}, {"lo": netio(sent=10)}], stats={"lo": IfStats(True, 0)})
+        diag = script.diag()
+        diag.get_network_rates()
+        rates = diag.get_network_rates()
+        assert "util_pct" not in rates["lo"]
+        assert diag.get_interface_info(rates)[0]['Utilisation'] == "N/A"
+
+    def test_interfaces_come_and_go(self):
+        script = Script([
+            {"eth0": netio()},
+            {"eth0": netio(recv=10), "wg0": netio()},
+            {"wg0": netio(recv=20)},
+        ])
+        diag = script.diag()
+        diag.get_network_rates()
+        assert set(diag.get_network_rates()) == {"eth0"}
+        assert set(diag.get_network_rates()) == {"wg0"}
+
+    def test_interface_info_has_stable_key(self):
+        script = Script([{"eth0": netio()}, {"eth0": netio(recv=2 * 1024 ** 2)}],
+                        stats={"eth0": IfStats(False, 100)})
+        diag = script.diag()
+        diag.get_network_rates()
+        info = diag.get_interface_info(diag.get_network_rates())
+        assert info[0]['Interface'] == "eth0"
+        assert info[0]['Status'] == "Down"
+        assert info[0]['RX'].startswith("1.00 MB/s")
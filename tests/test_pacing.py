@@ -0,0 +1,96 @@
+"""Unit tests for the adaptive poll interval."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from config import (
+    POLL_BUSY_FACTOR,
+    POLL_HIDDEN_FACTOR,
+    POLL_IDLE_AFTER_SEC,
+    POLL_IDLE_FACTOR,
+    POLL_UNFOCUSED_FACTOR,
+)
+from modules.pacing import AdaptivePacer
+
+
+class FakeClocks:
+    def __init__(self):
+        self.wall = 1000.0
+        self.cpu = 0.0
+
+    def advance(self, seconds: float, cpu_pct: float = 0.0) -> None:
+        self.wall += seconds
+        self.cpu += seconds * cpu_pct / 100.0
+
+
+@pytest.fixture
+def clocks():
+    return FakeClocks()
+
+
+def make(clocks, **kwargs):
+    kwargs.setdefault("max_interval", 1000.0)
+    return AdaptivePacer(base_interval=2.0, clock=lambda: clocks.wall, cpu_clock=lambda: clocks.cpu, **kwargs)
+
+
+class TestAdaptivePacer:
+
+    def test_full_rate_by_default(self, clocks):
+        pacer = make(clocks)
+        assert pacer.interval() == 2.0
+        assert "full rate" in pacer.describe()
+
+    def test_minimized_and_unfocused(self, clocks):
+        pacer = make(clocks)
+        pacer.set_focused(False)
+        assert pacer.interval() == 2.0 * POLL_UNFOCUSED_FACTOR
+        pacer.set_visible(False)
+        assert pacer.interval() == 2.0 * POLL_HIDDEN_FACTOR
+        assert "minimized" in pacer.describe()
+        assert pacer.set_visible(True) is True     # restoring the window speeds up
+        assert pacer.set_focused(True) is True
+        assert pacer.interval() == 2.0
+
+    def test_idle_backs_off_and_interaction_snaps_back(self, clocks):
+        pacer = make(clocks)
+        pacer.set_focused(False)
+        clocks.advance(POLL_IDLE_AFTER_SEC)
+        assert pacer.interval() == 2.0 * POLL_UNFOCUSED_FACTOR * POLL_IDLE_FACTOR
+        assert pacer.touch() is True               # caller should wake the engine
+        assert pacer.touch() is False              # already at the reduced rate
+        assert pacer.interval() == 2.0 * POLL_UNFOCUSED_FACTOR
+
+    def test_saturated_system_backs_off_further(self, clocks):
+        pacer = make(clocks)
+        pacer.observe(99.0)
+        assert pacer.interval() == 2.0 * POLL_BUSY_FACTOR
+        assert "system busy" in pacer.describe()
+        pacer.observe(20.0)
+        assert pacer.interval() == 2.0
+
+    def test_overhead_ceiling_stretches_interval(self, clocks):
+        pacer = make(clocks, overhead_ceiling_pct=5.0)
+        pacer.observe(10.0)
+        for _ in range(30):
+            # A tick costs 0.4 s of CPU: 20 % of a core at the 2 s base rate
+            interval = pacer.interval()
+            clocks.advance(interval)
+            clocks.cpu += 0.4
+            pacer.observe(10.0)
+        assert pacer.interval() == pytest.approx(8.0, rel=0.05)   # 0.4 / 8 = 5 %
+        assert pacer.overhead_pct == pytest.approx(5.0, rel=0.1)
+
+    def test_cap_and_disabled_ceiling(self, clocks):
+        pacer = make(clocks, max_interval=6.0, overhead_ceiling_pct=0)
+        pacer.set_visible(False)
+        pacer.observe(99.0)
+        assert pacer.interval() == 6.0
+        clocks.advance(1.0, cpu_pct=100.0)
+        pacer.observe(10.0)
+        assert pacer.interval() == 6.0 and pacer._overhead_scale == 1.0
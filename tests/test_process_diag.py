@@ -0,0 +1,88 @@
+"""Unit tests for ProcessDiagnostic (incremental top-N process table)."""
+
+from __future__ import annotations
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from conftest import FakeProcess
+from modules.process_diag import ProcessDiagnostic
+
+
+class ProcessTable:
+    """A mutable fake process table wired into ProcessDiagnostic."""
+
+    def __init__(self, procs):
+        self.procs = {p.pid: p for p in procs}
+        self.created: list[int] = []
+
+    def pids(self):
+        return list(self.procs)
+
+    def factory(self, pid):
+        self.created.append(pid)
+        return self.procs[pid]
+
+    def diag(self, top_n=3):
+        return ProcessDiagnostic(top_n=top_n, pids_fn=self.pids, process_factory=self.factory)
+
+
+@pytest.fixture
+def table():
+    return ProcessTable([
+        FakeProcess(1, "init", cpu=0.5, rss=10 << 20),
+        FakeProcess(2, "db", cpu=80.0, rss=4000 << 20),
+        FakeProcess(3, "web", cpu=20.0, rss=300 << 20),
+        FakeProcess(4, "idle", cpu=0.0, rss=1 << 20),
+    ])
+
+
+class TestProcessDiagnostic:
+
+    def test_top_by_cpu(self, table):
+        rows = table.diag(top_n=2).get_top_processes("cpu")
+        assert [r['Name'] for r in rows] == ["db", "web"]
+        assert rows[0]['CPU'] == "80.0%"
+        assert rows[0]['Memory'] == "4000.0 MB"
+
+    def test_top_by_rss(self, table):
+        rows = table.diag(top_n=1).get_top_processes("rss")
+        assert rows[0]['PID'] == "2"
+
+    def test_top_by_io_uses_deltas(self, table):
+        diag = table.diag(top_n=1)
+        diag.get_top_processes("io")
+        table.procs[3].io_bytes += 50 << 20
+        rows = diag.get_top_processes("io")
+        assert rows[0]['Name'] == "web"
+
+    def test_process_objects_are_reused(self, table):
+        diag = table.diag()
+        diag.get_top_processes()
+        diag.get_top_processes()
+        assert sorted(table.created) == [1, 2, 3, 4]
+
+    def test_names_fetched_for_top_n_only(self, table):
+        diag = table.diag(top_n=1)
+        diag.get_top_processes()
+        diag.get_top_processes()
+        assert table.procs[2].calls.get("name") == 1   # cached after first fetch
+        assert "name" not in table.procs[4].calls
+        assert "rss" not in table.procs[4].calls       # not ranked by memory
+
+    def test_exited_and_reused_pids_are_evicted(self, table):
+        diag = table.diag()
+        diag.get_top_processes()
+        del table.procs[2]
+        table.procs[3].running = False           # pid reused by another process
+        rows = diag.get_top_processes()
+        assert {r['PID'] for r in rows} == {"1", "4"}
+        assert diag.get_process_count() == 2
+
+    def test_invalid_sort_key(self, table):
+        with pytest.raises(ValueError):
+            table.diag().get_top_processes("disk")
@@ -0,0 +1,168 @@
+"""Unit tests for collector record / replay and synthetic captures."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.history import flatten_metrics
+from modules.replay import (
+    Capture,
+    CaptureWriter,
+    RecordingCollector,
+    ReplayClock,
+    ReplayCollector,
+    replay_collectors,
+    synthesize,
+)
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class FakeRAM:
+
+    def __init__(self) -> None:
+        self.percent = 10.0
+
+    def get_ram_info(self):
+        return {'Total': "16.00 GB", 'Percentage': self.percent}
+
+
+class FakeGPU:
+
+    async def get_gpu_info_async(self):
+        return [{'Name': "G", 'Temperature': "70 C"}]
+
+
+class FakeDisk:
+
+    def get_disk_partitions_and_usage(self):
+        return [{'Device': "/dev/sda1", 'Mountpoint': "/"}]
+
+    def attach_io(self, disks, io):
+        for d in disks:
+            d['Read'] = "1.00 MB/s"
+
+    def stop(self):
+        return "passed through"
+
+
+def _record(path, clock):
+    writer = CaptureWriter(path, clock=clock)
+    ram = FakeRAM()
+    rec_ram = RecordingCollector('ram', ram, writer)
+    rec_gpu = RecordingCollector('gpu', FakeGPU(), writer)
+    rec_disk = RecordingCollector('disk', FakeDisk(), writer)
+    for t in range(5):
+        clock.t = float(t)
+        ram.percent = 10.0 * (t + 1)
+        rec_ram.get_ram_info()
+        asyncio.run(rec_gpu.get_gpu_info_async())
+        disks = rec_disk.get_disk_partitions_and_usage()
+        rec_disk.attach_io(disks, {})
+    assert rec_disk.stop() == "passed through"
+    writer.close()
+
+
+class TestRecordReplay:
+
+    def test_replay_follows_the_clock(self, tmp_path):
+        path = str(tmp_path / "cap.jsonl")
+        _record(path, FakeClock())
+
+        capture = Capture.load(path)
+        assert capture.duration == 4.0
+        clock = FakeClock()
+        replay_clock = ReplayClock(capture.duration, speed=2.0, clock=clock)
+        ram = ReplayCollector('ram', capture, replay_clock)
+
+        assert ram.get_ram_info()['Percentage'] == 10.0
+        clock.t = 1.0          # 2x speed -> capture time 2.0
+        assert ram.get_ram_info()['Percentage'] == 30.0
+        clock.t = 2.5          # wraps around: 5.0 mod 4.0 = 1.0
+        assert ram.get_ram_info()['Percentage'] == 20.0
+
+    def test_no_loop_holds_last_sample(self, tmp_path):
+        path = str(tmp_path / "cap.jsonl")
+        _record(path, FakeClock())
+        capture = Capture.load(path)
+        clock = FakeClock()
+        ram = ReplayCollector('ram', capture, ReplayClock(capture.duration, loop=False, clock=clock))
+        clock.t = 100.0
+        assert ram.get_ram_info()['Percentage'] == 50.0
+
+    def test_async_in_place_and_unrecorded_methods(self, tmp_path):
+        path = str(tmp_path / "cap.jsonl.gz")
+        _record(path, FakeClock())
+        collectors = replay_collectors(path)
+
+        assert asyncio.run(collectors['gpu'].get_gpu_info_async())[0]['Temperature'] == "70 C"
+        # The sync variant is served from the async recording
+        assert collectors['gpu'].get_gpu_info()[0]['Name'] == "G"
+
+        disks = collectors['disk'].get_disk_partitions_and_usage()
+        assert 'Read' not in disks[0]
+        collectors['disk'].attach_io(disks, {})
+        assert disks[0]['Read'] == "1.00 MB/s"
+
+        assert collectors['disk'].smart.available() is False
+        assert collectors['cpu'].start_sampler() is None
+
+    def test_each_call_gets_fresh_objects(self, tmp_path):
+        path = str(tmp_path / "cap.jsonl")
+        _record(path, FakeClock())
+        ram = replay_collectors(path)['ram']
+        ram.get_ram_info().pop('Total')
+        assert 'Total' in ram.get_ram_info()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.jsonl"
+        path.write_text(json.dumps({'format': "something-else"}) + "\n")
+        with pytest.raises(ValueError):
+            Capture.load(str(path))
+
+
+class TestSynthetic:
+
+    def test_shapes_match_requested_hardware(self, tmp_path):
+        path = str(tmp_path / "big.jsonl.gz")
+        calls = synthesize(path, cores=256, gpus=8, mounts=100, duration=5, interval=1.0)
+        assert calls == 1 + 5 * 9
+
+        c = replay_collectors(path)
+        assert c['cpu'].get_cpu_info()['Threads'] == 256
+        stats = c['cpu'].get_interval_stats()
+        assert len(stats['per_core']['mean']) == 256
+        gpus = asyncio.run(c['gpu'].get_gpu_info_async())
+        assert len(gpus) == 8
+        disks = c['disk'].get_disk_partitions_and_usage()
+        io = c['disk'].get_disk_io()
+        c['disk'].attach_io(disks, io)
+        assert len(disks) == 100
+        assert all('Busy' in d for d in disks)
+
+        values = flatten_metrics(
+            stats['overall']['mean'], c['ram'].get_ram_info(), io, {},
+            per_core=stats['per_core']['mean'], gpus=gpus,
+        )
+        assert "cpu.core255.usage" in values
+        assert "gpu.7.temperature_c" in values
+
+    def test_seed_is_deterministic(self, tmp_path):
+        a, b = str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")
+        synthesize(a, cores=4, gpus=1, mounts=2, duration=3, seed=7)
+        synthesize(b, cores=4, gpus=1, mounts=2, duration=3, seed=7)
+        assert Capture.load(a).calls == Capture.load(b).calls
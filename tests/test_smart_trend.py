@@ -0,0 +1,101 @@
+"""Unit tests for SmartTrendStore (on-disk SMART time series + predictions)."""
+
+from __future__ import annotations
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.smart_trend import RECORD_DTYPE, SmartTrendStore
+
+DAY = 86400
+
+
+def attrs(reallocated=0, pending=0, wear=5, temp=35, poh=1000):
+    return {'reallocated': reallocated, 'pending': pending, 'wear_pct': wear,
+            'temperature_c': temp, 'power_on_hours': poh, 'media_errors': None}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SmartTrendStore(directory=str(tmp_path), min_interval=3600, window_days=30,
+                           thresholds={'reallocated': 100, 'wear_pct': 100}, warn_days=90)
+
+
+class TestStorage:
+
+    def test_records_are_fixed_width(self, store, tmp_path):
+        store.record("S1", attrs(), ts=1000)
+        store.record("S1", attrs(reallocated=1), ts=2000)
+        assert os.path.getsize(tmp_path / "S1.bin") == 2 * RECORD_DTYPE.itemsize == 64
+
+    def test_unchanged_samples_are_throttled(self, store):
+        assert store.record("S1", attrs(), ts=0)
+        assert not store.record("S1", attrs(), ts=60)          # same values, too soon
+        assert store.record("S1", attrs(temp=36), ts=120)      # changed
+        assert store.record("S1", attrs(temp=36), ts=120 + 3600)
+        assert len(store.load("S1")) == 3
+
+    def test_missing_values_round_trip_as_nan(self, store):
+        store.record("S1", attrs(), ts=0)
+        assert store.load("S1")['media_errors'][0] != store.load("S1")['media_errors'][0]
+
+    def test_reopened_store_continues_from_disk(self, store, tmp_path):
+        store.record("S1", attrs(), ts=0)
+        fresh = SmartTrendStore(directory=str(tmp_path), min_interval=3600)
+        assert not fresh.record("S1", attrs(), ts=10)
+
+    def test_torn_tail_is_cut_before_appending(self, tmp_path):
+        store = SmartTrendStore(str(tmp_path))
+        store.record("S1", attrs(reallocated=5), ts=0)
+        with open(store._path("S1"), "ab") as f:
+            f.write(b"\x01" * 13)      # crash mid-append
+        assert len(store.load("S1")) == 1
+        assert SmartTrendStore(str(tmp_path)).record("S1", attrs(reallocated=6), ts=DAY)
+        assert os.path.getsize(store._path("S1")) == 2 * RECORD_DTYPE.itemsize
+        assert list(store.load("S1")['reallocated']) == [5.0, 6.0]
+
+    def test_serial_is_sanitised(self, store):
+        store.record("WD-WX/12 34", attrs(), ts=0)
+        assert store.serials() == ["WD-WX_12_34"]
+
+
+class TestTrends:
+
+    def test_growth_rate_and_projection(self, store):
+        # reallocated grows by 2 per day from 10 → 28 over 9 days
+        for d in range(10):
+            store.record("S1", attrs(reallocated=10 + 2 * d), ts=d * DAY)
+        t = store.trends("S1", now=9 * DAY)
+        assert t['reallocated']['rate_per_day'] == pytest.approx(2.0)
+        assert t['reallocated']['days_to_threshold'] == pytest.approx(36.0)
+        assert t['temperature_c']['days_to_threshold'] is None
+
+    def test_warnings(self, store):
+        for d in range(10):
+            store.record("S1", attrs(reallocated=10 + 2 * d), ts=d * DAY)
+        msgs = store.warnings("S1", now=9 * DAY)
+        assert msgs == ["Reallocated sectors projected to reach threshold in 36 days"]
+
+    def test_slow_growth_still_warns(self, store):
+        store.record("S1", attrs(pending=0), ts=0)
+        store.record("S1", attrs(pending=1), ts=7 * DAY)
+        assert store.warnings("S1", now=7 * DAY) == ["Pending sectors growing (+1.0/week)"]
+
+    def test_threshold_reached(self, store):
+        store.record("S1", attrs(wear=100), ts=0)
+        assert store.warnings("S1", now=0) == ["Wear level at threshold (100)"]
+
+    def test_healthy_drive_has_no_warnings(self, store):
+        for d in range(5):
+            store.record("S1", attrs(temp=30 + d), ts=d * DAY)
+        assert store.warnings("S1", now=5 * DAY) == []
+
+    def test_window_excludes_old_samples(self, store):
+        store.record("S1", attrs(reallocated=0), ts=0)
+        store.record("S1", attrs(reallocated=50), ts=1 * DAY)
+        store.record("S1", attrs(reallocated=50), ts=100 * DAY)
+        assert store.trends("S1", now=100 * DAY)['reallocated']['rate_per_day'] is None
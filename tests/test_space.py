@@ -0,0 +1,215 @@
+"""Unit tests for the parallel, incremental disk space analyzer."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import time
+import types
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'UnifiedDiagnostics'))
+
+from modules.space import SpaceAnalyzer, SpaceIndex, format_size
+
+
+def write(path, size: int) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    write(tmp_path / "a" / "big.bin", 5000)
+    write(tmp_path / "a" / "deep" / "er" / "est" / "f.bin", 700)
+    write(tmp_path / "b" / "one.bin", 100)
+    write(tmp_path / "b" / "two.bin", 200)
+    write(tmp_path / "top.bin", 10)
+    os.makedirs(tmp_path / "empty")
+    return tmp_path
+
+
+def bump_mtime(path) -> None:
+    # Coarse filesystem timestamps: make the change visible to the mtime check
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+class TestSpaceAnalyzer:
+
+    def test_totals_per_directory(self, tree):
+        result = SpaceAnalyzer(str(tree), workers=4).scan()
+        root = result.tree
+        assert (root.bytes, root.files) == (6010, 5)
+        assert root.dirs == 7      # root, a, a/deep, a/deep/er, a/deep/er/est, b, empty
+        a = root.children["a"]
+        assert (a.bytes, a.files) == (5700, 2)
+        assert root.children["b"].bytes == 300
+        assert [c.name for c in root.largest(2)] == ["a", "b"]
+        assert result.complete and result.errors == 0
+
+    def test_depth_limit_keeps_totals_exact(self, tree):
+        result = SpaceAnalyzer(str(tree), depth=1).scan()
+        a = result.tree.children["a"]
+        assert a.children == {}
+        assert a.bytes == 5700
+
+    def test_node_cap_folds_into_ancestors(self, tree):
+        result = SpaceAnalyzer(str(tree), max_nodes=2).scan()
+        assert result.tree.bytes == 6010
+        assert sum(1 for _ in result.tree.children) <= 2
+
+    def test_progress_is_streamed(self, tree):
+        seen = []
+        SpaceAnalyzer(str(tree)).scan(progress=seen.append)
+        assert seen and seen[-1]['complete']
+        assert seen[-1]['tree']['children'][0]['name'] == "a"
+
+    def test_unreadable_directory_is_counted(self, tree):
+        if os.geteuid() == 0:
+            pytest.skip("root can read everything")
+        locked = tree / "locked"
+        os.makedirs(locked)
+        os.chmod(locked, 0)
+        try:
+            result = SpaceAnalyzer(str(tree)).scan()
+        finally:
+            os.chmod(locked, 0o755)
+        assert result.errors == 1 and result.tree.bytes == 6010
+
+    def test_cancel(self, tree):
+        analyzer = SpaceAnalyzer(str(tree))
+        analyzer.cancel()
+        result = analyzer.scan()
+        assert not result.complete
+
+    def test_unexpected_error_does_not_hang_the_walk(self, tree):
+        visit = SpaceAnalyzer._visit
+
+        def flaky(self, path, *args):
+            if path.endswith("deep"):
+                raise ValueError("boom")
+            return visit(self, path, *args)
+
+        with patch.object(SpaceAnalyzer, "_visit", flaky):
+            result = SpaceAnalyzer(str(tree)).scan()
+        assert result.complete and result.errors == 1
+        assert result.tree.bytes == 5310   # everything but deep/er/est/f.bin
+
+    def test_directory_entries_without_a_device(self, tree):
+        # Windows: DirEntry.stat() reports st_dev 0 while os.stat(root) does not
+        scandir = os.scandir
+
+        class Entry:
+            def __init__(self, entry):
+                self._entry, self.path, self.name = entry, entry.path, entry.name
+
+            def is_dir(self, follow_symlinks=True):
+                return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+            def is_file(self, follow_symlinks=True):
+                return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+            def stat(self, follow_symlinks=True):
+                st = self._entry.stat(follow_symlinks=follow_symlinks)
+                return types.SimpleNamespace(st_dev=0, st_mtime_ns=st.st_mtime_ns, st_size=st.st_size)
+
+        class Listing:
+            def __init__(self, path):
+                self._it = scandir(path)
+
+            def __enter__(self):
+                return (Entry(e) for e in self._it)
+
+            def __exit__(self, *exc):
+                self._it.close()
+
+        with patch("os.scandir", Listing):
+            result = SpaceAnalyzer(str(tree)).scan()
+        assert (result.tree.bytes, result.tree.dirs) == (6010, 7)
+
+
+class TestIncrementalIndex:
+
+    def test_rescan_reuses_unchanged_directories(self, tree, tmp_path_factory):
+        index = SpaceIndex(str(tmp_path_factory.mktemp("idx") / "space.db"))
+        first = SpaceAnalyzer(str(tree), index=index).scan()
+        assert first.reused_dirs == 0
+
+        second = SpaceAnalyzer(str(tree), index=index).scan()
+        assert second.scanned_dirs == 0 and second.reused_dirs == first.scanned_dirs
+        assert second.tree.bytes == first.tree.bytes
+
+        write(tree / "b" / "three.bin", 50)
+        bump_mtime(tree / "b")
+        third = SpaceAnalyzer(str(tree), index=index).scan()
+        assert third.scanned_dirs == 1
+        assert third.tree.children["b"].bytes == 350
+        assert index.totals(str(tree)) == (6060, 6, 7)
+
+    def test_deleted_directories_are_pruned(self, tree, tmp_path_factory):
+        index = SpaceIndex(str(tmp_path_factory.mktemp("idx") / "space.db"))
+        SpaceAnalyzer(str(tree), index=index).scan()
+        os.remove(tree / "b" / "one.bin")
+        os.remove(tree / "b" / "two.bin")
+        os.rmdir(tree / "b")
+        bump_mtime(tree)
+        result = SpaceAnalyzer(str(tree), index=index).scan()
+        assert "b" not in result.tree.children
+        assert index.totals(str(tree))[0] == 5710
+
+    def test_filesystem_mounted_after_indexing_is_not_walked(self, tree, tmp_path_factory):
+        index = SpaceIndex(str(tmp_path_factory.mktemp("idx") / "space.db"))
+        SpaceAnalyzer(str(tree), index=index).scan()
+        real_stat = os.stat
+        mounted = str(tree / "b")
+
+        def stat(path, *args, **kwargs):
+            st = real_stat(path, *args, **kwargs)
+            if os.fspath(path) == mounted:     # something got mounted on b; tree's mtime is unchanged
+                return types.SimpleNamespace(st_dev=st.st_dev + 1, st_mtime_ns=st.st_mtime_ns)
+            return st
+
+        with patch("os.stat", stat):
+            result = SpaceAnalyzer(str(tree), index=index).scan()
+        assert result.scanned_dirs == 0 and "b" not in result.tree.children
+        assert result.tree.bytes == 5710
+        assert index.totals(str(tree)) == (5710, 3, 6)
+
+    @pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="needs a filesystem that accepts any bytes")
+    def test_names_that_are_not_utf8(self, tree, tmp_path_factory):
+        bad = os.path.join(os.fsencode(tree), b"bad\xff")
+        os.makedirs(os.path.join(bad, b"sub"))
+        with open(os.path.join(bad, b"sub", b"f.bin"), "wb") as f:
+            f.write(b"x" * 40)
+        index = SpaceIndex(str(tmp_path_factory.mktemp("idx") / "space.db"))
+        first = SpaceAnalyzer(str(tree), index=index).scan()
+        assert first.complete and first.errors == 0
+        assert first.tree.children[os.fsdecode(b"bad\xff")].bytes == 40
+        second = SpaceAnalyzer(str(tree), index=index).scan()
+        assert second.scanned_dirs == 0 and second.tree.bytes == first.tree.bytes
+        assert index.totals(str(tree)) == (6050, 6, 9)
+
+    def test_old_index_layout_is_rebuilt(self, tree, tmp_path_factory):
+        path = str(tmp_path_factory.mktemp("idx") / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER, own_bytes INTEGER,"
+                     " own_files INTEGER, subdirs TEXT, scan INTEGER) WITHOUT ROWID")
+        conn.execute("INSERT INTO dirs VALUES (?, 0, 999, 1, '', 0)", (str(tree),))
+        conn.commit()
+        conn.close()
+        index = SpaceIndex(path)
+        assert index.totals(str(tree)) == (0, 0, 0)
+        SpaceAnalyzer(str(tree), index=index).scan()
+        assert index.totals(str(tree)) == (6010, 5, 7)
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.50 KB"
+    assert format_size(5 * 1024 ** 3) == "5.00 GB"
+    assert format_size(3 * 1024 ** 5) == "3072.00 TB"